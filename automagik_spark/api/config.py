@@ -1,7 +1,7 @@
 """API configuration."""
 
 import os
-from typing import List
+from typing import Dict, List
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -98,3 +98,277 @@ def get_http_timeout() -> float:
         if "could not convert" in str(e):
             raise ValueError(f"Invalid timeout value: {timeout_str}")
         raise
+
+
+def get_http_pool_enabled() -> bool:
+    """Check whether worker processes keep a pool of keep-alive HTTP clients.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_HTTP_POOL: Enable the per-process client pool (default: true)
+    """
+    return os.getenv("AUTOMAGIK_SPARK_HTTP_POOL", "true").lower() in ("true", "1", "yes")
+
+
+def get_http_max_connections() -> int:
+    """Get the maximum number of pooled connections per source client.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_HTTP_MAX_CONNECTIONS: Connections per source (default: 20)
+    """
+    return int(os.getenv("AUTOMAGIK_SPARK_HTTP_MAX_CONNECTIONS", "20"))
+
+
+def get_http_keepalive_expiry() -> float:
+    """Get how long idle pooled connections are kept open, in seconds.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_HTTP_KEEPALIVE_EXPIRY: Idle seconds before closing (default: 60)
+    """
+    return float(os.getenv("AUTOMAGIK_SPARK_HTTP_KEEPALIVE_EXPIRY", "60"))
+
+
+def get_catalog_ttl() -> float:
+    """Get how long a cached remote flow catalog is served as fresh, in seconds.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_CATALOG_TTL: Fresh seconds; 0 disables the cache (default: 60)
+    """
+    return float(os.getenv("AUTOMAGIK_SPARK_CATALOG_TTL", "60"))
+
+
+def get_catalog_stale_ttl() -> float:
+    """Get how long past its TTL a catalog is served while it is refreshed, in seconds.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_CATALOG_STALE_TTL: Stale-while-revalidate seconds (default: 600)
+    """
+    return float(os.getenv("AUTOMAGIK_SPARK_CATALOG_STALE_TTL", "600"))
+
+
+def get_catalog_redis_url() -> str | None:
+    """Get the Redis URL of the shared remote flow catalog tier.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_CATALOG_REDIS_URL: Redis URL; unset keeps the catalog in-process only
+    """
+    return os.getenv("AUTOMAGIK_SPARK_CATALOG_REDIS_URL") or None
+
+
+def get_catalog_source_timeout() -> float:
+    """Get the time budget for listing one source's flows, in seconds.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_CATALOG_SOURCE_TIMEOUT: Seconds per source before it is reported as timed out (default: 15)
+    """
+    return float(os.getenv("AUTOMAGIK_SPARK_CATALOG_SOURCE_TIMEOUT", "15"))
+
+
+def get_resolved_flow_ttl() -> float:
+    """Get how long the run metadata looked up for an unsynced flow is reused, in seconds.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_RESOLVED_FLOW_TTL: Seconds; 0 looks the flow up before every run (default: 600)
+    """
+    return float(os.getenv("AUTOMAGIK_SPARK_RESOLVED_FLOW_TTL", "600"))
+
+
+def get_adapter_threads() -> int:
+    """Get the size of the thread pool that runs blocking adapter calls for async callers.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_ADAPTER_THREADS: Maximum concurrent blocking adapter calls (default: 16)
+    """
+    return int(os.getenv("AUTOMAGIK_SPARK_ADAPTER_THREADS", "16"))
+
+
+def get_callback_timeout() -> float:
+    """Get the timeout for task completion callbacks, in seconds.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_CALLBACK_TIMEOUT: Seconds to wait for the callback URL (default: 10)
+    """
+    return float(os.getenv("AUTOMAGIK_SPARK_CALLBACK_TIMEOUT", "10"))
+
+
+def get_stream_poll_interval() -> float:
+    """Get how often task streams re-check the task row and send keepalives, in seconds.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_STREAM_POLL_INTERVAL: Seconds between task status polls (default: 2)
+    """
+    return float(os.getenv("AUTOMAGIK_SPARK_STREAM_POLL_INTERVAL", "2"))
+
+
+def get_count_cache_ttl() -> float:
+    """Get how long list totals requested with ``count=cached`` are reused, in seconds.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_COUNT_CACHE_TTL: Seconds to keep list totals (default: 30)
+    """
+    return float(os.getenv("AUTOMAGIK_SPARK_COUNT_CACHE_TTL", "30"))
+
+
+def get_task_retention_days() -> int | None:
+    """Get how many days finished tasks are kept by default.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_TASK_RETENTION_DAYS: Days to keep finished tasks (default: unset, keep forever)
+    """
+    value = os.getenv("AUTOMAGIK_SPARK_TASK_RETENTION_DAYS")
+    return int(value) if value else None
+
+
+def get_task_retention_by_status() -> Dict[str, int]:
+    """Get per-status task retention, overriding the default retention.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_TASK_RETENTION_BY_STATUS: Comma-separated status=days pairs,
+            e.g. "completed=7,failed=30" (default: none)
+    """
+    retention = {}
+    for pair in os.getenv("AUTOMAGIK_SPARK_TASK_RETENTION_BY_STATUS", "").split(","):
+        if "=" not in pair:
+            continue
+        status, days = pair.split("=", 1)
+        retention[status.strip().lower()] = int(days)
+    return retention
+
+
+def get_task_retention_batch_size() -> int:
+    """Get how many tasks a retention purge deletes per transaction.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_TASK_RETENTION_BATCH_SIZE: Tasks per purge batch (default: 1000)
+    """
+    return int(os.getenv("AUTOMAGIK_SPARK_TASK_RETENTION_BATCH_SIZE", "1000"))
+
+
+def get_task_archive_dir() -> str | None:
+    """Get the directory purged tasks are archived to before deletion.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_TASK_ARCHIVE_DIR: Directory for gzip JSON Lines archives (default: unset, no archive)
+    """
+    return os.getenv("AUTOMAGIK_SPARK_TASK_ARCHIVE_DIR") or None
+
+
+def get_task_retention_interval() -> int:
+    """Get how often the beat runs the retention purge, in seconds.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_TASK_RETENTION_INTERVAL: Seconds between purges; 0 disables them (default: 3600)
+    """
+    return int(os.getenv("AUTOMAGIK_SPARK_TASK_RETENTION_INTERVAL", "3600"))
+
+
+def get_task_output_inline_limit() -> int:
+    """Get the largest task output, in bytes, stored as is in the task row.
+
+    Larger outputs are compressed into the task_outputs table and only a
+    compact extract (the result text and run identifiers) stays in the row.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_TASK_OUTPUT_INLINE_LIMIT: Bytes kept inline (default: 8192)
+    """
+    return int(os.getenv("AUTOMAGIK_SPARK_TASK_OUTPUT_INLINE_LIMIT", "8192"))
+
+
+def get_celery_broker_url() -> str:
+    """Get the Celery broker URL.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_CELERY_BROKER_URL: Broker URL (default: redis://localhost:6379/0)
+    """
+    return os.getenv("AUTOMAGIK_SPARK_CELERY_BROKER_URL", "redis://localhost:6379/0")
+
+
+def get_source_limiter_redis_url() -> str | None:
+    """Get the Redis URL the per-source run limits are shared through.
+
+    Defaults to the Celery broker when it is Redis, so every worker draws
+    from the same concurrency slots and rate buckets.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_LIMITER_REDIS_URL: Redis URL; "none" keeps the limits per process
+    """
+    url = os.getenv("AUTOMAGIK_SPARK_LIMITER_REDIS_URL")
+    if url is None:
+        url = get_celery_broker_url()
+    if not url.startswith(("redis://", "rediss://", "unix://")):
+        return None
+    return url
+
+
+def get_source_limiter_wait() -> float:
+    """Get how long a run waits for a free slot of a limited source before it is requeued, in seconds.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_LIMITER_WAIT: Seconds to wait (default: 10)
+    """
+    return float(os.getenv("AUTOMAGIK_SPARK_LIMITER_WAIT", "10"))
+
+
+def get_source_latency_target() -> float:
+    """Get the run latency above which a limited source is treated as overloaded, in seconds.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_LIMITER_LATENCY_TARGET: Seconds; 0 only backs off on 429/5xx and timeouts (default: 120)
+    """
+    return float(os.getenv("AUTOMAGIK_SPARK_LIMITER_LATENCY_TARGET", "120"))
+
+
+def get_queue_routes() -> Dict[str, str]:
+    """Get the queues workflow runs are routed to by source type or source ID.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_QUEUE_ROUTES: Comma-separated key=queue pairs, where the key is a
+            source type or a source ID, e.g. "automagik-hive=slow,langflow=fast" (default: none)
+    """
+    routes = {}
+    for pair in os.getenv("AUTOMAGIK_SPARK_QUEUE_ROUTES", "").split(","):
+        if "=" not in pair:
+            continue
+        key, queue = pair.split("=", 1)
+        if key.strip() and queue.strip():
+            routes[key.strip().lower()] = queue.strip()
+    return routes
+
+
+def get_extra_queues() -> List[str]:
+    """Get queues declared for workflows to opt into besides the routed ones.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_QUEUES: Comma-separated queue names, e.g. "critical,bulk" (default: none)
+    """
+    return [queue.strip() for queue in os.getenv("AUTOMAGIK_SPARK_QUEUES", "").split(",") if queue.strip()]
+
+
+def get_worker_pool() -> str:
+    """Get the Celery pool workers run tasks in.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_WORKER_POOL: "prefork", "threads", "gevent" or "eventlet" (default: prefork)
+    """
+    return os.getenv("AUTOMAGIK_SPARK_WORKER_POOL", "prefork").lower()
+
+
+def get_worker_io_concurrency() -> int:
+    """Get the default number of concurrent runs of a threads, gevent or eventlet worker.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_WORKER_IO_CONCURRENCY: Concurrent runs per worker process (default: 100)
+    """
+    return int(os.getenv("AUTOMAGIK_SPARK_WORKER_IO_CONCURRENCY", "100"))
+
+
+def get_workflow_max_slots() -> int:
+    """Get how many runs of one workflow of default priority may be in flight at once across workers.
+
+    Higher-priority workflows get a proportionally larger share and lower-priority
+    ones a smaller one (at least one run), so a single busy workflow cannot take
+    every worker slot. Runs over their share are requeued behind other work.
+
+    Environment Variable:
+        AUTOMAGIK_SPARK_WORKFLOW_MAX_SLOTS: Concurrent runs per workflow; 0 disables the share (default: 0)
+    """
+    return int(os.getenv("AUTOMAGIK_SPARK_WORKFLOW_MAX_SLOTS", "0"))
@@ -1,5 +1,6 @@
 """API models for request/response validation."""
 
+import json
 from typing import Any, Dict, List, Optional, Generic, TypeVar
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
@@ -17,6 +18,16 @@ class ErrorResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+def decode_task_data(value: Any) -> Any:
+    """Decode task input or output stored as JSON text; plain text is wrapped as ``{"value": ...}``."""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return {"value": value}
+    return value
+
+
 class TaskBase(BaseModel):
     """Base model for task operations."""
 
@@ -60,25 +71,9 @@ class TaskResponse(TaskBase):
     ) -> "TaskResponse":
         """Convert a Task object to TaskResponse."""
         if hasattr(obj, "__dict__"):
-            # Convert input_data from string to dict if needed
-            input_data = obj.input_data
-            if isinstance(input_data, str):
-                try:
-                    import json
-
-                    input_data = json.loads(input_data)
-                except json.JSONDecodeError:
-                    input_data = {"value": input_data}
-
-            # Convert output_data from string to dict if needed
-            output_data = obj.output_data
-            if isinstance(output_data, str):
-                try:
-                    import json
-
-                    output_data = json.loads(output_data)
-                except json.JSONDecodeError:
-                    output_data = {"value": output_data}
+            # Convert input_data and output_data from string to dict if needed
+            input_data = decode_task_data(obj.input_data)
+            output_data = decode_task_data(obj.output_data)
 
             data = {
                 "id": str(obj.id) if isinstance(obj.id, UUID) else obj.id,
@@ -112,6 +107,11 @@ class WorkflowBase(BaseModel):
     input_component: Optional[str] = Field(None, description="Input component ID")
     output_component: Optional[str] = Field(None, description="Output component ID")
     is_component: Optional[bool] = Field(False, description="Whether the workflow is a component")
+    retention_days: Optional[int] = Field(
+        None, ge=1, description="Days to keep finished tasks of this workflow (default: global retention)"
+    )
+    queue: Optional[str] = Field(None, description="Queue its runs are sent to (default: routed by source)")
+    priority: Optional[int] = Field(None, ge=0, le=9, description="Run priority, 0 (lowest) to 9 (highest)")
     folder_id: Optional[str] = Field(None, description="Folder ID")
     folder_name: Optional[str] = Field(None, description="Folder name")
     icon: Optional[str] = Field(None, description="Icon name")
@@ -156,39 +156,9 @@ class WorkflowListResponse(WorkflowBase):
         context: Any | None = None,
     ) -> "WorkflowListResponse":
         """Convert a Workflow object to WorkflowListResponse."""
-        if hasattr(obj, "__dict__"):
-            # Get latest task
-            latest_task = None
-            task_count = 0
-            failed_task_count = 0
-            if hasattr(obj, "tasks") and obj.tasks:
-                latest_task = max(obj.tasks, key=lambda t: t.created_at)
-                task_count = len(obj.tasks)
-                failed_task_count = sum(1 for t in obj.tasks if t.status == "failed")
-
-            data = {
-                "id": str(obj.id) if isinstance(obj.id, UUID) else obj.id,
-                "name": obj.name,
-                "description": obj.description,
-                "source": obj.source,
-                "remote_flow_id": obj.remote_flow_id,
-                "flow_version": obj.flow_version,
-                "input_component": obj.input_component,
-                "output_component": obj.output_component,
-                "is_component": obj.is_component,
-                "folder_id": obj.folder_id,
-                "folder_name": obj.folder_name,
-                "icon": obj.icon,
-                "icon_bg_color": obj.icon_bg_color,
-                "liked": obj.liked,
-                "tags": obj.tags,
-                "created_at": obj.created_at,
-                "updated_at": obj.updated_at,
-                "latest_run": "NEW" if not latest_task else latest_task.status.upper(),
-                "task_count": task_count,
-                "failed_task_count": failed_task_count,
-            }
-            return cls(**data)
+        if hasattr(obj, "to_dict"):
+            # Only uses tasks that are already loaded; list queries pass precomputed stats instead
+            return cls(**obj.to_dict(include_data=False))
         return obj
 
     model_config = ConfigDict(from_attributes=True)
@@ -222,6 +192,9 @@ class WorkflowResponse(WorkflowWithData):
                 "input_component": obj.input_component,
                 "output_component": obj.output_component,
                 "is_component": obj.is_component,
+                "retention_days": obj.retention_days,
+                "queue": obj.queue,
+                "priority": obj.priority,
                 "folder_id": obj.folder_id,
                 "folder_name": obj.folder_name,
                 "icon": obj.icon,
@@ -248,6 +221,9 @@ class ScheduleBase(BaseModel):
         description="Schedule expression (cron expression, interval like '1h', or datetime/now for one-time)",
     )
     input_value: Optional[str] = Field(None, description="Input string to be passed to the workflow's input component")
+    priority: Optional[int] = Field(
+        None, ge=0, le=9, description="Run priority, 0 (lowest) to 9 (highest) (default: the workflow's priority)"
+    )
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -273,6 +249,7 @@ class ScheduleResponse(BaseModel):
     input_value: Optional[str] = Field(None, description="Input string to be passed to the workflow's input component")
     status: str = Field(..., description="Schedule status")
     next_run_at: Optional[datetime] = Field(None, description="Next run timestamp")
+    priority: Optional[int] = Field(None, description="Run priority, 0 (lowest) to 9 (highest)")
     created_at: datetime = Field(..., description="Schedule creation timestamp")
     updated_at: datetime = Field(..., description="Schedule last update timestamp")
 
@@ -295,6 +272,7 @@ class ScheduleResponse(BaseModel):
                 "input_value": obj.params.get("value") if obj.params else None,
                 "status": obj.status,
                 "next_run_at": obj.next_run_at,
+                "priority": obj.priority,
                 "created_at": obj.created_at,
                 "updated_at": obj.updated_at,
             }
@@ -316,13 +294,41 @@ class WorkerStatus(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class RemoteSourceStatus(BaseModel):
+    """Outcome of listing flows from one workflow source."""
+
+    source_id: str = Field(..., description="Source ID")
+    source_url: str = Field(..., description="Source URL")
+    instance: str = Field(..., description="Instance name derived from the URL")
+    status: str = Field(..., description="ok, error or timeout")
+    flow_count: int = Field(0, description="Number of flows listed")
+    error: Optional[str] = Field(None, description="Error message if the source failed")
+    elapsed_ms: int = Field(0, description="Time spent on the source in milliseconds")
+
+
+class RemoteFlowsResponse(BaseModel):
+    """Remote flows together with the per-source listing status."""
+
+    flows: List[Dict[str, Any]] = Field(..., description="Flows from the sources that answered")
+    sources: List[RemoteSourceStatus] = Field(..., description="Status of each queried source")
+
+
+CURSOR_DESCRIPTION = "Cursor from a previous page's next_cursor; replaces offset"
+COUNT_DESCRIPTION = (
+    "How to compute total: exact, cached (reused for a few seconds), estimate (table statistics) or none"
+)
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
     """Generic paginated response model."""
 
     items: List[T] = Field(..., description="List of items")
-    total: int = Field(..., description="Total number of items")
+    total: Optional[int] = Field(
+        ..., description="Total number of items (approximate with count=estimate, null with count=none)"
+    )
     limit: int = Field(..., description="Number of items per page")
     offset: int = Field(..., description="Number of items skipped")
     has_more: bool = Field(..., description="Whether there are more items")
+    next_cursor: Optional[str] = Field(None, description="Cursor to pass to get the next page")
 
     model_config = ConfigDict(from_attributes=True)
@@ -1,12 +1,20 @@
 """Schedules router for the AutoMagik API."""
 
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, HTTPException, Depends, Query
-from ..models import ScheduleCreate, ScheduleResponse, ErrorResponse, PaginatedResponse
+from ..models import (
+    ScheduleCreate,
+    ScheduleResponse,
+    ErrorResponse,
+    PaginatedResponse,
+    COUNT_DESCRIPTION,
+    CURSOR_DESCRIPTION,
+)
 from ..dependencies import verify_api_key
 from ..dependencies import get_session
 from ...core.workflows.manager import WorkflowManager
+from ...core.database.pagination import CountMode, next_cursor, page_items
 from ...core.scheduler.manager import SchedulerManager
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -42,6 +50,7 @@ async def create_schedule(
             schedule_type=schedule.schedule_type,
             schedule_expr=schedule.schedule_expr,
             params=({"value": schedule.input_value} if schedule.input_value is not None else None),
+            priority=schedule.priority,
         )
         if not created_schedule:
             raise HTTPException(status_code=400, detail="Failed to create schedule")
@@ -56,19 +65,23 @@ async def create_schedule(
 async def list_schedules(
     limit: int = Query(50, ge=1, le=100, description="Number of items per page"),
     offset: int = Query(0, ge=0, description="Number of items to skip"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    count: CountMode = Query("exact", description=COUNT_DESCRIPTION),
     scheduler_manager: SchedulerManager = Depends(get_scheduler_manager),
 ):
-    """List all schedules with pagination support."""
+    """List all schedules with pagination support, oldest first."""
     try:
-        schedules = await scheduler_manager.list_schedules(limit=limit, offset=offset)
-        total = await scheduler_manager.count_schedules()
+        schedules = await scheduler_manager.list_schedules(limit=limit + 1, offset=offset, cursor=cursor)
+        schedules, has_more = page_items(schedules, limit)
+        total = await scheduler_manager.count_schedules(mode=count)
 
         return PaginatedResponse[ScheduleResponse](
             items=[ScheduleResponse.model_validate(schedule) for schedule in schedules],
             total=total,
             limit=limit,
-            offset=offset,
-            has_more=(offset + limit) < total,
+            offset=0 if cursor else offset,
+            has_more=has_more,
+            next_cursor=next_cursor(schedules, has_more),
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -122,6 +135,12 @@ async def update_schedule(
             if not success:
                 raise HTTPException(status_code=400, detail="Failed to update schedule expression")
 
+        # Update schedule priority if changed
+        if existing_schedule.priority != schedule.priority:
+            success = await scheduler_manager.update_schedule_priority(schedule_uuid, schedule.priority)
+            if not success:
+                raise HTTPException(status_code=400, detail="Failed to update schedule priority")
+
         # Update schedule status if changed
         # Type ignore: ScheduleCreate doesn't have status attribute in schema
         # but it's accessed here for update operations - this is a design choice
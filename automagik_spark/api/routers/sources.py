@@ -2,7 +2,7 @@
 
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 import httpx
@@ -10,6 +10,8 @@ from ..dependencies import verify_api_key
 from ..models import PaginatedResponse
 from ...core.database.session import get_async_session
 from ...core.database.models import WorkflowSource
+from ...core.workflows.catalog import get_flow_catalog
+from ...core.workflows.manager import WorkflowManager
 from ...core.schemas.source import (
     WorkflowSourceCreate,
     WorkflowSourceUpdate,
@@ -134,6 +136,8 @@ async def create_source(
         encrypted_api_key=WorkflowSource.encrypt_api_key(source.api_key),
         version_info=version_info,
         status=("active" if version_info.get("status") == expected_status else "inactive"),
+        max_concurrency=source.max_concurrency,
+        max_runs_per_minute=source.max_runs_per_minute,
     )
     session.add(db_source)
     await session.commit()
@@ -219,15 +223,20 @@ async def update_source(
                 raise HTTPException(status_code=400, detail=f"Source with URL {url_str} already exists")
         source.url = url_str
     if update_data.api_key is not None:
+        WorkflowSource.invalidate_api_key_cache(source.id)
         source.encrypted_api_key = WorkflowSource.encrypt_api_key(update_data.api_key)
         # Validate new API key and update version info
         version_info = await _validate_source(source.url, update_data.api_key, source.source_type)
         source.version_info = version_info
     if update_data.status is not None:
         source.status = update_data.status
+    for limit in ("max_concurrency", "max_runs_per_minute"):
+        if limit in update_data.model_fields_set:
+            setattr(source, limit, getattr(update_data, limit))
 
     await session.commit()
     await session.refresh(source)
+    get_flow_catalog().invalidate(source)
     return WorkflowSourceResponse.from_orm(source)
 
 
@@ -239,8 +248,28 @@ async def delete_source(source_id: UUID, session: AsyncSession = Depends(get_asy
         if not source:
             raise HTTPException(status_code=404, detail="Source not found")
 
+        get_flow_catalog().invalidate(source)
         await session.delete(source)
         await session.commit()
+        WorkflowSource.invalidate_api_key_cache(source_id)
         return {"message": "Source deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error deleting source: {str(e)}")
+
+
+@router.post("/{source_id}/sync", dependencies=[Depends(verify_api_key)])
+async def sync_source(
+    source_id: UUID,
+    flow_ids: Optional[List[str]] = Body(None, embed=True, description="Remote flow IDs to sync (default: all)"),
+    session: AsyncSession = Depends(get_async_session),
+) -> dict:
+    """Sync all flows of a source (or the given ones) into local workflows in one pass."""
+    source = await session.get(WorkflowSource, source_id)
+    if not source:
+        raise HTTPException(status_code=404, detail="Source not found")
+    try:
+        return await WorkflowManager(session).sync_source(str(source_id), flow_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"Error listing flows from source: {str(e)}")
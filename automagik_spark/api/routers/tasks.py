@@ -1,10 +1,25 @@
 """Tasks router for the AutoMagik API."""
 
-from typing import List, Optional
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
+from uuid import UUID
 from fastapi import APIRouter, HTTPException, Depends, Query
-from ..models import TaskResponse, ErrorResponse, PaginatedResponse
+from fastapi.responses import StreamingResponse
+from ..config import get_stream_poll_interval
+from ..models import (
+    COUNT_DESCRIPTION,
+    CURSOR_DESCRIPTION,
+    ErrorResponse,
+    PaginatedResponse,
+    TaskResponse,
+    decode_task_data,
+)
 from ..dependencies import verify_api_key
 from ..dependencies import get_session
+from ...core.celery.task_events import iter_task_events
+from ...core.database.models import Task
+from ...core.database.pagination import CountMode, next_cursor, page_items
+from ...core.database.session import get_session as open_session
 from ...core.workflows.manager import WorkflowManager
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -24,19 +39,27 @@ async def list_tasks(
     status: Optional[str] = None,
     limit: int = Query(50, ge=1, le=100, description="Number of items per page"),
     offset: int = Query(0, ge=0, description="Number of items to skip"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    count: CountMode = Query("exact", description=COUNT_DESCRIPTION),
     flow_manager: WorkflowManager = Depends(get_flow_manager),
 ):
-    """List all tasks with pagination support."""
+    """List all tasks with pagination support, newest first.
+
+    Pass the returned ``next_cursor`` as ``cursor`` to page through tasks;
+    cursor pages cost the same at any depth, unlike large offsets.
+    """
     try:
-        tasks = await flow_manager.list_tasks(workflow_id, status, limit, offset)
-        total = await flow_manager.count_tasks(workflow_id, status)
+        tasks = await flow_manager.list_tasks(workflow_id, status, limit + 1, offset, cursor=cursor)
+        tasks, has_more = page_items(tasks, limit)
+        total = await flow_manager.count_tasks(workflow_id, status, mode=count)
 
         return PaginatedResponse[TaskResponse](
             items=[TaskResponse.model_validate(task) for task in tasks],
             total=total,
             limit=limit,
-            offset=offset,
-            has_more=(offset + limit) < total,
+            offset=0 if cursor else offset,
+            has_more=has_more,
+            next_cursor=next_cursor(tasks, has_more),
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -49,7 +72,12 @@ async def get_task(task_id: str, flow_manager: WorkflowManager = Depends(get_flo
         task = await flow_manager.get_task(task_id)
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
-        return TaskResponse.model_validate(task)
+        response = TaskResponse.model_validate(task)
+        # Large outputs only keep a compact extract in the row; return the full response here
+        raw_output = await flow_manager.get_task_output(task)
+        if raw_output is not None:
+            response.output_data = decode_task_data(raw_output)
+        return response
     except HTTPException:
         raise
     except Exception as e:
@@ -66,3 +94,48 @@ async def delete_task(task_id: str, flow_manager: WorkflowManager = Depends(get_
         return TaskResponse.model_validate(deleted_task)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _task_state(task_id: UUID) -> Optional[Dict[str, Any]]:
+    """Read the status of a task in a short-lived session of its own."""
+    async with open_session() as session:
+        task = await session.get(Task, task_id)
+        if not task:
+            return None
+        return {"status": task.status, "error": task.error}
+
+
+async def _sse_events(task_id: UUID) -> AsyncIterator[str]:
+    """Format the events of a task as Server-Sent Events."""
+    async for event, data in iter_task_events(
+        task_id, lambda: _task_state(task_id), poll_interval=get_stream_poll_interval()
+    ):
+        if event == "keepalive":
+            yield ": keepalive\n\n"
+        else:
+            yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get(
+    "/{task_id}/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}, 404: {"model": ErrorResponse}},
+    dependencies=[Depends(verify_api_key)],
+)
+async def stream_task(task_id: str, flow_manager: WorkflowManager = Depends(get_flow_manager)):
+    """Follow a task as Server-Sent Events.
+
+    Sends ``status`` events when the task changes state, ``token`` events with
+    the output chunks of streamed runs (``stream=true`` on the run endpoint),
+    ``event`` for other upstream events, and a final ``done`` event with the
+    task's status and error. The full output is read from ``GET /tasks/{id}``.
+    """
+    task = await flow_manager.get_task(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    return StreamingResponse(
+        _sse_events(task.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
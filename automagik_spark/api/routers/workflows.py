@@ -4,13 +4,23 @@ Workflow router.
 Provides endpoints for managing workflows.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Literal, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Body, Query
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..dependencies import get_session, verify_api_key
-from ..models import WorkflowResponse, WorkflowListResponse, ErrorResponse, TaskResponse, PaginatedResponse
+from ..models import (
+    WorkflowResponse,
+    WorkflowListResponse,
+    ErrorResponse,
+    TaskResponse,
+    PaginatedResponse,
+    RemoteFlowsResponse,
+    COUNT_DESCRIPTION,
+    CURSOR_DESCRIPTION,
+)
+from ...core.database.pagination import CountMode, next_cursor, page_items
 from ...core.workflows.manager import WorkflowManager
 
 router = APIRouter(
@@ -35,75 +45,94 @@ async def get_workflow_manager(
 async def list_workflows(
     limit: int = Query(50, ge=1, le=100, description="Number of items per page"),
     offset: int = Query(0, ge=0, description="Number of items to skip"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    count: CountMode = Query("exact", description=COUNT_DESCRIPTION),
     workflow_manager: WorkflowManager = Depends(get_workflow_manager),
 ) -> PaginatedResponse[WorkflowListResponse]:
-    """List all workflows with pagination support."""
-    workflows = await workflow_manager.list_workflows(limit=limit, offset=offset)
-    total = await workflow_manager.count_workflows()
+    """List all workflows with pagination support, newest first."""
+    try:
+        workflows = await workflow_manager.list_workflows(limit=limit + 1, offset=offset, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    workflows, has_more = page_items(workflows, limit)
+    total = await workflow_manager.count_workflows(mode=count)
 
     return PaginatedResponse[WorkflowListResponse](
         items=[WorkflowListResponse.model_validate(w) for w in workflows],
         total=total,
         limit=limit,
-        offset=offset,
-        has_more=(offset + limit) < total,
+        offset=0 if cursor else offset,
+        has_more=has_more,
+        next_cursor=next_cursor(workflows, has_more),
     )
 
 
 @router.get(
     "/remote",
-    response_model=List[Dict[str, Any]],
+    response_model=Union[List[Dict[str, Any]], RemoteFlowsResponse],
     dependencies=[Depends(verify_api_key)],
 )
 async def list_remote_flows(
     simplified: bool = True,
     source_url: Optional[str] = None,
+    refresh: bool = False,
+    include_status: bool = False,
     workflow_manager: WorkflowManager = Depends(get_workflow_manager),
-) -> List[Dict[str, Any]]:
+) -> Union[List[Dict[str, Any]], RemoteFlowsResponse]:
     """List remote flows from LangFlow API.
 
+    Sources are queried concurrently; a source that fails or times out is
+    left out of the result instead of failing the request.
+
     Args:
         simplified: Flag to return only essential flow information. Defaults to True.
         source_url: Optional URL or instance name to filter flows by source
+        refresh: Bypass the cached flow catalog. Defaults to False.
+        include_status: Wrap the flows in an object that also reports each source's status. Defaults to False.
         workflow_manager: Workflow manager instance
     """
-    flows = await workflow_manager.list_remote_flows(source_url=source_url)
-
-    if not flows:
-        return []
-
+    flows, statuses = await workflow_manager.list_remote_flows_with_status(
+        source_url=source_url, force_refresh=refresh
+    )
     if simplified:
-        simplified_flows = []
-        for flow in flows:
-            # Extract essential flow information
-            simplified_flow = {
-                "id": flow.get("id"),
-                "name": flow.get("name"),
-                "description": flow.get("description"),
-                "origin": {
-                    "instance": flow.get("instance"),
-                    "source_url": flow.get("source_url"),
-                },
-                "components": [],
-            }
-
-            # Extract essential component information
-            if "data" in flow and "nodes" in flow["data"]:
-                for node in flow["data"]["nodes"]:
-                    component = {
-                        "id": node.get("id"),
-                        "name": node.get("data", {}).get("name") or node.get("data", {}).get("type"),
-                        "description": node.get("data", {}).get("description", ""),
-                    }
-                    simplified_flow["components"].append(component)
-
-            simplified_flows.append(simplified_flow)
-
-        return simplified_flows
+        flows = _simplify_flows(flows)
 
+    if include_status:
+        return RemoteFlowsResponse(flows=flows, sources=statuses)
     return flows
 
 
+def _simplify_flows(flows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Reduce remote flows to their essential information."""
+    simplified_flows = []
+    for flow in flows:
+        # Extract essential flow information
+        simplified_flow = {
+            "id": flow.get("id"),
+            "name": flow.get("name"),
+            "description": flow.get("description"),
+            "origin": {
+                "instance": flow.get("instance"),
+                "source_url": flow.get("source_url"),
+            },
+            "components": [],
+        }
+
+        # Extract essential component information
+        if "data" in flow and "nodes" in flow["data"]:
+            for node in flow["data"]["nodes"]:
+                component = {
+                    "id": node.get("id"),
+                    "name": node.get("data", {}).get("name") or node.get("data", {}).get("type"),
+                    "description": node.get("data", {}).get("description", ""),
+                }
+                simplified_flow["components"].append(component)
+
+        simplified_flows.append(simplified_flow)
+
+    return simplified_flows
+
+
 @router.get(
     "/remote/{flow_id}",
     response_model=Dict[str, Any],
@@ -196,18 +225,37 @@ async def sync_flow(
 @router.post(
     "/{workflow_id}/run",
     response_model=TaskResponse,
+    responses={202: {"model": TaskResponse, "description": "Task accepted and queued (mode=async)"}},
     dependencies=[Depends(verify_api_key)],
 )
 async def run_workflow(
     workflow_id: str,
+    response: Response,
     input_data: str = Body(..., description="Input string to be passed to the workflow's input component"),
+    mode: Literal["sync", "async"] = Query(
+        "sync", description="sync runs the workflow in the request; async queues it and returns 202"
+    ),
+    callback_url: Optional[str] = Query(None, description="URL to POST the finished task to (mode=async only)"),
+    stream: bool = Query(
+        False, description="Stream tokens from the source; follow them on /api/v1/tasks/{id}/stream (mode=async only)"
+    ),
     workflow_manager: WorkflowManager = Depends(get_workflow_manager),
 ) -> TaskResponse:
     """Run a workflow with input data.
 
+    In async mode, or in sync mode when the workflow or its source is at its
+    run limits, the task is queued for a worker and returned right away with
+    status pending and a 202; poll ``GET /api/v1/tasks/{task_id}`` (also sent
+    as the Location header), pass a ``callback_url``, or follow the run live
+    on ``GET /api/v1/tasks/{task_id}/stream``.
+
     Args:
         workflow_id: ID of the workflow to run
+        response: Response used to set the 202 status and Location header
         input_data: Input string to be passed to the workflow's input component
+        mode: Run inline ("sync") or queue the run ("async")
+        callback_url: Optional URL the worker POSTs the finished task to
+        stream: Use the source's streaming endpoint and publish tokens (async mode)
         workflow_manager: Workflow manager instance
 
     Returns:
@@ -216,10 +264,29 @@ async def run_workflow(
     Raises:
         HTTPException: If the workflow is not found or if there's an error running it
     """
+    if mode == "async":
+        try:
+            task = await workflow_manager.enqueue_workflow(
+                workflow_id, input_data, callback_url=callback_url, stream=stream
+            )
+        except RuntimeError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if not task:
+            raise HTTPException(status_code=404, detail="Workflow not found")
+        response.status_code = 202
+        response.headers["Location"] = f"/api/v1/tasks/{task.id}"
+        return TaskResponse.model_validate(task)
+
     try:
         task = await workflow_manager.run_workflow(workflow_id, input_data)
         if not task:
             raise HTTPException(status_code=404, detail="Workflow not found")
+        if task.status == "pending":
+            # The run limits had no room, so the run was handed to a worker
+            response.status_code = 202
+            response.headers["Location"] = f"/api/v1/tasks/{task.id}"
         return TaskResponse.model_validate(task)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -14,10 +14,11 @@ import json
 import logging
 from datetime import datetime, timezone
 from uuid import UUID
-from croniter import croniter
 from sqlalchemy import select, func, case
 
 from ...core.workflows import WorkflowManager
+from ...core.scheduler.compiled import compile_schedule
+from ...core.scheduler.manager import SchedulerManager
 from ...core.scheduler.scheduler import WorkflowScheduler
 from ...core.database.session import get_session
 from ...core.database.models import Workflow, Schedule, Task
@@ -147,7 +148,9 @@ def create():
                 schedule_expr = click.prompt("\nEnter cron expression")
 
                 # Validate cron expression
-                if not croniter.is_valid(schedule_expr):
+                try:
+                    compile_schedule("cron", schedule_expr)
+                except ValueError:
                     click.echo("Invalid cron expression")
                     return
 
@@ -347,6 +350,32 @@ def set_input(schedule_id: str, input_data: str):
     asyncio.run(_set_input())
 
 
+@schedule_group.command(name="set-priority")
+@click.argument("schedule_id")
+@click.argument("priority", type=click.IntRange(0, 9), required=False)
+def set_priority(schedule_id: str, priority: int | None):
+    """Set the priority of runs of a schedule, 0 (lowest) to 9 (highest).
+
+    Omit PRIORITY to use the workflow's priority again.
+    """
+
+    async def _set_priority():
+        async with get_session() as session:
+            scheduler = SchedulerManager(session, WorkflowManager(session))
+            try:
+                schedule_uuid = UUID(schedule_id)
+            except ValueError:
+                raise click.ClickException(f"Invalid schedule ID: {schedule_id}")
+            if not await scheduler.update_schedule_priority(schedule_uuid, priority):
+                raise click.ClickException(f"Failed to update priority of schedule {schedule_id}")
+            if priority is None:
+                click.echo(f"Schedule {schedule_id} now uses its workflow's priority")
+            else:
+                click.echo(f"Schedule {schedule_id} runs at priority {priority}")
+
+    asyncio.run(_set_priority())
+
+
 @schedule_group.command()
 @click.argument("schedule_id")
 def delete(schedule_id: str):
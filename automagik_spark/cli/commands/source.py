@@ -9,6 +9,7 @@ from rich.console import Console
 from rich.table import Table
 
 from ...core.database.session import get_session
+from ...core.workflows.manager import WorkflowManager
 from ...core.workflows.source import WorkflowSource
 
 
@@ -36,6 +37,7 @@ def add(name: str, type: str, url: str, api_key: str, status: str):
                 click.echo(f"Source with URL {url} already exists. Updating instead...")
                 existing.name = name
                 existing.source_type = type
+                WorkflowSource.invalidate_api_key_cache(existing.id)
                 existing.encrypted_api_key = WorkflowSource.encrypt_api_key(api_key)
                 existing.status = status
                 source = existing
@@ -142,11 +144,40 @@ def delete(id_or_url: str, force: bool = False):
 
             await session.delete(source)
             await session.commit()
+            WorkflowSource.invalidate_api_key_cache(source.id)
             click.echo(f"Successfully deleted source: {source.url} (ID: {source.id})")
 
     asyncio.run(_delete())
 
 
+@source_group.command()
+@click.argument("id_or_url")
+@click.argument("flow_ids", nargs=-1)
+def sync(id_or_url: str, flow_ids: tuple):
+    """Sync all flows of a source into local workflows, or only FLOW_IDS."""
+
+    async def _sync():
+        async with get_session() as session:
+            try:
+                # (``list`` is shadowed by the list command below)
+                result = await WorkflowManager(session).sync_source(id_or_url, [*flow_ids] or None)
+            except ValueError as e:
+                click.echo(f"Error: {str(e)}", err=True)
+                return
+            except httpx.HTTPError as e:
+                click.echo(f"Error listing flows from source: {str(e)}", err=True)
+                return
+
+            click.echo(
+                f"Synced {len(result['workflows'])} flow(s): {result['created']} new, "
+                f"{result['updated']} updated, {result['unchanged']} unchanged"
+            )
+            for flow_id in result["missing"]:
+                click.echo(f"Flow not found in source: {flow_id}", err=True)
+
+    asyncio.run(_sync())
+
+
 @source_group.command()
 @click.option("--status", "-s", help="Filter by status (active/inactive)")
 def list(status: Optional[str] = None):
@@ -201,7 +232,17 @@ def list(status: Optional[str] = None):
 @click.argument("url")
 @click.option("--status", "-s", help="New status (active/inactive)")
 @click.option("--api-key", "-k", help="New API key")
-def update(url: str, status: Optional[str] = None, api_key: Optional[str] = None):
+@click.option("--max-concurrency", type=click.IntRange(min=0), help="Most runs sent at once (0 removes the limit)")
+@click.option(
+    "--max-runs-per-minute", type=click.IntRange(min=0), help="Most runs started per minute (0 removes the limit)"
+)
+def update(
+    url: str,
+    status: Optional[str] = None,
+    api_key: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+    max_runs_per_minute: Optional[int] = None,
+):
     """Update a workflow source."""
 
     async def _update():
@@ -215,6 +256,7 @@ def update(url: str, status: Optional[str] = None, api_key: Optional[str] = None
             if status:
                 source.status = status
             if api_key:
+                WorkflowSource.invalidate_api_key_cache(source.id)
                 source.encrypted_api_key = WorkflowSource.encrypt_api_key(api_key)
 
                 # Validate new API key by fetching version info
@@ -226,6 +268,10 @@ def update(url: str, status: Optional[str] = None, api_key: Optional[str] = None
                         source.version_info = response.json()
                 except Exception as e:
                     click.echo(f"Warning: Failed to fetch version info with new API key: {str(e)}")
+            if max_concurrency is not None:
+                source.max_concurrency = max_concurrency or None
+            if max_runs_per_minute is not None:
+                source.max_runs_per_minute = max_runs_per_minute or None
 
             await session.commit()
             click.echo(f"Successfully updated source: {url}")
@@ -15,14 +15,15 @@ from rich.table import Table
 from rich import box
 from rich.panel import Panel
 from typing import Optional, Any, Callable
-from sqlalchemy import select, cast, String
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import joinedload
 import asyncio
 
 from automagik_spark.core.database import get_session
-from automagik_spark.core.database.models import Task, Workflow
+from automagik_spark.core.database.models import Task
+from automagik_spark.core.tasks.retention import RetentionPolicy, purge_task_history
 from automagik_spark.core.workflows.manager import WorkflowManager
 from automagik_spark.cli.utils.async_helper import handle_async_command
 from automagik_spark.cli.utils.log import get_logger
@@ -139,14 +140,16 @@ async def _view_task(task_id: str) -> int:
         session: AsyncSession
         async with get_session() as session:
             # Get task by ID or prefix
-            stmt = select(Task).where(cast(Task.id, String).startswith(task_id.lower()))
-            result = await session.execute(stmt)
-            task = result.scalar_one_or_none()
+            workflow_manager = WorkflowManager(session)
+            task = await workflow_manager.find_task_by_prefix(task_id)
 
             if not task:
                 logger.error(f"Task {task_id} not found")
                 raise click.ClickException(f"Task {task_id} not found")
 
+            # Large outputs are stored apart from the task row
+            output_data = await workflow_manager.get_task_output(task) or task.output_data
+
             # Load relationships
             await session.refresh(task, ["workflow"])
 
@@ -167,9 +170,9 @@ async def _view_task(task_id: str) -> int:
             click.echo("\nInput:")
             click.echo(json.dumps(task.input_data, indent=2) if task.input_data else "None")
 
-            if task.output_data:
+            if output_data:
                 click.echo("\nOutput:")
-                click.echo(json.dumps(task.output_data, indent=2))
+                click.echo(json.dumps(output_data, indent=2))
 
             if task.error:
                 click.echo("\nError:")
@@ -197,9 +200,7 @@ async def _retry_task(task_id: str) -> int:
         session: AsyncSession
         async with get_session() as session:
             # Get task by ID or prefix
-            stmt = select(Task).where(cast(Task.id, String).startswith(task_id.lower()))
-            result = await session.execute(stmt)
-            task = result.scalar_one_or_none()
+            task = await WorkflowManager(session).find_task_by_prefix(task_id)
 
             if not task:
                 logger.error(f"Task {task_id} not found")
@@ -241,16 +242,16 @@ async def _create_task(
         session: AsyncSession
         async with get_session() as session:
             # Get workflow by ID or prefix
-            stmt = select(Workflow).where(cast(Workflow.id, String).startswith(workflow_id.lower()))
-            result = await session.execute(stmt)
-            workflow = result.scalar_one_or_none()
+            workflow_manager = WorkflowManager(session)
+            workflow = await workflow_manager.get_workflow(workflow_id)
+            if not workflow:
+                workflow = await workflow_manager.find_workflow_by_prefix(workflow_id)
 
             if not workflow:
                 logger.error(f"Workflow {workflow_id} not found")
                 raise click.ClickException(f"Workflow {workflow_id} not found")
 
             # Use input data directly as a string
-            workflow_manager = WorkflowManager(session)
             task = await workflow_manager.create_task(
                 workflow_id=str(workflow.id),
                 input_data=input_data if input_data else "",
@@ -299,3 +300,55 @@ def create_task(
 ):
     """Create a new task for a workflow."""
     return handle_async_command(_create_task(workflow_id, input_data, max_retries, run))
+
+
+@task_group.command(name="purge")
+@click.option("--older-than", type=int, help="Purge finished tasks older than this many days")
+@click.option(
+    "--status",
+    type=click.Choice(["completed", "failed", "cancelled"]),
+    multiple=True,
+    help="Only purge tasks in this status (repeatable, with --older-than)",
+)
+@click.option("--archive-dir", help="Archive purged tasks to gzip JSON Lines files in this directory")
+@click.option("--batch-size", type=int, help="Tasks deleted per transaction")
+@click.option("--dry-run", is_flag=True, help="Only count the tasks that would be purged")
+def purge_tasks(
+    older_than: Optional[int],
+    status: tuple,
+    archive_dir: Optional[str],
+    batch_size: Optional[int],
+    dry_run: bool,
+):
+    """Delete finished tasks past their retention.
+
+    Without --older-than, the configured retention (AUTOMAGIK_SPARK_TASK_RETENTION_*
+    and per-workflow retention) is applied; --older-than replaces all of it.
+    """
+    policy = RetentionPolicy.from_env()
+    if older_than is not None:
+        policy.workflow_overrides = False
+        if status:
+            policy.default_days = None
+            policy.status_days = {s: older_than for s in status}
+        else:
+            policy.default_days = older_than
+            policy.status_days = {}
+    if archive_dir:
+        policy.archive_dir = archive_dir
+    if batch_size:
+        policy.batch_size = batch_size
+
+    try:
+        result = purge_task_history(policy, dry_run=dry_run)
+    except SQLAlchemyError as e:
+        logger.error(f"Database error: {str(e)}")
+        raise click.ClickException(f"Database error: {str(e)}")
+
+    if dry_run:
+        click.echo(f"{result.deleted} task(s) would be purged")
+        return 0
+    click.echo(f"Purged {result.deleted} task(s) and {result.logs_deleted} log(s)")
+    if result.archive_path:
+        click.echo(f"Archived to {result.archive_path}")
+    return 0
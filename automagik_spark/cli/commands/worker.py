@@ -6,6 +6,7 @@ Provides CLI commands for running the worker that executes scheduled workflows.
 
 import asyncio
 import click
+import importlib.util
 import json
 import logging
 import os
@@ -14,10 +15,13 @@ import sys
 import subprocess
 import time
 from datetime import datetime, timezone
+from typing import List, Optional, Tuple
 from uuid import uuid4
 
 from sqlalchemy import select
 
+from ...api.config import get_worker_io_concurrency, get_worker_pool
+from ...core.celery.routing import get_queue_names
 from ...core.database.models import Schedule, Task
 from ...core.database.session import get_session
 from ...core.celery_config import app as celery_app
@@ -38,6 +42,9 @@ BEAT_PID_FILE = os.path.join(os.path.dirname(WORKER_LOG), "beat.pid")
 # Ensure log directory exists
 os.makedirs(os.path.dirname(WORKER_LOG), exist_ok=True)
 
+# Celery pools a worker can run in; all but prefork hold many runs in one process
+WORKER_POOLS = ("prefork", "threads", "gevent", "eventlet")
+
 
 def configure_logging():
     """Configure logging based on environment variables."""
@@ -133,8 +140,13 @@ async def process_schedule(session, schedule, workflow_manager, now=None):
 
 def save_worker_pid(pid):
     """Save worker PID to file."""
+    save_worker_pids([pid])
+
+
+def save_worker_pids(pids):
+    """Save the PIDs of all worker pools to file, one per line."""
     with open(WORKER_PID_FILE, "w") as f:
-        f.write(str(pid))
+        f.write("\n".join(str(pid) for pid in pids))
 
 
 def save_beat_pid(pid):
@@ -145,11 +157,17 @@ def save_beat_pid(pid):
 
 def get_worker_pid():
     """Get worker PID from file."""
+    pids = get_worker_pids()
+    return pids[0] if pids else None
+
+
+def get_worker_pids():
+    """Get the PIDs of all worker pools from file."""
     try:
         with open(WORKER_PID_FILE, "r") as f:
-            return int(f.read().strip())
+            return [int(line) for line in f.read().split()]
     except (FileNotFoundError, ValueError):
-        return None
+        return []
 
 
 def get_beat_pid():
@@ -232,15 +250,120 @@ def worker_process_init():
     logger.info("Worker process initialized")
 
 
+def parse_queue_spec(spec: str, default_concurrency: int) -> Tuple[List[str], int]:
+    """Parse a worker pool spec of the form ``QUEUE[,QUEUE...][:CONCURRENCY]``."""
+    names, _, concurrency = spec.partition(":")
+    queues = [name.strip() for name in names.split(",") if name.strip()]
+    if not queues:
+        raise click.BadParameter(f"No queue given in '{spec}'")
+
+    unknown = [name for name in queues if name not in get_queue_names()]
+    if unknown:
+        raise click.BadParameter(
+            f"Unknown queue(s) {', '.join(unknown)}; known queues: {', '.join(get_queue_names())}"
+        )
+
+    if not concurrency:
+        return queues, default_concurrency
+    try:
+        value = int(concurrency)
+    except ValueError:
+        raise click.BadParameter(f"Invalid concurrency '{concurrency}' in '{spec}'")
+    if value < 1:
+        raise click.BadParameter(f"Concurrency must be at least 1 in '{spec}'")
+    return queues, value
+
+
+def resolve_pool(pool: Optional[str], threads: Optional[int]) -> Tuple[str, int]:
+    """Pick the worker pool and its default concurrency, checking green pools can be loaded."""
+    pool = (pool or get_worker_pool()).lower()
+    if pool not in WORKER_POOLS:
+        raise click.BadParameter(f"Unknown pool '{pool}'; choose one of {', '.join(WORKER_POOLS)}")
+    if pool in ("gevent", "eventlet") and importlib.util.find_spec(pool) is None:
+        raise click.ClickException(f"The {pool} pool needs the {pool} package: pip install automagik-spark[{pool}]")
+
+    if threads is None:
+        threads = 2 if pool == "prefork" else get_worker_io_concurrency()
+    return pool, threads
+
+
+def _worker_command(
+    concurrency: int,
+    hostname: str,
+    queues: Optional[List[str]] = None,
+    log_dir: Optional[str] = None,
+    name: str = "worker",
+    pool: str = "prefork",
+) -> List[str]:
+    """Build the celery command of one worker pool; it consumes every queue when none are given."""
+    cmd = [
+        "celery",
+        "-A",
+        "automagik_spark.core.celery.celery_app",
+        "worker",
+        "--loglevel=INFO",
+        "-P",
+        pool,
+        "--concurrency",
+        str(concurrency),
+        "--hostname",
+        hostname,
+        "--without-gossip",  # Disable gossip to avoid broken pipe
+        "--without-mingle",  # Disable mingle to avoid broken pipe
+        "--without-heartbeat",  # Disable heartbeat to avoid broken pipe
+    ]
+    if queues:
+        cmd.extend(["-Q", ",".join(queues)])
+
+    # Add log and pid files only in daemon mode
+    if log_dir:
+        cmd.extend(
+            [
+                "--logfile",
+                os.path.join(log_dir, f"{name}.log"),
+                "--pidfile",
+                os.path.join(log_dir, f"{name}.pid"),
+            ]
+        )
+    return cmd
+
+
 worker_group = click.Group(name="worker", help="Worker management commands")
 
 
 @worker_group.command()
-@click.option("--threads", default=2, type=int, help="Number of worker threads")
+@click.option(
+    "--threads",
+    default=None,
+    type=int,
+    help="Concurrent runs per worker (default: 2 for prefork, AUTOMAGIK_SPARK_WORKER_IO_CONCURRENCY otherwise)",
+)
+@click.option(
+    "--pool",
+    "-P",
+    type=click.Choice(WORKER_POOLS, case_sensitive=False),
+    default=None,
+    help="Worker pool; threads, gevent and eventlet hold many I/O-bound runs in one process "
+    "(default: AUTOMAGIK_SPARK_WORKER_POOL or prefork)",
+)
 @click.option("--daemon", is_flag=True, default=False, help="Run in daemon mode (background)")
-def start(threads: int = 2, daemon: bool = False):
+@click.option(
+    "--queue",
+    "-Q",
+    "queue_specs",
+    multiple=True,
+    help="Start a worker pool for QUEUE[,QUEUE...][:CONCURRENCY] (repeatable; default: one pool for all queues)",
+)
+def start(
+    threads: Optional[int] = None,
+    daemon: bool = False,
+    queue_specs: Tuple[str, ...] = (),
+    pool: Optional[str] = None,
+):
     """Start the worker."""
     try:
+        pool, threads = resolve_pool(pool, threads)
+
         # Configure logging
         configure_logging()
 
@@ -260,23 +383,24 @@ def start(threads: int = 2, daemon: bool = False):
         log_dir = os.path.dirname(WORKER_LOG)
         os.makedirs(log_dir, exist_ok=True)
 
-        # Common worker command
-        worker_cmd = [
-            "celery",
-            "-A",
-            "automagik_spark.core.celery.celery_app",
-            "worker",
-            "--loglevel=INFO",
-            "-P",
-            "prefork",
-            "--concurrency",
-            str(threads),
-            "--hostname",
-            "celery@automagik",
-            "--without-gossip",  # Disable gossip to avoid broken pipe
-            "--without-mingle",  # Disable mingle to avoid broken pipe
-            "--without-heartbeat",  # Disable heartbeat to avoid broken pipe
-        ]
+        # One worker pool per queue spec, each with its own concurrency, or one pool for every queue
+        if queue_specs:
+            queue_pools = [parse_queue_spec(spec, threads) for spec in queue_specs]
+            worker_cmds = [
+                _worker_command(
+                    concurrency,
+                    f"{'-'.join(queues)}@automagik",
+                    queues,
+                    log_dir if daemon else None,
+                    name=f"worker-{'-'.join(queues)}",
+                    pool=pool,
+                )
+                for queues, concurrency in queue_pools
+            ]
+        else:
+            worker_cmds = [
+                _worker_command(threads, "celery@automagik", log_dir=log_dir if daemon else None, pool=pool)
+            ]
 
         # Common beat command
         beat_cmd = [
@@ -293,14 +417,6 @@ def start(threads: int = 2, daemon: bool = False):
 
         # Add log and pid files only in daemon mode
         if daemon:
-            worker_cmd.extend(
-                [
-                    "--logfile",
-                    os.path.join(log_dir, "worker.log"),
-                    "--pidfile",
-                    os.path.join(log_dir, "worker.pid"),
-                ]
-            )
             beat_cmd.extend(
                 [
                     "--logfile",
@@ -314,35 +430,43 @@ def start(threads: int = 2, daemon: bool = False):
             # In foreground mode (default), run worker directly
             # This will block and show logs directly to console
             click.echo("Starting worker and beat scheduler in foreground mode...")
-            worker_process = subprocess.Popen(worker_cmd, env=dict(os.environ, PYTHONUNBUFFERED="1"))
+            worker_processes = [
+                subprocess.Popen(worker_cmd, env=dict(os.environ, PYTHONUNBUFFERED="1")) for worker_cmd in worker_cmds
+            ]
             beat_process = subprocess.Popen(beat_cmd, env=dict(os.environ, PYTHONUNBUFFERED="1"))
 
-            # Wait for either process to exit
+            # Wait for any process to exit
             while True:
-                worker_status = worker_process.poll()
-                beat_status = beat_process.poll()
-
-                if worker_status is not None:
-                    click.echo("Worker process exited with status: " + str(worker_status))
-                    beat_process.terminate()
-                    sys.exit(worker_status)
+                for worker_process in worker_processes:
+                    worker_status = worker_process.poll()
+                    if worker_status is not None:
+                        click.echo("Worker process exited with status: " + str(worker_status))
+                        for process in [*worker_processes, beat_process]:
+                            if process is not worker_process:
+                                process.terminate()
+                        sys.exit(worker_status)
 
+                beat_status = beat_process.poll()
                 if beat_status is not None:
                     click.echo("Beat scheduler process exited with status: " + str(beat_status))
-                    worker_process.terminate()
+                    for worker_process in worker_processes:
+                        worker_process.terminate()
                     sys.exit(beat_status)
 
                 time.sleep(1)
         else:
             # Daemon mode - run in background
             with open(os.devnull, "w") as devnull:
-                worker_process = subprocess.Popen(
-                    worker_cmd,
-                    stdout=devnull,
-                    stderr=devnull,
-                    preexec_fn=os.setsid,
-                    env=dict(os.environ, PYTHONUNBUFFERED="1"),
-                )
+                worker_processes = [
+                    subprocess.Popen(
+                        worker_cmd,
+                        stdout=devnull,
+                        stderr=devnull,
+                        preexec_fn=os.setsid,
+                        env=dict(os.environ, PYTHONUNBUFFERED="1"),
+                    )
+                    for worker_cmd in worker_cmds
+                ]
 
                 beat_process = subprocess.Popen(
                     beat_cmd,
@@ -353,17 +477,17 @@ def start(threads: int = 2, daemon: bool = False):
                 )
 
             # Save PIDs for background processes
-            save_worker_pid(worker_process.pid)
+            save_worker_pids([worker_process.pid for worker_process in worker_processes])
             save_beat_pid(beat_process.pid)
 
-            # Verify both processes are running
-            worker_running = False
+            # Verify all processes are running
+            worker_running = True
             beat_running = False
-            try:
-                os.kill(worker_process.pid, 0)
-                worker_running = True
-            except ProcessLookupError:
-                pass
+            for worker_process in worker_processes:
+                try:
+                    os.kill(worker_process.pid, 0)
+                except ProcessLookupError:
+                    worker_running = False
 
             try:
                 os.kill(beat_process.pid, 0)
@@ -424,9 +548,9 @@ def logs(tail: bool, lines: int, follow: bool):
 def stop():
     """Stop the worker."""
     try:
-        # Stop worker
-        worker_pid = get_worker_pid()
-        if worker_pid:
+        # Stop every worker pool
+        worker_pids = get_worker_pids()
+        for worker_pid in worker_pids:
             try:
                 # Try to stop worker gracefully first
                 os.kill(worker_pid, signal.SIGTERM)
@@ -444,11 +568,11 @@ def stop():
                     except ProcessLookupError:
                         pass
 
-                click.echo("Worker stopped successfully")
+                click.echo(f"Worker stopped successfully (PID: {worker_pid})")
             except ProcessLookupError:
-                click.echo("Worker process not found")
-            finally:
-                remove_worker_pid()
+                click.echo(f"Worker process {worker_pid} not found")
+        if worker_pids:
+            remove_worker_pid()
         else:
             click.echo("No worker is running")
 
@@ -488,10 +612,10 @@ def stop():
 @worker_group.command()
 def status():
     """Get worker status."""
-    worker_pid = get_worker_pid()
+    worker_pids = get_worker_pids()
     beat_pid = get_beat_pid()
-    if worker_pid:
-        click.echo(f"Worker is running (PID: {worker_pid})")
+    if worker_pids:
+        click.echo(f"Worker is running (PID: {', '.join(str(pid) for pid in worker_pids)})")
 
         # Get Celery stats
         try:
@@ -35,7 +35,7 @@ def list_workflows(folder: Optional[str]):
             result = await session.execute(query)
             sources = {str(s.id): s for s in result.scalars().all()}
 
-            # Get workflows with eager loading of tasks and schedules
+            # Get workflows with their schedules and task statistics
             async with WorkflowManager(session) as manager:
                 workflows = await manager.list_workflows(options={"with_source": True})
 
@@ -74,24 +74,22 @@ def list_workflows(folder: Optional[str]):
 
                 # Add rows with proper styling
                 for w in workflows:
-                    tasks = w.get("tasks", [])
                     schedules = w.get("schedules", [])
-                    latest_task = max(tasks, key=lambda t: t["created_at"], default=None) if tasks else None
-
-                    # Count failed tasks
-                    failed_tasks = sum(1 for t in tasks if t["status"].lower() == "failed")
+                    task_count = w.get("task_count", 0)
+                    failed_tasks = w.get("failed_task_count", 0)
+                    latest_run = w.get("latest_run", "NEW")
 
                     # Determine workflow status from latest run
-                    if not latest_task:
+                    if latest_run == "NEW":
                         status = "[bold yellow]NEW[/bold yellow]"
                     else:
-                        status = get_status_style(latest_task["status"])
+                        status = get_status_style(latest_run)
 
                     # Format task counts
                     if failed_tasks > 0:
-                        tasks_display = f"[bold]{len(tasks)}[/bold] ([red]{failed_tasks}[/red])"
+                        tasks_display = f"[bold]{task_count}[/bold] ([red]{failed_tasks}[/red])"
                     else:
-                        tasks_display = f"[bold]{len(tasks)}[/bold] ([dim]0[/dim])"
+                        tasks_display = f"[bold]{task_count}[/bold] ([dim]0[/dim])"
 
                     # Get source display name from workflow source
                     instance_name = "unknown"
@@ -301,6 +299,82 @@ def delete_workflow(workflow_id: str):
     asyncio.run(_delete())
 
 
+@workflow_group.command("retention")
+@click.argument("workflow_id")
+@click.argument("days", type=int, required=False)
+def set_retention(workflow_id: str, days: Optional[int]):
+    """Set how many days finished tasks of a workflow are kept.
+
+    Omit DAYS to fall back to the global retention.
+    """
+
+    async def _set():
+        async with get_session() as session:
+            try:
+                workflow = await WorkflowManager(session).set_workflow_retention(workflow_id, days)
+            except ValueError as e:
+                raise click.ClickException(str(e))
+            if not workflow:
+                raise click.ClickException(f"Workflow {workflow_id} not found")
+            if days is None:
+                click.echo(f"Workflow {workflow.name} now uses the global task retention")
+            else:
+                click.echo(f"Finished tasks of workflow {workflow.name} are kept for {days} day(s)")
+
+    asyncio.run(_set())
+
+
+@workflow_group.command("queue")
+@click.argument("workflow_id")
+@click.argument("queue", required=False)
+def set_queue(workflow_id: str, queue: Optional[str]):
+    """Send runs of a workflow to QUEUE, e.g. a dedicated worker pool.
+
+    Omit QUEUE to route the workflow by its source again.
+    """
+
+    async def _set():
+        async with get_session() as session:
+            try:
+                workflow = await WorkflowManager(session).set_workflow_queue(workflow_id, queue)
+            except ValueError as e:
+                raise click.ClickException(str(e))
+            if not workflow:
+                raise click.ClickException(f"Workflow {workflow_id} not found")
+            if queue is None:
+                click.echo(f"Runs of workflow {workflow.name} are routed by source")
+            else:
+                click.echo(f"Runs of workflow {workflow.name} go to the {queue} queue")
+
+    asyncio.run(_set())
+
+
+@workflow_group.command("priority")
+@click.argument("workflow_id")
+@click.argument("priority", type=click.IntRange(0, 9), required=False)
+def set_priority(workflow_id: str, priority: Optional[int]):
+    """Set the priority of runs of a workflow, 0 (lowest) to 9 (highest).
+
+    Higher priorities are served first and get a larger share of worker
+    slots. Omit PRIORITY to use the default priority again.
+    """
+
+    async def _set():
+        async with get_session() as session:
+            try:
+                workflow = await WorkflowManager(session).set_workflow_priority(workflow_id, priority)
+            except ValueError as e:
+                raise click.ClickException(str(e))
+            if not workflow:
+                raise click.ClickException(f"Workflow {workflow_id} not found")
+            if priority is None:
+                click.echo(f"Workflow {workflow.name} runs at the default priority")
+            else:
+                click.echo(f"Workflow {workflow.name} runs at priority {priority}")
+
+    asyncio.run(_set())
+
+
 @workflow_group.command(name="run")
 @click.argument("workflow_id")
 @click.option("--input", "-i", help="Input string", default="")
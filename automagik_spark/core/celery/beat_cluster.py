@@ -0,0 +1,165 @@
+"""Coordination between multiple beat instances sharing one Redis."""
+
+import hashlib
+import logging
+import os
+import socket
+import time
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "automagik_spark:beat"
+
+# Longest window in seconds a single schedule can fire once in
+FIRE_SLOT_SECONDS = 60
+
+
+def _score(member: str, key: str) -> int:
+    return int.from_bytes(hashlib.sha1(f"{member}:{key}".encode()).digest()[:8], "big")
+
+
+def pick_owner(members: List[str], key: str) -> Optional[str]:
+    """Pick the member that owns a key using rendezvous (highest random weight) hashing.
+
+    When a member joins or leaves, only the keys it owned move.
+    """
+    if not members:
+        return None
+    return max(members, key=lambda member: (_score(member, key), member))
+
+
+def fire_slot(schedule: Any) -> float:
+    """Get the claim slot length for a Celery schedule.
+
+    Consecutive runs of an entry are at least one interval apart, so a slot
+    no longer than the interval never lets one run's claim swallow the next.
+    Crontab schedules run at most once a minute.
+    """
+    run_every = getattr(schedule, "run_every", None)
+    if run_every is None:
+        return FIRE_SLOT_SECONDS
+    return min(max(run_every.total_seconds(), 1.0), FIRE_SLOT_SECONDS)
+
+
+class BeatCluster:
+    """Membership and schedule ownership for a group of beat instances.
+
+    Every instance keeps the full schedule in memory and sends an entry only
+    if it owns the entry's name. Members heartbeat into a Redis sorted set;
+    a member that stops heartbeating for ``member_ttl`` seconds drops out and
+    its entries are picked up by the others on their next heartbeat. A short
+    lived ``SET NX`` claim per entry and time slot guards against double
+    sends while members disagree about the membership.
+    """
+
+    def __init__(self, client, node_id: Optional[str] = None, member_ttl: int = 30):
+        self._client = client
+        self.node_id = node_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.member_ttl = member_ttl
+        self.members: List[str] = [self.node_id]
+        self._last_heartbeat = None
+
+    @classmethod
+    def create(cls, app) -> Optional["BeatCluster"]:
+        """Create the cluster coordinator if clustered beat is enabled."""
+        if not app.conf.get("beat_cluster"):
+            return None
+
+        from .schedule_events import get_events_url
+
+        url = get_events_url()
+        if url is None:
+            logger.warning("Clustered beat needs a Redis broker; running standalone")
+            return None
+
+        import redis
+
+        client = redis.from_url(url, socket_connect_timeout=1, socket_timeout=2)
+        cluster = cls(
+            client,
+            node_id=app.conf.get("beat_node_id"),
+            member_ttl=int(app.conf.get("beat_member_ttl") or 30),
+        )
+        logger.info(f"Clustered beat enabled as node {cluster.node_id}")
+        return cluster
+
+    @property
+    def members_key(self) -> str:
+        return f"{KEY_PREFIX}:members"
+
+    @property
+    def heartbeat_interval(self) -> float:
+        return self.member_ttl / 3
+
+    def seconds_until_heartbeat(self) -> float:
+        """Seconds until the next heartbeat is due."""
+        if self._last_heartbeat is None:
+            return 0
+        return max(self._last_heartbeat + self.heartbeat_interval - time.monotonic(), 0)
+
+    def heartbeat(self, force: bool = False) -> bool:
+        """Refresh this node's membership and the list of live members.
+
+        Returns:
+            bool: True if the membership changed
+        """
+        if not force and self.seconds_until_heartbeat() > 0:
+            return False
+
+        now = time.time()
+        try:
+            pipe = self._client.pipeline()
+            pipe.zadd(self.members_key, {self.node_id: now})
+            pipe.zremrangebyscore(self.members_key, "-inf", now - self.member_ttl)
+            pipe.zrange(self.members_key, 0, -1)
+            _, _, raw_members = pipe.execute()
+        except Exception as e:
+            # Keep the last known membership; other nodes will drop us if this persists
+            logger.warning(f"Beat heartbeat failed: {e}")
+            self._last_heartbeat = time.monotonic()
+            return False
+
+        self._last_heartbeat = time.monotonic()
+        members = sorted(m.decode() if isinstance(m, bytes) else m for m in raw_members)
+        if self.node_id not in members:
+            members = sorted(members + [self.node_id])
+
+        changed = members != self.members
+        if changed:
+            logger.info(f"Beat membership changed: {members}")
+            self.members = members
+        return changed
+
+    def owns(self, key: str) -> bool:
+        """Whether this node is responsible for sending an entry."""
+        return pick_owner(self.members, key) == self.node_id
+
+    def claim(self, key: str, now: Optional[float] = None, slot_seconds: float = FIRE_SLOT_SECONDS) -> bool:
+        """Claim the right to send an entry in the current time slot.
+
+        Slots must be no longer than the entry's interval so that every run
+        lands in its own slot; see ``fire_slot``.
+        """
+        slot = int((now or time.time()) // slot_seconds)
+        try:
+            return bool(
+                self._client.set(
+                    f"{KEY_PREFIX}:fired:{key}:{slot}", self.node_id, nx=True, ex=max(int(2 * slot_seconds), 1)
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Could not claim {key}: {e}")
+            # Membership already says we own it
+            return True
+
+    def should_send(self, key: str, now: Optional[float] = None, slot_seconds: float = FIRE_SLOT_SECONDS) -> bool:
+        """Whether this node should send a due entry."""
+        return self.owns(key) and self.claim(key, now, slot_seconds)
+
+    def leave(self):
+        """Leave the cluster so the other nodes take over immediately."""
+        try:
+            self._client.zrem(self.members_key, self.node_id)
+        except Exception as e:
+            logger.warning(f"Could not leave beat cluster: {e}")
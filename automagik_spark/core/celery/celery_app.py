@@ -2,9 +2,10 @@
 
 import os
 from celery import Celery
-from kombu.messaging import Exchange, Queue
 from dotenv import load_dotenv
 from ..config import get_settings
+from ...api.config import get_celery_broker_url, get_task_retention_interval
+from .routing import DEFAULT_PRIORITY, DEFAULT_QUEUE, MAX_PRIORITY, get_task_queues, message_priority
 
 # Load environment variables from .env file
 load_dotenv()
@@ -15,30 +16,36 @@ def get_celery_config():
     get_settings()
 
     # Default broker and backend URLs
-    broker_url = os.getenv("AUTOMAGIK_SPARK_CELERY_BROKER_URL", "redis://localhost:6379/0")
+    broker_url = get_celery_broker_url()
     result_backend = os.getenv("AUTOMAGIK_SPARK_CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
 
     # Get timezone from AUTOMAGIK_TIMEZONE setting
     timezone = os.getenv("AUTOMAGIK_TIMEZONE", "UTC")
 
-    # Define queues
-    task_queues = [
-        Queue("celery", Exchange("celery"), routing_key="celery"),
-        Queue("direct", Exchange("direct"), routing_key="direct"),
-    ]
+    # Default queues plus every queue runs can be routed to (see routing.py)
+    task_queues = get_task_queues()
 
     config = {
         "broker_url": broker_url,
         "result_backend": result_backend,
         "timezone": timezone,
         "task_queues": task_queues,
-        "task_default_queue": "celery",
-        "task_default_exchange": "celery",
-        "task_default_routing_key": "celery",
+        "task_default_queue": DEFAULT_QUEUE,
+        "task_default_exchange": DEFAULT_QUEUE,
+        "task_default_routing_key": DEFAULT_QUEUE,
+        # Runs carry a message priority (see routing.py); Redis keeps one list per level
+        "task_queue_max_priority": MAX_PRIORITY,
+        "task_default_priority": message_priority(DEFAULT_PRIORITY),
+        "broker_transport_options": {
+            "priority_steps": list(range(MAX_PRIORITY + 1)),
+            "sep": ":",
+            "queue_order_strategy": "priority",
+        },
         "beat_scheduler": "automagik_spark.core.celery.scheduler:DatabaseScheduler",
         "imports": (
             "automagik_spark.core.celery.tasks",
             "automagik_spark.core.tasks.workflow_tasks",
+            "automagik_spark.core.tasks.retention",
         ),
         "worker_prefetch_multiplier": 1,
         "task_track_started": True,
@@ -49,8 +56,32 @@ def get_celery_config():
         # Beat scheduler configuration
         "beat_max_loop_interval": 5,  # Maximum number of seconds to sleep between checking schedule
         "beat_schedule_filename": None,  # Disable file-based schedule persistence since we use database
+        # Seconds between full reconciliations of the beat schedule with the database;
+        # ticks in between only read schedules changed since the last sync
+        "beat_full_sync_interval": int(os.getenv("AUTOMAGIK_SPARK_BEAT_FULL_SYNC_INTERVAL", "300")),
+        # Seconds between incremental database polls while schedule change
+        # notifications are arriving over Redis pub/sub
+        "beat_poll_interval": int(os.getenv("AUTOMAGIK_SPARK_BEAT_POLL_INTERVAL", "60")),
+        # Run several beat instances that split schedules between them (needs a Redis broker)
+        "beat_cluster": os.getenv("AUTOMAGIK_SPARK_BEAT_CLUSTER", "false").lower() in ("true", "1", "yes"),
+        "beat_node_id": os.getenv("AUTOMAGIK_SPARK_BEAT_NODE_ID") or None,
+        "beat_member_ttl": int(os.getenv("AUTOMAGIK_SPARK_BEAT_MEMBER_TTL", "30")),
+        # Send schedules that come due together as batches claimed in one transaction
+        "beat_batch_dispatch": os.getenv("AUTOMAGIK_SPARK_BEAT_BATCH_DISPATCH", "false").lower() in ("true", "1", "yes"),
+        "beat_dispatch_batch_size": int(os.getenv("AUTOMAGIK_SPARK_BEAT_DISPATCH_BATCH_SIZE", "500")),
     }
 
+    # Periodic purge of finished tasks past their retention; a no-op until a
+    # retention is configured (globally, per status or per workflow)
+    retention_interval = get_task_retention_interval()
+    if retention_interval > 0:
+        config["beat_schedule"] = {
+            "purge-task-history": {
+                "task": "automagik_spark.core.tasks.retention.purge_task_history",
+                "schedule": float(retention_interval),
+            }
+        }
+
     return config
 
 
@@ -0,0 +1,139 @@
+"""
+Queue routing for workflow runs.
+
+Runs are sent to a queue picked from, in order: the workflow's own ``queue``
+(its priority class), a route for its source ID, a route for its source type
+(``AUTOMAGIK_SPARK_QUEUE_ROUTES``), and finally the default queue of the path
+that enqueued it (``celery`` for schedules, ``direct`` for API runs). Workers
+can then be started per queue with their own concurrency, so slow sources do
+not hold the slots fast ones need.
+
+Within a queue, runs are served by priority: 0 (lowest) to 9 (highest), taken
+from the schedule, else the workflow, else ``DEFAULT_PRIORITY``.
+"""
+
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from uuid import UUID
+
+from kombu.messaging import Exchange, Queue
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ...api.config import get_celery_broker_url, get_extra_queues, get_queue_routes
+from ..database.models import Schedule, Task, Workflow, WorkflowSource
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE = "celery"
+DIRECT_QUEUE = "direct"
+
+DEFAULT_PRIORITY = 5
+MAX_PRIORITY = 9
+
+
+class Route(NamedTuple):
+    """Where a run is sent: its queue and message priority."""
+
+    queue: str
+    priority: int
+
+
+def get_queue_names() -> List[str]:
+    """Get every queue runs can be routed to, default queues first."""
+    names = [DEFAULT_QUEUE, DIRECT_QUEUE, *get_queue_routes().values(), *get_extra_queues()]
+    return list(dict.fromkeys(names))
+
+
+def get_task_queues() -> List[Queue]:
+    """Get the Celery queue declarations; a worker started without ``-Q`` consumes all of them."""
+    return [Queue(name, Exchange(name), routing_key=name) for name in get_queue_names()]
+
+
+def resolve_queue(
+    workflow_queue: Optional[str] = None,
+    source_id=None,
+    source_type: Optional[str] = None,
+    default: str = DEFAULT_QUEUE,
+) -> str:
+    """Pick the queue of a run from its workflow and source."""
+    if workflow_queue:
+        return workflow_queue
+    routes = get_queue_routes()
+    if source_id is not None and str(source_id).lower() in routes:
+        return routes[str(source_id).lower()]
+    if source_type and source_type.lower() in routes:
+        return routes[source_type.lower()]
+    return default
+
+
+def resolve_priority(schedule_priority: Optional[int] = None, workflow_priority: Optional[int] = None) -> int:
+    """Pick the priority of a run: the schedule's, else the workflow's, else the default."""
+    for priority in (schedule_priority, workflow_priority):
+        if priority is not None:
+            return min(MAX_PRIORITY, max(0, priority))
+    return DEFAULT_PRIORITY
+
+
+def message_priority(priority: int) -> int:
+    """Map a run priority (higher is more urgent) to the broker's message priority.
+
+    RabbitMQ delivers the highest message priority first, Redis the lowest.
+    """
+    if get_celery_broker_url().startswith(("redis://", "rediss://", "sentinel://", "unix://")):
+        return MAX_PRIORITY - priority
+    return priority
+
+
+def queue_for_workflow(workflow: Workflow, default: str = DEFAULT_QUEUE) -> str:
+    """Pick the queue of a run of a loaded workflow (its source relationship is used if set)."""
+    source = workflow.workflow_source
+    return resolve_queue(
+        workflow.queue,
+        source.id if source is not None else None,
+        source.source_type if source is not None else None,
+        default,
+    )
+
+
+def routes_for_tasks(session: Session, task_ids: Iterable[str], default: str = DEFAULT_QUEUE) -> Dict[str, Route]:
+    """Pick the queue and message priority of each task in one query.
+
+    Returns:
+        Mapping of task ID (as given) to its route
+    """
+    ids = {str(UUID(str(task_id))): str(task_id) for task_id in task_ids}
+    if not ids:
+        return {}
+
+    rows = session.execute(
+        select(
+            Task.id,
+            Workflow.queue,
+            Workflow.priority,
+            Schedule.priority,
+            WorkflowSource.id,
+            WorkflowSource.source_type,
+        )
+        .join(Workflow, Task.workflow_id == Workflow.id)
+        .outerjoin(Schedule, Task.schedule_id == Schedule.id)
+        .outerjoin(WorkflowSource, Workflow.workflow_source_id == WorkflowSource.id)
+        .where(Task.id.in_([UUID(task_id) for task_id in ids]))
+    ).all()
+
+    routes = {task_id: Route(default, message_priority(DEFAULT_PRIORITY)) for task_id in ids.values()}
+    for task_id, workflow_queue, workflow_priority, schedule_priority, source_id, source_type in rows:
+        routes[ids[str(task_id)]] = Route(
+            resolve_queue(workflow_queue, source_id, source_type, default),
+            message_priority(resolve_priority(schedule_priority, workflow_priority)),
+        )
+    return routes
+
+
+def queues_for_tasks(session: Session, task_ids: Iterable[str], default: str = DEFAULT_QUEUE) -> Dict[str, str]:
+    """Pick the queue of each task in one query.
+
+    Returns:
+        Mapping of task ID (as given) to queue name
+    """
+    return {task_id: route.queue for task_id, route in routes_for_tasks(session, task_ids, default).items()}
@@ -0,0 +1,159 @@
+"""Cross-process schedule change notifications over Redis pub/sub."""
+
+import json
+import logging
+import os
+import time
+from typing import Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Wildcard payload asking subscribers to look for any changed schedule
+ALL_SCHEDULES = "*"
+
+# Seconds to stop trying to publish after the broker could not be reached
+PUBLISH_BACKOFF = 30.0
+
+_publisher = None
+_publisher_failed_at = None
+
+
+def get_channel() -> str:
+    """Get the pub/sub channel used for schedule changes."""
+    return os.getenv("AUTOMAGIK_SPARK_SCHEDULE_CHANNEL", "automagik_spark:schedule_changes")
+
+
+def get_events_url() -> Optional[str]:
+    """Get the Redis URL for schedule events, or None if the broker is not Redis."""
+    url = os.getenv("AUTOMAGIK_SPARK_CELERY_BROKER_URL", "redis://localhost:6379/0")
+    if not url.startswith(("redis://", "rediss://", "unix://")):
+        return None
+    return url
+
+
+def _connect():
+    import redis
+
+    url = get_events_url()
+    if url is None:
+        return None
+    return redis.from_url(url, socket_connect_timeout=1, socket_timeout=2)
+
+
+def publish_schedule_change(*schedule_ids) -> bool:
+    """Publish the IDs of schedules that were created, changed or deleted.
+
+    Publishing is best effort: the beat also polls the database, so a lost
+    message only delays a change until the next poll.
+
+    Args:
+        schedule_ids: IDs of the changed schedules; none means "anything may have changed"
+
+    Returns:
+        bool: True if the message was handed to Redis
+    """
+    global _publisher, _publisher_failed_at
+
+    if _publisher_failed_at is not None and time.monotonic() - _publisher_failed_at < PUBLISH_BACKOFF:
+        return False
+
+    payload = json.dumps([str(schedule_id) for schedule_id in schedule_ids] or [ALL_SCHEDULES])
+    try:
+        if _publisher is None:
+            _publisher = _connect()
+            if _publisher is None:
+                return False
+        _publisher.publish(get_channel(), payload)
+        _publisher_failed_at = None
+        return True
+    except Exception as e:
+        logger.warning(f"Could not publish schedule change: {e}")
+        _publisher = None
+        _publisher_failed_at = time.monotonic()
+        return False
+
+
+class ScheduleChangeListener:
+    """Subscriber side of the schedule change channel, used by the beat."""
+
+    def __init__(self, client):
+        self._client = client
+        self._pubsub = None
+        # Set whenever messages may have been missed (first connect, reconnects)
+        self.missed_messages = True
+
+    @classmethod
+    def create(cls) -> Optional["ScheduleChangeListener"]:
+        """Create a listener for the configured broker, or None if it is not Redis."""
+        try:
+            client = _connect()
+        except ImportError:
+            return None
+        if client is None:
+            return None
+        return cls(client)
+
+    @property
+    def connected(self) -> bool:
+        """Whether the listener is currently subscribed."""
+        return self._pubsub is not None
+
+    def _ensure_subscribed(self) -> bool:
+        if self._pubsub is not None:
+            return True
+        try:
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(get_channel())
+            self._pubsub = pubsub
+            self.missed_messages = True
+            logger.info(f"Subscribed to schedule changes on {get_channel()}")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not subscribe to schedule changes: {e}")
+            return False
+
+    def _reset(self):
+        try:
+            self._pubsub.close()
+        except Exception:
+            pass
+        self._pubsub = None
+        self.missed_messages = True
+
+    @staticmethod
+    def _parse(data, changes: Set[str]):
+        try:
+            ids = json.loads(data)
+        except (TypeError, ValueError):
+            ids = None
+        if not isinstance(ids, list):
+            logger.warning(f"Ignoring malformed schedule change message: {data!r}")
+            return
+        changes.update(str(schedule_id) for schedule_id in ids)
+
+    def poll(self, timeout: float = 0.0) -> Set[str]:
+        """Collect pending schedule IDs, waiting up to ``timeout`` seconds for the first one.
+
+        Returns:
+            Set of changed schedule IDs; contains ``ALL_SCHEDULES`` when any
+            schedule may have changed
+        """
+        changes: Set[str] = set()
+        if not self._ensure_subscribed():
+            return changes
+
+        try:
+            message = self._pubsub.get_message(timeout=timeout)
+            while message is not None:
+                if message.get("type") == "message":
+                    self._parse(message["data"], changes)
+                message = self._pubsub.get_message(timeout=0.0)
+        except Exception as e:
+            logger.warning(f"Lost schedule change subscription: {e}")
+            self._reset()
+        return changes
+
+    def close(self):
+        """Unsubscribe and release the connection."""
+        if self._pubsub is not None:
+            self._reset()
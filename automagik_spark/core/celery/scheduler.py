@@ -1,28 +1,87 @@
 """Database-backed Celery beat scheduler."""
 
 import logging
-from datetime import datetime, timezone, timedelta
+import threading
+import time
+from uuid import UUID
+from datetime import datetime, timedelta
 from celery.beat import Scheduler, ScheduleEntry
-from celery.schedules import schedule as celery_schedule, crontab
-from dateutil import parser
-from sqlalchemy import select
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import joinedload, selectinload
 from ..database.session import get_sync_session
-from ..database.models import Schedule
+from ..database.models import Schedule, Workflow
+from ..scheduler.compiled import compile_schedule
+from ..scheduler.due_queue import DueQueue
+from .beat_cluster import BeatCluster, fire_slot
+from .routing import DEFAULT_QUEUE, message_priority, queue_for_workflow, resolve_priority
+from .schedule_events import ALL_SCHEDULES, ScheduleChangeListener, publish_schedule_change
 
 logger = logging.getLogger(__name__)
 
 # Global scheduler instance
 _scheduler_instance = None
 
+EXECUTE_WORKFLOW_TASK = "automagik_spark.core.tasks.workflow_tasks.execute_workflow"
+DISPATCH_SCHEDULES_TASK = "automagik_spark.core.tasks.workflow_tasks.dispatch_schedules"
+SCHEDULE_ENTRY_PREFIX = "schedule_"
+
+# Default number of seconds between full reconciliations with the schedules table
+DEFAULT_FULL_SYNC_INTERVAL = 300
+
+# Default number of seconds between incremental database polls while change
+# notifications are being received
+DEFAULT_POLL_INTERVAL = 60
+
+# Rows touched shortly before the watermark are re-read on every sync so that
+# transactions committing out of order are never missed
+WATERMARK_LOOKBACK = timedelta(seconds=5)
+
+# Loads what routing needs alongside schedule rows
+_ROUTING_LOADS = selectinload(Schedule.workflow).joinedload(Workflow.workflow_source)
+
 
 class DatabaseScheduler(Scheduler):
-    """Custom scheduler that loads schedules from database."""
+    """Custom scheduler that loads schedules from database.
+
+    The full set of active schedules is only read on startup and on a slow
+    reconciliation interval (``beat_full_sync_interval``). Every other tick asks
+    the database for rows whose ``updated_at`` moved past the last seen
+    watermark and patches just those entries, so unchanged entries keep their
+    ``last_run_at``.
+
+    When the broker is Redis the scheduler also subscribes to schedule change
+    notifications (see ``schedule_events``). Changed IDs are applied as soon as
+    they arrive, even while the beat is sleeping, and database polling drops to
+    ``beat_poll_interval`` as a safety net.
+
+    Due entries are found through a ``DueQueue`` keyed on each entry's next
+    deadline instead of Celery's heap, which is rebuilt by comparing every
+    entry whenever the schedule changes. A tick pops only the entries that are
+    due and sleeps until the next deadline.
+
+    With ``beat_cluster`` enabled several beat processes can run at once: each
+    keeps the full schedule but only sends the entries it owns (see
+    ``BeatCluster``), and ownership moves automatically when a node dies.
+
+    With ``beat_batch_dispatch`` enabled, database schedules that come due in
+    the same tick are sent as ``dispatch_schedules`` batches, which claim the
+    schedules and create their tasks in one transaction, instead of one
+    ``execute_workflow`` message per schedule.
+    """
 
     def __init__(self, *args, **kwargs):
         """Initialize scheduler."""
         global _scheduler_instance
         logger.info("Initializing DatabaseScheduler")
         self.schedule_changed = True
+        self._watermark = None
+        self._fingerprints = {}
+        self._last_full_sync = None
+        self._last_poll = None
+        self._due = DueQueue()
+        # Changes notified from other threads, applied by the beat thread on its next tick
+        self._pending_changes = set()
+        self._pending_lock = threading.Lock()
         super().__init__(*args, **kwargs)
 
         # Store instance globally before updating database
@@ -34,165 +93,371 @@ class DatabaseScheduler(Scheduler):
         if "app" in kwargs:
             self.app = kwargs["app"]
 
-        # Now update from database
-        self.update_from_database()
+        self.full_sync_interval = float(
+            self.app.conf.get("beat_full_sync_interval") or DEFAULT_FULL_SYNC_INTERVAL
+        )
+        self.poll_interval = float(self.app.conf.get("beat_poll_interval") or DEFAULT_POLL_INTERVAL)
+        self._listener = ScheduleChangeListener.create()
+        self._cluster = BeatCluster.create(self.app)
+        self.batch_dispatch = bool(self.app.conf.get("beat_batch_dispatch"))
+        self.batch_size = int(self.app.conf.get("beat_dispatch_batch_size") or 500)
+
+        # Lazy schedulers skip setup_schedule, so load the database here
+        if self._last_full_sync is None:
+            self.update_from_database()
 
     def setup_schedule(self):
         """Set up the schedule."""
-        self.update_from_database()
+        # Static entries first: merge_inplace drops every key it does not know about
         self.merge_inplace(self.app.conf.beat_schedule)
+        for name in self.schedule:
+            self._index_entry(name)
+        self.update_from_database()
+
+    @staticmethod
+    def _queue(schedule):
+        """Get the queue runs of a schedule are sent to."""
+        return queue_for_workflow(schedule.workflow) if schedule.workflow is not None else DEFAULT_QUEUE
+
+    @staticmethod
+    def _priority(schedule):
+        """Get the priority of runs of a schedule."""
+        workflow = schedule.workflow
+        return resolve_priority(schedule.priority, workflow.priority if workflow is not None else None)
+
+    @classmethod
+    def _fingerprint(cls, schedule):
+        """Return the fields that shape a schedule's beat entry."""
+        return (
+            schedule.schedule_type,
+            schedule.schedule_expr,
+            schedule.status,
+            cls._queue(schedule),
+            cls._priority(schedule),
+        )
+
+    def _build_entry(self, session, schedule):
+        """Build the beat entry for a schedule row, or None if it should not run."""
+        schedule_id = str(schedule.id)
+        schedule_name = f"{SCHEDULE_ENTRY_PREFIX}{schedule_id}"
+
+        # Common task options
+        task_options = {
+            "queue": self._queue(schedule),
+            "priority": message_priority(self._priority(schedule)),
+            "expires": 600,  # Task expires after 10 minutes
+            "retry": True,
+            "retry_policy": {
+                "max_retries": 3,
+                "interval_start": 0,
+                "interval_step": 0.2,
+                "interval_max": 0.2,
+            },
+        }
+
+        compiled = compile_schedule(schedule.schedule_type, schedule.schedule_expr, self.app.conf.timezone)
+        run_every = compiled.beat_schedule()
+        if run_every is None:
+            # One-time schedule in the past
+            return None
+
+        if compiled.interval is not None:
+            # Record the next run without bumping updated_at, otherwise the
+            # write would show up as a change on the next incremental sync
+            session.execute(
+                update(Schedule)
+                .where(Schedule.id == schedule.id)
+                .values(next_run_at=compiled.next_run(), updated_at=Schedule.updated_at)
+            )
+
+        return ScheduleEntry(
+            name=schedule_name,
+            schedule=run_every,
+            task=EXECUTE_WORKFLOW_TASK,
+            args=(schedule_id,),
+            kwargs={},
+            options=task_options,
+            app=self.app,
+        )
+
+    def _apply_row(self, session, schedule):
+        """Add, replace or drop the entry for a single schedule row.
+
+        Returns:
+            bool: True if the in-memory schedule changed
+        """
+        schedule_id = str(schedule.id)
+        schedule_name = f"{SCHEDULE_ENTRY_PREFIX}{schedule_id}"
+
+        if schedule.status != "active":
+            return self._drop_entry(schedule_name)
+
+        fingerprint = self._fingerprint(schedule)
+        if self._fingerprints.get(schedule_id) == fingerprint and schedule_name in self.schedule:
+            return False
 
-    def update_from_database(self):
-        """Update schedule from database."""
         try:
-            # Update scheduler
-            self.schedule = {}
+            entry = self._build_entry(session, schedule)
+        except Exception as e:
+            logger.error(f"Error processing schedule {schedule_id}: {e}")
+            entry = None
+
+        if entry is None:
+            return self._drop_entry(schedule_name)
+
+        self._fingerprints[schedule_id] = fingerprint
+        self.schedule[schedule_name] = entry
+        self._index_entry(schedule_name)
+        return True
+
+    def _drop_entry(self, name):
+        """Remove an entry from the schedule and the due queue.
+
+        Returns:
+            bool: True if the entry existed
+        """
+        self._fingerprints.pop(name[len(SCHEDULE_ENTRY_PREFIX) :], None)
+        self._due.discard(name)
+        return self.schedule.pop(name, None) is not None
+
+    def _index_entry(self, name, now=None):
+        """(Re)queue an entry at its next deadline."""
+        entry = self.schedule[name]
+        is_due, next_time_to_run = self.is_due(entry)
+        now = time.time() if now is None else now
+        self._due.push(name, now if is_due else now + next_time_to_run)
+
+    def _advance_watermark(self, updated_at):
+        if updated_at is not None and (self._watermark is None or updated_at > self._watermark):
+            self._watermark = updated_at
 
-            # Get all active schedules
+    def update_from_database(self):
+        """Reconcile the whole schedule with the database.
+
+        Entries whose row did not change are kept as they are; entries for rows
+        that were deleted or deactivated are dropped.
+        """
+        try:
             with get_sync_session() as session:
-                stmt = select(Schedule).where(Schedule.status == "active").with_for_update()
-                result = session.execute(stmt)
-                schedules = result.scalars().all()
+                # Get all active schedules
+                stmt = select(Schedule).where(Schedule.status == "active").options(_ROUTING_LOADS)
+                schedules = session.execute(stmt).scalars().all()
+
+                seen = set()
+                changed = False
                 for schedule in schedules:
-                    schedule_id = str(schedule.id)
-                    schedule_name = f"schedule_{schedule_id}"
-
-                    # Common task options
-                    task_options = {
-                        "expires": 600,  # Task expires after 10 minutes
-                        "retry": True,
-                        "retry_policy": {
-                            "max_retries": 3,
-                            "interval_start": 0,
-                            "interval_step": 0.2,
-                            "interval_max": 0.2,
-                        },
-                    }
-
-                    try:
-                        if schedule.schedule_type == "interval":
-                            # Parse interval string (e.g., "1m")
-                            value = int(schedule.schedule_expr[:-1])
-                            unit = schedule.schedule_expr[-1]
-
-                            # Convert to seconds
-                            seconds = {
-                                "s": lambda x: x,
-                                "m": lambda x: x * 60,
-                                "h": lambda x: x * 3600,
-                                "d": lambda x: x * 86400,
-                            }.get(unit, lambda x: x)(value)
-
-                            # Calculate next run time based on current time
-                            now = datetime.now(timezone.utc)
-                            next_run = now + timedelta(seconds=seconds)
-                            schedule.next_run_at = next_run
-                            session.commit()
-
-                            entry = ScheduleEntry(
-                                name=schedule_name,
-                                schedule=celery_schedule(timedelta(seconds=seconds)),
-                                task="automagik_spark.core.tasks.workflow_tasks.execute_workflow",
-                                args=(schedule_id,),
-                                kwargs={},
-                                options=task_options,
-                                app=self.app,
-                            )
-                            self.schedule[schedule_name] = entry
-
-                        elif schedule.schedule_type == "cron":
-                            cron_parts = schedule.schedule_expr.split()
-                            if len(cron_parts) != 5:
-                                logger.error(f"Invalid cron expression for schedule {schedule_id}")
-                                continue
-
-                            minute, hour, day_of_month, month_of_year, day_of_week = cron_parts
-
-                            entry = ScheduleEntry(
-                                name=schedule_name,
-                                schedule=crontab(
-                                    minute=minute,
-                                    hour=hour,
-                                    day_of_month=day_of_month,
-                                    month_of_year=month_of_year,
-                                    day_of_week=day_of_week,
-                                ),
-                                task="automagik_spark.core.tasks.workflow_tasks.execute_workflow",
-                                args=(schedule_id,),
-                                kwargs={},
-                                options=task_options,
-                                app=self.app,
-                            )
-                            self.schedule[schedule_name] = entry
-
-                        elif schedule.schedule_type == "one-time":
-                            # Parse datetime
-                            if schedule.schedule_expr.lower() == "now":
-                                # Add 2 seconds to avoid race conditions
-                                run_time = datetime.now(timezone.utc) + timedelta(seconds=2)
-                            else:
-                                run_time = parser.parse(schedule.schedule_expr)
-                                # If the parsed datetime is naive, assume it is local time
-                                if not run_time.tzinfo:
-                                    local_tz = datetime.now().astimezone().tzinfo
-                                    run_time = run_time.replace(tzinfo=local_tz)
-                                # Now convert to UTC for comparison
-                                run_time = run_time.astimezone(timezone.utc)
-
-                            now = datetime.now(timezone.utc)
-
-                            # For 'now' schedules or future schedules
-                            if schedule.schedule_expr.lower() == "now" or run_time > now:
-                                # Calculate delay in seconds
-                                delay = (run_time - now).total_seconds()
-
-                                entry = ScheduleEntry(
-                                    name=schedule_name,
-                                    schedule=celery_schedule(timedelta(seconds=delay), relative=True),
-                                    task="automagik_spark.core.tasks.workflow_tasks.execute_workflow",
-                                    args=(schedule_id,),
-                                    kwargs={},
-                                    options=task_options,
-                                    app=self.app,
-                                )
-                            self.schedule[schedule_name] = entry
-
-                    except Exception as e:
-                        logger.error(f"Error processing schedule {schedule_id}: {e}")
-                        continue
+                    seen.add(f"{SCHEDULE_ENTRY_PREFIX}{schedule.id}")
+                    changed |= self._apply_row(session, schedule)
+
+                for name in [n for n in self.schedule if n.startswith(SCHEDULE_ENTRY_PREFIX) and n not in seen]:
+                    changed |= self._drop_entry(name)
+
+                # Paused or completed rows also count towards the watermark
+                self._advance_watermark(session.execute(select(func.max(Schedule.updated_at))).scalar())
+
+            self._last_full_sync = time.monotonic()
+            if changed:
+                logger.info(f"Reloaded schedules from database ({len(seen)} active)")
 
         except Exception as e:
             logger.error(f"Error updating schedule from database: {e}")
 
+    def sync_changes(self):
+        """Apply only the schedule rows modified since the last sync."""
+        self._last_poll = time.monotonic()
+        if self._watermark is None or self._full_sync_due():
+            self.update_from_database()
+            return
+
+        try:
+            with get_sync_session() as session:
+                stmt = (
+                    select(Schedule)
+                    .options(_ROUTING_LOADS)
+                    .where(Schedule.updated_at >= self._watermark - WATERMARK_LOOKBACK)
+                    .order_by(Schedule.updated_at)
+                )
+                schedules = session.execute(stmt).scalars().all()
+
+                changed = 0
+                for schedule in schedules:
+                    changed += self._apply_row(session, schedule)
+                    self._advance_watermark(schedule.updated_at)
+
+            if changed:
+                logger.info(f"Applied {changed} schedule change(s) from database")
+
+        except Exception as e:
+            logger.error(f"Error syncing schedule changes from database: {e}")
+
+    def apply_changes(self, schedule_ids):
+        """Apply the current database state of specific schedules.
+
+        Args:
+            schedule_ids: IDs of schedules reported as changed; IDs that no longer
+                exist in the database have their entries removed
+        """
+        if ALL_SCHEDULES in schedule_ids:
+            self.sync_changes()
+            return
+
+        ids = {}
+        for schedule_id in schedule_ids:
+            try:
+                ids[str(schedule_id)] = UUID(str(schedule_id))
+            except ValueError:
+                logger.warning(f"Ignoring change for invalid schedule ID {schedule_id}")
+        if not ids:
+            return
+
+        try:
+            with get_sync_session() as session:
+                stmt = select(Schedule).options(_ROUTING_LOADS).where(Schedule.id.in_(list(ids.values())))
+                schedules = session.execute(stmt).scalars().all()
+
+                changed = 0
+                for schedule in schedules:
+                    ids.pop(str(schedule.id), None)
+                    changed += self._apply_row(session, schedule)
+
+            # Whatever is left was deleted
+            for schedule_id in ids:
+                changed += self._drop_entry(f"{SCHEDULE_ENTRY_PREFIX}{schedule_id}")
+
+            if changed:
+                logger.info(f"Applied {changed} notified schedule change(s)")
+
+        except Exception as e:
+            logger.error(f"Error applying schedule changes: {e}")
+
+    def queue_changes(self, schedule_ids):
+        """Hand schedule changes to the beat thread; safe to call from any thread."""
+        with self._pending_lock:
+            self._pending_changes.update(schedule_ids)
+
+    def _take_queued_changes(self):
+        with self._pending_lock:
+            changes, self._pending_changes = self._pending_changes, set()
+        return changes
+
+    def _full_sync_due(self):
+        return (
+            self._last_full_sync is None or time.monotonic() - self._last_full_sync >= self.full_sync_interval
+        )
+
+    def _poll_due(self):
+        # Without a live subscription the database is the only source of changes
+        if self._listener is None or not self._listener.connected or self._listener.missed_messages:
+            return True
+        return self._last_poll is None or time.monotonic() - self._last_poll >= self.poll_interval
+
     def tick(self, *args, **kwargs):
         """Called by the beat service periodically."""
         start_time = datetime.now()
 
         try:
-            self.update_from_database()
-            result = super().tick(*args, **kwargs)
-
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
-
-            return result
+            if self._cluster is not None:
+                self._cluster.heartbeat()
+
+            queued = self._take_queued_changes()
+            if queued:
+                self.apply_changes(queued)
+
+            if self._listener is not None:
+                changes = self._listener.poll()
+                if changes:
+                    self.apply_changes(changes)
+
+            if self._poll_due():
+                if self._listener is not None:
+                    self._listener.missed_messages = False
+                self.sync_changes()
+
+            interval = self._run_due()
+            if self._cluster is not None:
+                interval = min(interval, self._cluster.seconds_until_heartbeat())
+
+            # Sleep on the subscription instead of in the beat loop so that a
+            # notification wakes the scheduler before the next deadline
+            if interval and self._listener is not None and self._listener.connected:
+                changes = self._listener.poll(timeout=interval)
+                if changes:
+                    self.apply_changes(changes)
+                return 0
+
+            return interval
         except Exception as e:
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
             logger.error(f"Scheduler tick failed after {duration:.3f} seconds: {e}")
             raise
 
+    def _run_due(self):
+        """Send every due entry and return the seconds until the next deadline."""
+        now = time.time()
+        batch = []
+        for name in self._due.pop_due(now):
+            entry = self.schedule.get(name)
+            if entry is None:
+                continue
+            is_due, next_time_to_run = self.is_due(entry)
+            if is_due:
+                # Non-owners still advance the entry so a takeover starts from the current run
+                self.reserve(entry)
+                if self._cluster is None or self._cluster.should_send(name, now, fire_slot(entry.schedule)):
+                    if self.batch_dispatch and name.startswith(SCHEDULE_ENTRY_PREFIX):
+                        batch.append(entry.args[0])
+                    else:
+                        self.apply_entry(entry, producer=self.producer)
+            self._due.push(name, now + next_time_to_run)
+
+        if batch:
+            self._dispatch_batch(batch)
+
+        deadline = self._due.peek()
+        if deadline is None:
+            return self.max_interval
+        return min(max(deadline - time.time(), 0), self.max_interval)
+
+    def _dispatch_batch(self, schedule_ids):
+        """Send due schedules to the batch dispatcher in chunks."""
+        for start in range(0, len(schedule_ids), self.batch_size):
+            chunk = schedule_ids[start : start + self.batch_size]
+            try:
+                self.app.send_task(
+                    DISPATCH_SCHEDULES_TASK,
+                    args=(chunk,),
+                    expires=600,
+                    producer=self.producer,
+                )
+                logger.info(f"Dispatched batch of {len(chunk)} due schedule(s)")
+            except Exception as e:
+                logger.error(f"Error dispatching batch of {len(chunk)} schedule(s): {e}")
+
+    def close(self):
+        """Close the scheduler, its change subscription and cluster membership."""
+        if self._listener is not None:
+            self._listener.close()
+        if self._cluster is not None:
+            self._cluster.leave()
+        super().close()
+
 
 def get_scheduler_instance():
     """Get the current scheduler instance."""
     return _scheduler_instance
 
 
-def notify_scheduler_change():
-    """Notify the scheduler that schedules have changed."""
+def notify_scheduler_change(*schedule_ids):
+    """Notify the scheduler that schedules have changed.
+
+    Args:
+        schedule_ids: IDs of the changed schedules; none means any schedule may have changed
+    """
     global _scheduler_instance
     logger.info(f"Notifying scheduler change, scheduler instance: {_scheduler_instance}")
     if _scheduler_instance is not None:
-        _scheduler_instance.update_from_database()
-    else:
-        logger.warning("No scheduler instance found!")
+        # Only the beat thread touches its schedule; it applies the change on its next tick
+        _scheduler_instance.queue_changes(set(map(str, schedule_ids)) or {ALL_SCHEDULES})
+    # Beat normally runs in its own process
+    publish_schedule_change(*schedule_ids)
@@ -0,0 +1,191 @@
+"""Live task events (status changes, streamed tokens) over Redis pub/sub.
+
+Workers publish on a per-task channel while a task runs and the API relays
+the messages to ``GET /api/v1/tasks/{id}/stream`` clients. Pub/sub does not
+keep messages, so subscribers also poll the task row: events are a fast path
+for progress, the database stays the source of truth for the outcome.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from .schedule_events import get_events_url
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "automagik_spark:task"
+
+# Seconds to stop trying to publish after the broker could not be reached
+PUBLISH_BACKOFF = 30.0
+
+# Task statuses after which no more events are published
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+_publisher = None
+_publisher_failed_at = None
+
+
+def get_task_channel(task_id) -> str:
+    """Get the pub/sub channel of a task."""
+    return f"{CHANNEL_PREFIX}:{task_id}"
+
+
+def publish_task_event(task_id, event: str, data: Any = None) -> bool:
+    """Publish an event of a running task.
+
+    Publishing is best effort and never raises: a worker must not fail a run
+    because nobody can listen to it.
+
+    Args:
+        task_id: ID of the task
+        event: Event name (``status``, ``token``, ``event`` or ``done``)
+        data: JSON-serializable event data
+
+    Returns:
+        bool: True if the message was handed to Redis
+    """
+    global _publisher, _publisher_failed_at
+
+    if _publisher_failed_at is not None and time.monotonic() - _publisher_failed_at < PUBLISH_BACKOFF:
+        return False
+
+    try:
+        payload = json.dumps({"event": event, "data": data}, default=str)
+        if _publisher is None:
+            url = get_events_url()
+            if url is None:
+                return False
+            import redis
+
+            _publisher = redis.from_url(url, socket_connect_timeout=1, socket_timeout=2)
+        _publisher.publish(get_task_channel(task_id), payload)
+        _publisher_failed_at = None
+        return True
+    except Exception as e:
+        logger.warning(f"Could not publish event for task {task_id}: {e}")
+        _publisher = None
+        _publisher_failed_at = time.monotonic()
+        return False
+
+
+class TaskEventSubscriber:
+    """Async subscriber to the events of one task, used by the API."""
+
+    def __init__(self, client, pubsub):
+        self._client = client
+        self._pubsub = pubsub
+
+    @classmethod
+    async def create(cls, task_id) -> Optional["TaskEventSubscriber"]:
+        """Subscribe to a task's channel, or return None if Redis is not available."""
+        url = get_events_url()
+        if url is None:
+            return None
+        client = None
+        try:
+            import redis.asyncio as aioredis
+
+            client = aioredis.from_url(url, socket_connect_timeout=1)
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(get_task_channel(task_id))
+            return cls(client, pubsub)
+        except Exception as e:
+            logger.warning(f"Could not subscribe to events of task {task_id}: {e}")
+            if client is not None:
+                try:
+                    await client.aclose()
+                except Exception:
+                    pass
+            return None
+
+    async def get(self, timeout: float) -> Optional[Tuple[str, Any]]:
+        """Wait up to ``timeout`` seconds for the next event.
+
+        Raises:
+            ConnectionError: If the subscription was lost
+        """
+        message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None or message.get("type") != "message":
+            return None
+        try:
+            payload = json.loads(message["data"])
+            return str(payload["event"]), payload.get("data")
+        except (TypeError, ValueError, KeyError):
+            logger.warning(f"Ignoring malformed task event: {message['data']!r}")
+            return None
+
+    async def close(self):
+        """Unsubscribe and release the connection."""
+        try:
+            await self._pubsub.aclose()
+            await self._client.aclose()
+        except Exception:
+            pass
+
+
+async def iter_task_events(
+    task_id,
+    get_status: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+    poll_interval: float = 2.0,
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Iterate over the events of a task until it finishes.
+
+    Subscribes before reading the task so nothing published in between is
+    lost, relays pub/sub events and polls ``get_status`` every
+    ``poll_interval`` seconds. Without Redis it only polls.
+
+    Args:
+        task_id: ID of the task
+        get_status: Coroutine returning ``{"status": ..., "error": ...}`` of the task, or None if it is gone
+        poll_interval: Seconds between status polls (and keepalives)
+
+    Yields:
+        Tuple of event name and data; ``("keepalive", None)`` when nothing
+        happened during a poll interval, and ``("done", {...})`` last
+    """
+    subscriber = await TaskEventSubscriber.create(task_id)
+    try:
+        last_status = None
+        while True:
+            state = await get_status()
+            if state is None:
+                yield "done", {"status": "deleted", "error": None}
+                return
+            if state["status"] in FINISHED_STATUSES:
+                yield "done", state
+                return
+            if state["status"] != last_status:
+                last_status = state["status"]
+                yield "status", {"status": last_status}
+
+            relayed = False
+            deadline = time.monotonic() + poll_interval
+            while subscriber is not None and (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    item = await subscriber.get(timeout=remaining)
+                except Exception as e:
+                    logger.warning(f"Lost event subscription of task {task_id}: {e}")
+                    await subscriber.close()
+                    subscriber = None
+                    break
+                if item is None:
+                    continue
+                event, data = item
+                if event == "done":
+                    # Read the stored outcome; the event only says the run ended
+                    break
+                if event == "status":
+                    last_status = (data or {}).get("status", last_status)
+                relayed = True
+                yield event, data
+
+            if subscriber is None:
+                await asyncio.sleep(max(deadline - time.monotonic(), 0))
+            if not relayed:
+                yield "keepalive", None
+    finally:
+        if subscriber is not None:
+            await subscriber.close()
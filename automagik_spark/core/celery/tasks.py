@@ -2,22 +2,30 @@
 
 import logging
 from celery.signals import (
+    worker_init,
     worker_process_init,
     worker_process_shutdown,
+    worker_shutdown,
     beat_init,
     celeryd_after_setup,
 )
-from kombu.messaging import Exchange, Queue
 from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 from ..database.models import Schedule
 from ..database.session import get_sync_session
+from ..workflows.http_pool import close_client_pool, init_client_pool
+from ...api.config import get_http_max_connections, get_http_pool_enabled
 from .celery_app import app
+from .routing import get_task_queues
 from rich.console import Console
 from rich.table import Table
 
 logger = logging.getLogger(__name__)
 
+# Pools that run tasks in the worker process itself instead of forked children
+IN_PROCESS_POOLS = ("solo", "threads", "gevent", "eventlet")
+GREEN_POOLS = ("gevent", "eventlet")
+
 
 def print_active_schedules():
     """Print active schedules and their next run times."""
@@ -77,7 +85,10 @@ def configure_worker(**kwargs):
     # Print active schedules
     print_active_schedules()
 
-    # Initialize any worker-specific resources here
+    # Keep-alive HTTP clients shared by every task this process runs
+    if get_http_pool_enabled():
+        init_client_pool()
+
     logger.info("Worker process initialized")
 
 
@@ -85,6 +96,55 @@ def configure_worker(**kwargs):
 def cleanup_worker(**kwargs):
     """Cleanup tasks when worker shuts down."""
     logger.info("Worker process shutting down")
+    close_client_pool()
+
+
+def get_pool_name(worker) -> str:
+    """Get the name of the pool a worker runs tasks in, as given to ``-P``."""
+    pool_cls = getattr(worker, "pool_cls", None) or app.conf.worker_pool
+    name = pool_cls if isinstance(pool_cls, str) else pool_cls.__module__.rsplit(".", 1)[-1]
+    name = name.lower()
+    return "threads" if name == "thread" else name
+
+
+def patch_green_database(pool: str):
+    """Make psycopg2 yield to other greenlets while it waits on PostgreSQL."""
+    try:
+        if pool == "gevent":
+            from psycogreen.gevent import patch_psycopg
+        else:
+            from psycogreen.eventlet import patch_psycopg
+    except ImportError:
+        logger.warning(f"psycogreen is not installed, database queries will block every run of this {pool} worker")
+        return
+    patch_psycopg()
+    logger.info(f"Patched psycopg2 for the {pool} pool")
+
+
+@worker_init.connect
+def configure_in_process_worker(sender=None, **kwargs):
+    """Configure workers whose pool runs tasks in the worker process itself.
+
+    ``worker_process_init`` only fires in prefork children, so threads, gevent
+    and eventlet workers set up their HTTP client pool here, with a connection
+    for every concurrent run.
+    """
+    pool = get_pool_name(sender)
+    if pool not in IN_PROCESS_POOLS:
+        return
+
+    logger.info(f"Initializing {pool} worker")
+    if pool in GREEN_POOLS:
+        patch_green_database(pool)
+
+    if get_http_pool_enabled():
+        init_client_pool(max_connections=max(get_http_max_connections(), getattr(sender, "concurrency", 0) or 0))
+
+
+@worker_shutdown.connect
+def cleanup_in_process_worker(**kwargs):
+    """Close the HTTP client pool of threads, gevent and eventlet workers."""
+    close_client_pool()
 
 
 @beat_init.connect
@@ -101,9 +161,6 @@ def init_scheduler(sender=None, **kwargs):
 
 @celeryd_after_setup.connect
 def setup_direct_queue(sender, instance, **kwargs):
-    """Setup direct queue after worker initialized."""
+    """Setup direct and routed queues after worker initialized."""
     logger.info(f"Setting up direct queue for worker {sender}")
-    app.conf.task_queues = [
-        Queue("celery", Exchange("celery"), routing_key="celery"),
-        Queue("direct", Exchange("direct"), routing_key="direct"),
-    ]
+    app.conf.task_queues = get_task_queues()
@@ -2,7 +2,7 @@
 Database package initialization.
 """
 
-from .models import Base, Task, Workflow, Schedule, TaskLog, Worker
+from .models import Base, Task, Workflow, Schedule, TaskLog, TaskOutput, Worker
 from .session import get_session, get_sync_session, get_engine
 
 __all__ = [
@@ -11,6 +11,7 @@ __all__ = [
     "Workflow",
     "Schedule",
     "TaskLog",
+    "TaskOutput",
     "Worker",
     "get_session",
     "get_sync_session",
@@ -0,0 +1,56 @@
+"""
+ID parsing for database lookups.
+
+IDs from URLs and the CLI are parsed into UUIDs before they reach a query,
+so lookups compare the UUID columns directly and use their indexes instead
+of casting every row to text. Short ID prefixes (as shown by the CLI) are
+turned into a UUID range, which the primary key index can also serve.
+"""
+
+import string
+from typing import Any, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_
+from sqlalchemy.sql.elements import ColumnElement
+
+_HEX_DIGITS = set(string.hexdigits)
+
+
+def parse_uuid(value: Any) -> Optional[UUID]:
+    """Parse a UUID, with or without dashes.
+
+    Returns:
+        The UUID, or None if the value is not a UUID
+    """
+    if isinstance(value, UUID):
+        return value
+    try:
+        return UUID(str(value).strip())
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def uuid_prefix_bounds(prefix: str) -> Optional[Tuple[UUID, UUID]]:
+    """Get the lowest and highest UUID starting with a hex prefix.
+
+    Returns:
+        Tuple of bounds, or None if the prefix is empty or not hexadecimal
+    """
+    digits = str(prefix).strip().replace("-", "").lower()
+    if not digits or len(digits) > 32 or not set(digits) <= _HEX_DIGITS:
+        return None
+    return UUID(digits.ljust(32, "0")), UUID(digits.ljust(32, "f"))
+
+
+def uuid_prefix_filter(column, prefix: str) -> Optional[ColumnElement]:
+    """Build a range predicate matching UUIDs that start with ``prefix``.
+
+    Returns:
+        The predicate, or None if the prefix is not a valid UUID prefix
+    """
+    bounds = uuid_prefix_bounds(prefix)
+    if bounds is None:
+        return None
+    low, high = bounds
+    return and_(column >= low, column <= high)
@@ -3,10 +3,13 @@ Database models for the application.
 """
 
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from uuid import uuid4
 import os
 import base64
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from cryptography.fernet import Fernet
 import logging
 from sqlalchemy import (
@@ -15,11 +18,14 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     UUID,
 )
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.orm import relationship, synonym
 
 from automagik_spark.core.database.base import Base
@@ -27,6 +33,65 @@ from automagik_spark.core.database.base import Base
 logger = logging.getLogger(__name__)
 
 
+# Fixed testing key that's URL-safe base64 encoded (as string, not bytes)
+_TEST_ENCRYPTION_KEY = "5aQaTalKCAOAgOPFV_xZrQVzWgE80mseLFW-x_sa06o="
+_FALLBACK_ENCRYPTION_KEY = "S1JwNXY2Z1hrY1NhcUxXR3VZM3pNMHh3cU1mWWVEejVQYk09"
+
+# Maximum number of decrypted source API keys kept per process
+API_KEY_CACHE_SIZE = int(os.getenv("AUTOMAGIK_SPARK_API_KEY_CACHE_SIZE", "256"))
+
+_decrypted_keys: "OrderedDict[tuple, str]" = OrderedDict()
+_decrypted_keys_lock = threading.Lock()
+
+
+@lru_cache(maxsize=8)
+def _resolve_encryption_key(key):
+    """Normalize the raw AUTOMAGIK_SPARK_ENCRYPTION_KEY value into a Fernet key.
+
+    Cached per raw value, so the checks and warnings below run once per process.
+    """
+    if not key:
+        # Log a warning that we're using a testing key
+        logger.warning(
+            "No AUTOMAGIK_SPARK_ENCRYPTION_KEY found in environment, using testing key. This is unsafe for production!"
+        )
+        return _TEST_ENCRYPTION_KEY
+
+    # Strip quotes if present (environment might have quotes)
+    key = key.strip("\"'")
+
+    # Key is provided in environment
+    try:
+        # First try to decode as URL-safe base64
+        decoded = base64.urlsafe_b64decode(key.encode())
+        if len(decoded) == 32:
+            logger.debug("Using environment encryption key")
+            return key  # Return as string, not bytes
+    except Exception as e:
+        logger.warning(f"Failed to decode encryption key as base64: {e}")
+
+    try:
+        # If not base64, try to encode the raw key
+        if len(key.encode()) == 32:
+            logger.debug("Encoded raw environment encryption key to base64")
+            return base64.urlsafe_b64encode(key.encode()).decode()
+        elif len(key) == 44:  # Standard base64 encoded length for 32 bytes
+            logger.debug(f"Using environment encryption key as-is: length={len(key)}")
+            return key
+    except Exception as e:
+        logger.error(f"Invalid encryption key format: {str(e)}")
+
+    # If we reach here, the key doesn't match any expected format
+    logger.error("AUTOMAGIK_SPARK_ENCRYPTION_KEY doesn't match any expected format. Falling back to test key.")
+    return _FALLBACK_ENCRYPTION_KEY
+
+
+@lru_cache(maxsize=8)
+def _get_fernet(key: str) -> Fernet:
+    """Get the Fernet instance for an encryption key."""
+    return Fernet(key)
+
+
 def utcnow():
     """Return current UTC datetime with timezone."""
     return datetime.now(timezone.utc)
@@ -45,8 +110,10 @@ class Workflow(Base):
 
     # Source system info
     source = Column(String(50), nullable=False)  # e.g., "langflow"
-    remote_flow_id = Column(String(255), nullable=False)  # ID of the remote flow (UUID)
+    remote_flow_id = Column(String(255), nullable=False, index=True)  # ID of the remote flow (UUID)
     flow_version = Column(Integer, default=1)
+    # SHA-256 of the normalized flow at the last sync, to skip unchanged flows on re-sync
+    flow_hash = Column(String(64), nullable=True)
     workflow_source_id = Column(UUID(as_uuid=True), ForeignKey("workflow_sources.id"))
     workflow_source = relationship("WorkflowSource", back_populates="workflows")
 
@@ -55,6 +122,15 @@ class Workflow(Base):
     output_component = Column(String(255))  # Component ID in source system
     is_component = Column(Boolean, default=False)
 
+    # Days to keep finished tasks of this workflow; overrides the global task retention
+    retention_days = Column(Integer, nullable=True)
+
+    # Celery queue its runs go to; overrides the source routes
+    queue = Column(String(64), nullable=True)
+
+    # Run priority, 0 (lowest) to 9 (highest); also weights its share of worker slots
+    priority = Column(Integer, nullable=True)
+
     # Metadata
     folder_id = Column(String(255))
     folder_name = Column(String(255))
@@ -76,29 +152,40 @@ class Workflow(Base):
         """Return a string representation of the workflow."""
         return f"{self.name} ({self.id})"
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert workflow to dictionary."""
-        # Get latest task
-        latest_task = None
-        task_count = 0
-        failed_task_count = 0
-        if self.tasks:
-            latest_task = max(self.tasks, key=lambda t: t.created_at)
-            task_count = len(self.tasks)
-            failed_task_count = sum(1 for t in self.tasks if t.status == "failed")
-
-        return {
+    def to_dict(self, include_data: bool = True, task_stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Convert workflow to dictionary.
+
+        Args:
+            include_data: Include the ``data`` and ``flow_raw_data`` JSON; list
+                views leave them out (and may not have loaded them)
+            task_stats: ``latest_run``, ``task_count`` and ``failed_task_count``
+                computed by the database; derived from the loaded tasks otherwise
+        """
+        unloaded = sa_inspect(self).unloaded
+        if task_stats is None:
+            # Never lazy-load the task history just to count it
+            tasks = self.tasks if "tasks" not in unloaded else []
+            latest_task = max(tasks, key=lambda t: t.created_at) if tasks else None
+            task_stats = {
+                "latest_run": "NEW" if not latest_task else latest_task.status.upper(),
+                "task_count": len(tasks),
+                "failed_task_count": sum(1 for t in tasks if t.status == "failed"),
+            }
+        schedules = self.schedules if "schedules" not in unloaded else []
+
+        result = {
             "id": str(self.id),
             "name": self.name,
             "description": self.description,
-            "data": self.data,
-            "flow_raw_data": self.flow_raw_data,
             "source": self.source,
             "remote_flow_id": self.remote_flow_id,
             "flow_version": self.flow_version,
             "input_component": self.input_component,
             "output_component": self.output_component,
             "is_component": self.is_component,
+            "retention_days": self.retention_days,
+            "queue": self.queue,
+            "priority": self.priority,
             "folder_id": self.folder_id,
             "folder_name": self.folder_name,
             "icon": self.icon,
@@ -108,11 +195,15 @@ class Workflow(Base):
             "workflow_source_id": (str(self.workflow_source_id) if self.workflow_source_id else None),
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "schedules": ([s.to_dict() for s in self.schedules] if self.schedules else []),
-            "latest_run": "NEW" if not latest_task else latest_task.status.upper(),
-            "task_count": task_count,
-            "failed_task_count": failed_task_count,
+            "schedules": [s.to_dict() for s in schedules],
+            "latest_run": task_stats["latest_run"],
+            "task_count": task_stats["task_count"],
+            "failed_task_count": task_stats["failed_task_count"],
         }
+        if include_data:
+            result["data"] = self.data
+            result["flow_raw_data"] = self.flow_raw_data
+        return result
 
 
 class WorkflowSource(Base):
@@ -127,6 +218,9 @@ class WorkflowSource(Base):
     encrypted_api_key = Column(String, nullable=False)
     version_info = Column(JSON)
     status = Column(String(50), nullable=False, default="active")
+    # Run limits; NULL leaves the source unbounded (see core/workflows/limiter.py)
+    max_concurrency = Column(Integer, nullable=True)
+    max_runs_per_minute = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), default=utcnow)
     updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
 
@@ -136,68 +230,37 @@ class WorkflowSource(Base):
     @staticmethod
     def _get_encryption_key():
         """Get encryption key from environment or generate a default one."""
-        key = os.environ.get("AUTOMAGIK_SPARK_ENCRYPTION_KEY")
-        logger.info(f"Raw environment key: {repr(key)}")
-
-        if not key:
-            # Log a warning that we're using a testing key
-            logger.warning(
-                "No AUTOMAGIK_SPARK_ENCRYPTION_KEY found in environment, using testing key. This is unsafe for production!"
-            )
-            # Use a fixed testing key that's URL-safe base64 encoded (as string, not bytes)
-            test_key = "5aQaTalKCAOAgOPFV_xZrQVzWgE80mseLFW-x_sa06o="
-            logger.info(f"Returning test key: {repr(test_key)}")
-            return test_key
-
-        # Strip quotes if present (environment might have quotes)
-        key = key.strip("\"'")
-        logger.info(f"Environment key after stripping quotes: {repr(key)}")
-
-        # Key is provided in environment
-        try:
-            # First try to decode as URL-safe base64
-            decoded = base64.urlsafe_b64decode(key.encode())
-            if len(decoded) == 32:
-                logger.info(f"Successfully using environment key - base64 decoded length: {len(decoded)}")
-                return key  # Return as string, not bytes
-        except Exception as e:
-            logger.warning(f"Failed to decode as base64: {e}")
-
-        try:
-            # If not base64, try to encode the raw key
-            if len(key.encode()) == 32:
-                encoded_key = base64.urlsafe_b64encode(key.encode()).decode()
-                logger.info(f"Encoded raw key to base64: {encoded_key}")
-                return encoded_key
-            elif len(key) == 44:  # Standard base64 encoded length for 32 bytes
-                logger.info(f"Using environment key as-is: length={len(key)}")
-                return key
-        except Exception as e:
-            logger.error(f"Invalid encryption key format: {str(e)}")
-
-        # If we reach here, the key doesn't match any expected format
-        logger.error(f"Environment key '{key}' doesn't match any expected format. Falling back to test key.")
-        test_key = "S1JwNXY2Z1hrY1NhcUxXR3VZM3pNMHh3cU1mWWVEejVQYk09"
-        logger.info(f"Returning fallback test key: {repr(test_key)}")
-        return test_key
+        return _resolve_encryption_key(os.environ.get("AUTOMAGIK_SPARK_ENCRYPTION_KEY"))
 
     @staticmethod
     def encrypt_api_key(api_key: str) -> str:
         """Encrypt an API key."""
-        key = WorkflowSource._get_encryption_key()
-        f = Fernet(key)
+        f = _get_fernet(WorkflowSource._get_encryption_key())
         return f.encrypt(api_key.encode()).decode()
 
     @staticmethod
-    def decrypt_api_key(encrypted_key: str) -> str:
-        """Decrypt an API key."""
+    def decrypt_api_key(encrypted_key: str, source_id=None) -> str:
+        """Decrypt an API key.
+
+        When ``source_id`` is given, the plaintext is kept in a bounded
+        per-process LRU keyed by ``(source_id, encrypted_key)`` so repeated
+        executions against the same source skip decryption.
+        """
         key = WorkflowSource._get_encryption_key()
-        f = Fernet(key)
+        cache_key = (str(source_id), encrypted_key, key) if source_id is not None else None
+        if cache_key is not None:
+            with _decrypted_keys_lock:
+                api_key = _decrypted_keys.get(cache_key)
+                if api_key is not None:
+                    _decrypted_keys.move_to_end(cache_key)
+                    return api_key
+
+        f = _get_fernet(key)
         try:
             decrypted_bytes = f.decrypt(encrypted_key.encode())
             if decrypted_bytes is None:
                 raise ValueError("Decryption returned None - possible key mismatch")
-            return decrypted_bytes.decode()
+            api_key = decrypted_bytes.decode()
         except Exception as e:
             logger.error(f"Failed to decrypt API key: {str(e)}")
             logger.error(
@@ -205,6 +268,25 @@ class WorkflowSource(Base):
             )
             raise ValueError(f"Failed to decrypt API key: {str(e)}")
 
+        if cache_key is not None and API_KEY_CACHE_SIZE > 0:
+            with _decrypted_keys_lock:
+                _decrypted_keys[cache_key] = api_key
+                _decrypted_keys.move_to_end(cache_key)
+                while len(_decrypted_keys) > API_KEY_CACHE_SIZE:
+                    _decrypted_keys.popitem(last=False)
+        return api_key
+
+    @staticmethod
+    def invalidate_api_key_cache(source_id=None) -> None:
+        """Drop cached decrypted API keys for a source, or for all sources."""
+        with _decrypted_keys_lock:
+            if source_id is None:
+                _decrypted_keys.clear()
+                return
+            source_id = str(source_id)
+            for cache_key in [k for k in _decrypted_keys if k[0] == source_id]:
+                del _decrypted_keys[cache_key]
+
     def __str__(self):
         """Return a string representation of the source."""
         return f"{self.source_type} source at {self.url}"
@@ -247,6 +329,11 @@ class Task(Base):
     """Task model."""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_workflow_id_created_at", "workflow_id", "created_at"),
+        Index("ix_tasks_status_created_at", "status", "created_at"),
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     workflow_id = Column(UUID(as_uuid=True), ForeignKey("workflows.id"), nullable=False)
@@ -289,6 +376,22 @@ class Task(Base):
         }
 
 
+class TaskOutput(Base):
+    """Raw upstream response of a task, compressed and kept out of the tasks table.
+
+    The task row only holds a compact extract of large responses; this row
+    is read when a single task is requested.
+    """
+
+    __tablename__ = "task_outputs"
+
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id"), primary_key=True)
+    encoding = Column(String(16), nullable=False, default="gzip")
+    size = Column(Integer, nullable=False)  # Uncompressed size in bytes
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=utcnow)
+
+
 class TaskLog(Base):
     """Task log entry."""
 
@@ -308,6 +411,11 @@ class Schedule(Base):
     """Schedule model."""
 
     __tablename__ = "schedules"
+    __table_args__ = (
+        Index("ix_schedules_status_next_run_at", "status", "next_run_at"),
+        # Incremental beat syncs read only rows changed since their watermark
+        Index("ix_schedules_updated_at", "updated_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     workflow_id = Column(UUID(as_uuid=True), ForeignKey("workflows.id"), nullable=False)
@@ -325,8 +433,10 @@ class Schedule(Base):
     )
     status = Column(String, nullable=False, default="active")
     next_run_at = Column(DateTime(timezone=True))
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
-    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Run priority, 0 (lowest) to 9 (highest); overrides the workflow's priority
+    priority = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=utcnow)
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
 
     # Relationships
     workflow = relationship("Workflow", back_populates="schedules")
@@ -343,6 +453,7 @@ class Schedule(Base):
             "input_data": self.input_data,
             "status": self.status,
             "next_run_at": self.next_run_at.isoformat() if self.next_run_at else None,
+            "priority": self.priority,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
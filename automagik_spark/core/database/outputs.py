@@ -0,0 +1,160 @@
+"""
+Task output storage.
+
+Upstream responses can be large (LangFlow returns its whole ``outputs``
+tree, Hive adds run metadata). Outputs up to
+AUTOMAGIK_SPARK_TASK_OUTPUT_INLINE_LIMIT bytes are stored in the task row as
+before. Larger ones are gzip-compressed into the ``task_outputs`` table and
+the row only keeps a compact extract: the result text, the run identifiers
+and a ``raw_output`` marker. Lists and exports read the small row; the raw
+response is only decompressed when a single task is requested.
+"""
+
+import gzip
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ...api.config import get_task_output_inline_limit
+from .models import Task, TaskOutput
+
+logger = logging.getLogger(__name__)
+
+# Key of the compact extract pointing to the stored raw response
+RAW_OUTPUT_KEY = "raw_output"
+
+# Fields of agent-style responses (Hive) kept in the compact extract
+_COMPACT_KEYS = ("result", "success", "status", "session_id", "run_id", "agent_id", "team_id", "workflow_id")
+
+
+def _langflow_result(output: Dict[str, Any]) -> Any:
+    """Get the message text(s) out of a LangFlow run response."""
+    texts = []
+    for run in output.get("outputs") or []:
+        for component in (run or {}).get("outputs") or []:
+            if not isinstance(component, dict):
+                continue
+            message = (component.get("results") or {}).get("message")
+            if isinstance(message, dict):
+                message = message.get("text")
+            if message is None:
+                messages = component.get("messages") or []
+                message = messages[0].get("message") if messages and isinstance(messages[0], dict) else None
+            if message is not None:
+                texts.append(message)
+    if not texts:
+        return None
+    return texts[0] if len(texts) == 1 else texts
+
+
+def extract_result(output: Any) -> Dict[str, Any]:
+    """Build the compact extract of a workflow output.
+
+    Args:
+        output: Decoded upstream response (dict) or plain text
+
+    Returns:
+        Dict with the result and the run identifiers found in the output
+    """
+    if isinstance(output, dict):
+        if isinstance(output.get("outputs"), list):
+            compact = {"result": _langflow_result(output)}
+            if output.get("session_id"):
+                compact["session_id"] = output["session_id"]
+            return compact
+        return {key: output[key] for key in _COMPACT_KEYS if key in output}
+    if isinstance(output, str):
+        return {"result": output}
+    return {}
+
+
+def _fit(compact: Dict[str, Any], limit: int) -> Dict[str, Any]:
+    """Truncate the result of a compact extract that is still over the limit."""
+    if len(json.dumps(compact, default=str)) <= limit:
+        return compact
+    result = compact.get("result")
+    if isinstance(result, str):
+        compact["result"] = result[:limit]
+    else:
+        compact.pop("result", None)
+    compact["truncated"] = True
+    return compact
+
+
+def pack_output(task_id: Any, encoded: str) -> Tuple[str, Optional[TaskOutput]]:
+    """Split an encoded output into the value of the task row and its raw storage.
+
+    Args:
+        task_id: ID of the task the output belongs to
+        encoded: Output as previously stored in ``Task.output_data`` (JSON text or plain text)
+
+    Returns:
+        Tuple of the value for ``Task.output_data`` and the TaskOutput row to
+        store, or None when the output is small enough to stay inline
+    """
+    raw = encoded.encode("utf-8")
+    limit = get_task_output_inline_limit()
+    if len(raw) <= limit:
+        return encoded, None
+
+    try:
+        output = json.loads(encoded)
+    except ValueError:
+        output = encoded
+
+    compact = _fit(extract_result(output), limit)
+    compact[RAW_OUTPUT_KEY] = {"encoding": "gzip", "size": len(raw)}
+    row = TaskOutput(task_id=task_id, encoding="gzip", size=len(raw), data=gzip.compress(raw, compresslevel=6))
+    return json.dumps(compact), row
+
+
+def store_task_output(session: Session, task: Task, encoded: str) -> None:
+    """Set a task's output, moving large outputs to ``task_outputs`` (sync sessions)."""
+    task.output_data, row = pack_output(task.id, encoded)
+    if row is not None:
+        # merge: a retried task replaces the output of its previous run
+        session.merge(row)
+
+
+async def store_task_output_async(session: AsyncSession, task: Task, encoded: str) -> None:
+    """Set a task's output, moving large outputs to ``task_outputs`` (async sessions)."""
+    task.output_data, row = pack_output(task.id, encoded)
+    if row is not None:
+        await session.merge(row)
+
+
+def is_offloaded(output_data: Any) -> bool:
+    """Check whether a task row holds a compact extract of a stored raw output."""
+    if isinstance(output_data, str):
+        if RAW_OUTPUT_KEY not in output_data:
+            return False
+        try:
+            output_data = json.loads(output_data)
+        except ValueError:
+            return False
+    return isinstance(output_data, dict) and isinstance(output_data.get(RAW_OUTPUT_KEY), dict)
+
+
+def unpack_output(row: TaskOutput) -> str:
+    """Decompress a stored raw output back to its encoded text."""
+    if row.encoding != "gzip":
+        raise ValueError(f"Unsupported output encoding: {row.encoding}")
+    return gzip.decompress(row.data).decode("utf-8")
+
+
+async def load_task_output(session: AsyncSession, task: Task) -> Optional[str]:
+    """Load the raw output of a task whose row only holds a compact extract.
+
+    Returns:
+        The encoded raw output, or None if the output is stored inline or missing
+    """
+    if not is_offloaded(task.output_data):
+        return None
+    row = await session.get(TaskOutput, task.id)
+    if row is None:
+        logger.warning(f"Raw output of task {task.id} is missing")
+        return None
+    return unpack_output(row)
@@ -0,0 +1,161 @@
+"""
+Keyset pagination helpers.
+
+List endpoints page on ``(created_at, id)``: a page starts right after the
+last row of the previous one instead of skipping ``offset`` rows, so deep
+pages cost the same as the first. Cursors are opaque to clients. Totals can
+be exact, cached for a few seconds, estimated from the planner statistics
+(PostgreSQL), or skipped entirely.
+"""
+
+import base64
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Hashable, Literal, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, and_, or_, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...api.config import get_count_cache_ttl
+
+logger = logging.getLogger(__name__)
+
+CountMode = Literal["exact", "cached", "estimate", "none"]
+
+# Maximum number of cached totals
+MAX_CACHED_COUNTS = 1024
+
+_counts: Dict[Hashable, Tuple[float, int]] = {}
+
+
+def encode_cursor(created_at: datetime | str, row_id: UUID | str) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    raw = json.dumps([created_at, str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor made by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def keyset_page(query: Select, model, cursor: Optional[str] = None, descending: bool = True) -> Select:
+    """Order a query by ``(created_at, id)`` and start it after the cursor.
+
+    Args:
+        query: Query selecting ``model`` rows
+        model: Mapped class with ``created_at`` and ``id`` columns
+        cursor: Cursor of the last row of the previous page, if any
+        descending: Newest first (default) or oldest first
+
+    Returns:
+        The ordered query; apply ``limit`` to it
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if descending:
+        query = query.order_by(model.created_at.desc(), model.id.desc())
+    else:
+        query = query.order_by(model.created_at.asc(), model.id.asc())
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        if descending:
+            after = or_(model.created_at < created_at, and_(model.created_at == created_at, model.id < row_id))
+        else:
+            after = or_(model.created_at > created_at, and_(model.created_at == created_at, model.id > row_id))
+        query = query.where(after)
+    return query
+
+
+async def _estimate_rows(session: AsyncSession, table: str) -> Optional[int]:
+    """Get the planner's row estimate of a table, or None if not available."""
+    bind = session.bind
+    if bind is None or bind.dialect.name != "postgresql":
+        return None
+    result = await session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+    )
+    estimate = result.scalar()
+    # -1 means the table was never analyzed
+    return int(estimate) if estimate is not None and estimate >= 0 else None
+
+
+async def count_total(
+    session: AsyncSession,
+    count_query: Select,
+    mode: CountMode = "exact",
+    cache_key: Optional[Hashable] = None,
+    table: Optional[str] = None,
+) -> Optional[int]:
+    """Get the total of a list according to the requested count mode.
+
+    Args:
+        session: Database session
+        count_query: Query selecting the exact count
+        mode: ``exact`` counts every time, ``cached`` reuses a count for
+            AUTOMAGIK_SPARK_COUNT_CACHE_TTL seconds, ``estimate`` uses the
+            table statistics when the list is unfiltered (cached count
+            otherwise), ``none`` skips counting
+        cache_key: Key identifying the list and its filters, for cached counts
+        table: Table name, for estimates of unfiltered lists
+
+    Returns:
+        The total, or None with mode ``none``
+    """
+    if mode == "none":
+        return None
+
+    if mode == "estimate" and table is not None:
+        estimate = await _estimate_rows(session, table)
+        if estimate is not None:
+            return estimate
+
+    ttl = get_count_cache_ttl()
+    use_cache = mode in ("cached", "estimate") and cache_key is not None and ttl > 0
+    if use_cache:
+        cached = _counts.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+
+    total = (await session.execute(count_query)).scalar() or 0
+    if use_cache:
+        if len(_counts) >= MAX_CACHED_COUNTS:
+            _counts.clear()
+        _counts[cache_key] = (time.monotonic(), total)
+    return total
+
+
+def clear_count_cache():
+    """Drop every cached total."""
+    _counts.clear()
+
+
+def page_items(items: list, limit: int) -> Tuple[list, bool]:
+    """Split the ``limit + 1`` rows fetched for a page into the page and whether more follow."""
+    return items[:limit], len(items) > limit
+
+
+def next_cursor(items: list, has_more: bool) -> Optional[str]:
+    """Get the cursor of the page after ``items`` (rows or dicts with created_at and id)."""
+    if not has_more or not items:
+        return None
+    last: Any = items[-1]
+    if isinstance(last, dict):
+        return encode_cursor(last["created_at"], last["id"])
+    return encode_cursor(last.created_at, last.id)
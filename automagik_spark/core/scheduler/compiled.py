@@ -0,0 +1,197 @@
+"""
+Compiled schedule cache.
+
+Parses schedule expressions once per ``(schedule_type, schedule_expr, timezone)``
+and keeps the parsed form (timedelta, Celery crontab, croniter) around for the
+beat, the API validators and the CLI.
+"""
+
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone as dt_timezone, tzinfo
+from functools import lru_cache
+from typing import Any, Iterator, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from celery.schedules import crontab, schedule as celery_schedule
+from croniter import croniter
+from dateutil import parser
+
+SCHEDULE_TYPES = ("interval", "cron", "one-time")
+
+INTERVAL_UNITS = {
+    "s": 1,
+    "m": 60,
+    "h": 3600,
+    "d": 86400,
+}
+
+
+def get_schedule_timezone() -> str:
+    """Get the timezone schedules are evaluated in (same as the Celery app)."""
+    return os.getenv("AUTOMAGIK_TIMEZONE", "UTC")
+
+
+def _get_tz(name: str) -> tzinfo:
+    if name.upper() == "UTC":
+        return dt_timezone.utc
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"Unknown timezone: {name}") from e
+
+
+@dataclass(frozen=True, eq=False)
+class CompiledSchedule:
+    """Parsed form of a schedule expression.
+
+    Exactly one of ``interval``, ``cron`` or ``run_at`` is set, except for
+    one-time "now" schedules where all three are None.
+    """
+
+    schedule_type: str
+    schedule_expr: str
+    timezone: str
+    tz: tzinfo
+    interval: Optional[timedelta] = None
+    cron: Optional[crontab] = None
+    run_at: Optional[datetime] = None
+    _cron_iter: Optional[croniter] = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def is_now(self) -> bool:
+        """Whether this is a one-time schedule that runs immediately."""
+        return self.schedule_type == "one-time" and self.run_at is None
+
+    def beat_schedule(self, now: Optional[datetime] = None) -> Optional[Any]:
+        """Get the Celery schedule object used for the beat entry.
+
+        Cron schedules share the crontab parsed at compile time; one-time
+        schedules are relative to ``now`` and return None once in the past.
+        """
+        if self.interval is not None:
+            return celery_schedule(self.interval)
+        if self.cron is not None:
+            return self.cron
+
+        now = now or datetime.now(dt_timezone.utc)
+        # Add 2 seconds to 'now' schedules to avoid race conditions
+        run_at = now + timedelta(seconds=2) if self.is_now else self.run_at
+        if run_at <= now:
+            return None
+        return celery_schedule(run_at - now, relative=True)
+
+    def next_run(self, after: Optional[datetime] = None) -> Optional[datetime]:
+        """Get the first run strictly after ``after`` (default now), in UTC.
+
+        One-time schedules return their run time, or None if it has passed.
+        """
+        after = after or datetime.now(dt_timezone.utc)
+        if after.tzinfo is None:
+            after = after.replace(tzinfo=dt_timezone.utc)
+
+        if self.interval is not None:
+            return after + self.interval
+
+        if self._cron_iter is not None:
+            with self._lock:
+                self._cron_iter.set_current(after.astimezone(self.tz), force=True)
+                next_run = self._cron_iter.get_next(datetime)
+            return next_run.astimezone(dt_timezone.utc)
+
+        if self.is_now:
+            return after
+        if self.run_at < after:
+            return None
+        return self.run_at
+
+    def iter_runs(self, after: Optional[datetime] = None) -> Iterator[datetime]:
+        """Iterate over upcoming run times, in UTC."""
+        next_run = self.next_run(after)
+        while next_run is not None:
+            yield next_run
+            if self.schedule_type == "one-time":
+                return
+            next_run = self.next_run(next_run)
+
+
+def _compile_interval(schedule_expr: str, /, **kwargs) -> CompiledSchedule:
+    expr = schedule_expr.strip()
+    unit = expr[-1:].lower()
+    value = expr[:-1]
+    if unit not in INTERVAL_UNITS or not value.isdigit() or int(value) <= 0:
+        raise ValueError(f"Invalid interval format: {schedule_expr}")
+    return CompiledSchedule(interval=timedelta(seconds=int(value) * INTERVAL_UNITS[unit]), **kwargs)
+
+
+def _compile_cron(schedule_expr: str, tz: tzinfo, /, **kwargs) -> CompiledSchedule:
+    parts = schedule_expr.split()
+    # The beat builds a five-field crontab, so seconds/years fields are rejected here too
+    if len(parts) != 5 or not croniter.is_valid(schedule_expr):
+        raise ValueError(f"Invalid cron expression: {schedule_expr}")
+
+    minute, hour, day_of_month, month_of_year, day_of_week = parts
+    cron = crontab(
+        minute=minute,
+        hour=hour,
+        day_of_month=day_of_month,
+        month_of_year=month_of_year,
+        day_of_week=day_of_week,
+    )
+    cron_iter = croniter(schedule_expr, datetime.now(tz))
+    return CompiledSchedule(cron=cron, _cron_iter=cron_iter, tz=tz, **kwargs)
+
+
+def _compile_one_time(schedule_expr: str, tz: tzinfo, /, **kwargs) -> CompiledSchedule:
+    if schedule_expr.strip().lower() == "now":
+        return CompiledSchedule(tz=tz, **kwargs)
+    try:
+        run_at = parser.parse(schedule_expr)
+    except (ValueError, OverflowError) as e:
+        raise ValueError(f"Invalid datetime expression: {schedule_expr}") from e
+    # Naive datetimes are in the schedule timezone
+    if run_at.tzinfo is None:
+        run_at = run_at.replace(tzinfo=tz)
+    return CompiledSchedule(run_at=run_at.astimezone(dt_timezone.utc), tz=tz, **kwargs)
+
+
+@lru_cache(maxsize=int(os.getenv("AUTOMAGIK_SPARK_SCHEDULE_CACHE_SIZE", "4096")))
+def _compile(schedule_type: str, schedule_expr: str, timezone: str) -> CompiledSchedule:
+    tz = _get_tz(timezone)
+    common = {"schedule_type": schedule_type, "schedule_expr": schedule_expr, "timezone": timezone}
+    if schedule_type == "interval":
+        return _compile_interval(schedule_expr, tz=tz, **common)
+    if schedule_type == "cron":
+        return _compile_cron(schedule_expr, tz, **common)
+    if schedule_type == "one-time":
+        return _compile_one_time(schedule_expr, tz, **common)
+    raise ValueError(f"Invalid schedule type: {schedule_type}")
+
+
+def compile_schedule(schedule_type: str, schedule_expr: str, timezone: Optional[str] = None) -> CompiledSchedule:
+    """
+    Get the compiled form of a schedule expression.
+
+    Results are cached per ``(schedule_type, schedule_expr, timezone)``.
+
+    Args:
+        schedule_type: One of "interval", "cron" or "one-time"
+        schedule_expr: Schedule expression (e.g., "30m", "0 8 * * *", "2025-01-01T08:00:00")
+        timezone: Timezone name; defaults to AUTOMAGIK_TIMEZONE
+
+    Returns:
+        CompiledSchedule instance
+
+    Raises:
+        ValueError if the type, expression or timezone is invalid
+    """
+    if not isinstance(schedule_expr, str) or not schedule_expr.strip():
+        raise ValueError(f"Invalid schedule expression: {schedule_expr!r}")
+    return _compile(schedule_type, schedule_expr, timezone or get_schedule_timezone())
+
+
+def clear_schedule_cache() -> None:
+    """Drop all compiled schedules."""
+    _compile.cache_clear()
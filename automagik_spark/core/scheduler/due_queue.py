@@ -0,0 +1,88 @@
+"""
+Due-time priority queue.
+
+Keeps schedule keys ordered by their next deadline so the scheduler only looks
+at entries that are actually due.
+"""
+
+import heapq
+import itertools
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class DueQueue:
+    """Min-heap of keys ordered by deadline with O(log n) push and pop.
+
+    Re-pushing a key replaces its deadline; stale heap items are skipped lazily
+    when they reach the top and compacted once they outnumber live keys.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[Any, int, Hashable]] = []
+        self._deadlines: Dict[Hashable, Tuple[Any, int]] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def push(self, key: Hashable, deadline: Any) -> None:
+        """Set the deadline of a key, replacing any previous one."""
+        seq = next(self._counter)
+        self._deadlines[key] = (deadline, seq)
+        heapq.heappush(self._heap, (deadline, seq, key))
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._compact()
+
+    def discard(self, key: Hashable) -> None:
+        """Remove a key if present."""
+        self._deadlines.pop(key, None)
+
+    def deadline(self, key: Hashable) -> Optional[Any]:
+        """Get the current deadline of a key."""
+        item = self._deadlines.get(key)
+        return item[0] if item else None
+
+    def clear(self) -> None:
+        """Remove all keys."""
+        self._heap.clear()
+        self._deadlines.clear()
+
+    def _is_live(self, item: Tuple[Any, int, Hashable]) -> bool:
+        deadline, seq, key = item
+        return self._deadlines.get(key) == (deadline, seq)
+
+    def _drop_stale(self) -> None:
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+
+    def _compact(self) -> None:
+        self._heap = [item for item in self._heap if self._is_live(item)]
+        heapq.heapify(self._heap)
+
+    def peek(self) -> Optional[Any]:
+        """Get the earliest deadline, or None if the queue is empty."""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: Any, limit: Optional[int] = None) -> List[Hashable]:
+        """Remove and return the keys whose deadline is at or before ``now``.
+
+        Args:
+            now: Current time, comparable with the pushed deadlines
+            limit: Maximum number of keys to return
+
+        Returns:
+            Due keys, earliest deadline first
+        """
+        due = []
+        while self._heap and (limit is None or len(due) < limit):
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now:
+                break
+            _, _, key = heapq.heappop(self._heap)
+            del self._deadlines[key]
+            due.append(key)
+        return due
@@ -4,19 +4,20 @@ Scheduler management module.
 Provides the main interface for managing schedules and running scheduled workflows.
 """
 
+import asyncio
 import logging
 from typing import Dict, List, Optional, Any
 from uuid import UUID
 from datetime import datetime, timezone, timedelta
-from croniter import croniter
-from dateutil import parser
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 
 from ..database.models import Schedule, Workflow
+from ..database.pagination import CountMode, count_total, keyset_page
 from ..workflows.manager import WorkflowManager
+from .compiled import compile_schedule
 from .scheduler import WorkflowScheduler
 from .task_runner import TaskRunner
 
@@ -55,6 +56,12 @@ class SchedulerManager:
         """Stop the scheduler."""
         await self.scheduler.stop()
 
+    async def _notify_change(self, *schedule_ids) -> None:
+        """Tell beat processes which schedules were created, changed or deleted."""
+        from ..celery.scheduler import notify_scheduler_change
+
+        await asyncio.to_thread(notify_scheduler_change, *schedule_ids)
+
     def _validate_interval(self, interval: str) -> bool:
         """
         Validate interval expression.
@@ -110,22 +117,12 @@ class SchedulerManager:
         if not self._validate_interval(interval):
             raise ValueError(f"Invalid interval format: {interval}")
 
-        value = int(interval[:-1])
-        unit = interval[-1].lower()
-
-        if unit == "m":
-            return timedelta(minutes=value)
-        elif unit == "h":
-            return timedelta(hours=value)
-        elif unit == "d":
-            return timedelta(days=value)
-        else:
-            raise ValueError("Invalid interval unit")
+        return compile_schedule("interval", interval).interval
 
     def _validate_cron(self, cron: str) -> bool:
         """Validate cron expression."""
         try:
-            croniter(cron)
+            compile_schedule("cron", cron)
             return True
         except (ValueError, TypeError):
             return False
@@ -133,7 +130,7 @@ class SchedulerManager:
     def _validate_datetime(self, dt_str: str) -> bool:
         """Validate datetime string."""
         try:
-            parser.parse(dt_str)
+            compile_schedule("one-time", dt_str)
             return True
         except (ValueError, TypeError):
             return False
@@ -146,40 +143,21 @@ class SchedulerManager:
             if not self._validate_interval(schedule_expr):
                 logger.error(f"Invalid interval expression: {schedule_expr}")
                 return None
-            try:
-                delta = self.parse_interval(schedule_expr)
-                return now + delta
-            except ValueError as e:
-                logger.error(f"Error parsing interval: {e}")
-                return None
-
         elif schedule_type == "cron":
             if not self._validate_cron(schedule_expr):
                 logger.error(f"Invalid cron expression: {schedule_expr}")
                 return None
-            cron = croniter(schedule_expr, now)
-            next_run = cron.get_next(datetime)
-            return next_run.replace(tzinfo=timezone.utc)
-
         elif schedule_type == "one-time":
-            if schedule_expr.lower() == "now":
-                return now
             if not self._validate_datetime(schedule_expr):
                 logger.error(f"Invalid datetime expression: {schedule_expr}")
                 return None
-            try:
-                run_time = parser.parse(schedule_expr)
-                if not run_time.tzinfo:
-                    run_time = run_time.replace(tzinfo=timezone.utc)
-                if run_time < now:
-                    logger.error("Cannot schedule in the past")
-                    return None
-                return run_time
-            except ValueError as e:
-                logger.error(f"Error parsing datetime: {e}")
-                return None
+        else:
+            return None
 
-        return None
+        next_run = compile_schedule(schedule_type, schedule_expr).next_run(now)
+        if next_run is None:
+            logger.error("Cannot schedule in the past")
+        return next_run
 
     # Schedule database operations
     async def create_schedule(
@@ -188,8 +166,15 @@ class SchedulerManager:
         schedule_type: str,
         schedule_expr: str,
         params: Optional[Dict[str, Any]] = None,
+        priority: Optional[int] = None,
     ) -> Optional[Schedule]:
         """Create a new schedule."""
+        from ..celery.routing import MAX_PRIORITY
+
+        if priority is not None and not 0 <= priority <= MAX_PRIORITY:
+            logger.error(f"Invalid priority: {priority}")
+            return None
+
         # Validate workflow exists
         workflow = await self.session.get(Workflow, workflow_id)
         if not workflow:
@@ -219,29 +204,49 @@ class SchedulerManager:
             schedule_expr=schedule_expr,
             params=params,
             next_run_at=next_run,
+            priority=priority,
             status="active",
         )
         self.session.add(schedule)
         await self.session.commit()
+        await self._notify_change(schedule.id)
         return schedule
 
-    async def list_schedules(self, limit: Optional[int] = None, offset: int = 0) -> List[Schedule]:
-        """List all schedules from database."""
-        query = select(Schedule).options(joinedload(Schedule.workflow)).order_by(Schedule.created_at)
+    async def list_schedules(
+        self, limit: Optional[int] = None, offset: int = 0, cursor: Optional[str] = None
+    ) -> List[Schedule]:
+        """List all schedules from database, oldest first.
+
+        Args:
+            limit: Maximum number of schedules to return
+            offset: Number of schedules to skip (ignored when a cursor is given)
+            cursor: Cursor of the last schedule of the previous page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = select(Schedule).options(joinedload(Schedule.workflow))
+        query = keyset_page(query, Schedule, cursor, descending=False)
 
         # Apply pagination
         if limit is not None:
-            query = query.limit(limit).offset(offset)
+            query = query.limit(limit)
+        if offset and not cursor:
+            query = query.offset(offset)
 
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
-    async def count_schedules(self) -> int:
-        """Count total schedules."""
+    async def count_schedules(self, mode: CountMode = "exact") -> Optional[int]:
+        """Count total schedules.
+
+        Args:
+            mode: How to count (exact, cached, estimate or none)
+        """
         from sqlalchemy import func
+
         query = select(func.count(Schedule.id))
-        result = await self.session.execute(query)
-        return result.scalar() or 0
+        return await count_total(self.session, query, mode, cache_key=("schedules",), table="schedules")
 
     async def update_schedule_status(self, schedule_id: str, action: str) -> bool:
         """Update schedule status."""
@@ -267,6 +272,7 @@ class SchedulerManager:
 
             schedule.status = new_status
             await self.session.commit()
+            await self._notify_change(schedule_uuid)
             return True
 
         except Exception as e:
@@ -340,12 +346,42 @@ class SchedulerManager:
                 return False
 
             await self.session.commit()
+            await self._notify_change(schedule_id)
             return True
 
         except Exception as e:
             logger.error(f"Error updating schedule expression: {str(e)}")
             return False
 
+    async def update_schedule_priority(self, schedule_id: UUID, priority: Optional[int]) -> bool:
+        """
+        Update a schedule's priority.
+
+        Args:
+            schedule_id: Schedule ID
+            priority: 0 (lowest) to 9 (highest), or None to use the workflow's priority
+
+        Returns:
+            True if update was successful
+        """
+        from ..celery.routing import MAX_PRIORITY
+
+        if priority is not None and not 0 <= priority <= MAX_PRIORITY:
+            logger.error(f"Invalid priority: {priority}")
+            return False
+
+        try:
+            result = await self.session.execute(select(Schedule).where(Schedule.id == schedule_id))
+            schedule = result.scalar_one()
+            schedule.priority = priority
+            await self.session.commit()
+            await self._notify_change(schedule_id)
+            return True
+
+        except Exception as e:
+            logger.error(f"Error updating schedule priority: {str(e)}")
+            return False
+
     async def delete_schedule(self, schedule_id: UUID) -> bool:
         """Delete a schedule."""
         try:
@@ -358,6 +394,7 @@ class SchedulerManager:
 
             await self.session.delete(schedule)
             await self.session.commit()
+            await self._notify_change(schedule_id)
             return True
 
         except Exception as e:
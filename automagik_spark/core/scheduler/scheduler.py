@@ -6,17 +6,20 @@ from datetime import datetime, timezone
 from typing import List, Optional
 from uuid import UUID, uuid4
 
-from croniter import croniter
-from dateutil.parser import parse as parse_datetime
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from ..database.models import Schedule, Task, Workflow
 from ..workflows.manager import WorkflowManager
+from .compiled import SCHEDULE_TYPES, compile_schedule
+from .utils import validate_interval
 
 logger = logging.getLogger(__name__)
 
+# Shortest sleep between passes, so a schedule that stays due cannot spin the loop
+MIN_SLEEP = 1.0
+
 
 class WorkflowScheduler:
     """Workflow scheduler."""
@@ -25,6 +28,8 @@ class WorkflowScheduler:
         """Initialize workflow scheduler."""
         self.session = session
         self.workflow_manager = workflow_manager
+        # Passes in a row that failed; the loop backs off while this is non-zero
+        self.failed_passes = 0
 
     async def __aenter__(self):
         """Enter context manager."""
@@ -41,24 +46,16 @@ class WorkflowScheduler:
     def _get_next_run(self, schedule_type: str, schedule_expr: str) -> Optional[datetime]:
         """Get next run time for a schedule."""
         try:
-            now = datetime.now(timezone.utc)
-            if schedule_type == "cron":
-                return croniter(schedule_expr, now).get_next(datetime)
-            elif schedule_type == "interval":
-                return parse_datetime(schedule_expr)
-            elif schedule_type == "one-time":
-                if schedule_expr.lower() == "now":
-                    return now
-                dt = parse_datetime(schedule_expr)
-                if not dt.tzinfo:
-                    dt = dt.replace(tzinfo=timezone.utc)
-                if dt < now:
-                    logger.error("Cannot schedule in the past")
-                    return None
-                return dt
-            else:
+            if schedule_type not in SCHEDULE_TYPES:
                 logger.error(f"Invalid schedule type: {schedule_type}")
                 return None
+            if schedule_type == "interval" and not validate_interval(schedule_expr):
+                logger.error(f"Invalid interval format: {schedule_expr}")
+                return None
+            next_run = compile_schedule(schedule_type, schedule_expr).next_run()
+            if next_run is None:
+                logger.error("Cannot schedule in the past")
+            return next_run
         except Exception as e:
             logger.error(f"Error parsing schedule expression: {e}")
             return None
@@ -115,7 +112,7 @@ class WorkflowScheduler:
             from ..celery_config import notify_scheduler_change
 
             logger.info("Notifying celery scheduler of changes")
-            notify_scheduler_change()
+            await asyncio.to_thread(notify_scheduler_change, schedule.id)
 
             return schedule
         except Exception as e:
@@ -162,6 +159,10 @@ class WorkflowScheduler:
                 schedule.next_run_at = next_run
 
             await self.session.commit()
+
+            from ..celery_config import notify_scheduler_change
+
+            await asyncio.to_thread(notify_scheduler_change, schedule.id)
             return schedule
         except Exception as e:
             logger.error(f"Error updating schedule: {e}")
@@ -179,6 +180,10 @@ class WorkflowScheduler:
 
             await self.session.delete(schedule)
             await self.session.commit()
+
+            from ..celery_config import notify_scheduler_change
+
+            await asyncio.to_thread(notify_scheduler_change, schedule_id)
             return True
         except Exception as e:
             logger.error(f"Error deleting schedule: {e}")
@@ -203,87 +208,101 @@ class WorkflowScheduler:
             logger.error(f"Error listing schedules: {e}")
             return []
 
-    async def process_schedules(self) -> None:
-        """Process all active schedules."""
+    async def _run_schedule(self, schedule: Schedule) -> None:
+        """Create a task for a due schedule, run it and move the schedule forward."""
+        input_data = str(schedule.workflow_params) if schedule.workflow_params else ""
+        task = Task(
+            id=uuid4(),
+            workflow_id=schedule.workflow_id,
+            schedule_id=schedule.id,
+            input_data=input_data,
+            status="pending",
+            created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc),
+        )
+        self.session.add(task)
+
+        # Move the schedule forward before running so a slow workflow is not picked up twice
+        if schedule.schedule_type == "one-time":
+            schedule.status = "completed"
+        else:
+            schedule.next_run_at = self._get_next_run(schedule.schedule_type, schedule.schedule_expr)
+        await self.session.commit()
+
+        # Run the workflow with the task
+        await self.workflow_manager.run_workflow(
+            workflow_id=schedule.workflow_id,
+            input_data=input_data,
+            existing_task=task,
+        )
+
+    async def get_next_deadline(self) -> Optional[datetime]:
+        """Get the earliest next run time among active schedules."""
+        result = await self.session.execute(
+            select(func.min(Schedule.next_run_at)).where(Schedule.status == "active")
+        )
+        deadline = result.scalar()
+        if deadline is not None and deadline.tzinfo is None:
+            deadline = deadline.replace(tzinfo=timezone.utc)
+        return deadline
+
+    async def process_schedules(self, batch_size: int = 100) -> int:
+        """Process active schedules that are due.
+
+        Only rows with ``next_run_at <= now`` are read, earliest first, so the
+        cost follows the number of due schedules rather than the total.
+
+        Args:
+            batch_size: Maximum number of schedules to run in one call
+
+        Returns:
+            Number of schedules processed
+        """
         try:
             now = datetime.now(timezone.utc)
-            # Query all active schedules
-            result = await self.session.execute(select(Schedule).where(Schedule.active))
+            result = await self.session.execute(
+                select(Schedule)
+                .where(Schedule.status == "active", Schedule.next_run_at <= now)
+                .order_by(Schedule.next_run_at)
+                .limit(batch_size)
+            )
             schedules = list(result.scalars().all())
 
             for schedule in schedules:
-                # Only process schedules that are due
-                if schedule.next_run_at and schedule.next_run_at <= now:
-                    # Create and run task
-                    input_data = str(schedule.workflow_params) if schedule.workflow_params else ""
-                    task = Task(
-                        id=uuid4(),
-                        workflow_id=schedule.workflow_id,
-                        schedule_id=schedule.id,
-                        input_data=input_data,
-                        status="pending",
-                        created_at=datetime.now(timezone.utc),
-                        updated_at=datetime.now(timezone.utc),
-                    )
-                self.session.add(task)
-                await self.session.commit()
-
-                # Run the workflow with the task
-                await self.workflow_manager.run_workflow(
-                    workflow_id=schedule.workflow_id,
-                    input_data=input_data,
-                    existing_task=task,
-                )
-
-                # Update next run time
-                next_run = self._get_next_run(schedule.schedule_type, schedule.schedule_expr)
-                if next_run:
-                    schedule.next_run_at = next_run
-                    await self.session.commit()
+                await self._run_schedule(schedule)
+            self.failed_passes = 0
+            return len(schedules)
 
         except Exception as e:
             logger.error(f"Error processing schedules: {e}")
             await self.session.rollback()
-
-    async def start_scheduler(self) -> None:
-        """Start the scheduler."""
+            self.failed_passes += 1
+            return 0
+
+    async def _sleep_time(self, max_sleep: float) -> float:
+        """Get how long to sleep before the next pass."""
+        if self.failed_passes:
+            return min(MIN_SLEEP * 2 ** (self.failed_passes - 1), max_sleep)
+
+        deadline = await self.get_next_deadline()
+        if deadline is None:
+            return max_sleep
+        remaining = (deadline - datetime.now(timezone.utc)).total_seconds()
+        return min(max(remaining, MIN_SLEEP), max_sleep)
+
+    async def start_scheduler(self, batch_size: int = 100, max_sleep: float = 60) -> None:
+        """Start the scheduler.
+
+        Sleeps until the earliest ``next_run_at`` (between ``MIN_SLEEP`` and
+        ``max_sleep`` seconds) instead of polling on a fixed interval, and
+        backs off exponentially while passes keep failing.
+        """
         try:
             while True:
-                # Get active schedules
-                query = select(Schedule).filter(Schedule.active)
-                result = await self.session.execute(query)
-                schedules = result.scalars().all()
-
-                for schedule in schedules:
-                    # Check if it's time to run
-                    if schedule.next_run_at <= datetime.now(timezone.utc):
-                        # Create and run task
-                        input_data = str(schedule.workflow_params) if schedule.workflow_params else ""
-                        task = Task(
-                            id=uuid4(),
-                            workflow_id=schedule.workflow_id,
-                            schedule_id=schedule.id,
-                            input_data=input_data,
-                            status="pending",
-                            created_at=datetime.now(timezone.utc),
-                            updated_at=datetime.now(timezone.utc),
-                        )
-                        self.session.add(task)
-                        await self.session.commit()
-
-                        # Run the workflow with the task
-                        await self.workflow_manager.run_workflow(
-                            workflow_id=schedule.workflow_id,
-                            input_data=input_data,
-                            existing_task=task,
-                        )
-
-                        # Update next run time
-                        next_run = self._get_next_run(schedule.schedule_type, schedule.schedule_expr)
-                        if next_run:
-                            schedule.next_run_at = next_run
-                            await self.session.commit()
-
-                await asyncio.sleep(60)  # Check every minute
+                if await self.process_schedules(batch_size) >= batch_size:
+                    # More schedules may already be due
+                    continue
+
+                await asyncio.sleep(await self._sleep_time(max_sleep))
         except Exception as e:
             logger.error(f"Error in scheduler loop: {str(e)}")
@@ -6,6 +6,8 @@ Provides standalone utility functions for scheduling operations.
 
 from datetime import timedelta
 
+from .compiled import compile_schedule
+
 
 def validate_interval(interval: str) -> bool:
     """
@@ -77,13 +79,4 @@ def parse_interval(interval: str) -> timedelta:
     if not validate_interval(interval):
         raise ValueError(f"Invalid interval format: {interval}")
 
-    value = int(interval[:-1])
-    unit = interval[-1].lower()
-
-    # Unit is already validated by validate_interval()
-    if unit == "m":
-        return timedelta(minutes=value)
-    elif unit == "h":
-        return timedelta(hours=value)
-    else:  # unit == "d"
-        return timedelta(days=value)
+    return compile_schedule("interval", interval).interval
@@ -4,7 +4,7 @@ from typing import Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime
 from enum import Enum
-from pydantic import BaseModel, HttpUrl, ConfigDict
+from pydantic import BaseModel, HttpUrl, ConfigDict, Field
 
 
 class SourceType(str, Enum):
@@ -34,6 +34,8 @@ class WorkflowSourceCreate(WorkflowSourceBase):
     """Model for creating a workflow source."""
 
     api_key: str = ""  # Allow empty string by default
+    max_concurrency: Optional[int] = Field(None, ge=1, description="Most runs sent to the source at once")
+    max_runs_per_minute: Optional[int] = Field(None, ge=1, description="Most runs started per minute")
 
 
 class WorkflowSourceUpdate(BaseModel):
@@ -44,6 +46,9 @@ class WorkflowSourceUpdate(BaseModel):
     url: Optional[HttpUrl] = None
     api_key: Optional[str] = None
     status: Optional[SourceStatus] = None
+    # Explicit nulls remove a limit
+    max_concurrency: Optional[int] = Field(None, ge=1)
+    max_runs_per_minute: Optional[int] = Field(None, ge=1)
 
 
 class WorkflowSourceResponse(WorkflowSourceBase):
@@ -52,6 +57,8 @@ class WorkflowSourceResponse(WorkflowSourceBase):
     id: UUID
     status: str
     version_info: Optional[Dict[str, Any]]
+    max_concurrency: Optional[int] = None
+    max_runs_per_minute: Optional[int] = None
     created_at: datetime
     updated_at: datetime
 
@@ -0,0 +1,224 @@
+"""
+Task history retention.
+
+Finished tasks (with their logs and stored outputs) older than their retention period are
+deleted in small batches, each in its own transaction, so a purge never
+holds long locks or builds one huge transaction. Retention is resolved per
+task: the workflow's ``retention_days`` if set, else the per-status
+retention, else the default retention. Pending and running tasks are never
+purged. When an archive directory is configured, each batch is appended to a
+gzip-compressed JSON Lines file before it is deleted.
+"""
+
+import gzip
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from celery import shared_task
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from ...api.config import (
+    get_task_archive_dir,
+    get_task_retention_batch_size,
+    get_task_retention_by_status,
+    get_task_retention_days,
+)
+from ..database.models import Task, TaskLog, TaskOutput, Worker, Workflow
+from ..database.outputs import unpack_output
+from ..database.session import get_sync_session
+
+logger = logging.getLogger(__name__)
+
+# Only tasks in these statuses are ever purged
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+@dataclass
+class RetentionPolicy:
+    """How long finished tasks are kept."""
+
+    default_days: Optional[int] = None
+    status_days: Dict[str, int] = field(default_factory=dict)
+    batch_size: int = 1000
+    archive_dir: Optional[str] = None
+    # Whether Workflow.retention_days takes precedence over the days above
+    workflow_overrides: bool = True
+
+    @classmethod
+    def from_env(cls) -> "RetentionPolicy":
+        """Build the policy from the AUTOMAGIK_SPARK_TASK_RETENTION_* settings."""
+        return cls(
+            default_days=get_task_retention_days(),
+            status_days=get_task_retention_by_status(),
+            batch_size=get_task_retention_batch_size(),
+            archive_dir=get_task_archive_dir(),
+        )
+
+    def days_for_status(self, status: str) -> Optional[int]:
+        """Get the retention of tasks in a status, or None to keep them."""
+        return self.status_days.get(status, self.default_days)
+
+
+@dataclass
+class PurgeResult:
+    """Outcome of a retention purge."""
+
+    deleted: int = 0
+    logs_deleted: int = 0
+    archive_path: Optional[str] = None
+    dry_run: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "deleted": self.deleted,
+            "logs_deleted": self.logs_deleted,
+            "archive_path": self.archive_path,
+            "dry_run": self.dry_run,
+        }
+
+
+def _expired_conditions(session: Session, policy: RetentionPolicy, now: datetime) -> List[Any]:
+    """Build one predicate per retention rule, each served by an index on (status, created_at)."""
+    conditions = []
+    if not policy.workflow_overrides:
+        for status in FINISHED_STATUSES:
+            days = policy.days_for_status(status)
+            if days is not None:
+                conditions.append(and_(Task.status == status, Task.created_at < now - timedelta(days=days)))
+        return conditions
+
+    overridden = select(Workflow.id).where(Workflow.retention_days.is_not(None))
+    rows = session.execute(select(Workflow.retention_days).where(Workflow.retention_days.is_not(None)).distinct())
+    for (days,) in rows:
+        workflows = select(Workflow.id).where(Workflow.retention_days == days)
+        conditions.append(
+            and_(
+                Task.workflow_id.in_(workflows),
+                Task.status.in_(FINISHED_STATUSES),
+                Task.created_at < now - timedelta(days=days),
+            )
+        )
+
+    for status in FINISHED_STATUSES:
+        days = policy.days_for_status(status)
+        if days is None:
+            continue
+        conditions.append(
+            and_(
+                Task.status == status,
+                Task.created_at < now - timedelta(days=days),
+                Task.workflow_id.not_in(overridden),
+            )
+        )
+    return conditions
+
+
+def _archive_record(task: Task, logs: List[TaskLog], output: Optional[TaskOutput]) -> Dict[str, Any]:
+    record = task.to_dict()
+    # Archive the full response, not the compact extract kept in the row
+    record["raw_output"] = unpack_output(output) if output is not None else None
+    record["logs"] = [
+        {
+            "id": str(log.id),
+            "level": log.level,
+            "message": log.message,
+            "component_id": log.component_id,
+            "created_at": log.created_at.isoformat() if log.created_at else None,
+        }
+        for log in logs
+    ]
+    return record
+
+
+def _batches(session: Session, condition, batch_size: int) -> Iterator[List[Any]]:
+    """Yield IDs of expired tasks, one batch at a time, until none are left."""
+    while True:
+        ids = session.execute(select(Task.id).where(condition).limit(batch_size)).scalars().all()
+        if not ids:
+            return
+        yield ids
+
+
+def purge_task_history(
+    policy: Optional[RetentionPolicy] = None,
+    dry_run: bool = False,
+    now: Optional[datetime] = None,
+) -> PurgeResult:
+    """Delete (and optionally archive) finished tasks past their retention.
+
+    Args:
+        policy: Retention policy (default: from the environment)
+        dry_run: Only count the tasks that would be purged
+        now: Reference time (default: now)
+
+    Returns:
+        PurgeResult: Number of purged tasks and logs, and the archive written
+    """
+    policy = policy or RetentionPolicy.from_env()
+    now = now or datetime.now(timezone.utc)
+    result = PurgeResult(dry_run=dry_run)
+
+    archive = None
+    try:
+        with get_sync_session() as session:
+            conditions = _expired_conditions(session, policy, now)
+            if not conditions:
+                logger.debug("No task retention configured")
+                return result
+            condition = or_(*conditions) if len(conditions) > 1 else conditions[0]
+
+            if dry_run:
+                result.deleted = session.execute(select(func.count(Task.id)).where(condition)).scalar() or 0
+                return result
+
+            for ids in _batches(session, condition, max(policy.batch_size, 1)):
+                if policy.archive_dir:
+                    if archive is None:
+                        os.makedirs(policy.archive_dir, exist_ok=True)
+                        result.archive_path = os.path.join(
+                            policy.archive_dir, f"tasks-{now.strftime('%Y%m%dT%H%M%S')}.jsonl.gz"
+                        )
+                        archive = gzip.open(result.archive_path, "at", encoding="utf-8")
+
+                    tasks = session.execute(select(Task).where(Task.id.in_(ids))).scalars().all()
+                    logs: Dict[Any, List[TaskLog]] = {}
+                    for log in session.execute(select(TaskLog).where(TaskLog.task_id.in_(ids))).scalars():
+                        logs.setdefault(log.task_id, []).append(log)
+                    outputs = {
+                        output.task_id: output
+                        for output in session.execute(select(TaskOutput).where(TaskOutput.task_id.in_(ids))).scalars()
+                    }
+                    for task in tasks:
+                        record = _archive_record(task, logs.get(task.id, []), outputs.get(task.id))
+                        archive.write(json.dumps(record, default=str) + "\n")
+                    # Records must be on disk before their rows are gone
+                    archive.flush()
+
+                session.execute(update(Worker).where(Worker.current_task_id.in_(ids)).values(current_task_id=None))
+                result.logs_deleted += session.execute(delete(TaskLog).where(TaskLog.task_id.in_(ids))).rowcount
+                session.execute(delete(TaskOutput).where(TaskOutput.task_id.in_(ids)))
+                result.deleted += session.execute(delete(Task).where(Task.id.in_(ids))).rowcount
+                session.commit()
+                # Drop the archived objects so memory stays flat across batches
+                session.expunge_all()
+    finally:
+        if archive is not None:
+            archive.close()
+
+    if result.deleted:
+        logger.info(
+            f"Purged {result.deleted} task(s) and {result.logs_deleted} log(s)"
+            + (f", archived to {result.archive_path}" if result.archive_path else "")
+        )
+    return result
+
+
+@shared_task(name="automagik_spark.core.tasks.retention.purge_task_history")
+def purge_task_history_task():
+    """Periodic retention purge, scheduled by the beat."""
+    return purge_task_history().to_dict()
@@ -3,20 +3,123 @@
 import json
 import logging
 from datetime import datetime, timezone
-from typing import Optional
+from functools import partial
+from typing import List, Optional
 from uuid import UUID, uuid4
 
-from celery import shared_task
+from celery import group, shared_task
 from celery.exceptions import MaxRetriesExceededError
-from sqlalchemy import select
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import joinedload
 
+from ...core.celery.routing import routes_for_tasks
+from ...core.celery.task_events import publish_task_event
 from ...core.database.session import get_sync_session
 from ...core.database.models import Task, Workflow, Schedule
+from ...core.database.outputs import store_task_output
+from ...core.scheduler.compiled import compile_schedule
 from ...core.workflows.sync import WorkflowSyncSync
+from ...core.workflows.http_pool import sync_client
+from ...core.workflows.limiter import RunLimitError
+from ...api.config import get_callback_timeout
 
 logger = logging.getLogger(__name__)
 
 
+def _schedule_input(schedule: Schedule) -> str:
+    """Get the input value a schedule passes to its workflow."""
+    input_data = ""
+    # Try input_value first (current field), then fallback to deprecated fields
+    if hasattr(schedule, "input_value") and schedule.input_value:
+        input_data = schedule.input_value
+    elif schedule.params and isinstance(schedule.params, dict):
+        input_data = schedule.params.get("value", "")
+    elif hasattr(schedule, "input_data") and schedule.input_data:
+        input_data = schedule.input_data  # Fallback to old field
+
+    # Ensure input_data is always a string
+    if not input_data:
+        input_data = "Hello World"  # Default value if nothing provided
+    return input_data
+
+
+def _run_task(session, task: Task, stream: bool = False) -> Task:
+    """Run the workflow of a task that is already marked running and record the result.
+
+    Status changes are published as task events; with ``stream`` the
+    workflow also runs against the source's streaming endpoint and its tokens
+    are published as they arrive.
+    """
+    publish_task_event(task.id, "status", {"status": "running"})
+    try:
+        task = _run_workflow(session, task, partial(publish_task_event, task.id) if stream else None)
+    except RunLimitError:
+        # The workflow or source is at its run limits: hand the task back untouched so it can be requeued
+        task.status = "pending"
+        task.started_at = None
+        task.updated_at = datetime.now(timezone.utc)
+        session.commit()
+        publish_task_event(task.id, "status", {"status": "pending"})
+        raise
+    finally:
+        if task.status != "pending":
+            publish_task_event(task.id, "done", {"status": task.status, "error": task.error})
+    return task
+
+
+def _run_workflow(session, task: Task, on_event=None) -> Task:
+    try:
+        # Get workflow with its source, so the run needs no further queries
+        workflow_query = (
+            select(Workflow).where(Workflow.id == task.workflow_id).options(joinedload(Workflow.workflow_source))
+        )
+        workflow = session.execute(workflow_query).scalar()
+        if not workflow:
+            logger.error(f"Workflow {task.workflow_id} not found")
+            task.status = "failed"
+            task.error = f"Workflow {task.workflow_id} not found"
+            task.finished_at = datetime.now(timezone.utc)
+            task.updated_at = datetime.now(timezone.utc)
+            session.commit()
+            return task
+
+        # Return the DB connection to the pool while the upstream call runs,
+        # so concurrent runs of threads/gevent workers do not each hold one
+        session.commit()
+
+        # Run workflow
+        with WorkflowSyncSync(session) as sync:
+            output = sync.execute_workflow(workflow, task.input_data, on_event=on_event)
+            if output:
+                # Extract and log only the result message
+                result_message = output.get("result", "")
+                if isinstance(result_message, dict):
+                    result_message = result_message.get("response", str(result_message))
+                logger.info(f"Workflow result: {result_message}")
+
+                # Store the full output in the task (large outputs go to task_outputs)
+                store_task_output(session, task, json.dumps(output))
+                task.status = "completed"
+            else:
+                task.status = "failed"
+                task.error = "No output from workflow"
+            task.finished_at = datetime.now(timezone.utc)
+            task.updated_at = datetime.now(timezone.utc)
+            session.commit()
+            return task
+
+    except RunLimitError:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to execute workflow: {str(e)}")
+        task.status = "failed"
+        task.error = str(e)
+        task.finished_at = datetime.now(timezone.utc)
+        task.updated_at = datetime.now(timezone.utc)
+        session.commit()
+        return task
+
+
 def _execute_workflow_sync(schedule_id: str) -> Optional[Task]:
     """Execute a workflow synchronously."""
     try:
@@ -39,24 +142,11 @@ def _execute_workflow_sync(schedule_id: str) -> Optional[Task]:
                 logger.info(f"Marked one-time schedule {schedule_id} as completed before execution")
 
             # Create task with input data as string
-            input_data = ""
-            # Try input_value first (current field), then fallback to deprecated fields
-            if hasattr(schedule, "input_value") and schedule.input_value:
-                input_data = schedule.input_value
-            elif schedule.params and isinstance(schedule.params, dict):
-                input_data = schedule.params.get("value", "")
-            elif hasattr(schedule, "input_data") and schedule.input_data:
-                input_data = schedule.input_data  # Fallback to old field
-
-            # Ensure input_data is always a string
-            if not input_data:
-                input_data = "Hello World"  # Default value if nothing provided
-
             task = Task(
                 id=uuid4(),
                 workflow_id=schedule.workflow_id,
                 schedule_id=schedule.id,
-                input_data=input_data,
+                input_data=_schedule_input(schedule),
                 status="running",
                 started_at=datetime.now(timezone.utc),
                 created_at=datetime.now(timezone.utc),
@@ -66,54 +156,108 @@ def _execute_workflow_sync(schedule_id: str) -> Optional[Task]:
             session.commit()
 
             # Task is already created and schedule is marked as completed for one-time schedules
-
             try:
-                # Get workflow
-                workflow_query = select(Workflow).where(Workflow.id == schedule.workflow_id)
-                workflow = session.execute(workflow_query).scalar()
-                if not workflow:
-                    logger.error(f"Workflow {schedule.workflow_id} not found")
-                    task.status = "failed"
-                    task.error = f"Workflow {schedule.workflow_id} not found"
-                    task.finished_at = datetime.now(timezone.utc)
-                    task.updated_at = datetime.now(timezone.utc)
-                    session.commit()
-                    return task
-
-                # Run workflow
-                with WorkflowSyncSync(session) as sync:
-                    output = sync.execute_workflow(workflow, task.input_data)
-                    if output:
-                        # Extract and log only the result message
-                        result_message = output.get("result", "")
-                        if isinstance(result_message, dict):
-                            result_message = result_message.get("response", str(result_message))
-                        logger.info(f"Workflow result: {result_message}")
-
-                        # Store the full output in the task
-                        task.output_data = json.dumps(output)
-                        task.status = "completed"
-                    else:
-                        task.status = "failed"
-                        task.error = "No output from workflow"
-                    task.finished_at = datetime.now(timezone.utc)
-                    task.updated_at = datetime.now(timezone.utc)
-                    session.commit()
-                    return task
-
-            except Exception as e:
-                logger.error(f"Failed to execute workflow: {str(e)}")
-                task.status = "failed"
-                task.error = str(e)
-                task.finished_at = datetime.now(timezone.utc)
-                task.updated_at = datetime.now(timezone.utc)
-                session.commit()
+                return _run_task(session, task)
+            except RunLimitError as e:
+                # Run the created task once the source has room rather than claiming the schedule again
+                route = routes_for_tasks(session, [str(task.id)])[str(task.id)]
+                execute_task.apply_async(
+                    (str(task.id),), countdown=e.retry_after, queue=route.queue, priority=route.priority
+                )
                 return task
     except Exception as e:
         logger.error(f"Task execution failed: {str(e)}")
         raise e
 
 
+def _claim_schedules_sync(schedule_ids: List[str]) -> List[str]:
+    """Claim a batch of due schedules and create their tasks in one transaction.
+
+    Schedules locked by another dispatcher are skipped rather than waited on,
+    one-time schedules are completed and the next run of the others is
+    recorded, all without per-schedule round-trips.
+
+    Returns:
+        IDs of the created (pending) tasks
+    """
+    ids = []
+    for schedule_id in schedule_ids:
+        try:
+            ids.append(UUID(str(schedule_id)))
+        except ValueError:
+            logger.error(f"Invalid schedule ID: {schedule_id}")
+    if not ids:
+        return []
+
+    now = datetime.now(timezone.utc)
+    with get_sync_session() as session:
+        schedule_query = (
+            select(Schedule)
+            .where(Schedule.id.in_(ids), Schedule.status == "active")
+            .with_for_update(skip_locked=True)
+        )
+        schedules = session.execute(schedule_query).scalars().all()
+        if not schedules:
+            return []
+
+        task_rows = []
+        schedule_updates = []
+        for schedule in schedules:
+            task_rows.append(
+                {
+                    "id": uuid4(),
+                    "workflow_id": schedule.workflow_id,
+                    "schedule_id": schedule.id,
+                    "input_data": _schedule_input(schedule),
+                    "status": "pending",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+
+            if schedule.schedule_type == "one-time":
+                schedule_updates.append({"id": schedule.id, "status": "completed", "updated_at": now})
+            else:
+                # Keep updated_at so the beat does not see this write as a schedule change
+                try:
+                    next_run = compile_schedule(schedule.schedule_type, schedule.schedule_expr).next_run(now)
+                except ValueError:
+                    next_run = None
+                schedule_updates.append(
+                    {"id": schedule.id, "next_run_at": next_run, "updated_at": schedule.updated_at}
+                )
+
+        session.execute(insert(Task), task_rows)
+        session.execute(update(Schedule), schedule_updates)
+        session.commit()
+
+    logger.info(f"Claimed {len(task_rows)} of {len(ids)} due schedule(s)")
+    return [str(row["id"]) for row in task_rows]
+
+
+def _execute_task_sync(task_id: str, allow_failed: bool = False, stream: bool = False) -> Optional[Task]:
+    """Run a task created by the batch dispatcher or queued through the API."""
+    with get_sync_session() as session:
+        task = session.execute(select(Task).where(Task.id == UUID(task_id)).with_for_update()).scalar()
+        if not task:
+            logger.info(f"Task {task_id} not found")
+            return None
+
+        allowed = ("pending", "failed") if allow_failed else ("pending",)
+        if task.status not in allowed:
+            logger.info(f"Task {task_id} is already {task.status}")
+            return None
+
+        if task.status == "failed":
+            task.tries = (task.tries or 0) + 1
+        task.status = "running"
+        task.started_at = datetime.now(timezone.utc)
+        task.updated_at = datetime.now(timezone.utc)
+        session.commit()
+
+        return _run_task(session, task, stream=stream)
+
+
 @shared_task(bind=True, max_retries=3)
 def execute_workflow(self, schedule_id: str):
     """Execute a workflow from a schedule."""
@@ -139,6 +283,82 @@ def execute_workflow(self, schedule_id: str):
             raise e
 
 
+@shared_task
+def dispatch_schedules(schedule_ids: List[str]):
+    """Claim a batch of due schedules and enqueue their tasks as one group, each on its routed queue."""
+    task_ids = _claim_schedules_sync(schedule_ids)
+    if task_ids:
+        with get_sync_session() as session:
+            routes = routes_for_tasks(session, task_ids)
+        group(
+            execute_task.s(task_id).set(queue=routes[task_id].queue, priority=routes[task_id].priority)
+            for task_id in task_ids
+        ).apply_async()
+    return task_ids
+
+
+def _send_callback(callback_url: str, task_id: str) -> bool:
+    """POST the finished task to the callback URL given when it was enqueued.
+
+    Delivery is best effort; clients can always fall back to polling the task.
+    """
+    with get_sync_session() as session:
+        task = session.get(Task, UUID(task_id))
+        if not task:
+            return False
+        payload = task.to_dict()
+
+    try:
+        with sync_client(timeout=get_callback_timeout()) as client:
+            response = client.post(callback_url, json=payload)
+            response.raise_for_status()
+        return True
+    except Exception as e:
+        logger.warning(f"Callback for task {task_id} to {callback_url} failed: {str(e)}")
+        return False
+
+
+@shared_task(bind=True, max_retries=3)
+def execute_task(self, task_id: str, callback_url: Optional[str] = None, stream: bool = False):
+    """Execute a pending task (batch-dispatched schedules and async API runs)."""
+    try:
+        task = _execute_task_sync(task_id, allow_failed=self.request.retries > 0, stream=stream)
+        if task and task.status == "failed":
+            # Retry the task if it failed
+            raise Exception(task.error)
+        if task and callback_url:
+            _send_callback(callback_url, task_id)
+        return task.to_dict() if task else None
+    except RunLimitError as e:
+        # Waiting for run limits is not a failed attempt: requeue without using a retry
+        logger.info(f"Task {task_id} requeued: {str(e)}")
+        execute_task.apply_async(
+            (task_id,),
+            {"callback_url": callback_url, "stream": stream},
+            countdown=e.retry_after,
+            queue=(self.request.delivery_info or {}).get("routing_key"),
+            priority=(self.request.delivery_info or {}).get("priority"),
+        )
+        return None
+    except Exception as e:
+        logger.error(f"Failed to execute task {task_id}: {str(e)}")
+        # Only retry on network errors or timeouts, not on server errors
+        error_str = str(e).lower()
+        if "connection" in error_str or "timeout" in error_str:
+            retry_in = 2**self.request.retries
+            try:
+                raise self.retry(exc=e, countdown=retry_in, max_retries=3)
+            except MaxRetriesExceededError:
+                logger.error(f"Max retries exceeded for task. Error: {str(e)}")
+                if callback_url:
+                    _send_callback(callback_url, task_id)
+                raise e
+        else:
+            if callback_url:
+                _send_callback(callback_url, task_id)
+            raise e
+
+
 @shared_task
 def schedule_workflow(workflow_id: str, workflow_params: Optional[str] = None):
     """Create a task for a scheduled workflow."""
@@ -196,7 +416,7 @@ def process_pending_tasks():
                 with WorkflowSyncSync(session) as sync:
                     output = sync.execute_workflow(workflow, task.input_data)
                     if output:
-                        task.output_data = json.dumps(output)
+                        store_task_output(session, task, json.dumps(output))
                         task.status = "completed"
                     else:
                         task.status = "failed"
@@ -205,6 +425,13 @@ def process_pending_tasks():
                     task.updated_at = datetime.now(timezone.utc)
                     session.commit()
 
+            except RunLimitError as e:
+                # Leave the task pending for a later pass rather than failing it
+                logger.info(f"Task {task.id} left pending: {str(e)}")
+                task.status = "pending"
+                task.started_at = None
+                task.updated_at = datetime.now(timezone.utc)
+                session.commit()
             except Exception as e:
                 logger.error(f"Failed to execute workflow: {str(e)}")
                 task.status = "failed"
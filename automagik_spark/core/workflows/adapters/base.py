@@ -1,9 +1,36 @@
 """Base workflow adapter interface."""
 
+import asyncio
+import functools
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any, TypeVar
 from dataclasses import dataclass, field
 
+from ....api.config import get_adapter_threads
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_adapter_executor() -> ThreadPoolExecutor:
+    """Get the bounded thread pool that runs blocking adapter calls off the event loop."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=get_adapter_threads(), thread_name_prefix="adapter")
+    return _executor
+
+
+async def run_blocking(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking adapter call in the adapter thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_adapter_executor(), functools.partial(func, *args, **kwargs))
+
 
 @dataclass
 class WorkflowExecutionResult:
@@ -73,6 +100,76 @@ class BaseWorkflowAdapter(ABC):
         """
         pass
 
+    async def list_flows(self) -> List[Dict[str, Any]]:
+        """List available flows from this source without blocking the event loop.
+
+        Adapters with a native async client override this; the default runs
+        ``list_flows_sync`` in the bounded adapter thread pool.
+
+        Returns:
+            List of flow dictionaries
+        """
+        return await run_blocking(self.list_flows_sync)
+
+    async def get_flow(self, flow_id: str) -> Optional[Dict[str, Any]]:
+        """Get a specific flow by ID without blocking the event loop.
+
+        Args:
+            flow_id: ID of the flow to retrieve
+
+        Returns:
+            Flow dictionary if found, None otherwise
+        """
+        return await run_blocking(self.get_flow_sync, flow_id)
+
+    async def run_flow(
+        self, flow_id: str, input_data: Any, session_id: Optional[str] = None
+    ) -> WorkflowExecutionResult:
+        """Execute a flow without blocking the event loop.
+
+        Args:
+            flow_id: ID of the flow to execute
+            input_data: Input data for the flow
+            session_id: Optional session ID for tracking
+
+        Returns:
+            WorkflowExecutionResult with normalized response
+        """
+        return await run_blocking(self.run_flow_sync, flow_id, input_data, session_id)
+
+    def run_workflow_sync(
+        self, workflow: Any, input_data: Any, session_id: Optional[str] = None
+    ) -> WorkflowExecutionResult:
+        """Execute a synced workflow using the metadata stored with it (synchronous).
+
+        Override this in subclasses that need more than the remote flow ID to
+        reach the run endpoint, so runs skip the lookup ``run_flow_sync`` does.
+
+        Args:
+            workflow: Workflow row holding the synced flow metadata
+            input_data: Input data for the flow
+            session_id: Optional session ID for tracking
+
+        Returns:
+            WorkflowExecutionResult with normalized response
+        """
+        return self.run_flow_sync(workflow.remote_flow_id, input_data, session_id)
+
+    async def run_workflow(
+        self, workflow: Any, input_data: Any, session_id: Optional[str] = None
+    ) -> WorkflowExecutionResult:
+        """Execute a synced workflow using the metadata stored with it without blocking the event loop.
+
+        Args:
+            workflow: Workflow row holding the synced flow metadata
+            input_data: Input data for the flow
+            session_id: Optional session ID for tracking
+
+        Returns:
+            WorkflowExecutionResult with normalized response
+        """
+        return await self.run_flow(workflow.remote_flow_id, input_data, session_id)
+
     @abstractmethod
     async def validate(self) -> Dict[str, Any]:
         """Validate connection to the source.
@@ -115,3 +212,11 @@ class BaseWorkflowAdapter(ABC):
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Exit sync context manager."""
         pass
+
+    async def __aenter__(self):
+        """Enter async context manager."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Exit async context manager."""
+        pass
@@ -3,6 +3,7 @@
 from typing import Dict, List, Optional, Any
 import logging
 from .base import BaseWorkflowAdapter, WorkflowExecutionResult
+from ..limiter import is_overload_error
 from ..automagik_hive import AutomagikHiveManager
 
 logger = logging.getLogger(__name__)
@@ -54,43 +55,138 @@ class HiveAdapter(BaseWorkflowAdapter):
             logger.error(f"Failed to get Hive flow {flow_id}: {str(e)}")
             raise
 
-    def run_flow_sync(self, flow_id: str, input_data: Any, session_id: Optional[str] = None) -> WorkflowExecutionResult:
+    def _to_execution_result(self, result: Dict[str, Any], session_id: Optional[str]) -> WorkflowExecutionResult:
+        """Convert a Hive run response into a WorkflowExecutionResult."""
+        # Hive returns a dict with various fields
+        # Extract the relevant information
+        return WorkflowExecutionResult(
+            success=result.get("success", True),
+            result=result.get("result"),
+            session_id=result.get("session_id", session_id),
+            run_id=result.get("run_id"),
+            metadata={
+                "agent_id": result.get("agent_id"),
+                "team_id": result.get("team_id"),
+                "workflow_id": result.get("workflow_id"),
+                "status": result.get("status"),
+                "coordinator_response": result.get("coordinator_response"),
+                "member_responses": result.get("member_responses"),
+                "steps_completed": result.get("steps_completed"),
+                "final_output": result.get("final_output"),
+            },
+        )
+
+    def run_flow_sync(
+        self,
+        flow_id: str,
+        input_data: Any,
+        session_id: Optional[str] = None,
+        flow_type: Optional[str] = None,
+    ) -> WorkflowExecutionResult:
         """Execute a Hive flow and return normalized result.
 
         Args:
             flow_id: ID of the flow to execute
             input_data: Input data (string or dict)
             session_id: Optional session ID for tracking
+            flow_type: Entity type when known; otherwise it is looked up in Hive
 
         Returns:
             WorkflowExecutionResult with normalized response
+
+        Raises:
+            Exception: The source is overloaded (429, 5xx or timeout)
         """
         try:
             # Run the flow using Hive manager
-            result = self.manager.run_flow_sync(flow_id, input_data, session_id)
-
-            # Hive returns a dict with various fields
-            # Extract the relevant information
-            return WorkflowExecutionResult(
-                success=result.get("success", True),
-                result=result.get("result"),
-                session_id=result.get("session_id", session_id),
-                run_id=result.get("run_id"),
-                metadata={
-                    "agent_id": result.get("agent_id"),
-                    "team_id": result.get("team_id"),
-                    "workflow_id": result.get("workflow_id"),
-                    "status": result.get("status"),
-                    "coordinator_response": result.get("coordinator_response"),
-                    "member_responses": result.get("member_responses"),
-                    "steps_completed": result.get("steps_completed"),
-                    "final_output": result.get("final_output"),
-                },
-            )
+            result = self.manager.run_flow_sync(flow_id, input_data, session_id, flow_type=flow_type)
+            return self._to_execution_result(result, session_id)
+        except Exception as e:
+            logger.error(f"Failed to execute Hive flow {flow_id}: {str(e)}")
+            if is_overload_error(e):
+                # Let the run limiter see the overload so it can back off
+                raise
+            return WorkflowExecutionResult(success=False, result=None, error=str(e))
+
+    async def list_flows(self) -> List[Dict[str, Any]]:
+        """List all flows from Hive (async).
+
+        Returns:
+            List of flow dictionaries
+        """
+        try:
+            return await self.manager.list_flows()
+        except Exception as e:
+            logger.error(f"Failed to list Hive flows: {str(e)}")
+            raise
+
+    async def get_flow(self, flow_id: str) -> Optional[Dict[str, Any]]:
+        """Get a specific flow from Hive by ID (async).
+
+        Args:
+            flow_id: ID of the flow to retrieve
+
+        Returns:
+            Flow dictionary if found, None otherwise
+        """
+        try:
+            return await self.manager.get_flow(flow_id)
+        except Exception as e:
+            logger.error(f"Failed to get Hive flow {flow_id}: {str(e)}")
+            raise
+
+    async def run_flow(
+        self,
+        flow_id: str,
+        input_data: Any,
+        session_id: Optional[str] = None,
+        flow_type: Optional[str] = None,
+    ) -> WorkflowExecutionResult:
+        """Execute a Hive flow and return normalized result (async).
+
+        Args:
+            flow_id: ID of the flow to execute
+            input_data: Input data (string or dict)
+            session_id: Optional session ID for tracking
+            flow_type: Entity type when known; otherwise it is looked up in Hive
+
+        Returns:
+            WorkflowExecutionResult with normalized response
+
+        Raises:
+            Exception: The source is overloaded (429, 5xx or timeout)
+        """
+        try:
+            result = await self.manager.run_flow(flow_id, input_data, session_id, flow_type=flow_type)
+            return self._to_execution_result(result, session_id)
         except Exception as e:
             logger.error(f"Failed to execute Hive flow {flow_id}: {str(e)}")
+            if is_overload_error(e):
+                # Let the run limiter see the overload so it can back off
+                raise
             return WorkflowExecutionResult(success=False, result=None, error=str(e))
 
+    @staticmethod
+    def _synced_flow_type(workflow: Any) -> Optional[str]:
+        """Get the entity type recorded when the workflow was synced."""
+        return (workflow.data or {}).get("type")
+
+    def run_workflow_sync(
+        self, workflow: Any, input_data: Any, session_id: Optional[str] = None
+    ) -> WorkflowExecutionResult:
+        """Execute a synced Hive workflow straight from its stored entity type."""
+        return self.run_flow_sync(
+            workflow.remote_flow_id, input_data, session_id, flow_type=self._synced_flow_type(workflow)
+        )
+
+    async def run_workflow(
+        self, workflow: Any, input_data: Any, session_id: Optional[str] = None
+    ) -> WorkflowExecutionResult:
+        """Execute a synced Hive workflow straight from its stored entity type (async)."""
+        return await self.run_flow(
+            workflow.remote_flow_id, input_data, session_id, flow_type=self._synced_flow_type(workflow)
+        )
+
     async def validate(self) -> Dict[str, Any]:
         """Validate connection to Hive.
 
@@ -103,6 +199,15 @@ class HiveAdapter(BaseWorkflowAdapter):
             logger.error(f"Hive validation failed: {str(e)}")
             raise
 
+    async def __aenter__(self):
+        """Enter async context, sharing one HTTP client across calls."""
+        await self.manager.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Exit async context."""
+        await self.manager.__aexit__(exc_type, exc_val, exc_tb)
+
     def get_default_sync_params(self, flow_data: Dict[str, Any]) -> Dict[str, Optional[str]]:
         """Get default sync parameters for Hive flows.
 
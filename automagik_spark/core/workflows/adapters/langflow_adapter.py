@@ -3,6 +3,7 @@
 from typing import Dict, List, Optional, Any
 import logging
 from .base import BaseWorkflowAdapter, WorkflowExecutionResult
+from ..limiter import is_overload_error
 from ..remote import LangFlowManager
 
 logger = logging.getLogger(__name__)
@@ -64,6 +65,9 @@ class LangFlowAdapter(BaseWorkflowAdapter):
 
         Returns:
             WorkflowExecutionResult with normalized response
+
+        Raises:
+            Exception: The source is overloaded (429, 5xx or timeout)
         """
         try:
             # Run the flow using LangFlow manager
@@ -73,6 +77,63 @@ class LangFlowAdapter(BaseWorkflowAdapter):
             return WorkflowExecutionResult(success=True, result=result, session_id=session_id, metadata={})
         except Exception as e:
             logger.error(f"Failed to execute LangFlow flow {flow_id}: {str(e)}")
+            if is_overload_error(e):
+                # Let the run limiter see the overload so it can back off
+                raise
+            return WorkflowExecutionResult(success=False, result=None, error=str(e))
+
+    async def list_flows(self) -> List[Dict[str, Any]]:
+        """List all flows from LangFlow (async).
+
+        Returns:
+            List of flow dictionaries
+        """
+        try:
+            return await self.manager.list_flows()
+        except Exception as e:
+            logger.error(f"Failed to list LangFlow flows: {str(e)}")
+            raise
+
+    async def get_flow(self, flow_id: str) -> Optional[Dict[str, Any]]:
+        """Get a specific flow from LangFlow by ID (async).
+
+        Args:
+            flow_id: ID of the flow to retrieve
+
+        Returns:
+            Flow dictionary if found, None otherwise
+        """
+        try:
+            return await self.manager.get_flow(flow_id)
+        except Exception as e:
+            logger.error(f"Failed to get LangFlow flow {flow_id}: {str(e)}")
+            raise
+
+    async def run_flow(
+        self, flow_id: str, input_data: Any, session_id: Optional[str] = None
+    ) -> WorkflowExecutionResult:
+        """Execute a LangFlow flow and return normalized result (async).
+
+        Args:
+            flow_id: ID of the flow to execute
+            input_data: Input data (string or dict)
+            session_id: Optional session ID for tracking
+
+        Returns:
+            WorkflowExecutionResult with normalized response
+
+        Raises:
+            Exception: The source is overloaded (429, 5xx or timeout)
+        """
+        try:
+            result = await self.manager.run_workflow(flow_id, input_data)
+
+            return WorkflowExecutionResult(success=True, result=result, session_id=session_id, metadata={})
+        except Exception as e:
+            logger.error(f"Failed to execute LangFlow flow {flow_id}: {str(e)}")
+            if is_overload_error(e):
+                # Let the run limiter see the overload so it can back off
+                raise
             return WorkflowExecutionResult(success=False, result=None, error=str(e))
 
     async def validate(self) -> Dict[str, Any]:
@@ -6,6 +6,7 @@ from fastapi import HTTPException
 import logging
 from uuid import UUID
 from ...api.config import get_http_timeout
+from .http_pool import sync_client
 
 logger = logging.getLogger(__name__)
 
@@ -289,7 +290,7 @@ class AutoMagikAgentManager:
             logger.info(f"Processed input_data: {repr(input_data)}")
 
             # Create a synchronous client
-            with httpx.Client(
+            with sync_client(
                 base_url=self.api_url,
                 headers={"accept": "application/json", "x-api-key": self.api_key},
                 verify=False,  # TODO: Make this configurable
@@ -360,7 +361,7 @@ class AutoMagikAgentManager:
         """
         try:
             # Create a synchronous client
-            with httpx.Client(
+            with sync_client(
                 base_url=self.api_url,
                 headers={"accept": "application/json", "x-api-key": self.api_key},
                 verify=False,  # TODO: Make this configurable
@@ -6,9 +6,20 @@ from fastapi import HTTPException
 import logging
 from uuid import UUID
 from ...api.config import get_http_timeout
+from .catalog import conditional_get
+from .endpoints import forget_resolved, resolve, resolve_async
+from .http_pool import sync_client
+from .streaming import EventCallback, iter_stream_events
 
 logger = logging.getLogger(__name__)
 
+# Endpoint and extra form fields of each entity type's runs
+_RUN_PATHS = {
+    "hive_agent": ("/agents/{id}/runs", {}),
+    "hive_team": ("/teams/{id}/runs", {"mode": "coordinate"}),
+    "hive_workflow": ("/workflows/{id}/runs", {}),
+}
+
 
 class AutomagikHiveManager:
     """Manager for AutoMagik Hive source type.
@@ -324,24 +335,41 @@ class AutomagikHiveManager:
                 return None
             raise
 
-    async def run_flow(self, flow_id: str, input_data, session_id: Optional[str] = None) -> Dict[str, Any]:
+    async def _resolve_flow_type(self, flow_id: str) -> str:
+        """Look up the entity type of a flow, reusing a recent lookup."""
+
+        async def lookup():
+            flow = await self.get_flow(flow_id)
+            return flow["data"].get("type", "unknown") if flow else None
+
+        flow_type = await resolve_async(self.api_url, flow_id, lookup)
+        if flow_type is None:
+            raise ValueError(f"Flow {flow_id} not found in AutoMagik Hive")
+        return flow_type
+
+    async def run_flow(
+        self,
+        flow_id: str,
+        input_data,
+        session_id: Optional[str] = None,
+        flow_type: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Run a flow (agent, team, or workflow) with input data.
 
         Args:
             flow_id: ID of the flow to run
             input_data: Input data for the flow
             session_id: Optional session ID for conversation continuity
+            flow_type: Entity type (hive_agent, hive_team or hive_workflow) when already
+                known, e.g. from the synced workflow; otherwise it is looked up in Hive
 
         Returns:
             Dict[str, Any]: Flow execution result
         """
         try:
-            # First, determine what type of entity this is
-            flow = await self.get_flow(flow_id)
-            if not flow:
-                raise ValueError(f"Flow {flow_id} not found in AutoMagik Hive")
-
-            flow_type = flow["data"].get("type", "unknown")
+            # Determine what type of entity this is unless the caller knows
+            if not flow_type:
+                flow_type = await self._resolve_flow_type(flow_id)
 
             # Generate session ID if not provided
             if not session_id and self.source_id:
@@ -375,6 +403,8 @@ class AutomagikHiveManager:
 
         except Exception as e:
             logger.error(f"Failed to run flow {flow_id}: {str(e)}")
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 404:
+                forget_resolved(self.api_url, flow_id)
             raise
 
     async def _run_agent(
@@ -504,7 +534,7 @@ class AutomagikHiveManager:
     def list_flows_sync(self) -> List[Dict[str, Any]]:
         """Synchronous version of list_flows."""
         try:
-            with httpx.Client(
+            with sync_client(
                 base_url=self.api_url,
                 headers={
                     "accept": "application/json",
@@ -513,24 +543,18 @@ class AutomagikHiveManager:
                 verify=False,
                 timeout=get_http_timeout(),
             ) as client:
-                # Get agents
-                agents_response = client.get("/agents")
-                agents_response.raise_for_status()
-                agents = agents_response.json()
+                # Get agents (revalidated with ETag/Last-Modified when Hive sends them)
+                agents = conditional_get(client, "/agents")
 
                 # Get teams
                 try:
-                    teams_response = client.get("/teams")
-                    teams_response.raise_for_status()
-                    teams = teams_response.json()
+                    teams = conditional_get(client, "/teams")
                 except:
                     teams = []
 
                 # Get workflows
                 try:
-                    workflows_response = client.get("/workflows")
-                    workflows_response.raise_for_status()
-                    workflows = workflows_response.json()
+                    workflows = conditional_get(client, "/workflows")
                 except:
                     workflows = []
 
@@ -646,19 +670,39 @@ class AutomagikHiveManager:
                 return None
             raise
 
-    def run_flow_sync(self, flow_id: str, input_data, session_id: Optional[str] = None) -> Dict[str, Any]:
-        """Synchronous version of run_flow."""
+    def _resolve_flow_type_sync(self, flow_id: str) -> str:
+        """Synchronous version of _resolve_flow_type."""
+
+        def lookup():
+            flow = self.get_flow_sync(flow_id)
+            return flow["data"].get("type", "unknown") if flow else None
+
+        flow_type = resolve(self.api_url, flow_id, lookup)
+        if flow_type is None:
+            raise ValueError(f"Flow {flow_id} not found in AutoMagik Hive")
+        return flow_type
+
+    def run_flow_sync(
+        self,
+        flow_id: str,
+        input_data,
+        session_id: Optional[str] = None,
+        on_event: Optional[EventCallback] = None,
+        flow_type: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Synchronous version of run_flow.
+
+        When ``on_event`` is given the run is streamed from Hive and content
+        chunks are relayed to it as ``token`` events while the run progresses.
+        """
         try:
             logger.info(
                 f"AutoMagik Hive run_flow_sync called with flow_id={flow_id}, input_data={repr(input_data)}, session_id={session_id}"
             )
 
-            # First, determine what type of entity this is
-            flow = self.get_flow_sync(flow_id)
-            if not flow:
-                raise ValueError(f"Flow {flow_id} not found in AutoMagik Hive")
-
-            flow_type = flow["data"].get("type", "unknown")
+            # Determine what type of entity this is unless the caller knows
+            if not flow_type:
+                flow_type = self._resolve_flow_type_sync(flow_id)
             logger.info(f"Flow type: {flow_type}")
 
             # Generate session ID if not provided
@@ -677,7 +721,7 @@ class AutomagikHiveManager:
 
             logger.info(f"Processed message: {repr(message)}")
 
-            with httpx.Client(
+            with sync_client(
                 base_url=self.api_url,
                 headers={
                     "accept": "application/json",
@@ -686,6 +730,8 @@ class AutomagikHiveManager:
                 verify=False,
                 timeout=get_http_timeout(),
             ) as client:
+                if on_event is not None and flow_type in _RUN_PATHS:
+                    return self._stream_run_sync(client, flow_type, flow_id, message, session_id, on_event)
                 if flow_type == "hive_agent":
                     return self._run_agent_sync(client, flow_id, message, session_id)
                 elif flow_type == "hive_team":
@@ -697,6 +743,8 @@ class AutomagikHiveManager:
 
         except Exception as e:
             logger.error(f"Failed to run flow {flow_id}: {str(e)}")
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 404:
+                forget_resolved(self.api_url, flow_id)
             raise
 
     def _run_agent_sync(
@@ -821,3 +869,60 @@ class AutomagikHiveManager:
             "status": result.get("status", "completed"),
             "success": result.get("status") in ["COMPLETED", "completed"],
         }
+
+    def _stream_run_sync(
+        self,
+        client: httpx.Client,
+        flow_type: str,
+        flow_id: str,
+        message: str,
+        session_id: Optional[str],
+        on_event: EventCallback,
+    ) -> Dict[str, Any]:
+        """Run an agent, team or workflow with streaming, relaying content chunks as they arrive."""
+        path, extra = _RUN_PATHS[flow_type]
+        payload = {"message": message, "stream": True, **extra}
+        if session_id:
+            payload["session_id"] = session_id
+
+        logger.info(f"Streaming {flow_type} {flow_id} run")
+
+        chunks: List[str] = []
+        final: Dict[str, Any] = {}
+        ids: Dict[str, Any] = {}
+        with client.stream("POST", path.format(id=flow_id), data=payload) as response:
+            if response.is_error:
+                response.read()
+            response.raise_for_status()
+            for event, data in iter_stream_events(response.iter_lines()):
+                if not isinstance(data, dict):
+                    continue
+                for key in ("session_id", "run_id", "agent_id", "team_id", "workflow_id"):
+                    if data.get(key):
+                        ids[key] = data[key]
+
+                content = data.get("content")
+                if event.endswith("Error"):
+                    raise ValueError(f"Hive run failed: {content or data.get('error') or event}")
+                if event.endswith("Completed") and event.startswith(("Run", "TeamRun", "Workflow")):
+                    final = data
+                elif event.endswith(("RunContent", "RunResponseContent")) or event == "RunResponse":
+                    if isinstance(content, str) and content:
+                        chunks.append(content)
+                        on_event("token", {"chunk": content})
+                else:
+                    on_event("event", {"type": event})
+
+        content = final.get("content")
+        result = content if isinstance(content, str) and content else "".join(chunks)
+        return {
+            "result": result,
+            "session_id": ids.get("session_id", session_id),
+            "run_id": ids.get("run_id"),
+            "agent_id": ids.get("agent_id"),
+            "team_id": ids.get("team_id"),
+            "workflow_id": ids.get("workflow_id"),
+            "metadata": final.get("metrics", {}),
+            "status": "completed",
+            "success": True,
+        }
@@ -0,0 +1,269 @@
+"""
+Remote flow catalog cache.
+
+Keeps the flows listed by each workflow source for a short TTL so the remote
+flow picker does not hit every LangFlow/Hive instance on each page load. Past
+the TTL, the stale catalog is still served while a single background refresh
+runs. An optional Redis tier shares catalogs between API processes, and
+``conditional_get`` lets source managers revalidate with ETag/Last-Modified
+instead of downloading unchanged listings.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from ...api.config import get_catalog_redis_url, get_catalog_stale_ttl, get_catalog_ttl
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "automagik_spark:catalog"
+
+# Maximum number of responses kept for conditional requests
+MAX_VALIDATED_RESPONSES = 256
+
+_validated: "OrderedDict[Tuple, Tuple[Dict[str, str], Any]]" = OrderedDict()
+_validated_lock = threading.Lock()
+
+
+def conditional_get(
+    client: httpx.Client,
+    url: str,
+    check: Optional[Callable[[httpx.Response], None]] = None,
+    **kwargs,
+) -> Any:
+    """GET a JSON resource, revalidating a previous response with its ETag/Last-Modified.
+
+    A ``304 Not Modified`` answer returns the previously parsed body. Sources
+    that send no validators behave exactly like a plain GET.
+
+    Args:
+        client: Client to send the request with
+        url: Absolute URL, or path relative to the client's base URL
+        check: Error handler called with non-304 responses (default: raise_for_status)
+        kwargs: Extra arguments for ``client.get``
+
+    Returns:
+        Parsed JSON body
+    """
+    headers = dict(kwargs.pop("headers", None) or {})
+    auth = sorted({**dict(client.headers), **headers}.items())
+    key = (str(client.base_url), url, hashlib.sha256(repr(auth).encode()).hexdigest())
+
+    with _validated_lock:
+        cached = _validated.get(key)
+    if cached is not None:
+        validators, _ = cached
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last-modified" in validators:
+            headers["If-Modified-Since"] = validators["last-modified"]
+
+    response = client.get(url, headers=headers, **kwargs)
+    if response.status_code == 304 and cached is not None:
+        logger.debug(f"Not modified: {url}")
+        with _validated_lock:
+            if key in _validated:
+                _validated.move_to_end(key)
+        return cached[1]
+
+    if check is not None:
+        check(response)
+    else:
+        response.raise_for_status()
+    data = response.json()
+
+    validators = {name: response.headers[name] for name in ("etag", "last-modified") if name in response.headers}
+    with _validated_lock:
+        if validators:
+            _validated[key] = (validators, data)
+            _validated.move_to_end(key)
+            while len(_validated) > MAX_VALIDATED_RESPONSES:
+                _validated.popitem(last=False)
+        else:
+            _validated.pop(key, None)
+    return data
+
+
+def catalog_key(source) -> str:
+    """Get the catalog key of a source.
+
+    Includes the URL, type and credentials, so editing a source makes every
+    process miss its old catalog.
+    """
+    fingerprint = f"{source.url}|{source.source_type}|{source.encrypted_api_key}"
+    return f"{source.id}:{hashlib.sha256(fingerprint.encode()).hexdigest()[:16]}"
+
+
+@dataclass
+class CatalogEntry:
+    """Flows listed by a source and when they were fetched (epoch seconds)."""
+
+    flows: List[Dict[str, Any]]
+    fetched_at: float
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now or time.time()) - self.fetched_at
+
+
+class RemoteFlowCatalog:
+    """Per-source cache of remote flow listings with stale-while-revalidate."""
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        stale_ttl: Optional[float] = None,
+        redis_url: Optional[str] = None,
+    ):
+        self.ttl = get_catalog_ttl() if ttl is None else ttl
+        self.stale_ttl = get_catalog_stale_ttl() if stale_ttl is None else stale_ttl
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._redis = None
+        if redis_url:
+            import redis
+
+            self._redis = redis.from_url(redis_url, socket_connect_timeout=1, socket_timeout=1)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _redis_key(self, key: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{key}"
+
+    def _load_shared(self, key: str) -> Optional[CatalogEntry]:
+        try:
+            raw = self._redis.get(self._redis_key(key))
+        except Exception as e:
+            logger.warning(f"Could not read shared flow catalog: {e}")
+            return None
+        if not raw:
+            return None
+        try:
+            payload = json.loads(raw)
+            return CatalogEntry(flows=payload["flows"], fetched_at=float(payload["fetched_at"]))
+        except (TypeError, ValueError, KeyError):
+            return None
+
+    def _store_shared(self, key: str, entry: CatalogEntry):
+        try:
+            payload = json.dumps({"flows": entry.flows, "fetched_at": entry.fetched_at}, default=str)
+            self._redis.set(self._redis_key(key), payload, ex=max(int(self.ttl + self.stale_ttl), 1))
+        except Exception as e:
+            logger.warning(f"Could not write shared flow catalog: {e}")
+
+    async def _lookup(self, key: str) -> Optional[CatalogEntry]:
+        entry = self._entries.get(key)
+        if self._redis is not None and (entry is None or entry.age() >= self.ttl):
+            shared = await asyncio.to_thread(self._load_shared, key)
+            if shared is not None and (entry is None or shared.fetched_at > entry.fetched_at):
+                self._entries[key] = entry = shared
+        return entry
+
+    async def _fetch(self, key: str, fetch: Callable[[], List[Dict[str, Any]]]) -> CatalogEntry:
+        flows = await asyncio.to_thread(fetch)
+        entry = CatalogEntry(flows=flows, fetched_at=time.time())
+        self._entries[key] = entry
+        if self._redis is not None:
+            await asyncio.to_thread(self._store_shared, key, entry)
+        return entry
+
+    def _refresh(self, key: str, fetch: Callable[[], List[Dict[str, Any]]]) -> asyncio.Task:
+        """Start a refresh unless one is already running for this key on this loop."""
+        loop = asyncio.get_running_loop()
+        task = self._refreshing.get(key)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return task
+
+        task = loop.create_task(self._fetch(key, fetch))
+        self._refreshing[key] = task
+
+        def _done(finished: asyncio.Task):
+            if self._refreshing.get(key) is finished:
+                del self._refreshing[key]
+            if not finished.cancelled() and finished.exception() is not None:
+                logger.warning(f"Flow catalog refresh for {key} failed: {finished.exception()}")
+
+        task.add_done_callback(_done)
+        return task
+
+    async def get_flows(
+        self,
+        source,
+        fetch: Callable[[], List[Dict[str, Any]]],
+        force_refresh: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Get the flows of a source, fetching them only when needed.
+
+        Args:
+            source: WorkflowSource the flows belong to
+            fetch: Blocking callable that lists the source's flows; runs in a thread
+            force_refresh: Skip the cache and fetch now
+
+        Returns:
+            List of flows (shallow copies, safe to modify)
+
+        Raises:
+            Whatever ``fetch`` raises when there is no usable cached catalog
+        """
+        if not self.enabled:
+            return await asyncio.to_thread(fetch)
+
+        key = catalog_key(source)
+        entry = None if force_refresh else await self._lookup(key)
+        if entry is None or entry.age() >= self.ttl + self.stale_ttl:
+            # Shielded so a caller giving up (timeout) leaves the refresh running for the next one
+            entry = await asyncio.shield(self._refresh(key, fetch))
+        elif entry.age() >= self.ttl:
+            logger.debug(f"Serving stale flow catalog for {source.url} while refreshing")
+            self._refresh(key, fetch)
+        return [dict(flow) for flow in entry.flows]
+
+    def invalidate(self, source=None):
+        """Drop the cached catalog of a source, or of every source."""
+        if source is None:
+            keys = list(self._entries)
+            self._entries.clear()
+        else:
+            prefix = f"{source.id}:"
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            keys.append(catalog_key(source))
+
+        if self._redis is not None and keys:
+            try:
+                self._redis.delete(*{self._redis_key(key) for key in keys})
+            except Exception as e:
+                logger.warning(f"Could not invalidate shared flow catalog: {e}")
+
+
+_catalog: Optional[RemoteFlowCatalog] = None
+
+
+def get_flow_catalog() -> RemoteFlowCatalog:
+    """Get the process-wide remote flow catalog."""
+    global _catalog
+    if _catalog is None:
+        _catalog = RemoteFlowCatalog(redis_url=get_catalog_redis_url())
+    return _catalog
+
+
+def reset_flow_catalog():
+    """Drop the process-wide remote flow catalog and the stored conditional responses."""
+    global _catalog
+    _catalog = None
+    with _validated_lock:
+        _validated.clear()
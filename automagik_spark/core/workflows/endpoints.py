@@ -0,0 +1,89 @@
+"""
+Resolved run endpoint cache.
+
+Running a flow needs a little metadata the run endpoint itself does not give
+back: the entity type of a Hive flow (agent, team or workflow) and the
+ChatInput/ChatOutput node IDs of a LangFlow flow. Synced workflows carry it in
+their row, so callers pass it straight through. For ad-hoc runs by remote flow
+ID the first lookup is remembered here for a TTL, so repeated runs go straight
+to the run endpoint.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from ...api.config import get_resolved_flow_ttl
+
+# Maximum number of resolved flows kept per process
+MAX_RESOLVED_FLOWS = 1024
+
+_resolved: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+_resolved_lock = threading.Lock()
+
+
+def get_resolved(api_url: str, flow_id: str) -> Optional[Any]:
+    """Get the cached run metadata of a flow, or None when unknown or expired."""
+    key = (api_url, flow_id)
+    with _resolved_lock:
+        cached = _resolved.get(key)
+        if cached is None:
+            return None
+        expires_at, value = cached
+        if expires_at <= time.monotonic():
+            del _resolved[key]
+            return None
+        _resolved.move_to_end(key)
+        return value
+
+
+def set_resolved(api_url: str, flow_id: str, value: Any):
+    """Remember the run metadata of a flow for the configured TTL."""
+    ttl = get_resolved_flow_ttl()
+    if ttl <= 0 or value is None:
+        return
+    with _resolved_lock:
+        _resolved[(api_url, flow_id)] = (time.monotonic() + ttl, value)
+        _resolved.move_to_end((api_url, flow_id))
+        while len(_resolved) > MAX_RESOLVED_FLOWS:
+            _resolved.popitem(last=False)
+
+
+def forget_resolved(api_url: str, flow_id: str):
+    """Drop the cached run metadata of a flow, e.g. after the run endpoint answered 404."""
+    with _resolved_lock:
+        _resolved.pop((api_url, flow_id), None)
+
+
+def clear_resolved():
+    """Drop every cached run metadata entry."""
+    with _resolved_lock:
+        _resolved.clear()
+
+
+def resolve(api_url: str, flow_id: str, lookup: Callable[[], Optional[Any]]) -> Optional[Any]:
+    """Get the run metadata of a flow, calling ``lookup`` only on a cache miss.
+
+    Args:
+        api_url: Base URL of the source the flow lives in
+        flow_id: Remote flow ID
+        lookup: Blocking callable fetching the metadata; None means not found and is not cached
+
+    Returns:
+        The cached or freshly looked up metadata
+    """
+    value = get_resolved(api_url, flow_id)
+    if value is None:
+        value = lookup()
+        set_resolved(api_url, flow_id, value)
+    return value
+
+
+async def resolve_async(api_url: str, flow_id: str, lookup: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+    """Async version of :func:`resolve`."""
+    value = get_resolved(api_url, flow_id)
+    if value is None:
+        value = await lookup()
+        set_resolved(api_url, flow_id, value)
+    return value
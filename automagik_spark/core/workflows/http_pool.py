@@ -0,0 +1,129 @@
+"""
+Per-process pool of keep-alive HTTP clients.
+
+Worker processes create the pool on start-up and close it on shutdown; managers
+borrow a client per source through ``sync_client`` so repeated executions reuse
+open (TLS) connections. Without a pool, ``sync_client`` falls back to a
+short-lived client per call.
+"""
+
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+import httpx
+
+from ...api.config import get_http_keepalive_expiry, get_http_max_connections
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional["HTTPClientPool"] = None
+
+
+class HTTPClientPool:
+    """Keep-alive ``httpx.Client`` instances keyed by source URL and credentials."""
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+    ):
+        max_connections = max_connections or get_http_max_connections()
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry or get_http_keepalive_expiry(),
+        )
+        self._clients: Dict[Tuple, httpx.Client] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(base_url: str, headers: Optional[Dict[str, str]], timeout, verify: bool) -> Tuple:
+        # Hash headers so credentials are not kept around as plain dict keys
+        header_items = sorted((headers or {}).items())
+        header_hash = hashlib.sha256(repr(header_items).encode()).hexdigest()
+        return (base_url, header_hash, repr(timeout), verify)
+
+    def get_client(
+        self,
+        base_url: str = "",
+        headers: Optional[Dict[str, str]] = None,
+        timeout=None,
+        verify: bool = True,
+    ) -> httpx.Client:
+        """Get the shared client for a source, creating it on first use."""
+        key = self._key(base_url, headers, timeout, verify)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None or client.is_closed:
+                    client = httpx.Client(
+                        base_url=base_url,
+                        headers=headers,
+                        timeout=timeout,
+                        verify=verify,
+                        limits=self.limits,
+                    )
+                    self._clients[key] = client
+                    logger.debug(f"Opened pooled HTTP client for {base_url or 'absolute URLs'}")
+        return client
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def close(self):
+        """Close every pooled client."""
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                client.close()
+            except Exception as e:
+                logger.warning(f"Error closing pooled HTTP client: {e}")
+
+
+def init_client_pool(**kwargs) -> HTTPClientPool:
+    """Create the process-wide client pool, replacing any existing one."""
+    global _pool
+    close_client_pool()
+    _pool = HTTPClientPool(**kwargs)
+    logger.info("HTTP client pool initialized")
+    return _pool
+
+
+def get_client_pool() -> Optional[HTTPClientPool]:
+    """Get the process-wide client pool, if one was initialized."""
+    return _pool
+
+
+def close_client_pool():
+    """Close and drop the process-wide client pool."""
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+        logger.info("HTTP client pool closed")
+
+
+@contextmanager
+def sync_client(
+    base_url: str = "",
+    headers: Optional[Dict[str, str]] = None,
+    timeout=None,
+    verify: bool = True,
+) -> Iterator[httpx.Client]:
+    """Borrow a client for a source.
+
+    Yields the pooled client when a pool is active (it stays open afterwards),
+    otherwise a new client that is closed on exit.
+    """
+    pool = get_client_pool()
+    if pool is not None:
+        yield pool.get_client(base_url=base_url, headers=headers, timeout=timeout, verify=verify)
+        return
+
+    with httpx.Client(base_url=base_url, headers=headers, timeout=timeout, verify=verify) as client:
+        yield client
@@ -0,0 +1,520 @@
+"""
+Per-source run limits.
+
+Bounds how many runs Spark sends to one workflow source at a time and how many
+it starts per minute, using the ``max_concurrency`` and ``max_runs_per_minute``
+columns of the source. The limits live in Redis so every worker draws from the
+same slots and token bucket; without Redis they are enforced per process.
+
+``max_concurrency`` is a ceiling. The window actually used is halved when runs
+hit 429/5xx responses, time out or take longer than the latency target, and
+grows back by about one slot per window of healthy runs (AIMD), so a source
+is driven at the rate it can sustain instead of being flooded until it fails.
+
+Workflows also get a share of the worker slots (``AUTOMAGIK_SPARK_WORKFLOW_MAX_SLOTS``
+weighted by their priority), so one busy workflow cannot crowd out the
+others. A run over its workflow's share is requeued rather than kept
+waiting, with a delay that grows with the runs already waiting for that share
+and shrinks with the size of the share.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from uuid import uuid4
+
+import httpx
+
+from ...api.config import (
+    get_http_timeout,
+    get_source_latency_target,
+    get_source_limiter_redis_url,
+    get_source_limiter_wait,
+    get_workflow_max_slots,
+)
+from .remote import APIServerError, RateLimitError
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "automagik_spark:limiter"
+
+# Seconds between attempts to get a concurrency slot
+POLL_INTERVAL = 0.5
+
+# Minimum seconds between two window decreases, so one burst of failures halves it once
+BACKOFF_COOLDOWN = 10.0
+
+# Seconds limiter state is kept after its last use
+STATE_TTL = 86400
+
+# Weight of the newest run in a workflow's average run time
+RUN_TIME_SMOOTHING = 0.2
+
+# Most runs counted as waiting for one workflow's share
+MAX_WAITING_RUNS = 2**31 - 1
+
+# Seconds to use the per-process limits after Redis could not be reached
+REDIS_BACKOFF = 30.0
+
+_ACQUIRE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[2]) then
+    redis.call('ZADD', KEYS[1], ARGV[3], ARGV[4])
+    redis.call('EXPIRE', KEYS[1], ARGV[5])
+    return 1
+end
+return 0
+"""
+
+_TAKE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local capacity = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return tostring(wait)
+"""
+
+_FEEDBACK_SCRIPT = """
+local ceiling = tonumber(ARGV[1])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'window', 'decreased_at')
+local window = math.min(ceiling, tonumber(state[1]) or ceiling)
+local decreased_at = tonumber(state[2]) or 0
+if ARGV[2] == '1' then
+    if now - decreased_at >= tonumber(ARGV[4]) then
+        window = math.max(1, window / 2)
+        decreased_at = now
+    end
+else
+    window = math.min(ceiling, window + 1 / window)
+end
+redis.call('HSET', KEYS[1], 'window', tostring(window), 'decreased_at', tostring(decreased_at))
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return tostring(window)
+"""
+
+_OBSERVE_SCRIPT = """
+local value = tonumber(ARGV[1])
+local average = tonumber(redis.call('HGET', KEYS[1], 'average'))
+if average then
+    average = average + tonumber(ARGV[2]) * (value - average)
+else
+    average = value
+end
+redis.call('HSET', KEYS[1], 'average', tostring(average))
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return tostring(average)
+"""
+
+
+class RunLimitError(Exception):
+    """A run limit has no room; the run should be retried after ``retry_after`` seconds."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class SourceBusyError(RunLimitError):
+    """A source is at its run limits; the run should be retried later."""
+
+    def __init__(self, source_id, retry_after: float):
+        super().__init__(f"Source {source_id} is at its run limit, retry in {retry_after:.1f}s", retry_after)
+        self.source_id = source_id
+
+
+class WorkflowBusyError(RunLimitError):
+    """A workflow holds its share of worker slots; the run should be retried later."""
+
+    def __init__(self, workflow_id, retry_after: float):
+        super().__init__(
+            f"Workflow {workflow_id} holds its share of worker slots, retry in {retry_after:.1f}s", retry_after
+        )
+        self.workflow_id = workflow_id
+
+
+@dataclass(frozen=True)
+class SourceLimits:
+    """Run limits of one source."""
+
+    max_concurrency: Optional[int] = None
+    max_runs_per_minute: Optional[int] = None
+
+    @classmethod
+    def of(cls, source) -> "SourceLimits":
+        return cls(
+            max_concurrency=getattr(source, "max_concurrency", None) or None,
+            max_runs_per_minute=getattr(source, "max_runs_per_minute", None) or None,
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.max_concurrency or self.max_runs_per_minute)
+
+
+def workflow_slots(priority: Optional[int] = None) -> Optional[int]:
+    """Get how many runs of a workflow of the given priority may be in flight, or None for no limit."""
+    # Imported here: the celery package loads the Celery app and beat scheduler on import
+    from ..celery.routing import DEFAULT_PRIORITY, resolve_priority
+
+    max_slots = get_workflow_max_slots()
+    if max_slots <= 0:
+        return None
+    weight = (resolve_priority(workflow_priority=priority) + 1) / (DEFAULT_PRIORITY + 1)
+    return max(1, round(max_slots * weight))
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Check whether a run failed because the source is overloaded (429, 5xx or timeout)."""
+    if isinstance(error, (RateLimitError, APIServerError, httpx.TimeoutException)):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return False
+
+
+class LocalLimiterBackend:
+    """Limiter state kept in this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._leases: Dict[str, Dict[str, float]] = {}
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._windows: Dict[str, Tuple[float, float]] = {}
+        self._averages: Dict[str, float] = {}
+
+    def _live_leases(self, key: str, now: float) -> Dict[str, float]:
+        leases = self._leases.setdefault(key, {})
+        for expired in [lease_id for lease_id, expiry in leases.items() if expiry <= now]:
+            del leases[expired]
+        return leases
+
+    def acquire(self, key: str, limit: int, lease: str, expires_at: float, now: float) -> bool:
+        with self._lock:
+            leases = self._live_leases(key, now)
+            if len(leases) >= limit:
+                return False
+            leases[lease] = expires_at
+            return True
+
+    def count(self, key: str, now: float) -> int:
+        with self._lock:
+            return len(self._live_leases(key, now))
+
+    def release(self, key: str, lease: str):
+        with self._lock:
+            self._leases.get(key, {}).pop(lease, None)
+
+    def take(self, key: str, rate: float, capacity: float, now: float) -> float:
+        with self._lock:
+            tokens, ts = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            return wait
+
+    def window(self, key: str, ceiling: int) -> float:
+        with self._lock:
+            return min(ceiling, self._windows.get(key, (ceiling, 0.0))[0])
+
+    def feedback(self, key: str, ceiling: int, congested: bool, now: float) -> float:
+        with self._lock:
+            window, decreased_at = self._windows.get(key, (ceiling, 0.0))
+            window = min(ceiling, window)
+            if congested:
+                if now - decreased_at >= BACKOFF_COOLDOWN:
+                    window, decreased_at = max(1.0, window / 2), now
+            else:
+                window = min(ceiling, window + 1 / window)
+            self._windows[key] = (window, decreased_at)
+            return window
+
+    def average(self, key: str) -> Optional[float]:
+        with self._lock:
+            return self._averages.get(key)
+
+    def observe(self, key: str, value: float) -> float:
+        with self._lock:
+            average = self._averages.get(key)
+            average = value if average is None else average + RUN_TIME_SMOOTHING * (value - average)
+            self._averages[key] = average
+            return average
+
+
+class RedisLimiterBackend:
+    """Limiter state shared between processes through Redis."""
+
+    def __init__(self, client):
+        self._client = client
+        self._acquire = client.register_script(_ACQUIRE_SCRIPT)
+        self._take = client.register_script(_TAKE_SCRIPT)
+        self._feedback = client.register_script(_FEEDBACK_SCRIPT)
+        self._observe = client.register_script(_OBSERVE_SCRIPT)
+
+    @staticmethod
+    def _key(kind: str, key: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{kind}:{key}"
+
+    def acquire(self, key: str, limit: int, lease: str, expires_at: float, now: float) -> bool:
+        keys = [self._key("slots", key)]
+        return bool(self._acquire(keys=keys, args=[now, limit, expires_at, lease, STATE_TTL]))
+
+    def release(self, key: str, lease: str):
+        self._client.zrem(self._key("slots", key), lease)
+
+    def count(self, key: str, now: float) -> int:
+        pipeline = self._client.pipeline()
+        pipeline.zremrangebyscore(self._key("slots", key), "-inf", now)
+        pipeline.zcard(self._key("slots", key))
+        return int(pipeline.execute()[1])
+
+    def take(self, key: str, rate: float, capacity: float, now: float) -> float:
+        return float(self._take(keys=[self._key("bucket", key)], args=[now, rate, capacity, STATE_TTL]))
+
+    def window(self, key: str, ceiling: int) -> float:
+        window = self._client.hget(self._key("window", key), "window")
+        return min(ceiling, float(window)) if window is not None else float(ceiling)
+
+    def feedback(self, key: str, ceiling: int, congested: bool, now: float) -> float:
+        args = [ceiling, "1" if congested else "0", now, BACKOFF_COOLDOWN, STATE_TTL]
+        return float(self._feedback(keys=[self._key("window", key)], args=args))
+
+    def average(self, key: str) -> Optional[float]:
+        average = self._client.hget(self._key("runtime", key), "average")
+        return float(average) if average is not None else None
+
+    def observe(self, key: str, value: float) -> float:
+        args = [value, RUN_TIME_SMOOTHING, STATE_TTL]
+        return float(self._observe(keys=[self._key("runtime", key)], args=args))
+
+
+class SourceLimiter:
+    """Enforces the run limits of workflow sources."""
+
+    def __init__(self, redis_url: Optional[str] = None, wait: Optional[float] = None):
+        self.wait = get_source_limiter_wait() if wait is None else wait
+        self._local = LocalLimiterBackend()
+        self._redis_url = redis_url
+        self._redis: Optional[RedisLimiterBackend] = None
+        self._redis_failed_at: Optional[float] = None
+
+    def _call(self, method: str, *args):
+        """Call the shared backend, falling back to this process's state while Redis is unreachable."""
+        if self._redis_url and (
+            self._redis_failed_at is None or time.monotonic() - self._redis_failed_at >= REDIS_BACKOFF
+        ):
+            try:
+                if self._redis is None:
+                    import redis
+
+                    client = redis.from_url(self._redis_url, socket_connect_timeout=1, socket_timeout=2)
+                    self._redis = RedisLimiterBackend(client)
+                result = getattr(self._redis, method)(*args)
+                self._redis_failed_at = None
+                return result
+            except Exception as e:
+                logger.warning(f"Source limiter could not reach Redis, limiting per process: {e}")
+                self._redis = None
+                self._redis_failed_at = time.monotonic()
+        return getattr(self._local, method)(*args)
+
+    def _try_acquire(self, key: str, limits: SourceLimits, lease: str) -> float:
+        """Take a slot and a token; return 0 on success or the seconds to wait before trying again."""
+        now = time.time()
+        if limits.max_concurrency:
+            window = int(self._call("window", key, limits.max_concurrency))
+            # A lease outlives the longest possible run, so a crashed worker cannot leak its slot
+            expires_at = now + get_http_timeout() + 60
+            if not self._call("acquire", key, window, lease, expires_at, now):
+                return POLL_INTERVAL
+
+        if limits.max_runs_per_minute:
+            rate = limits.max_runs_per_minute / 60
+            wait = self._call("take", key, rate, max(1.0, rate), now)
+            if wait > 0:
+                if limits.max_concurrency:
+                    self._call("release", key, lease)
+                return wait
+        return 0.0
+
+    def acquire(self, source, limits: Optional[SourceLimits] = None) -> Optional[str]:
+        """Wait for room to run on a source.
+
+        Returns:
+            Lease to pass to :meth:`release`, or None when the source has no limits
+
+        Raises:
+            SourceBusyError: No room within the configured wait
+        """
+        limits = limits or SourceLimits.of(source)
+        if not limits:
+            return None
+
+        lease, retry_after = self._acquire(str(source.id), limits, self.wait)
+        if lease is None:
+            raise SourceBusyError(source.id, retry_after=retry_after)
+        return lease
+
+    def _acquire(self, key: str, limits: SourceLimits, wait: float) -> Tuple[Optional[str], float]:
+        """Wait up to ``wait`` seconds for room; return the lease, or None and the seconds to retry in."""
+        lease = uuid4().hex
+        deadline = time.monotonic() + wait
+        while True:
+            delay = self._try_acquire(key, limits, lease)
+            if delay <= 0:
+                return lease, 0.0
+            if time.monotonic() + delay > deadline:
+                return None, max(delay, 1.0)
+            time.sleep(delay)
+
+    def release(self, source, lease: Optional[str], limits: Optional[SourceLimits] = None):
+        """Free the slot of a finished run."""
+        limits = limits or SourceLimits.of(source)
+        if lease is not None and limits.max_concurrency:
+            self._call("release", str(source.id), lease)
+
+    def record(self, source, latency: float, error: Optional[BaseException] = None):
+        """Adjust the concurrency window of a source after a run."""
+        limits = SourceLimits.of(source)
+        if not limits.max_concurrency:
+            return
+        target = get_source_latency_target()
+        congested = (error is not None and is_overload_error(error)) or (target > 0 and latency > target)
+        window = self._call("feedback", str(source.id), limits.max_concurrency, congested, time.time())
+        if congested:
+            logger.warning(f"Source {source.id} looks overloaded, concurrency window is now {window:.1f}")
+
+    @contextmanager
+    def slot(self, source):
+        """Run the body inside one of the source's slots and feed its outcome back to the window.
+
+        Raises:
+            SourceBusyError: The source had no room within the configured wait
+        """
+        limits = SourceLimits.of(source)
+        if not limits:
+            yield
+            return
+
+        lease = self.acquire(source, limits)
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self.record(source, time.monotonic() - started, e)
+            raise
+        else:
+            self.record(source, time.monotonic() - started)
+        finally:
+            self.release(source, lease, limits)
+
+    def _share_retry_after(self, key: str, slots: int) -> float:
+        """Get how long a run turned away from a workflow's share should wait, and count it as waiting.
+
+        Runs already waiting get through the share ``slots`` at a time, each
+        taking about the workflow's average run time, so every further run
+        waits one step longer instead of all of them retrying at once.
+        """
+        now = time.time()
+        waiting_key = f"{key}:waiting"
+        waiting = self._call("count", waiting_key, now)
+        run_time = self._call("average", key) or 1.0
+        retry_after = min(max(run_time * (waiting + 1) / slots, 1.0), get_http_timeout())
+        # Counted as a lease that ends when the run comes back; the limit only has to leave room for it
+        self._call("acquire", waiting_key, MAX_WAITING_RUNS, uuid4().hex, now + retry_after, now)
+        return retry_after
+
+    @contextmanager
+    def workflow_share(self, workflow):
+        """Run the body inside the workflow's share of worker slots.
+
+        Raises:
+            WorkflowBusyError: The workflow already holds its share
+        """
+        slots = workflow_slots(getattr(workflow, "priority", None))
+        if not slots:
+            yield
+            return
+
+        # Fail fast rather than wait: the slot is better spent on another workflow's run
+        key = f"workflow:{workflow.id}"
+        limits = SourceLimits(max_concurrency=slots)
+        lease, _ = self._acquire(key, limits, 0)
+        if lease is None:
+            raise WorkflowBusyError(workflow.id, retry_after=self._share_retry_after(key, slots))
+        started = time.monotonic()
+        try:
+            yield
+        except RunLimitError:
+            # The source turned the run away, so it says nothing about run times
+            raise
+        except Exception:
+            self._call("observe", key, time.monotonic() - started)
+            raise
+        else:
+            self._call("observe", key, time.monotonic() - started)
+        finally:
+            self._call("release", key, lease)
+
+    @contextmanager
+    def run(self, workflow, source):
+        """Run the body within the workflow's share of worker slots and one of the source's slots.
+
+        Every path that sends a run to a source goes through here.
+
+        Raises:
+            RunLimitError: The workflow or the source has no room for the run
+        """
+        with self.workflow_share(workflow), self.slot(source):
+            yield
+
+    @asynccontextmanager
+    async def run_async(self, workflow, source):
+        """Async form of :meth:`run` that waits for room without blocking the event loop."""
+        limited = self.run(workflow, source)
+        await asyncio.to_thread(limited.__enter__)
+        try:
+            yield
+        except BaseException as e:
+            if not await asyncio.to_thread(limited.__exit__, type(e), e, e.__traceback__):
+                raise
+        else:
+            await asyncio.to_thread(limited.__exit__, None, None, None)
+
+
+_limiter: Optional[SourceLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_source_limiter() -> SourceLimiter:
+    """Get the process-wide source limiter."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = SourceLimiter(redis_url=get_source_limiter_redis_url())
+    return _limiter
+
+
+def reset_source_limiter():
+    """Drop the process-wide source limiter and its per-process state."""
+    global _limiter
+    _limiter = None
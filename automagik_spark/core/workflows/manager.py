@@ -4,23 +4,29 @@ Workflow management.
 Provides the main interface for managing workflows and remote flows
 """
 
+import hashlib
 import json
 import logging
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from uuid import UUID, uuid4
 
 import httpx
-from sqlalchemy import select, delete, cast, String, or_, func
+from sqlalchemy import select, delete, false, or_, func, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, defer, joinedload, selectinload
 
+from ...api.config import get_catalog_source_timeout
+from ..database.ids import parse_uuid, uuid_prefix_filter
+from ..database.outputs import load_task_output, store_task_output, store_task_output_async
+from ..database.pagination import CountMode, count_total, keyset_page
 from ..database.models import (
     Workflow,
     Schedule,
     Task,
     WorkflowComponent,
     TaskLog,
+    TaskOutput,
     WorkflowSource,
 )
 from ..schemas.source import SourceType
@@ -29,15 +35,24 @@ from .task import TaskManager
 from .automagik_agents import AutoMagikAgentManager
 from .automagik_hive import AutomagikHiveManager
 from .adapters import AdapterRegistry
+from .limiter import RunLimitError, get_source_limiter
+from .catalog import get_flow_catalog
 
 import os
 import asyncio
+import time
 
 LANGFLOW_API_URL = os.environ.get("LANGFLOW_API_URL")
 LANGFLOW_API_KEY = os.environ.get("LANGFLOW_API_KEY")
 
 logger = logging.getLogger(__name__)
 
+# Workflow fields left out of the flow content hash
+_UNHASHED_FIELDS = ("flow_raw_data", "flow_hash", "workflow_source_id", "id", "created_at", "updated_at")
+
+# Upstream flow keys that change without the flow changing
+_VOLATILE_FLOW_KEYS = ("created_at", "updated_at", "date_created", "last_tested_version", "source_url", "instance")
+
 
 class WorkflowManager:
     """Workflow management class."""
@@ -84,7 +99,7 @@ class WorkflowManager:
             raise ValueError("Either source or source_url must be provided")
 
         # Get decrypted API key
-        api_key = WorkflowSource.decrypt_api_key(source.encrypted_api_key)
+        api_key = WorkflowSource.decrypt_api_key(source.encrypted_api_key, source_id=source.id)
 
         # Initialize appropriate manager based on source type
         if source.source_type == SourceType.LANGFLOW:
@@ -97,17 +112,76 @@ class WorkflowManager:
         else:
             raise ValueError(f"Unsupported source type: {source.source_type}")
 
-    async def list_remote_flows(
-        self, workflow_id: Optional[str] = None, source_url: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """List remote flows from all sources, or a specific source if provided.
+    async def _list_source_flows(self, source: WorkflowSource, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """List the flows of one source through the remote flow catalog cache."""
+        if source.source_type not in (SourceType.LANGFLOW, SourceType.AUTOMAGIK_AGENTS, SourceType.AUTOMAGIK_HIVE):
+            logger.warning(f"Unsupported source type: {source.source_type}")
+            return []
+
+        # Use consistent pattern with _get_source_manager
+        manager = await self._get_source_manager(source=source)
+        source_url = source.url
+        instance = source_url.split("://")[-1].split("/")[0].split(".")[0]
+
+        def fetch() -> List[Dict[str, Any]]:
+            if source.source_type == SourceType.LANGFLOW:
+                with manager:  # Use context manager for proper cleanup
+                    flows = manager.list_flows_sync()
+            else:
+                flows = manager.list_flows_sync()
+
+            # Add source info to each flow
+            for flow in flows:
+                flow["source_url"] = source_url
+                flow["instance"] = instance
+            return flows
+
+        return await get_flow_catalog().get_flows(source, fetch, force_refresh=force_refresh)
+
+    async def _list_source_flows_with_status(
+        self, source: WorkflowSource, force_refresh: bool, timeout: float
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """List one source's flows within a time budget, reporting how it went."""
+        status = {
+            "source_id": str(source.id),
+            "source_url": source.url,
+            "instance": source.url.split("://")[-1].split("/")[0].split(".")[0],
+            "status": "ok",
+            "flow_count": 0,
+            "error": None,
+        }
+        started = time.monotonic()
+        flows: List[Dict[str, Any]] = []
+        try:
+            flows = await asyncio.wait_for(self._list_source_flows(source, force_refresh=force_refresh), timeout)
+            status["flow_count"] = len(flows)
+        except asyncio.TimeoutError:
+            logger.error(f"Listing flows from source {source.url} timed out after {timeout}s")
+            status.update(status="timeout", error=f"Timed out after {timeout}s")
+        except Exception as e:
+            logger.error(f"Failed to list flows from source {source.url}: {str(e)}")
+            status.update(status="error", error=str(e))
+        status["elapsed_ms"] = int((time.monotonic() - started) * 1000)
+        return flows, status
+
+    async def list_remote_flows_with_status(
+        self,
+        source_url: Optional[str] = None,
+        force_refresh: bool = False,
+        timeout: Optional[float] = None,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """List remote flows from all active sources concurrently, or from the sources matching a URL.
+
+        Each source gets its own time budget; sources that fail or time out
+        are reported instead of failing the whole listing.
 
         Args:
-            workflow_id: Optional workflow ID to filter by
             source_url: Optional source URL or instance name to filter by
+            force_refresh: Bypass the catalog cache and query the sources
+            timeout: Seconds allowed per source; defaults to AUTOMAGIK_SPARK_CATALOG_SOURCE_TIMEOUT
 
         Returns:
-            List[Dict[str, Any]]: List of flows matching the criteria
+            Tuple of the flows that could be listed and one status dict per source
         """
         if source_url:
             # Try to find source by URL or instance name
@@ -119,54 +193,51 @@ class WorkflowManager:
                 )
             )
             sources = (await self.session.execute(sources_query)).scalars().all()
-
             if not sources:
                 logger.warning(f"No sources found matching {source_url}")
-                return []
+        else:
+            # Get all active sources (skip inactive ones to avoid connection errors)
+            sources = [
+                source
+                for source in (await self.session.execute(select(WorkflowSource))).scalars().all()
+                if getattr(source, "status", "active") == "active"
+            ]
+
+        if not sources:
+            return [], []
+
+        timeout = timeout or get_catalog_source_timeout()
+        results = await asyncio.gather(
+            *(self._list_source_flows_with_status(source, force_refresh, timeout) for source in sources)
+        )
 
-            all_flows = []
-            for source in sources:
-                try:
-                    # Use consistent pattern with _get_source_manager
-                    manager = await self._get_source_manager(source=source)
+        all_flows: List[Dict[str, Any]] = []
+        statuses: List[Dict[str, Any]] = []
+        for flows, status in results:
+            all_flows.extend(flows)
+            statuses.append(status)
+        return all_flows, statuses
 
-                    if source.source_type == SourceType.LANGFLOW:
-                        with manager:  # Use context manager for proper cleanup
-                            flows = manager.list_flows_sync()
-                    elif source.source_type == SourceType.AUTOMAGIK_AGENTS:
-                        flows = manager.list_flows_sync()
-                    elif source.source_type == SourceType.AUTOMAGIK_HIVE:
-                        flows = manager.list_flows_sync()
-                    else:
-                        logger.warning(f"Unsupported source type: {source.source_type}")
-                        continue
+    async def list_remote_flows(
+        self,
+        workflow_id: Optional[str] = None,
+        source_url: Optional[str] = None,
+        force_refresh: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """List remote flows from all sources, or a specific source if provided.
 
-                    # Add source info to each flow
-                    for flow in flows:
-                        flow["source_url"] = source.url
-                        instance = source.url.split("://")[-1].split("/")[0]
-                        instance = instance.split(".")[0]
-                        flow["instance"] = instance
-                    all_flows.extend(flows)
-                except Exception as e:
-                    logger.error(f"Failed to list flows from source {source.url}: {str(e)}")
-                    continue
+        Listings are served from the remote flow catalog cache when fresh enough.
 
-            return all_flows
-        else:
-            # Get all active sources (skip inactive ones to avoid connection errors)
-            all_sources = (await self.session.execute(select(WorkflowSource))).scalars().all()
-            if not all_sources:
-                return []
-
-            aggregated_flows: List[Dict[str, Any]] = []
-            for src in all_sources:
-                # Skip inactive sources
-                if getattr(src, "status", "active") != "active":
-                    continue
-                flows_for_src = await self.list_remote_flows(workflow_id=workflow_id, source_url=src.url)
-                aggregated_flows.extend(flows_for_src)
-            return aggregated_flows
+        Args:
+            workflow_id: Optional workflow ID to filter by
+            source_url: Optional source URL or instance name to filter by
+            force_refresh: Bypass the catalog cache and query the sources
+
+        Returns:
+            List[Dict[str, Any]]: List of flows matching the criteria
+        """
+        flows, _ = await self.list_remote_flows_with_status(source_url=source_url, force_refresh=force_refresh)
+        return flows
 
     async def get_remote_flow(self, flow_id: str, source_url: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Get a remote flow by ID from any source or a specific source.
@@ -304,7 +375,7 @@ class WorkflowManager:
                 continue
 
             # Get adapter for this source
-            api_key = WorkflowSource.decrypt_api_key(source.encrypted_api_key)
+            api_key = WorkflowSource.decrypt_api_key(source.encrypted_api_key, source_id=source.id)
             try:
                 adapter = AdapterRegistry.get_adapter(
                     source_type=source.source_type,
@@ -316,15 +387,18 @@ class WorkflowManager:
                 logger.warning(f"No adapter for source type {source.source_type}: {e}")
                 continue
 
-            # Check if flow exists and get it
+            # Check if flow exists and get it (async adapter calls keep the event loop free)
             try:
-                flows = adapter.list_flows_sync()
-                flow_exists = any(flow.get("id") == flow_id for flow in flows)
-                if not flow_exists:
-                    continue
+                async with adapter:
+                    flows = await adapter.list_flows()
+                    flow_data = next((flow for flow in flows if flow.get("id") == flow_id), None)
+                    if flow_data is None:
+                        continue
 
-                # Get flow data
-                flow_data = adapter.get_flow_sync(flow_id)
+                    # Listings usually carry the full flow; only fetch it when they don't
+                    # (for Hive, get_flow would list every agent, team and workflow again)
+                    if not flow_data.get("data"):
+                        flow_data = await adapter.get_flow(flow_id)
                 if not flow_data:
                     continue
 
@@ -350,43 +424,221 @@ class WorkflowManager:
 
         raise ValueError(f"No source found containing flow {flow_id}")
 
-    async def list_workflows(self, options: dict = None, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
-        """List all workflows from the local database."""
-        query = select(Workflow).order_by(Workflow.created_at.desc())
+    async def _get_source(self, source_id: str) -> Optional[WorkflowSource]:
+        """Get a workflow source by ID or URL."""
+        source_uuid = parse_uuid(source_id)
+        if source_uuid is not None:
+            return await self.session.get(WorkflowSource, source_uuid)
+        result = await self.session.execute(select(WorkflowSource).where(WorkflowSource.url == source_id))
+        return result.scalar_one_or_none()
+
+    async def sync_source(self, source_id: str, flow_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Sync every flow of a source (or the given ones) in one pass.
+
+        The source is listed once, the listing is diffed against the existing
+        workflows, and all workflows and their components are written in one
+        transaction, so a full sync costs one listing instead of a listing per flow.
+
+        Args:
+            source_id: ID or URL of the source
+            flow_ids: Remote flow IDs to sync; all flows of the source if omitted
+
+        Returns:
+            Dict[str, Any]: Counts of created, updated and unchanged workflows, the
+                synced workflows and the requested flow IDs the source does not have
+
+        Raises:
+            ValueError: If the source does not exist or has no adapter
+        """
+        source = await self._get_source(source_id)
+        if not source:
+            raise ValueError(f"Source {source_id} not found")
+
+        api_key = WorkflowSource.decrypt_api_key(source.encrypted_api_key, source_id=source.id)
+        adapter = AdapterRegistry.get_adapter(
+            source_type=source.source_type,
+            api_url=source.url,
+            api_key=api_key,
+            source_id=source.id,
+        )
+
+        wanted = set(flow_ids) if flow_ids else None
+        async with adapter:
+            # Keyed by ID: one entry per flow even if the listing repeats one
+            listed = {flow["id"]: flow for flow in await adapter.list_flows() if flow.get("id")}
+            flows = [flow for flow_id, flow in listed.items() if wanted is None or flow_id in wanted]
+            # Listings usually carry the full flow; fetch the few that don't
+            for index, flow in enumerate(flows):
+                if not flow.get("data"):
+                    flows[index] = await adapter.get_flow(flow["id"]) or flow
+
+        remote_ids = [flow["id"] for flow in flows]
+        existing = {
+            workflow.remote_flow_id: workflow
+            for workflow in (
+                await self.session.execute(
+                    select(Workflow)
+                    .options(defer(Workflow.data), defer(Workflow.flow_raw_data))
+                    .where(Workflow.remote_flow_id.in_(remote_ids))
+                )
+            ).scalars()
+        }
+
+        now = datetime.now(timezone.utc)
+        created: List[Dict[str, Any]] = []
+        updated: List[Dict[str, Any]] = []
+        components: List[Dict[str, Any]] = []
+        synced: List[Dict[str, Any]] = []
+        for flow in flows:
+            current = existing.get(flow["id"])
+            defaults = adapter.get_default_sync_params(flow)
+            flow = adapter.normalize_flow_data(flow)
+            # Keep the components chosen for an existing workflow
+            flow["input_component"] = (current and current.input_component) or defaults.get("input_component")
+            flow["output_component"] = (current and current.output_component) or defaults.get("output_component")
+
+            fields = self._workflow_fields(flow, source)
+            fields["updated_at"] = now
+            if current is None:
+                action = "created"
+                fields.update(id=uuid4(), created_at=now)
+                created.append(fields)
+            elif current.flow_hash == fields["flow_hash"]:
+                # Nothing changed upstream: leave the row, its components and updated_at alone
+                action = "unchanged"
+                fields["id"] = current.id
+            else:
+                action = "updated"
+                fields.update(id=current.id, flow_version=self._next_flow_version(current))
+                updated.append(fields)
+            if action != "unchanged":
+                components.extend(self._component_rows(fields["id"], flow))
+            synced.append(
+                {"id": str(fields["id"]), "remote_flow_id": flow["id"], "name": fields["name"], "action": action}
+            )
+
+        try:
+            if updated:
+                await self.session.execute(
+                    delete(WorkflowComponent).where(
+                        WorkflowComponent.workflow_id.in_([fields["id"] for fields in updated])
+                    )
+                )
+                await self.session.execute(update(Workflow), updated)
+            if created:
+                await self.session.execute(insert(Workflow), created)
+            if components:
+                await self.session.execute(insert(WorkflowComponent), components)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        # The bulk UPDATE bypassed these objects; reload them on next access
+        for workflow in existing.values():
+            self.session.expire(workflow)
+        unchanged = len(flows) - len(created) - len(updated)
+        logger.info(
+            f"Synced {len(flows)} flow(s) from source {source.url}: "
+            f"{len(created)} new, {len(updated)} updated, {unchanged} unchanged"
+        )
+        return {
+            "source_id": str(source.id),
+            "created": len(created),
+            "updated": len(updated),
+            "unchanged": unchanged,
+            "missing": sorted(wanted - set(remote_ids)) if wanted else [],
+            "workflows": synced,
+        }
+
+    async def list_workflows(
+        self,
+        options: dict = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """List all workflows from the local database.
+
+        Task statistics (count, failed count, latest status) are computed by the
+        database for the listed page only, so listing does not load task history,
+        and the large ``data``/``flow_raw_data`` columns are left out.
+
+        Args:
+            options: ``joinedload`` (extra relationships to load) and ``with_source``
+            limit: Maximum number of workflows to return
+            offset: Number of workflows to skip (ignored when a cursor is given)
+            cursor: Cursor of the last workflow of the previous page
+
+        Returns:
+            List of workflow dictionaries without ``data``/``flow_raw_data``, newest first
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
         options = options or {}
 
+        task_count = (
+            select(func.count(Task.id)).where(Task.workflow_id == Workflow.id).correlate(Workflow).scalar_subquery()
+        )
+        failed_task_count = (
+            select(func.count(Task.id))
+            .where(Task.workflow_id == Workflow.id, Task.status == "failed")
+            .correlate(Workflow)
+            .scalar_subquery()
+        )
+        # Correlated LIMIT 1 per row: an index seek on (workflow_id, created_at) instead of a scan
+        latest_status = (
+            select(Task.status)
+            .where(Task.workflow_id == Workflow.id)
+            .order_by(Task.created_at.desc())
+            .limit(1)
+            .correlate(Workflow)
+            .scalar_subquery()
+        )
+        query = select(Workflow, task_count, failed_task_count, latest_status).options(
+            defer(Workflow.data), defer(Workflow.flow_raw_data)
+        )
+        query = keyset_page(query, Workflow, cursor)
+
         # Apply pagination
         if limit is not None:
-            query = query.limit(limit).offset(offset)
-
-        # Always load schedules and tasks by default
-        if "joinedload" not in options:
-            options["joinedload"] = []
-        if isinstance(options["joinedload"], list):
-            options["joinedload"].extend(["schedules", "tasks"])
-
-        # Add other relationships if requested
+            query = query.limit(limit)
+        if offset and not cursor:
+            query = query.offset(offset)
+
+        # Schedules are always listed; tasks are only loaded if explicitly requested
+        relationships = ["schedules"]
+        joined = options.get("joinedload") or []
+        relationships.extend([joined] if isinstance(joined, str) else joined)
         if options.get("with_source"):
-            if isinstance(options["joinedload"], list):
-                options["joinedload"].append("workflow_source")
-            else:
-                options["joinedload"] = ["workflow_source"]
+            relationships.append("workflow_source")
 
-        # Apply joinedload options
-        if options.get("joinedload"):
-            for relationship in options["joinedload"]:
-                query = query.options(joinedload(getattr(Workflow, relationship)))
+        for relationship in dict.fromkeys(relationships):
+            loader = joinedload if relationship == "workflow_source" else selectinload
+            query = query.options(loader(getattr(Workflow, relationship)))
 
         result = await self.session.execute(query)
-        # Call unique() to handle collection relationships
-        workflows = result.unique().scalars().all()
-        return [workflow.to_dict() for workflow in workflows]
+        return [
+            workflow.to_dict(
+                include_data=False,
+                task_stats={
+                    "latest_run": latest.upper() if latest else "NEW",
+                    "task_count": count or 0,
+                    "failed_task_count": failed or 0,
+                },
+            )
+            for workflow, count, failed, latest in result.all()
+        ]
+
+    async def count_workflows(self, mode: CountMode = "exact") -> Optional[int]:
+        """Count total workflows.
 
-    async def count_workflows(self) -> int:
-        """Count total workflows."""
+        Args:
+            mode: How to count (exact, cached, estimate or none)
+        """
         query = select(func.count(Workflow.id))
-        result = await self.session.execute(query)
-        return result.scalar() or 0
+        return await count_total(self.session, query, mode, cache_key=("workflows",), table="workflows")
 
     async def get_workflow(self, workflow_id: str) -> Optional[Workflow]:
         """Get a workflow by ID.
@@ -397,17 +649,13 @@ class WorkflowManager:
         Returns:
             Optional[Workflow]: The workflow if found, None otherwise
         """
-        # Try to find by local ID first
-        query = (
-            select(Workflow)
-            .options(joinedload(Workflow.workflow_source))
-            .where(
-                or_(
-                    cast(Workflow.id, String) == workflow_id,
-                    Workflow.remote_flow_id == workflow_id,
-                )
-            )
-        )
+        # Both branches are index lookups: the primary key and ix_workflows_remote_flow_id
+        condition = Workflow.remote_flow_id == str(workflow_id)
+        workflow_uuid = parse_uuid(workflow_id)
+        if workflow_uuid is not None:
+            condition = or_(Workflow.id == workflow_uuid, condition)
+
+        query = select(Workflow).options(joinedload(Workflow.workflow_source)).where(condition)
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
@@ -418,27 +666,11 @@ class WorkflowManager:
 
         # If no exact match and workflow_id looks like UUID prefix, search by prefix
         if not workflow and len(workflow_id) < 36:
-            result = await self.session.execute(
-                select(Workflow).where(cast(Workflow.id, String).like(f"{workflow_id}%"))
-            )
-            workflows = result.scalars().all()
-            if len(workflows) > 1:
-                raise ValueError("Prefix matches multiple workflows")
-            workflow = workflows[0] if workflows else None
-
-        # Try again with sanitized id (remove dashes) for SQLite UUID representation
-        if not workflow:
-            sanitized = workflow_id.replace("-", "")
-            result = await self.session.execute(select(Workflow).where(cast(Workflow.id, String) == sanitized))
-            workflow = result.scalar_one_or_none()
+            workflow = await self.find_workflow_by_prefix(workflow_id)
 
         if not workflow:
             # If the id string is not a valid UUID and neither matches remote_flow_id, raise
-            import uuid
-
-            try:
-                uuid.UUID(workflow_id)
-            except ValueError:
+            if parse_uuid(workflow_id) is None:
                 raise ValueError("Invalid UUID format")
             return False
 
@@ -448,6 +680,11 @@ class WorkflowManager:
                 delete(TaskLog).where(TaskLog.task_id.in_(select(Task.id).where(Task.workflow_id == workflow.id)))
             )
 
+            # Delete stored task outputs
+            await self.session.execute(
+                delete(TaskOutput).where(TaskOutput.task_id.in_(select(Task.id).where(Task.workflow_id == workflow.id)))
+            )
+
             # Delete tasks
             await self.session.execute(delete(Task).where(Task.workflow_id == workflow.id))
 
@@ -466,11 +703,134 @@ class WorkflowManager:
             await self.session.rollback()
             raise e
 
+    async def set_workflow_retention(self, workflow_id: str, days: Optional[int]) -> Optional[Workflow]:
+        """Set how many days finished tasks of a workflow are kept.
+
+        Args:
+            workflow_id: Workflow ID, ID prefix or remote flow ID
+            days: Days to keep finished tasks, or None to use the global retention
+
+        Returns:
+            Optional[Workflow]: The updated workflow, or None if not found
+        """
+        if days is not None and days < 1:
+            raise ValueError("Retention must be at least one day")
+
+        workflow = await self.get_workflow(workflow_id)
+        if not workflow:
+            workflow = await self.find_workflow_by_prefix(workflow_id)
+        if not workflow:
+            return None
+
+        workflow.retention_days = days
+        await self.session.commit()
+        return workflow
+
+    async def set_workflow_queue(self, workflow_id: str, queue: Optional[str]) -> Optional[Workflow]:
+        """Set the queue (priority class) runs of a workflow are sent to.
+
+        Args:
+            workflow_id: Workflow ID, ID prefix or remote flow ID
+            queue: One of the declared queues, or None to route by source
+
+        Returns:
+            Optional[Workflow]: The updated workflow, or None if not found
+        """
+        from ..celery.routing import get_queue_names
+
+        if queue is not None and queue not in get_queue_names():
+            raise ValueError(f"Unknown queue {queue}; declared queues: {', '.join(get_queue_names())}")
+
+        workflow = await self.get_workflow(workflow_id)
+        if not workflow:
+            workflow = await self.find_workflow_by_prefix(workflow_id)
+        if not workflow:
+            return None
+
+        workflow.queue = queue
+        await self.session.commit()
+        return workflow
+
+    async def set_workflow_priority(self, workflow_id: str, priority: Optional[int]) -> Optional[Workflow]:
+        """Set the priority of runs of a workflow.
+
+        Args:
+            workflow_id: Workflow ID, ID prefix or remote flow ID
+            priority: 0 (lowest) to 9 (highest), or None for the default priority
+
+        Returns:
+            Optional[Workflow]: The updated workflow, or None if not found
+        """
+        from ..celery.routing import MAX_PRIORITY
+
+        if priority is not None and not 0 <= priority <= MAX_PRIORITY:
+            raise ValueError(f"Priority must be between 0 and {MAX_PRIORITY}")
+
+        workflow = await self.get_workflow(workflow_id)
+        if not workflow:
+            workflow = await self.find_workflow_by_prefix(workflow_id)
+        if not workflow:
+            return None
+
+        workflow.priority = priority
+        await self.session.commit()
+        return workflow
+
+    async def find_workflow_by_prefix(self, prefix: str) -> Optional[Workflow]:
+        """Find a workflow by a prefix of its ID, as shown by the CLI.
+
+        The prefix is matched as a range on the primary key, not by casting IDs to text.
+
+        Raises:
+            ValueError: If the prefix matches more than one workflow
+        """
+        condition = uuid_prefix_filter(Workflow.id, prefix)
+        if condition is None:
+            return None
+        result = await self.session.execute(select(Workflow).where(condition).limit(2))
+        workflows = result.scalars().all()
+        if len(workflows) > 1:
+            raise ValueError("Prefix matches multiple workflows")
+        return workflows[0] if workflows else None
+
     async def get_task(self, task_id: str) -> Optional[Task]:
         """Get a task by ID."""
-        query = select(Task).where(cast(Task.id, String) == task_id)
-        result = await self.session.execute(query)
-        return result.scalar_one_or_none()
+        task_uuid = parse_uuid(task_id)
+        if task_uuid is None:
+            return None
+        return await self.session.get(Task, task_uuid)
+
+    async def get_task_output(self, task: Task) -> Optional[str]:
+        """Load the raw output of a task whose row only holds a compact extract.
+
+        Returns:
+            Optional[str]: The raw output as stored before compaction, or None if it is inline
+        """
+        return await load_task_output(self.session, task)
+
+    async def find_task_by_prefix(self, prefix: str) -> Optional[Task]:
+        """Find a task by its ID or a prefix of it, as shown by the CLI.
+
+        Raises:
+            ValueError: If the prefix matches more than one task
+        """
+        task = await self.get_task(prefix)
+        if task:
+            return task
+        condition = uuid_prefix_filter(Task.id, prefix)
+        if condition is None:
+            return None
+        result = await self.session.execute(select(Task).where(condition).limit(2))
+        tasks = result.scalars().all()
+        if len(tasks) > 1:
+            raise ValueError("Prefix matches multiple tasks")
+        return tasks[0] if tasks else None
+
+    @staticmethod
+    def _task_workflow_filter(workflow_id: str):
+        """Filter tasks by workflow on the indexed UUID column; an invalid ID matches nothing."""
+        workflow_uuid = parse_uuid(workflow_id)
+        return Task.workflow_id == workflow_uuid if workflow_uuid is not None else false()
 
     async def list_tasks(
         self,
@@ -478,12 +838,26 @@ class WorkflowManager:
         status: Optional[str] = None,
         limit: int = 50,
         offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """List tasks from database."""
-        query = select(Task).order_by(Task.created_at.desc()).limit(limit).offset(offset)
+        """List tasks from database, newest first.
+
+        Args:
+            workflow_id: Only list tasks of this workflow
+            status: Only list tasks with this status
+            limit: Maximum number of tasks to return
+            offset: Number of tasks to skip (ignored when a cursor is given)
+            cursor: Cursor of the last task of the previous page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = keyset_page(select(Task), Task, cursor).limit(limit)
+        if offset and not cursor:
+            query = query.offset(offset)
 
         if workflow_id:
-            query = query.where(cast(Task.workflow_id, String) == workflow_id)
+            query = query.where(self._task_workflow_filter(workflow_id))
         if status:
             query = query.where(Task.status == status)
 
@@ -495,17 +869,30 @@ class WorkflowManager:
         self,
         workflow_id: Optional[str] = None,
         status: Optional[str] = None,
-    ) -> int:
-        """Count total tasks matching filters."""
+        mode: CountMode = "exact",
+    ) -> Optional[int]:
+        """Count total tasks matching filters.
+
+        Args:
+            workflow_id: Only count tasks of this workflow
+            status: Only count tasks with this status
+            mode: How to count (exact, cached, estimate or none)
+        """
         query = select(func.count(Task.id))
 
         if workflow_id:
-            query = query.where(cast(Task.workflow_id, String) == workflow_id)
+            query = query.where(self._task_workflow_filter(workflow_id))
         if status:
             query = query.where(Task.status == status)
 
-        result = await self.session.execute(query)
-        return result.scalar() or 0
+        filtered = bool(workflow_id or status)
+        return await count_total(
+            self.session,
+            query,
+            mode,
+            cache_key=("tasks", workflow_id, status),
+            table=None if filtered else "tasks",
+        )
 
     async def retry_task(self, task_id: str) -> Optional[Task]:
         """Retry a failed task."""
@@ -578,7 +965,7 @@ class WorkflowManager:
             logger.info(f"Remote flow ID: {workflow.remote_flow_id}")
 
             # Get adapter for this source
-            api_key = WorkflowSource.decrypt_api_key(source.encrypted_api_key)
+            api_key = WorkflowSource.decrypt_api_key(source.encrypted_api_key, source_id=source.id)
             adapter = AdapterRegistry.get_adapter(
                 source_type=source.source_type,
                 api_url=source.url,
@@ -586,10 +973,10 @@ class WorkflowManager:
                 source_id=source.id,
             )
 
-            # Execute workflow using adapter
+            # Execute workflow using adapter, within the workflow's and the source's run limits
             try:
-                with adapter:
-                    execution_result = adapter.run_flow_sync(workflow.remote_flow_id, input_data, str(task.id))
+                async with get_source_limiter().run_async(workflow, source), adapter:
+                    execution_result = await adapter.run_workflow(workflow, input_data, str(task.id))
 
                 # Handle execution result
                 if execution_result.success:
@@ -598,9 +985,10 @@ class WorkflowManager:
 
                     # Store the result appropriately based on its type
                     if isinstance(execution_result.result, (dict, list)):
-                        task.output_data = json.dumps(execution_result.result)
+                        encoded = json.dumps(execution_result.result)
                     else:
-                        task.output_data = str(execution_result.result)
+                        encoded = str(execution_result.result)
+                    await store_task_output_async(self.session, task, encoded)
 
                     task.status = "completed"
                     task.finished_at = datetime.now(timezone.utc)
@@ -610,6 +998,8 @@ class WorkflowManager:
                     task.error = execution_result.error or "No error details provided"
                     task.finished_at = datetime.now(timezone.utc)
 
+            except RunLimitError:
+                raise
             except Exception as e:
                 logger.error(f"Error executing flow: {str(e)}")
                 if isinstance(e, httpx.HTTPStatusError):
@@ -617,6 +1007,20 @@ class WorkflowManager:
                     logger.error(f"Response text: {e.response.text}")
                 raise
 
+        except RunLimitError as e:
+            # No room under the run limits: hand the task to a worker instead of failing it
+            logger.info(f"Task {task.id} requeued: {str(e)}")
+            task.status = "pending"
+            task.started_at = None
+            await self.session.commit()
+            try:
+                await self._send_task(workflow, task, countdown=e.retry_after)
+            except Exception as send_error:
+                logger.error(f"Failed to requeue task {task.id}: {str(send_error)}")
+                task.status = "failed"
+                task.error = f"Failed to requeue task: {str(send_error)}"
+                task.finished_at = datetime.now(timezone.utc)
+
         except Exception as e:
             logger.error(f"Failed to run workflow: {str(e)}")
             if isinstance(e, httpx.HTTPStatusError):
@@ -628,6 +1032,77 @@ class WorkflowManager:
         await self.session.commit()
         return task
 
+    async def _send_task(
+        self, workflow: Workflow, task: Task, kwargs: Optional[Dict[str, Any]] = None, countdown: Optional[float] = None
+    ):
+        """Send a pending task to a worker on its workflow's queue."""
+        # Imported here to avoid a circular import with the Celery task modules
+        from ..celery.routing import DIRECT_QUEUE, message_priority, queue_for_workflow, resolve_priority
+        from ..tasks.workflow_tasks import execute_task
+
+        options = {"countdown": countdown} if countdown is not None else {}
+        await asyncio.to_thread(
+            execute_task.apply_async,
+            args=(str(task.id),),
+            kwargs=kwargs or None,
+            queue=queue_for_workflow(workflow, default=DIRECT_QUEUE),
+            priority=message_priority(resolve_priority(workflow_priority=workflow.priority)),
+            **options,
+        )
+
+    async def enqueue_workflow(
+        self,
+        workflow_id: str | UUID,
+        input_data: str,
+        callback_url: Optional[str] = None,
+        stream: bool = False,
+    ) -> Optional[Task]:
+        """Create a pending task for a workflow and hand it to a worker on the direct queue.
+
+        Args:
+            workflow_id: ID of the workflow to run
+            input_data: Input data for the workflow
+            callback_url: Optional URL the worker POSTs the finished task to
+            stream: Run against the source's streaming endpoint and publish tokens
+                for ``GET /api/v1/tasks/{id}/stream``
+
+        Returns:
+            Optional[Task]: The pending task, or None if the workflow does not exist
+
+        Raises:
+            RuntimeError: If the task could not be sent to the broker
+        """
+        workflow = await self.get_workflow(str(workflow_id))
+        if not workflow:
+            return None
+
+        task = Task(
+            id=uuid4(),
+            workflow_id=workflow.id,
+            input_data=input_data,
+            status="pending",
+        )
+        self.session.add(task)
+        await self.session.commit()
+
+        kwargs = {}
+        if callback_url:
+            kwargs["callback_url"] = callback_url
+        if stream:
+            kwargs["stream"] = True
+        try:
+            await self._send_task(workflow, task, kwargs)
+        except Exception as e:
+            logger.error(f"Failed to enqueue task {task.id}: {str(e)}")
+            task.status = "failed"
+            task.error = f"Failed to enqueue task: {str(e)}"
+            task.finished_at = datetime.now(timezone.utc)
+            await self.session.commit()
+            raise RuntimeError(f"Failed to enqueue task {task.id}: {str(e)}") from e
+
+        logger.info(f"Enqueued task {task.id} for workflow {workflow.id}")
+        return task
+
     async def create_task(
         self, workflow_id: str, input_data: Optional[str] = None, max_retries: int = 3
     ) -> Optional[Task]:
@@ -650,26 +1125,12 @@ class WorkflowManager:
         }
         return await self.task.create_task(task_data)
 
-    async def _create_or_update_workflow(self, flow_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create or update a workflow from flow data."""
-        # Get existing workflow by remote flow ID
-        query = select(Workflow).where(Workflow.remote_flow_id == flow_data["id"])
-        result = await self.session.execute(query)
-        workflow = result.scalar_one_or_none()
-
-        # Get the source
-        source = (
-            await self.session.execute(select(WorkflowSource).where(WorkflowSource.url == self.source_manager.api_url))
-        ).scalar_one_or_none()
-
-        if not source:
-            raise ValueError(f"Source not found for URL: {self.source_manager.api_url}")
-
-        # Extract workflow fields from flow data
-        workflow_fields = {
+    def _workflow_fields(self, flow_data: Dict[str, Any], source: WorkflowSource) -> Dict[str, Any]:
+        """Map normalized flow data to Workflow column values, including the flow's content hash."""
+        fields = {
             "name": flow_data.get("name"),
             "description": flow_data.get("description"),
-            "source": self.source_manager.api_url,
+            "source": source.url,
             "remote_flow_id": flow_data["id"],
             "data": flow_data.get("data"),
             "flow_raw_data": flow_data,  # Store the complete flow data
@@ -684,35 +1145,86 @@ class WorkflowManager:
             "tags": flow_data.get("tags", []),
             "workflow_source_id": source.id,  # Use the actual source ID
         }
+        fields["flow_hash"] = self._flow_hash(fields)
+        return fields
+
+    @staticmethod
+    def _flow_hash(fields: Dict[str, Any]) -> str:
+        """Hash the synced content of a flow, ignoring upstream bookkeeping such as timestamps."""
+        content = {key: value for key, value in fields.items() if key not in _UNHASHED_FIELDS}
+        raw = fields.get("flow_raw_data") or {}
+        content["flow_raw_data"] = {key: value for key, value in raw.items() if key not in _VOLATILE_FLOW_KEYS}
+        encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _next_flow_version(workflow: Workflow) -> int:
+        """Get the flow version of a changed workflow.
+
+        Rows synced before content hashes existed keep their version, since
+        whether they changed is unknown.
+        """
+        version = workflow.flow_version or 1
+        return version + 1 if workflow.flow_hash else version
 
-        if workflow:
-            # Update existing workflow
-            for key, value in workflow_fields.items():
-                setattr(workflow, key, value)
+    @staticmethod
+    def _component_rows(workflow_id: UUID, flow_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build WorkflowComponent column values for the nodes of a flow."""
+        nodes = (flow_data.get("data") or {}).get("nodes") or []
+        return [
+            {
+                "id": uuid4(),
+                "workflow_id": workflow_id,
+                "component_id": node["id"],
+                "type": node.get("data", {}).get("type", "genericNode"),
+                "template": node.get("data", {}),
+                "tweakable_params": node.get("data", {}).get("template", {}),
+                "is_input": flow_data.get("input_component") == node["id"],
+                "is_output": flow_data.get("output_component") == node["id"],
+            }
+            for node in nodes
+        ]
+
+    async def _create_or_update_workflow(self, flow_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create or update a workflow from flow data."""
+        # Get existing workflow by remote flow ID
+        query = select(Workflow).where(Workflow.remote_flow_id == flow_data["id"])
+        result = await self.session.execute(query)
+        workflow = result.scalar_one_or_none()
+
+        # Get the source
+        source = (
+            await self.session.execute(select(WorkflowSource).where(WorkflowSource.url == self.source_manager.api_url))
+        ).scalar_one_or_none()
+
+        if not source:
+            raise ValueError(f"Source not found for URL: {self.source_manager.api_url}")
+
+        # Extract workflow fields from flow data
+        workflow_fields = self._workflow_fields(flow_data, source)
+
+        if workflow and workflow.flow_hash == workflow_fields["flow_hash"]:
+            # Nothing changed upstream: skip rewriting the flow and its components
+            logger.debug(f"Flow {flow_data['id']} is unchanged, skipping update")
         else:
-            # Create new workflow
-            workflow = Workflow(**workflow_fields)
-            self.session.add(workflow)
-
-        # Delete existing components if any
-        await self.session.execute(delete(WorkflowComponent).where(WorkflowComponent.workflow_id == workflow.id))
-
-        # Create components from flow data
-        if "data" in flow_data and "nodes" in flow_data["data"]:
-            for node in flow_data["data"]["nodes"]:
-                component = WorkflowComponent(
-                    id=uuid4(),
-                    workflow_id=workflow.id,
-                    component_id=node["id"],
-                    type=node.get("data", {}).get("type", "genericNode"),
-                    template=node.get("data", {}),
-                    tweakable_params=node.get("data", {}).get("template", {}),
-                    is_input=workflow.input_component == node["id"],
-                    is_output=workflow.output_component == node["id"],
-                )
-                self.session.add(component)
+            if workflow:
+                # Update existing workflow
+                workflow_fields["flow_version"] = self._next_flow_version(workflow)
+                for key, value in workflow_fields.items():
+                    setattr(workflow, key, value)
+            else:
+                # Create new workflow
+                workflow = Workflow(**workflow_fields)
+                self.session.add(workflow)
 
-        await self.session.commit()
+            # Delete existing components if any
+            await self.session.execute(delete(WorkflowComponent).where(WorkflowComponent.workflow_id == workflow.id))
+
+            # Create components from flow data
+            for component in self._component_rows(workflow.id, flow_data):
+                self.session.add(WorkflowComponent(**component))
+
+            await self.session.commit()
         # Detach the workflow from the session to avoid greenlet errors
         self.session.expunge(workflow)
         return {
@@ -768,9 +1280,10 @@ class SyncWorkflowManager:
 
     def get_workflow(self, workflow_id: str) -> Optional[Workflow]:
         """Get a workflow by ID."""
-        query = select(Workflow).where(cast(Workflow.id, String) == workflow_id)
-        result = self.session.execute(query)
-        return result.scalar_one_or_none()
+        workflow_uuid = parse_uuid(workflow_id)
+        if workflow_uuid is None:
+            return None
+        return self.session.get(Workflow, workflow_uuid)
 
     def run_workflow_sync(self, workflow: Workflow, task: Task, session: Session) -> Optional[Task]:
         """Run a workflow synchronously."""
@@ -784,8 +1297,7 @@ class SyncWorkflowManager:
             logger.info(f"Remote flow ID: {workflow.remote_flow_id}")
 
             # Get adapter for this source
-            api_key = WorkflowSource.decrypt_api_key(source.encrypted_api_key)
-            logger.info(f"Decrypted API key length: {len(api_key) if api_key else 0}")
+            api_key = WorkflowSource.decrypt_api_key(source.encrypted_api_key, source_id=source.id)
 
             adapter = AdapterRegistry.get_adapter(
                 source_type=source.source_type,
@@ -794,18 +1306,19 @@ class SyncWorkflowManager:
                 source_id=source.id,
             )
 
-            # Execute workflow using adapter
-            with adapter:
-                execution_result = adapter.run_flow_sync(workflow.remote_flow_id, task.input_data, str(task.id))
+            # Execute workflow using adapter, within the workflow's and the source's run limits
+            with get_source_limiter().run(workflow, source), adapter:
+                execution_result = adapter.run_workflow_sync(workflow, task.input_data, str(task.id))
 
             # Handle execution result
             if execution_result.success:
                 logger.info(f"Task {task.id} completed successfully")
                 # Store the result appropriately based on its type
                 if isinstance(execution_result.result, (dict, list)):
-                    task.output_data = json.dumps(execution_result.result)
+                    encoded = json.dumps(execution_result.result)
                 else:
-                    task.output_data = str(execution_result.result)
+                    encoded = str(execution_result.result)
+                store_task_output(session, task, encoded)
                 task.status = "completed"
                 task.finished_at = datetime.now(timezone.utc)
             else:
@@ -814,6 +1327,20 @@ class SyncWorkflowManager:
                 task.error = execution_result.error or "No error details provided"
                 task.finished_at = datetime.now(timezone.utc)
 
+        except RunLimitError as e:
+            # No room under the run limits: hand the task to a worker instead of failing it
+            logger.info(f"Task {task.id} requeued: {str(e)}")
+            task.status = "pending"
+            task.started_at = None
+            session.commit()
+            try:
+                self._send_task(session, task, countdown=e.retry_after)
+            except Exception as send_error:
+                logger.error(f"Failed to requeue task {task.id}: {str(send_error)}")
+                task.status = "failed"
+                task.error = f"Failed to requeue task: {str(send_error)}"
+                task.finished_at = datetime.now(timezone.utc)
+
         except Exception as e:
             logger.error(f"Failed to run workflow: {str(e)}")
             if isinstance(e, httpx.HTTPStatusError):
@@ -825,3 +1352,12 @@ class SyncWorkflowManager:
 
         session.commit()
         return task
+
+    def _send_task(self, session: Session, task: Task, countdown: Optional[float] = None):
+        """Send a pending task to a worker on its route."""
+        # Imported here to avoid a circular import with the Celery task modules
+        from ..celery.routing import routes_for_tasks
+        from ..tasks.workflow_tasks import execute_task
+
+        route = routes_for_tasks(session, [str(task.id)])[str(task.id)]
+        execute_task.apply_async((str(task.id),), countdown=countdown, queue=route.queue, priority=route.priority)
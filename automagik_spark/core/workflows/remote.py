@@ -1,7 +1,7 @@
 """LangFlow API integration."""
 
 import logging
-from typing import Any, Dict, List, Optional, TypeVar, Union
+from typing import Any, Dict, List, Optional, Tuple, TypeVar, Union
 from uuid import UUID
 from datetime import datetime
 from tenacity import (
@@ -16,6 +16,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field, field_validator, ConfigDict
 from ...api.config import get_langflow_api_url, get_langflow_api_key, get_http_timeout
+from .catalog import conditional_get
+from .endpoints import forget_resolved, resolve, resolve_async
+from .http_pool import sync_client
+from .streaming import EventCallback, iter_stream_events
 
 logger = logging.getLogger(__name__)
 
@@ -138,12 +142,12 @@ class BaseAPIClient:
     @staticmethod
     def _handle_error_response(response: httpx.Response) -> None:
         """Handle error responses from the API."""
-        if 400 <= response.status_code < 500:
+        if response.status_code == 429:
+            raise RateLimitError(f"Rate limit exceeded - {response.text}")
+        elif 400 <= response.status_code < 500:
             raise APIClientError(f"Client error: {response.status_code} - {response.text}")
         elif 500 <= response.status_code < 600:
             raise APIServerError(f"Server error: {response.status_code} - {response.text}")
-        elif response.status_code == 429:
-            raise RateLimitError("Rate limit exceeded")
         response.raise_for_status()
 
     @retry(
@@ -203,12 +207,12 @@ class LangFlowManager:
     @staticmethod
     def _handle_error_response(response: httpx.Response) -> None:
         """Handle error responses from the API."""
-        if 400 <= response.status_code < 500:
+        if response.status_code == 429:
+            raise RateLimitError(f"Rate limit exceeded - {response.text}")
+        elif 400 <= response.status_code < 500:
             raise APIClientError(f"Client error: {response.status_code} - {response.text}")
         elif 500 <= response.status_code < 600:
             raise APIServerError(f"Server error: {response.status_code} - {response.text}")
-        elif response.status_code == 429:
-            raise RateLimitError("Rate limit exceeded")
         response.raise_for_status()
 
     @retry(
@@ -327,11 +331,22 @@ class LangFlowManager:
             logger.warning("Calling sync method on async session. This may cause issues.")
 
         # Use a new client instance to avoid session type issues
-        with httpx.Client(headers=self.headers, timeout=self.timeout, verify=False) as client:
+        with sync_client(headers=self.headers, timeout=self.timeout, verify=False) as client:
             response = client.request(method, self._get_endpoint(endpoint), **kwargs)
             self._handle_error_response(response)
             return self._process_response(response)
 
+    def _get_sync_conditional(self, endpoint: str) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """GET a listing endpoint, revalidating the previous response if LangFlow sent an ETag."""
+        with sync_client(headers=self.headers, timeout=self.timeout, verify=False) as client:
+            data = conditional_get(client, self._get_endpoint(endpoint), check=self._handle_error_response)
+        # Copy, since the parsed body is kept for the next revalidation
+        if isinstance(data, dict):
+            return dict(data)
+        elif isinstance(data, list):
+            return [dict(item) for item in data]
+        return {}
+
     async def _get_folders(self) -> List[str]:
         """Get list of valid folder or project IDs.
 
@@ -341,7 +356,7 @@ class LangFlowManager:
         """
         # Legacy attempt – /folders/
         try:
-            folders = await self._make_request_async("GET", "folders/")
+            folders = await self._execute_async_request("GET", "folders/")
             if isinstance(folders, list) and folders:
                 return [item.get("id") for item in folders if item and item.get("id")]
         except Exception:
@@ -349,7 +364,7 @@ class LangFlowManager:
 
         # Fallback – /projects/
         try:
-            projects = await self._make_request_async("GET", "projects/")
+            projects = await self._execute_async_request("GET", "projects/")
             if isinstance(projects, list) and projects:
                 return [proj.get("id") for proj in projects if proj and proj.get("id")]
         except Exception as e:
@@ -361,7 +376,7 @@ class LangFlowManager:
         """Sync variant for _get_folders supporting both projects & folders."""
         # Legacy attempt – /folders/
         try:
-            folders = self._make_request_sync("GET", "folders/")
+            folders = self._get_sync_conditional("folders/")
             if isinstance(folders, list) and folders:
                 return [item.get("id") for item in folders if item and item.get("id")]
         except Exception:
@@ -369,7 +384,7 @@ class LangFlowManager:
 
         # Fallback – /projects/
         try:
-            projects = self._make_request_sync("GET", "projects/")
+            projects = self._get_sync_conditional("projects/")
             if isinstance(projects, list) and projects:
                 return [proj.get("id") for proj in projects if proj and proj.get("id")]
         except Exception as e:
@@ -402,7 +417,7 @@ class LangFlowManager:
             valid_containers = await self._get_folders()
 
             # Get all flows
-            flows = await self._make_request_async("GET", "flows/")
+            flows = await self._execute_async_request("GET", "flows/")
 
             def _get_container_id(flow: Dict[str, Any]):
                 return flow.get("folder_id") or flow.get("project_id")
@@ -446,7 +461,7 @@ class LangFlowManager:
             valid_containers = self._get_folders_sync()
 
             # Get all flows
-            flows = self._make_request_sync("GET", "flows/")
+            flows = self._get_sync_conditional("flows/")
 
             def _get_container_id(flow: Dict[str, Any]):
                 return flow.get("folder_id") or flow.get("project_id")
@@ -470,7 +485,7 @@ class LangFlowManager:
 
     async def get_flow(self, flow_id: str) -> Dict[str, Any]:
         """Get flow details from LangFlow API."""
-        return await self._make_request_async("GET", f"flows/{flow_id}")
+        return await self._execute_async_request("GET", f"flows/{flow_id}")
 
     def get_flow_sync(self, flow_id: str) -> Dict[str, Any]:
         """Get flow details from LangFlow API (sync version)."""
@@ -484,26 +499,46 @@ class LangFlowManager:
         """Get flow components from LangFlow API (sync version)."""
         return self._make_request_sync("GET", f"flows/{flow_id}/components/")
 
-    async def run_flow(self, flow_id: str, input_data: str | Dict[str, Any]) -> Dict[str, Any]:
-        """Run a flow with input data."""
-        try:
-            # Get flow data to find component IDs
-            flow_data = await self.get_flow(flow_id)
-            if not flow_data:
-                raise ValueError(f"Flow {flow_id} not found")
+    @staticmethod
+    def _chat_components(flow_data: Optional[Dict[str, Any]]) -> Optional[Tuple[str, str]]:
+        """Find the ChatInput and ChatOutput node IDs of a flow graph."""
+        if not flow_data:
+            return None
+        input_component = None
+        output_component = None
+        for node in (flow_data.get("data") or {}).get("nodes", []):
+            node_type = node.get("data", {}).get("type", "")
+            if node_type == "ChatInput":
+                input_component = node["id"]
+            elif node_type == "ChatOutput":
+                output_component = node["id"]
 
-            # Get input and output component IDs
-            input_component = None
-            output_component = None
-            for node in flow_data.get("data", {}).get("nodes", []):
-                node_type = node.get("data", {}).get("type", "")
-                if node_type == "ChatInput":
-                    input_component = node["id"]
-                elif node_type == "ChatOutput":
-                    output_component = node["id"]
+        if not input_component or not output_component:
+            raise ValueError("Could not find chat input and output components in flow")
+        return input_component, output_component
 
+    async def run_flow(
+        self,
+        flow_id: str,
+        input_data: str | Dict[str, Any],
+        input_component: Optional[str] = None,
+        output_component: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Run a flow with input data.
+
+        The chat component IDs of synced workflows are passed in; otherwise the
+        flow graph is downloaded once and the IDs are reused for later runs.
+        """
+        try:
             if not input_component or not output_component:
-                raise ValueError("Could not find chat input and output components in flow")
+
+                async def lookup():
+                    return self._chat_components(await self.get_flow(flow_id))
+
+                components = await resolve_async(self.api_url, flow_id, lookup)
+                if not components:
+                    raise ValueError(f"Flow {flow_id} not found")
+                input_component, output_component = components
 
             request_data = FlowExecuteRequest(
                 input_value=input_data,
@@ -519,38 +554,51 @@ class LangFlowManager:
             )
         except Exception as e:
             logger.error(f"Error in run_flow: {str(e)}")
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 404:
+                forget_resolved(self.api_url, flow_id)
             raise
 
-    def run_flow_sync(self, flow_id: str, input_data: str | Dict[str, Any]) -> Dict[str, Any]:
+    def run_flow_sync(
+        self,
+        flow_id: str,
+        input_data: str | Dict[str, Any],
+        input_component: Optional[str] = None,
+        output_component: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Run a flow with input data (sync version)."""
-        # Get flow data to find component IDs
-        flow_data = self.get_flow_sync(flow_id)
-        if not flow_data:
-            raise ValueError(f"Flow {flow_id} not found")
-
-        # Get input and output component IDs
-        input_component = None
-        output_component = None
-        for node in flow_data.get("data", {}).get("nodes", []):
-            node_type = node.get("data", {}).get("type", "")
-            if node_type == "ChatInput":
-                input_component = node["id"]
-            elif node_type == "ChatOutput":
-                output_component = node["id"]
-
         if not input_component or not output_component:
-            raise ValueError("Could not find chat input and output components in flow")
+            components = resolve(self.api_url, flow_id, lambda: self._chat_components(self.get_flow_sync(flow_id)))
+            if not components:
+                raise ValueError(f"Flow {flow_id} not found")
+            input_component, output_component = components
 
         request_data = FlowExecuteRequest(input_value=input_data, tweaks={input_component: {}, output_component: {}})
-        return self._make_request_sync(
-            "POST",
-            f"run/{flow_id}",
-            params={"stream": "false"},
-            json=request_data.dict(),
-        )
-
-    def run_workflow_sync(self, flow_id: str, input_data: str) -> Dict[str, Any]:
-        """Run a workflow synchronously."""
+        try:
+            return self._make_request_sync(
+                "POST",
+                f"run/{flow_id}",
+                params={"stream": "false"},
+                json=request_data.dict(),
+            )
+        except APIClientError:
+            # The flow may have been deleted or rebuilt; look it up again next time
+            forget_resolved(self.api_url, flow_id)
+            raise
+
+    def run_workflow_sync(
+        self, flow_id: str, input_data: str, on_event: Optional[EventCallback] = None
+    ) -> Dict[str, Any]:
+        """Run a workflow synchronously.
+
+        Args:
+            flow_id: ID of the flow to run
+            input_data: Input value for the flow
+            on_event: Optional callback; when given the run uses LangFlow's
+                streaming endpoint and tokens are relayed as they arrive
+
+        Returns:
+            Run response (the same shape whether streamed or not)
+        """
         try:
             # Don't check session type here to allow this method to be called from both contexts
             # self._check_session_type(False)
@@ -566,8 +614,10 @@ class LangFlowManager:
             )
 
             # Execute workflow using a new client instance to avoid session type issues
-            with httpx.Client(headers=self.headers, timeout=get_http_timeout(), verify=False) as client:
+            with sync_client(headers=self.headers, timeout=get_http_timeout(), verify=False) as client:
                 url = f"{self.api_url}/api/v1/run/{flow_id}"
+                if on_event is not None:
+                    return self._stream_workflow_sync(client, url, request_data.dict(), on_event)
                 response = client.post(url, json=request_data.dict(), params={"stream": "false"})
                 response.raise_for_status()
                 return response.json()
@@ -579,6 +629,55 @@ class LangFlowManager:
             logger.error(f"Error executing workflow: {str(e)}")
             raise
 
+    @staticmethod
+    def _stream_workflow_sync(
+        client: httpx.Client, url: str, payload: Dict[str, Any], on_event: EventCallback
+    ) -> Dict[str, Any]:
+        """Run a workflow with ``stream=true``, relaying tokens and returning the final result."""
+        result = None
+        with client.stream("POST", url, json=payload, params={"stream": "true"}) as response:
+            if response.is_error:
+                response.read()
+            response.raise_for_status()
+            for event, data in iter_stream_events(response.iter_lines()):
+                if event == "token":
+                    chunk = data.get("chunk") if isinstance(data, dict) else data
+                    if chunk:
+                        on_event("token", {"chunk": chunk})
+                elif event == "end":
+                    result = data.get("result", data) if isinstance(data, dict) else data
+                elif event == "error":
+                    message = data.get("error") or data.get("text") if isinstance(data, dict) else data
+                    raise ValueError(f"LangFlow run failed: {message or data}")
+                else:
+                    on_event("event", {"type": event, "data": data})
+
+        if result is None:
+            raise ValueError("LangFlow stream ended without a result")
+        return result
+
+    async def run_workflow(self, flow_id: str, input_data: str) -> Dict[str, Any]:
+        """Run a workflow (async version of run_workflow_sync)."""
+        try:
+            # Ensure input_data is a string
+            if not isinstance(input_data, str):
+                input_data = str(input_data)
+
+            request_data = FlowExecuteRequest(input_value=input_data, tweaks={})
+
+            async with httpx.AsyncClient(headers=self.headers, timeout=get_http_timeout(), verify=False) as client:
+                url = f"{self.api_url}/api/v1/run/{flow_id}"
+                response = await client.post(url, json=request_data.dict(), params={"stream": "false"})
+                response.raise_for_status()
+                return response.json()
+
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error executing workflow: {e.response.text}")
+            raise
+        except Exception as e:
+            logger.error(f"Error executing workflow: {str(e)}")
+            raise
+
     async def __aenter__(self):
         """Enter async context manager."""
         if self.is_async:
@@ -0,0 +1,92 @@
+"""
+Parsing of upstream streaming run responses.
+
+LangFlow (``stream=true``) and AutoMagik Hive (``stream=True``) answer runs
+with a stream of events instead of one JSON body. Depending on the version
+they are sent as Server-Sent Events (``event:``/``data:`` lines), as one JSON
+object per line, or as JSON objects written back to back. This module turns
+any of those into ``(event, data)`` pairs.
+"""
+
+import json
+import logging
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Callback receiving the events relayed while a run streams
+EventCallback = Callable[[str, Any], None]
+
+_decoder = json.JSONDecoder()
+
+
+def _normalize(event: Optional[str], payload: Any) -> Tuple[str, Any]:
+    """Get the event name and data of a payload.
+
+    LangFlow wraps its events as ``{"event": ..., "data": ...}``; Hive puts the
+    event name next to the other fields.
+    """
+    if isinstance(payload, dict):
+        if set(payload) == {"event", "data"}:
+            return str(payload["event"]), payload["data"]
+        return event or str(payload.get("event") or "message"), payload
+    return event or "message", payload
+
+
+def _sse_event(event: Optional[str], data_lines: List[str]) -> Tuple[str, Any]:
+    text = "\n".join(data_lines)
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        payload = text
+    return _normalize(event, payload)
+
+
+def _json_events(line: str) -> Iterator[Tuple[str, Any]]:
+    """Decode one or more JSON objects written on a single line."""
+    position = 0
+    line = line.strip()
+    while position < len(line):
+        try:
+            payload, end = _decoder.raw_decode(line, position)
+        except ValueError:
+            logger.debug(f"Ignoring unparseable stream line: {line[position:][:200]!r}")
+            return
+        yield _normalize(None, payload)
+        position = end
+        while position < len(line) and line[position].isspace():
+            position += 1
+
+
+def iter_stream_events(lines: Iterable[str]) -> Iterator[Tuple[str, Any]]:
+    """Iterate over the events of a streaming response.
+
+    Args:
+        lines: Lines of the response body, without line endings (e.g. ``response.iter_lines()``)
+
+    Yields:
+        Tuple of event name and data (parsed JSON when possible)
+    """
+    event = None
+    data_lines: List[str] = []
+    for line in lines:
+        if not line.strip():
+            if data_lines:
+                yield _sse_event(event, data_lines)
+            event, data_lines = None, []
+            continue
+        if line.startswith(":"):
+            continue
+        if line.startswith("event:"):
+            event = line[6:].strip()
+            continue
+        if line.startswith("data:"):
+            data = line[5:]
+            data_lines.append(data[1:] if data.startswith(" ") else data)
+            continue
+        if line.startswith(("id:", "retry:")):
+            continue
+        yield from _json_events(line)
+
+    if data_lines:
+        yield _sse_event(event, data_lines)
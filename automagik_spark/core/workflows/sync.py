@@ -16,10 +16,13 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ..database.models import Workflow, Task, WorkflowSource
+from ..database.outputs import store_task_output_async
 from ..schemas.source import SourceType
 from .remote import LangFlowManager  # Import from .remote module
 from .automagik_agents import AutoMagikAgentManager  # Import AutoMagik manager
 from .automagik_hive import AutomagikHiveManager  # Import AutoMagik Hive manager
+from .limiter import get_source_limiter
+from .streaming import EventCallback
 
 logger = logging.getLogger(__name__)
 
@@ -119,12 +122,19 @@ class WorkflowSync:
             if self._manager is None:
                 raise RuntimeError("Manager not initialized")
 
-            # Run the workflow via manager (await if coroutine)
-            run_call = (
-                self._manager.run_flow(workflow.remote_flow_id, input_data)
-                if callable(getattr(self._manager, "run_flow", None))
-                else None
-            )
+            # Run the workflow via manager (await if coroutine); LangFlow gets the synced
+            # chat components so it does not download the flow graph to find them
+            if isinstance(self._manager, LangFlowManager):
+                run_call = self._manager.run_flow(
+                    workflow.remote_flow_id,
+                    input_data,
+                    input_component=workflow.input_component,
+                    output_component=workflow.output_component,
+                )
+            elif callable(getattr(self._manager, "run_flow", None)):
+                run_call = self._manager.run_flow(workflow.remote_flow_id, input_data)
+            else:
+                run_call = None
             if asyncio.iscoroutine(run_call):
                 result = await run_call
             else:
@@ -132,7 +142,7 @@ class WorkflowSync:
 
             # Attempt to JSON-serialize result to store in DB
             try:
-                task.output_data = json.dumps(result)
+                await store_task_output_async(self.session, task, json.dumps(result))
             except TypeError:
                 await self._mark_task_failed(task, "Result is not JSON serializable")
                 raise
@@ -212,14 +222,23 @@ class WorkflowSyncSync:
         # Return the associated workflow source
         return workflow.workflow_source
 
-    def execute_workflow(self, workflow: Workflow, input_data: str) -> Optional[Dict[str, Any]]:
-        """Execute a workflow with the given input data."""
+    def execute_workflow(
+        self, workflow: Workflow, input_data: str, on_event: Optional[EventCallback] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Execute a workflow with the given input data.
+
+        Args:
+            workflow: Workflow to run
+            input_data: Input value for the workflow
+            on_event: Optional callback receiving streamed tokens and events;
+                sources without a streaming endpoint run as usual
+        """
         try:
             logger.info(
                 f"WorkflowSyncSync.execute_workflow called with workflow.id={workflow.id}, input_data={repr(input_data)}"
             )
-            # Get workflow source
-            source = self._get_workflow_source(str(workflow.id))
+            # Get workflow source (already loaded by callers that run many workflows)
+            source = workflow.workflow_source
             if not source:
                 raise ValueError(f"No source found for workflow {workflow.id}")
 
@@ -230,67 +249,76 @@ class WorkflowSyncSync:
 
             # Initialize appropriate manager based on source type
             logger.info(f"Source encrypted_api_key: {repr(source.encrypted_api_key)}")
-            api_key = WorkflowSource.decrypt_api_key(source.encrypted_api_key)
+            api_key = WorkflowSource.decrypt_api_key(source.encrypted_api_key, source_id=source.id)
             logger.info(f"Decrypted API key: {'***' if api_key else 'None'}")
 
-            if source.source_type == SourceType.AUTOMAGIK_AGENTS:
-                # Use AutoMagik manager for AutoMagik sources
-                logger.info(
-                    f"Creating AutoMagikAgentManager with api_url={source.url}, api_key={'***' if api_key else None}"
-                )
-                try:
-                    self._manager = AutoMagikAgentManager(api_url=source.url, api_key=api_key)
-                    logger.info("AutoMagikAgentManager created successfully")
-                except Exception as create_error:
-                    logger.error(f"Failed to create AutoMagikAgentManager: {create_error}")
-                    import traceback
-
-                    logger.error(f"Create manager traceback: {traceback.format_exc()}")
-                    raise
-                logger.info(
-                    f"Calling run_flow_sync with agent_id={workflow.remote_flow_id}, input_data={repr(input_data)}"
-                )
-                try:
-                    result = self._manager.run_flow_sync(workflow.remote_flow_id, input_data)
-                    logger.info("AutoMagik run_flow_sync completed successfully")
-                except Exception as automagik_error:
-                    logger.error(f"AutoMagik run_flow_sync failed with error: {automagik_error}")
-                    logger.error(f"Error type: {type(automagik_error)}")
-                    import traceback
-
-                    logger.error(f"Full traceback: {traceback.format_exc()}")
-                    raise
-            elif source.source_type == SourceType.AUTOMAGIK_HIVE:
-                # Use AutoMagik Hive manager for Hive sources
-                logger.info(
-                    f"Creating AutomagikHiveManager with api_url={source.url}, api_key={'***' if api_key else None}"
-                )
-                try:
-                    self._manager = AutomagikHiveManager(api_url=source.url, api_key=api_key)
-                    logger.info("AutomagikHiveManager created successfully")
-                except Exception as create_error:
-                    logger.error(f"Failed to create AutomagikHiveManager: {create_error}")
-                    import traceback
-
-                    logger.error(f"Create manager traceback: {traceback.format_exc()}")
-                    raise
-                logger.info(
-                    f"Calling run_flow_sync with flow_id={workflow.remote_flow_id}, input_data={repr(input_data)}"
-                )
-                try:
-                    result = self._manager.run_flow_sync(workflow.remote_flow_id, input_data)
-                    logger.info("AutoMagik Hive run_flow_sync completed successfully")
-                except Exception as hive_error:
-                    logger.error(f"AutoMagik Hive run_flow_sync failed with error: {hive_error}")
-                    logger.error(f"Error type: {type(hive_error)}")
-                    import traceback
-
-                    logger.error(f"Full traceback: {traceback.format_exc()}")
-                    raise
-            else:
-                # Default to LangFlow manager for other sources
-                self._manager = LangFlowManager(self.session, api_url=source.url, api_key=api_key)
-                result = self._manager.run_workflow_sync(workflow.remote_flow_id, input_data)
+            # Stay within the workflow's share of worker slots, wait for room under the
+            # source's run limits, then report how the run went
+            with get_source_limiter().run(workflow, source):
+                if source.source_type == SourceType.AUTOMAGIK_AGENTS:
+                    # Use AutoMagik manager for AutoMagik sources
+                    logger.info(
+                        f"Creating AutoMagikAgentManager with api_url={source.url}, "
+                        f"api_key={'***' if api_key else None}"
+                    )
+                    try:
+                        self._manager = AutoMagikAgentManager(api_url=source.url, api_key=api_key)
+                        logger.info("AutoMagikAgentManager created successfully")
+                    except Exception as create_error:
+                        logger.error(f"Failed to create AutoMagikAgentManager: {create_error}")
+                        import traceback
+
+                        logger.error(f"Create manager traceback: {traceback.format_exc()}")
+                        raise
+                    logger.info(
+                        f"Calling run_flow_sync with agent_id={workflow.remote_flow_id}, input_data={repr(input_data)}"
+                    )
+                    try:
+                        result = self._manager.run_flow_sync(workflow.remote_flow_id, input_data)
+                        logger.info("AutoMagik run_flow_sync completed successfully")
+                    except Exception as automagik_error:
+                        logger.error(f"AutoMagik run_flow_sync failed with error: {automagik_error}")
+                        logger.error(f"Error type: {type(automagik_error)}")
+                        import traceback
+
+                        logger.error(f"Full traceback: {traceback.format_exc()}")
+                        raise
+                elif source.source_type == SourceType.AUTOMAGIK_HIVE:
+                    # Use AutoMagik Hive manager for Hive sources
+                    logger.info(
+                        f"Creating AutomagikHiveManager with api_url={source.url}, api_key={'***' if api_key else None}"
+                    )
+                    try:
+                        self._manager = AutomagikHiveManager(api_url=source.url, api_key=api_key)
+                        logger.info("AutomagikHiveManager created successfully")
+                    except Exception as create_error:
+                        logger.error(f"Failed to create AutomagikHiveManager: {create_error}")
+                        import traceback
+
+                        logger.error(f"Create manager traceback: {traceback.format_exc()}")
+                        raise
+                    logger.info(
+                        f"Calling run_flow_sync with flow_id={workflow.remote_flow_id}, input_data={repr(input_data)}"
+                    )
+                    try:
+                        result = self._manager.run_flow_sync(
+                            workflow.remote_flow_id,
+                            input_data,
+                            on_event=on_event,
+                            flow_type=(workflow.data or {}).get("type"),
+                        )
+                        logger.info("AutoMagik Hive run_flow_sync completed successfully")
+                    except Exception as hive_error:
+                        logger.error(f"AutoMagik Hive run_flow_sync failed with error: {hive_error}")
+                        logger.error(f"Error type: {type(hive_error)}")
+                        import traceback
+
+                        logger.error(f"Full traceback: {traceback.format_exc()}")
+                        raise
+                else:
+                    # Default to LangFlow manager for other sources
+                    self._manager = LangFlowManager(self.session, api_url=source.url, api_key=api_key)
+                    result = self._manager.run_workflow_sync(workflow.remote_flow_id, input_data, on_event=on_event)
             if not result:
                 raise ValueError("No result from workflow execution")
 
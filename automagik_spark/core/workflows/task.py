@@ -9,7 +9,7 @@ from uuid import UUID, uuid4
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database.models import Task, TaskLog
+from ..database.models import Task, TaskLog, TaskOutput
 
 logger = logging.getLogger(__name__)
 
@@ -175,8 +175,9 @@ class TaskManager:
                 updated_at=task.updated_at,
             )
 
-            # Delete related task logs first
+            # Delete related task logs and stored output first
             await self.session.execute(delete(TaskLog).where(TaskLog.task_id == task_id))
+            await self.session.execute(delete(TaskOutput).where(TaskOutput.task_id == task_id))
 
             # Delete the task
             await self.session.execute(delete(Task).where(Task.id == task_id))
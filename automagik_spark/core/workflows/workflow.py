@@ -8,10 +8,11 @@ import logging
 from typing import List, Optional
 from uuid import UUID
 
-from sqlalchemy import select, cast, String
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
+from ..database.ids import uuid_prefix_filter
 from ..database.models import Workflow
 
 logger = logging.getLogger(__name__)
@@ -71,7 +72,11 @@ class LocalWorkflowManager:
             if exact_match:
                 query = query.where(Workflow.id == uuid_obj)
             else:
-                query = query.where(cast(Workflow.id, String).like(f"{workflow_id}%"))
+                prefix_filter = uuid_prefix_filter(Workflow.id, workflow_id)
+                if prefix_filter is None:
+                    logger.error(f"Invalid workflow ID: {workflow_id}")
+                    return False
+                query = query.where(prefix_filter)
 
             # Execute query
             result = await self.session.execute(query)
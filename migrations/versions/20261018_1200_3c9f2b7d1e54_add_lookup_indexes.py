@@ -0,0 +1,38 @@
+"""add_lookup_indexes
+
+Revision ID: 3c9f2b7d1e54
+Revises: 6e679733120
+Create Date: 2026-10-18 12:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9f2b7d1e54"
+down_revision: Union[str, None] = "6e679733120"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_tasks_workflow_id_created_at", "tasks", ["workflow_id", "created_at"]),
+    ("ix_tasks_status_created_at", "tasks", ["status", "created_at"]),
+    ("ix_schedules_status_next_run_at", "schedules", ["status", "next_run_at"]),
+    ("ix_workflows_remote_flow_id", "workflows", ["remote_flow_id"]),
+]
+
+
+def upgrade() -> None:
+    # Build concurrently on PostgreSQL so large tasks tables stay writable during the upgrade
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,27 @@
+"""add_workflow_retention_days
+
+Revision ID: 7a1d4e8c2b90
+Revises: 3c9f2b7d1e54
+Create Date: 2026-10-18 12:30:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7a1d4e8c2b90"
+down_revision: Union[str, None] = "3c9f2b7d1e54"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("workflows", sa.Column("retention_days", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("workflows", "retention_days")
@@ -0,0 +1,38 @@
+"""add_task_outputs
+
+Revision ID: b5e3f09a6c17
+Revises: 7a1d4e8c2b90
+Create Date: 2026-10-18 13:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e3f09a6c17"
+down_revision: Union[str, None] = "7a1d4e8c2b90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_outputs",
+        sa.Column("task_id", sa.UUID(), nullable=False),
+        sa.Column("encoding", sa.String(16), nullable=False, server_default="gzip"),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()")),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"]),
+        sa.PrimaryKeyConstraint("task_id"),
+    )
+    # The payload is already compressed; skip TOAST compression
+    op.execute("ALTER TABLE task_outputs ALTER COLUMN data SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    op.drop_table("task_outputs")
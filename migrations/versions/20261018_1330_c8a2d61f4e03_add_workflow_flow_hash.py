@@ -0,0 +1,27 @@
+"""add_workflow_flow_hash
+
+Revision ID: c8a2d61f4e03
+Revises: b5e3f09a6c17
+Create Date: 2026-10-18 13:30:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c8a2d61f4e03"
+down_revision: Union[str, None] = "b5e3f09a6c17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("workflows", sa.Column("flow_hash", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("workflows", "flow_hash")
@@ -0,0 +1,29 @@
+"""add_source_run_limits
+
+Revision ID: d4f7a2b9c6e1
+Revises: c8a2d61f4e03
+Create Date: 2026-10-18 14:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4f7a2b9c6e1"
+down_revision: Union[str, None] = "c8a2d61f4e03"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("workflow_sources", sa.Column("max_concurrency", sa.Integer(), nullable=True))
+    op.add_column("workflow_sources", sa.Column("max_runs_per_minute", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("workflow_sources", "max_runs_per_minute")
+    op.drop_column("workflow_sources", "max_concurrency")
@@ -0,0 +1,27 @@
+"""add_workflow_queue
+
+Revision ID: e9b3c5d7a1f2
+Revises: d4f7a2b9c6e1
+Create Date: 2026-10-18 14:30:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e9b3c5d7a1f2"
+down_revision: Union[str, None] = "d4f7a2b9c6e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("workflows", sa.Column("queue", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("workflows", "queue")
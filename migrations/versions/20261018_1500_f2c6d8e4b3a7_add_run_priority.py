@@ -0,0 +1,29 @@
+"""add_run_priority
+
+Revision ID: f2c6d8e4b3a7
+Revises: e9b3c5d7a1f2
+Create Date: 2026-10-18 15:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c6d8e4b3a7"
+down_revision: Union[str, None] = "e9b3c5d7a1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("workflows", sa.Column("priority", sa.Integer(), nullable=True))
+    op.add_column("schedules", sa.Column("priority", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("schedules", "priority")
+    op.drop_column("workflows", "priority")
@@ -0,0 +1,29 @@
+"""add_schedule_updated_at_index
+
+Revision ID: a3d5f7b9c2e4
+Revises: f2c6d8e4b3a7
+Create Date: 2026-10-18 15:30:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3d5f7b9c2e4"
+down_revision: Union[str, None] = "f2c6d8e4b3a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Build concurrently on PostgreSQL so schedules stay writable during the upgrade
+    with op.get_context().autocommit_block():
+        op.create_index("ix_schedules_updated_at", "schedules", ["updated_at"], postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_schedules_updated_at", table_name="schedules", postgresql_concurrently=True)
@@ -0,0 +1,29 @@
+"""add_task_created_at_id_index
+
+Revision ID: b4e6a8c1d3f5
+Revises: a3d5f7b9c2e4
+Create Date: 2026-10-18 16:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b4e6a8c1d3f5"
+down_revision: Union[str, None] = "a3d5f7b9c2e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Unfiltered task listings page by (created_at, id); build concurrently so tasks stay writable
+    with op.get_context().autocommit_block():
+        op.create_index("ix_tasks_created_at_id", "tasks", ["created_at", "id"], postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_tasks_created_at_id", table_name="tasks", postgresql_concurrently=True)
@@ -79,6 +79,19 @@ def setup_test_env():
     os.environ.pop("AUTOMAGIK_SPARK_DATABASE_URL", None)
 
 
+@pytest.fixture(autouse=True)
+def clear_flow_catalog():
+    """Start every test with empty remote flow catalog and resolved endpoint caches."""
+    from automagik_spark.core.workflows.catalog import reset_flow_catalog
+    from automagik_spark.core.workflows.endpoints import clear_resolved
+
+    reset_flow_catalog()
+    clear_resolved()
+    yield
+    reset_flow_catalog()
+    clear_resolved()
+
+
 # Configure pytest-asyncio to use session scope for event loop
 pytest.mark.asyncio.loop_scope = "session"
 
@@ -159,6 +172,7 @@ async def session(test_engine) -> AsyncGenerator[AsyncSession, None]:
             # Clean up all tables after each test
             try:
                 await session.execute(text("DELETE FROM task_logs"))
+                await session.execute(text("DELETE FROM task_outputs"))
                 await session.execute(text("DELETE FROM tasks"))
                 await session.execute(text("DELETE FROM workflow_components"))
                 await session.execute(text("DELETE FROM workers"))
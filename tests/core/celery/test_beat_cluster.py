@@ -0,0 +1,115 @@
+"""Test cases for clustered beat coordination."""
+
+import time
+from datetime import timedelta
+
+from celery.schedules import crontab, schedule
+
+from automagik_spark.core.celery.beat_cluster import BeatCluster, fire_slot, pick_owner
+
+
+class _FakeRedis:
+    """Just enough of a Redis client for BeatCluster."""
+
+    def __init__(self):
+        self.zsets = {}
+        self.keys = {}
+
+    def pipeline(self):
+        return _FakePipeline(self)
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        for member in [m for m, score in zset.items() if score <= high]:
+            del zset[member]
+
+    def zrange(self, key, start, end):
+        return sorted(self.zsets.get(key, {}))
+
+    def zrem(self, key, member):
+        self.zsets.get(key, {}).pop(member, None)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = value
+        return True
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+
+        return call
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+def test_each_key_has_exactly_one_owner():
+    """Rendezvous hashing splits keys across live members."""
+    client = _FakeRedis()
+    nodes = [BeatCluster(client, node_id=f"node-{i}") for i in range(3)]
+    for node in nodes:
+        node.heartbeat(force=True)
+    for node in nodes:
+        node.heartbeat(force=True)
+
+    keys = [f"schedule_{i}" for i in range(300)]
+    for key in keys:
+        assert sum(node.owns(key) for node in nodes) == 1
+    assert all(any(node.owns(key) for key in keys) for node in nodes)
+
+
+def test_dead_member_keys_move_to_survivors():
+    """Only the keys of a member that stopped heartbeating change owner."""
+    client = _FakeRedis()
+    alive, dead = BeatCluster(client, node_id="alive"), BeatCluster(client, node_id="dead")
+    dead.heartbeat(force=True)
+    alive.heartbeat(force=True)
+    assert alive.members == ["alive", "dead"]
+
+    # Age the dead member past its TTL
+    client.zsets[alive.members_key]["dead"] = time.time() - 3600
+    assert alive.heartbeat(force=True) is True
+    assert alive.members == ["alive"]
+    assert all(alive.owns(f"schedule_{i}") for i in range(50))
+    assert pick_owner(["a", "b"], "key") == pick_owner(["b", "a"], "key")
+
+
+def test_claim_deduplicates_sends_in_a_slot():
+    """Two members that both think they own a key send it once per slot."""
+    client = _FakeRedis()
+    first, second = BeatCluster(client, node_id="first"), BeatCluster(client, node_id="second")
+    now = time.time()
+
+    assert first.claim("schedule_1", now) is True
+    assert second.claim("schedule_1", now) is False
+    assert second.claim("schedule_1", now + 120) is True
+
+
+def test_short_intervals_send_every_run():
+    """A 10 second interval is claimed six times a minute, once per run."""
+    client = _FakeRedis()
+    first, second = BeatCluster(client, node_id="first"), BeatCluster(client, node_id="second")
+    slot = fire_slot(schedule(timedelta(seconds=10)))
+    start = time.time() // 10 * 10 + 1
+
+    sent = 0
+    for run in range(6):
+        now = start + run * 10
+        sent += first.claim("schedule_1", now, slot) + second.claim("schedule_1", now + 0.01, slot)
+
+    assert slot == 10
+    assert sent == 6
+    assert fire_slot(crontab()) == 60
+    assert fire_slot(schedule(timedelta(hours=1))) == 60
@@ -0,0 +1,236 @@
+"""Test cases for the database-backed beat scheduler."""
+
+import pytest
+from datetime import timedelta
+from uuid import uuid4
+from sqlalchemy import delete
+
+from automagik_spark.core.celery.celery_app import app
+from automagik_spark.core.celery.scheduler import DatabaseScheduler
+from automagik_spark.core.database.models import Schedule, Workflow
+
+
+@pytest.fixture
+async def sample_workflow(session):
+    """Create a sample workflow for testing."""
+    workflow = Workflow(
+        id=uuid4(),
+        name="Test Workflow",
+        source="test",
+        remote_flow_id="test-workflow",
+        data={"test": "data"},
+    )
+    session.add(workflow)
+    await session.commit()
+    return workflow
+
+
+async def _add_schedule(session, workflow, schedule_type="interval", schedule_expr="30m"):
+    schedule = Schedule(
+        id=uuid4(),
+        workflow_id=workflow.id,
+        schedule_type=schedule_type,
+        schedule_expr=schedule_expr,
+        status="active",
+    )
+    session.add(schedule)
+    await session.commit()
+    return schedule
+
+
+@pytest.fixture
+def beat_schedule():
+    """Install a static beat entry for the duration of a test."""
+    original = app.conf.beat_schedule
+    app.conf.beat_schedule = {
+        "static-entry": {"task": "automagik_spark.core.celery.tasks.print_active_schedules", "schedule": 60.0}
+    }
+    yield
+    app.conf.beat_schedule = original
+
+
+@pytest.mark.asyncio
+async def test_initial_load_keeps_static_entries(session, sample_workflow, beat_schedule):
+    """Database entries are loaded next to the static beat schedule."""
+    schedule = await _add_schedule(session, sample_workflow)
+    await _add_schedule(session, sample_workflow, "cron", "0 8 * * *")
+
+    scheduler = DatabaseScheduler(app=app)
+
+    assert "static-entry" in scheduler.schedule
+    assert f"schedule_{schedule.id}" in scheduler.schedule
+    assert len([name for name in scheduler.schedule if name.startswith("schedule_")]) == 2
+
+
+@pytest.mark.asyncio
+async def test_sync_changes_keeps_unchanged_entries(session, sample_workflow):
+    """Unchanged rows keep their entry (and its last_run_at) across syncs."""
+    schedule = await _add_schedule(session, sample_workflow)
+    scheduler = DatabaseScheduler(app=app)
+    entry = scheduler.schedule[f"schedule_{schedule.id}"]
+
+    scheduler.sync_changes()
+
+    assert scheduler.schedule[f"schedule_{schedule.id}"] is entry
+
+
+@pytest.mark.asyncio
+async def test_sync_changes_applies_deltas(session, sample_workflow):
+    """New, edited and paused rows are picked up without a full reload."""
+    kept = await _add_schedule(session, sample_workflow)
+    paused = await _add_schedule(session, sample_workflow)
+    scheduler = DatabaseScheduler(app=app)
+    kept_entry = scheduler.schedule[f"schedule_{kept.id}"]
+
+    added = await _add_schedule(session, sample_workflow, "cron", "*/5 * * * *")
+    paused.status = "paused"
+    kept.schedule_expr = "1h"
+    await session.commit()
+
+    scheduler.sync_changes()
+
+    assert f"schedule_{added.id}" in scheduler.schedule
+    assert f"schedule_{paused.id}" not in scheduler.schedule
+    assert scheduler.schedule[f"schedule_{kept.id}"] is not kept_entry
+    assert scheduler.schedule[f"schedule_{kept.id}"].schedule.run_every.total_seconds() == 3600
+
+
+@pytest.mark.asyncio
+async def test_full_sync_drops_deleted_rows(session, sample_workflow):
+    """Hard deletes are only visible to the periodic full reconciliation."""
+    schedule = await _add_schedule(session, sample_workflow)
+    scheduler = DatabaseScheduler(app=app)
+
+    await session.execute(delete(Schedule).where(Schedule.id == schedule.id))
+    await session.commit()
+
+    scheduler.sync_changes()
+    assert f"schedule_{schedule.id}" in scheduler.schedule
+
+    scheduler.full_sync_interval = 0
+    scheduler.sync_changes()
+    assert f"schedule_{schedule.id}" not in scheduler.schedule
+
+
+@pytest.mark.asyncio
+async def test_apply_changes_only_touches_notified_rows(session, sample_workflow):
+    """Notified IDs are applied directly, including deletions."""
+    notified = await _add_schedule(session, sample_workflow)
+    deleted = await _add_schedule(session, sample_workflow)
+    scheduler = DatabaseScheduler(app=app)
+
+    other = await _add_schedule(session, sample_workflow)
+    notified.status = "paused"
+    await session.execute(delete(Schedule).where(Schedule.id == deleted.id))
+    await session.commit()
+
+    scheduler.apply_changes({str(notified.id), str(deleted.id)})
+
+    assert f"schedule_{notified.id}" not in scheduler.schedule
+    assert f"schedule_{deleted.id}" not in scheduler.schedule
+    # Not notified, so left for the next poll
+    assert f"schedule_{other.id}" not in scheduler.schedule
+
+
+def test_publish_schedule_change_without_redis_broker(monkeypatch):
+    """Publishing is a no-op when the broker is not Redis."""
+    from automagik_spark.core.celery import schedule_events
+
+    monkeypatch.setenv("AUTOMAGIK_SPARK_CELERY_BROKER_URL", "amqp://guest@localhost//")
+    monkeypatch.setattr(schedule_events, "_publisher", None)
+    monkeypatch.setattr(schedule_events, "_publisher_failed_at", None)
+
+    assert schedule_events.publish_schedule_change("some-id") is False
+    assert schedule_events.ScheduleChangeListener.create() is None
+
+
+def test_change_messages_that_are_not_id_lists_are_ignored():
+    from automagik_spark.core.celery.schedule_events import ScheduleChangeListener
+
+    changes = set()
+    for data in ("5", '"abc"', '{"id": 1}', "not json", None, '["a", "b"]'):
+        ScheduleChangeListener._parse(data, changes)
+
+    assert changes == {"a", "b"}
+
+
+@pytest.mark.asyncio
+async def test_tick_sends_only_due_entries(session, sample_workflow, monkeypatch):
+    """Due entries are popped from the due queue and rescheduled."""
+    due = await _add_schedule(session, sample_workflow, "one-time", "now")
+    later = await _add_schedule(session, sample_workflow, "interval", "1h")
+    scheduler = DatabaseScheduler(app=app)
+
+    sent = []
+    monkeypatch.setattr(scheduler, "apply_entry", lambda entry, producer=None: sent.append(entry.name))
+    monkeypatch.setattr(DatabaseScheduler, "producer", None)
+    entry = scheduler.schedule[f"schedule_{due.id}"]
+    entry.last_run_at = entry.default_now() - timedelta(minutes=1)
+    scheduler._due.push(f"schedule_{due.id}", 0)
+
+    interval = scheduler._run_due()
+
+    assert sent == [f"schedule_{due.id}"]
+    assert f"schedule_{due.id}" in scheduler._due
+    assert f"schedule_{later.id}" in scheduler._due
+    assert 0 < interval <= scheduler.max_interval
+
+
+@pytest.mark.asyncio
+async def test_batch_dispatch_groups_due_schedules(session, sample_workflow, monkeypatch):
+    """With batch dispatch, due database entries are sent as one batch."""
+    first = await _add_schedule(session, sample_workflow, "one-time", "now")
+    second = await _add_schedule(session, sample_workflow, "one-time", "now")
+    scheduler = DatabaseScheduler(app=app)
+    scheduler.batch_dispatch = True
+
+    batches = []
+    monkeypatch.setattr(scheduler, "_dispatch_batch", batches.append)
+    monkeypatch.setattr(scheduler, "apply_entry", lambda entry, producer=None: pytest.fail("sent individually"))
+    for schedule in (first, second):
+        entry = scheduler.schedule[f"schedule_{schedule.id}"]
+        entry.last_run_at = entry.default_now() - timedelta(minutes=1)
+        scheduler._due.push(f"schedule_{schedule.id}", 0)
+
+    scheduler._run_due()
+
+    assert len(batches) == 1
+    assert sorted(batches[0]) == sorted([str(first.id), str(second.id)])
+
+
+@pytest.mark.asyncio
+async def test_entries_carry_schedule_priority(session, sample_workflow, monkeypatch):
+    """Beat entries send runs at the schedule's priority, else the workflow's."""
+    monkeypatch.setenv("AUTOMAGIK_SPARK_CELERY_BROKER_URL", "amqp://localhost")
+    sample_workflow.priority = 2
+    await session.commit()
+    inherited = await _add_schedule(session, sample_workflow)
+    urgent = await _add_schedule(session, sample_workflow, "cron", "0 8 * * *")
+    urgent.priority = 9
+    await session.commit()
+
+    scheduler = DatabaseScheduler(app=app)
+
+    assert scheduler.schedule[f"schedule_{inherited.id}"].options["priority"] == 2
+    assert scheduler.schedule[f"schedule_{urgent.id}"].options["priority"] == 9
+
+
+@pytest.mark.asyncio
+async def test_notified_changes_wait_for_the_beat_thread(session, sample_workflow, monkeypatch):
+    """In-process notifications are queued and applied by the next tick, not by the caller."""
+    from automagik_spark.core.celery import scheduler as beat_scheduler
+
+    schedule = await _add_schedule(session, sample_workflow)
+    scheduler = DatabaseScheduler(app=app)
+    monkeypatch.setattr(beat_scheduler, "publish_schedule_change", lambda *ids: False)
+    monkeypatch.setattr(scheduler, "_listener", None)
+    monkeypatch.setattr(scheduler, "_run_due", lambda: 1.0)
+    monkeypatch.setattr(scheduler, "_poll_due", lambda: False)
+
+    schedule.status = "paused"
+    await session.commit()
+    beat_scheduler.notify_scheduler_change(schedule.id)
+
+    assert f"schedule_{schedule.id}" in scheduler.schedule
+    scheduler.tick()
+    assert f"schedule_{schedule.id}" not in scheduler.schedule
@@ -0,0 +1,157 @@
+"""Test cases for routing workflow runs to queues."""
+
+from unittest.mock import patch
+from uuid import uuid4
+
+import click
+import pytest
+from sqlalchemy.orm import Session
+
+from automagik_spark.cli.commands.worker import parse_queue_spec
+from automagik_spark.core.celery.routing import (
+    get_queue_names,
+    message_priority,
+    queues_for_tasks,
+    resolve_priority,
+    resolve_queue,
+    routes_for_tasks,
+)
+from automagik_spark.core.database.models import Schedule, Task, Workflow, WorkflowSource
+from automagik_spark.core.workflows.manager import WorkflowManager
+
+
+@pytest.fixture
+def routes(monkeypatch):
+    monkeypatch.setenv("AUTOMAGIK_SPARK_QUEUE_ROUTES", "automagik-hive=slow, langflow=fast")
+    monkeypatch.setenv("AUTOMAGIK_SPARK_QUEUES", "interactive")
+
+
+@pytest.fixture
+async def routed_workflows(session):
+    hive = WorkflowSource(
+        id=uuid4(), source_type="automagik-hive", url="http://hive", encrypted_api_key="key", status="active"
+    )
+    langflow = WorkflowSource(
+        id=uuid4(), source_type="langflow", url="http://langflow", encrypted_api_key="key", status="active"
+    )
+    workflows = [
+        Workflow(id=uuid4(), name="hive", source="hive", remote_flow_id="a", data={}, workflow_source_id=hive.id),
+        Workflow(
+            id=uuid4(),
+            name="pinned",
+            source="hive",
+            remote_flow_id="b",
+            data={},
+            workflow_source_id=hive.id,
+            queue="interactive",
+        ),
+        Workflow(id=uuid4(), name="local", source="test", remote_flow_id="c", data={}),
+        Workflow(
+            id=uuid4(), name="langflow", source="langflow", remote_flow_id="d", data={}, workflow_source_id=langflow.id
+        ),
+    ]
+    session.add_all([hive, langflow, *workflows])
+    await session.commit()
+    return workflows
+
+
+def test_resolve_queue_precedence(routes, monkeypatch):
+    """The workflow's queue wins over a source ID route, which wins over a source type route."""
+    source_id = uuid4()
+    assert resolve_queue(None, source_id, "automagik-hive") == "slow"
+    assert resolve_queue("interactive", source_id, "automagik-hive") == "interactive"
+    assert resolve_queue(None, source_id, "automagik-agents", default="direct") == "direct"
+
+    monkeypatch.setenv("AUTOMAGIK_SPARK_QUEUE_ROUTES", f"automagik-hive=slow,{source_id}=fast")
+    assert resolve_queue(None, source_id, "automagik-hive") == "fast"
+
+
+def test_queue_names_include_routes(routes):
+    assert get_queue_names() == ["celery", "direct", "slow", "fast", "interactive"]
+
+
+async def test_queues_for_tasks_in_one_query(routes, session, routed_workflows, test_sync_engine):
+    tasks = [
+        Task(id=uuid4(), workflow_id=workflow.id, input_data="hi", status="pending") for workflow in routed_workflows
+    ]
+    session.add_all(tasks)
+    await session.commit()
+
+    task_ids = [str(task.id) for task in tasks]
+    with Session(test_sync_engine) as sync_session:
+        queues = queues_for_tasks(sync_session, task_ids)
+
+    assert [queues[task_id] for task_id in task_ids] == ["slow", "interactive", "celery", "fast"]
+
+
+async def test_enqueue_routes_by_source(routes, session, routed_workflows):
+    manager = WorkflowManager(session)
+    with patch("automagik_spark.core.tasks.workflow_tasks.execute_task.apply_async") as apply_async:
+        await manager.enqueue_workflow(routed_workflows[0].remote_flow_id, "hello")
+        await manager.enqueue_workflow(routed_workflows[2].remote_flow_id, "hello")
+
+    assert [call.kwargs["queue"] for call in apply_async.call_args_list] == ["slow", "direct"]
+
+
+async def test_set_workflow_queue(routes, session, routed_workflows):
+    manager = WorkflowManager(session)
+    workflow = routed_workflows[0]
+
+    assert (await manager.set_workflow_queue(str(workflow.id), "interactive")).queue == "interactive"
+    assert (await manager.set_workflow_queue(str(workflow.id), None)).queue is None
+    with pytest.raises(ValueError):
+        await manager.set_workflow_queue(str(workflow.id), "missing")
+
+
+def test_parse_queue_spec(routes):
+    assert parse_queue_spec("slow", 2) == (["slow"], 2)
+    assert parse_queue_spec("fast,interactive:8", 2) == (["fast", "interactive"], 8)
+    for spec in ("missing:2", "slow:0", "slow:many", ":4"):
+        with pytest.raises(click.BadParameter):
+            parse_queue_spec(spec, 2)
+
+
+def test_resolve_priority():
+    assert resolve_priority() == 5
+    assert resolve_priority(None, 2) == 2
+    assert resolve_priority(8, 2) == 8
+    assert resolve_priority(0, 9) == 0
+
+
+def test_message_priority_follows_broker(monkeypatch):
+    """Redis serves priority 0 first, so run priorities are inverted for it."""
+    monkeypatch.setenv("AUTOMAGIK_SPARK_CELERY_BROKER_URL", "redis://localhost:6379/0")
+    assert message_priority(9) == 0
+    monkeypatch.setenv("AUTOMAGIK_SPARK_CELERY_BROKER_URL", "amqp://localhost")
+    assert message_priority(9) == 9
+
+
+async def test_routes_use_schedule_then_workflow_priority(session, routed_workflows, test_sync_engine, monkeypatch):
+    monkeypatch.setenv("AUTOMAGIK_SPARK_CELERY_BROKER_URL", "amqp://localhost")
+    workflow = routed_workflows[2]
+    workflow.priority = 3
+    schedule = Schedule(
+        id=uuid4(), workflow_id=workflow.id, schedule_type="interval", schedule_expr="10s", priority=8
+    )
+    session.add(schedule)
+    await session.commit()
+    scheduled = Task(id=uuid4(), workflow_id=workflow.id, schedule_id=schedule.id, input_data="hi", status="pending")
+    direct = Task(id=uuid4(), workflow_id=workflow.id, input_data="hi", status="pending")
+    session.add_all([scheduled, direct])
+    await session.commit()
+
+    with Session(test_sync_engine) as sync_session:
+        routes = routes_for_tasks(sync_session, [str(scheduled.id), str(direct.id)])
+
+    assert routes[str(scheduled.id)].priority == 8
+    assert routes[str(direct.id)].priority == 3
+
+
+async def test_set_workflow_priority(session, routed_workflows):
+    manager = WorkflowManager(session)
+    workflow = routed_workflows[0]
+
+    assert (await manager.set_workflow_priority(str(workflow.id), 9)).priority == 9
+    assert (await manager.set_workflow_priority(str(workflow.id), None)).priority is None
+    with pytest.raises(ValueError):
+        await manager.set_workflow_priority(str(workflow.id), 10)
@@ -0,0 +1,111 @@
+"""Tests for live task events and the task stream endpoint."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from automagik_spark.api.routers import tasks as tasks_router
+from automagik_spark.core.celery import task_events
+from automagik_spark.core.celery.task_events import TaskEventSubscriber, iter_task_events
+
+
+class FakeSubscriber:
+    def __init__(self, *events):
+        self.events = list(events)
+        self.closed = False
+
+    async def get(self, timeout):
+        return self.events.pop(0) if self.events else None
+
+    async def close(self):
+        self.closed = True
+
+
+def status_sequence(*states):
+    states = list(states)
+
+    async def get_status():
+        return states.pop(0) if len(states) > 1 else states[0]
+
+    return get_status
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+async def test_finished_task_ends_immediately():
+    with patch.object(TaskEventSubscriber, "create", AsyncMock(return_value=None)):
+        events = await collect(iter_task_events(uuid4(), status_sequence({"status": "completed", "error": None})))
+
+    assert events == [("done", {"status": "completed", "error": None})]
+
+
+async def test_events_are_relayed_until_done():
+    subscriber = FakeSubscriber(
+        ("token", {"chunk": "Hel"}),
+        ("token", {"chunk": "lo"}),
+        ("done", {"status": "completed", "error": None}),
+    )
+    get_status = status_sequence({"status": "running", "error": None}, {"status": "completed", "error": None})
+
+    with patch.object(TaskEventSubscriber, "create", AsyncMock(return_value=subscriber)):
+        events = await collect(iter_task_events(uuid4(), get_status, poll_interval=0.05))
+
+    assert events[0] == ("status", {"status": "running"})
+    assert [data["chunk"] for event, data in events if event == "token"] == ["Hel", "lo"]
+    assert events[-1] == ("done", {"status": "completed", "error": None})
+    assert subscriber.closed
+
+
+async def test_without_redis_the_task_is_polled():
+    get_status = status_sequence(
+        {"status": "pending", "error": None},
+        {"status": "running", "error": None},
+        {"status": "failed", "error": "boom"},
+    )
+    with patch.object(TaskEventSubscriber, "create", AsyncMock(return_value=None)):
+        events = await collect(iter_task_events(uuid4(), get_status, poll_interval=0.01))
+
+    assert events == [
+        ("status", {"status": "pending"}),
+        ("keepalive", None),
+        ("status", {"status": "running"}),
+        ("keepalive", None),
+        ("done", {"status": "failed", "error": "boom"}),
+    ]
+
+
+def test_publish_backs_off_when_broker_is_down(monkeypatch):
+    monkeypatch.setattr(task_events, "_publisher", None)
+    monkeypatch.setattr(task_events, "_publisher_failed_at", None)
+    publisher = MagicMock()
+    publisher.publish.side_effect = ConnectionError("refused")
+
+    with patch("redis.from_url", return_value=publisher) as from_url:
+        assert task_events.publish_task_event("task", "token", {"chunk": "a"}) is False
+        assert task_events.publish_task_event("task", "token", {"chunk": "b"}) is False
+
+    assert from_url.call_count == 1
+    assert publisher.publish.call_args[0][0] == "automagik_spark:task:task"
+
+
+async def test_stream_endpoint_formats_server_sent_events():
+    task_id = uuid4()
+    flow_manager = MagicMock()
+    flow_manager.get_task = AsyncMock(return_value=MagicMock(id=task_id))
+
+    async def fake_events(*args, **kwargs):
+        yield "token", {"chunk": "Hi"}
+        yield "keepalive", None
+        yield "done", {"status": "completed", "error": None}
+
+    with patch.object(tasks_router, "iter_task_events", fake_events):
+        response = await tasks_router.stream_task(str(task_id), flow_manager)
+        body = "".join([chunk async for chunk in response.body_iterator])
+
+    assert response.media_type == "text/event-stream"
+    assert body == (
+        'event: token\ndata: {"chunk": "Hi"}\n\n'
+        ": keepalive\n\n"
+        'event: done\ndata: {"status": "completed", "error": null}\n\n'
+    )
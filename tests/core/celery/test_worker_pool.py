@@ -0,0 +1,64 @@
+"""Test cases for running workers in thread and green pools."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import click
+import pytest
+
+from automagik_spark.cli.commands.worker import _worker_command, resolve_pool
+from automagik_spark.core.celery.tasks import configure_in_process_worker, get_pool_name
+from automagik_spark.core.workflows.http_pool import close_client_pool, get_client_pool
+
+
+@pytest.fixture(autouse=True)
+def no_client_pool():
+    close_client_pool()
+    yield
+    close_client_pool()
+
+
+def test_pool_name_from_name_or_class():
+    from celery.concurrency.thread import TaskPool
+
+    assert get_pool_name(SimpleNamespace(pool_cls="gevent")) == "gevent"
+    assert get_pool_name(SimpleNamespace(pool_cls=TaskPool)) == "threads"
+
+
+def test_in_process_worker_gets_client_pool_per_run():
+    """Thread workers never fire worker_process_init, so the client pool is set up at worker init."""
+    configure_in_process_worker(sender=SimpleNamespace(pool_cls="threads", concurrency=200))
+    assert get_client_pool().limits.max_connections == 200
+
+
+def test_prefork_worker_leaves_client_pool_to_children():
+    configure_in_process_worker(sender=SimpleNamespace(pool_cls="prefork", concurrency=4))
+    assert get_client_pool() is None
+
+
+def test_green_worker_patches_database_driver():
+    with patch("automagik_spark.core.celery.tasks.patch_green_database") as patch_db:
+        configure_in_process_worker(sender=SimpleNamespace(pool_cls="gevent", concurrency=10))
+    patch_db.assert_called_once_with("gevent")
+
+
+def test_resolve_pool_defaults(monkeypatch):
+    monkeypatch.setenv("AUTOMAGIK_SPARK_WORKER_IO_CONCURRENCY", "300")
+    assert resolve_pool(None, None) == ("prefork", 2)
+    assert resolve_pool("threads", None) == ("threads", 300)
+    assert resolve_pool("threads", 8) == ("threads", 8)
+
+    monkeypatch.setenv("AUTOMAGIK_SPARK_WORKER_POOL", "threads")
+    assert resolve_pool(None, None) == ("threads", 300)
+
+
+def test_green_pool_needs_its_package():
+    with patch("importlib.util.find_spec", return_value=None):
+        with pytest.raises(click.ClickException):
+            resolve_pool("gevent", None)
+
+
+def test_worker_command_uses_pool():
+    cmd = _worker_command(100, "io@automagik", ["slow"], pool="gevent")
+    assert cmd[cmd.index("-P") + 1] == "gevent"
+    assert cmd[cmd.index("--concurrency") + 1] == "100"
@@ -0,0 +1,92 @@
+"""Tests for the per-process encryption key and decrypted API key caches."""
+
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from automagik_spark.core.database import models
+from automagik_spark.core.database.models import WorkflowSource
+
+
+@pytest.fixture(autouse=True)
+def clear_key_cache():
+    WorkflowSource.invalidate_api_key_cache()
+    yield
+    WorkflowSource.invalidate_api_key_cache()
+
+
+def test_fernet_is_reused():
+    """The Fernet instance is built once per encryption key."""
+    key = WorkflowSource._get_encryption_key()
+    assert models._get_fernet(key) is models._get_fernet(key)
+
+
+def test_encryption_key_follows_environment(monkeypatch):
+    """Changing the environment key is picked up despite the cache."""
+    monkeypatch.delenv("AUTOMAGIK_SPARK_ENCRYPTION_KEY", raising=False)
+    default_key = WorkflowSource._get_encryption_key()
+
+    custom_key = "S1JwNXY2Z1hrY1NhcUxXR3VZM3pNMHh3cU1mWWVEejVQYk09"
+    monkeypatch.setenv("AUTOMAGIK_SPARK_ENCRYPTION_KEY", custom_key)
+    assert WorkflowSource._get_encryption_key() == custom_key
+    assert default_key != custom_key
+
+
+def test_decrypt_with_source_id_is_cached():
+    """Decrypting the same source key twice only runs Fernet once."""
+    source_id = uuid4()
+    encrypted = WorkflowSource.encrypt_api_key("secret")
+
+    fernet = models._get_fernet(WorkflowSource._get_encryption_key())
+
+    with patch.object(models.Fernet, "decrypt", wraps=fernet.decrypt) as decrypt:
+        assert WorkflowSource.decrypt_api_key(encrypted, source_id=source_id) == "secret"
+        assert WorkflowSource.decrypt_api_key(encrypted, source_id=source_id) == "secret"
+        assert decrypt.call_count == 1
+
+        # Without a source ID nothing is cached
+        assert WorkflowSource.decrypt_api_key(encrypted) == "secret"
+        assert decrypt.call_count == 2
+
+
+def test_new_encrypted_key_misses_cache():
+    """A rotated key is decrypted again even without explicit invalidation."""
+    source_id = uuid4()
+    old = WorkflowSource.encrypt_api_key("old-secret")
+    new = WorkflowSource.encrypt_api_key("new-secret")
+
+    assert WorkflowSource.decrypt_api_key(old, source_id=source_id) == "old-secret"
+    assert WorkflowSource.decrypt_api_key(new, source_id=source_id) == "new-secret"
+
+
+def test_invalidate_single_source():
+    """Invalidation only drops the given source's keys."""
+    first, second = uuid4(), uuid4()
+    encrypted = WorkflowSource.encrypt_api_key("secret")
+    WorkflowSource.decrypt_api_key(encrypted, source_id=first)
+    WorkflowSource.decrypt_api_key(encrypted, source_id=second)
+
+    WorkflowSource.invalidate_api_key_cache(first)
+
+    cached_sources = {cache_key[0] for cache_key in models._decrypted_keys}
+    assert cached_sources == {str(second)}
+
+
+def test_cache_is_bounded(monkeypatch):
+    """The least recently used keys are evicted past the size limit."""
+    monkeypatch.setattr(models, "API_KEY_CACHE_SIZE", 2)
+    encrypted = WorkflowSource.encrypt_api_key("secret")
+    sources = [uuid4() for _ in range(3)]
+    for source_id in sources:
+        WorkflowSource.decrypt_api_key(encrypted, source_id=source_id)
+
+    cached_sources = {cache_key[0] for cache_key in models._decrypted_keys}
+    assert cached_sources == {str(sources[1]), str(sources[2])}
+
+
+def test_decrypt_failure_is_not_cached():
+    """Invalid ciphertext raises and leaves the cache empty."""
+    with pytest.raises(ValueError):
+        WorkflowSource.decrypt_api_key("not-a-token", source_id=uuid4())
+    assert not models._decrypted_keys
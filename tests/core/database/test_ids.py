@@ -0,0 +1,85 @@
+"""Tests for UUID parsing and index-friendly ID lookups."""
+
+from uuid import UUID, uuid4
+
+import pytest
+
+from automagik_spark.core.database.ids import parse_uuid, uuid_prefix_bounds
+from automagik_spark.core.database.models import Base, Task, Workflow
+from automagik_spark.core.workflows.manager import WorkflowManager
+
+
+@pytest.fixture
+def flow_manager(session):
+    return WorkflowManager(session)
+
+
+async def add_workflow_with_task(session, task_id=None):
+    workflow = Workflow(id=uuid4(), name="wf", source="langflow", remote_flow_id=str(uuid4()))
+    task = Task(id=task_id or uuid4(), workflow_id=workflow.id, input_data="", status="completed")
+    session.add_all([workflow, task])
+    await session.commit()
+    return workflow, task
+
+
+def test_parse_uuid():
+    value = uuid4()
+    assert parse_uuid(str(value)) == value
+    assert parse_uuid(value.hex) == value
+    assert parse_uuid(value) is value
+    assert parse_uuid("not-a-uuid") is None
+    assert parse_uuid(None) is None
+
+
+def test_prefix_bounds():
+    assert uuid_prefix_bounds("ab12-3") == (
+        UUID("ab123000-0000-0000-0000-000000000000"),
+        UUID("ab123fff-ffff-ffff-ffff-ffffffffffff"),
+    )
+    assert uuid_prefix_bounds("xyz") is None
+    assert uuid_prefix_bounds("") is None
+
+
+async def test_lookups_by_uuid_string(session, flow_manager):
+    """Local IDs resolve without casting the column (also on sqlite)."""
+    workflow, task = await add_workflow_with_task(session)
+
+    assert (await flow_manager.get_workflow(str(workflow.id))).id == workflow.id
+    assert (await flow_manager.get_workflow(workflow.remote_flow_id)).id == workflow.id
+    assert (await flow_manager.get_task(str(task.id))).id == task.id
+    assert await flow_manager.get_task("not-a-uuid") is None
+
+    tasks = await flow_manager.list_tasks(workflow_id=str(workflow.id))
+    assert [t["id"] for t in tasks] == [str(task.id)]
+    assert await flow_manager.count_tasks(workflow_id=str(workflow.id)) == 1
+    assert await flow_manager.list_tasks(workflow_id="not-a-uuid") == []
+    assert await flow_manager.count_tasks(workflow_id="not-a-uuid") == 0
+
+
+async def test_prefix_lookups(session, flow_manager):
+    """CLI-style prefixes match through a primary key range."""
+    first_id = UUID("abcdef01-0000-4000-8000-000000000001")
+    second_id = UUID("abcdef02-0000-4000-8000-000000000002")
+    workflow, _ = await add_workflow_with_task(session, task_id=first_id)
+    session.add(Task(id=second_id, workflow_id=workflow.id, input_data="", status="failed"))
+    await session.commit()
+
+    assert (await flow_manager.find_task_by_prefix("abcdef01")).id == first_id
+    assert (await flow_manager.find_task_by_prefix(str(second_id))).id == second_id
+    assert await flow_manager.find_task_by_prefix("0000") is None
+    with pytest.raises(ValueError, match="multiple"):
+        await flow_manager.find_task_by_prefix("abcdef")
+
+    assert (await flow_manager.find_workflow_by_prefix(str(workflow.id)[:8])).id == workflow.id
+
+
+def test_lookup_indexes_are_declared():
+    indexes = {
+        index.name: [column.name for column in index.columns]
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+    }
+    assert indexes["ix_tasks_workflow_id_created_at"] == ["workflow_id", "created_at"]
+    assert indexes["ix_tasks_status_created_at"] == ["status", "created_at"]
+    assert indexes["ix_schedules_status_next_run_at"] == ["status", "next_run_at"]
+    assert indexes["ix_workflows_remote_flow_id"] == ["remote_flow_id"]
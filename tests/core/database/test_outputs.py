@@ -0,0 +1,100 @@
+"""Tests for compact task output storage."""
+
+import json
+from uuid import uuid4
+
+from sqlalchemy import select
+
+from automagik_spark.api.models import TaskResponse
+from automagik_spark.core.database.models import Task, TaskOutput, Workflow
+from automagik_spark.core.database.outputs import (
+    RAW_OUTPUT_KEY,
+    extract_result,
+    is_offloaded,
+    pack_output,
+    store_task_output_async,
+)
+from automagik_spark.core.workflows.manager import WorkflowManager
+
+
+def langflow_response(text, padding=0):
+    return {
+        "session_id": "session-1",
+        "outputs": [
+            {
+                "inputs": {"input_value": "hi"},
+                "outputs": [
+                    {
+                        "results": {"message": {"text": text, "sender": "Machine"}},
+                        "artifacts": {"padding": "x" * padding},
+                    }
+                ],
+            }
+        ],
+    }
+
+
+def test_small_outputs_stay_inline():
+    encoded = json.dumps({"result": "ok"})
+    assert pack_output(uuid4(), encoded) == (encoded, None)
+
+
+def test_extract_result():
+    assert extract_result(langflow_response("hello")) == {"result": "hello", "session_id": "session-1"}
+    hive = {"result": "done", "session_id": "s", "run_id": "r", "agent_id": "a", "metrics": {"tokens": 10}}
+    assert extract_result(hive) == {"result": "done", "session_id": "s", "run_id": "r", "agent_id": "a"}
+    assert extract_result("plain text") == {"result": "plain text"}
+
+
+def test_large_outputs_are_compacted(monkeypatch):
+    monkeypatch.setenv("AUTOMAGIK_SPARK_TASK_OUTPUT_INLINE_LIMIT", "1024")
+    encoded = json.dumps(langflow_response("hello", padding=50_000))
+
+    value, row = pack_output(uuid4(), encoded)
+
+    compact = json.loads(value)
+    assert compact["result"] == "hello"
+    assert compact[RAW_OUTPUT_KEY] == {"encoding": "gzip", "size": len(encoded)}
+    assert is_offloaded(value)
+    assert len(row.data) < len(encoded) // 10
+
+
+def test_long_results_are_truncated(monkeypatch):
+    monkeypatch.setenv("AUTOMAGIK_SPARK_TASK_OUTPUT_INLINE_LIMIT", "100")
+
+    value, row = pack_output(uuid4(), "y" * 5000)
+
+    compact = json.loads(value)
+    assert compact["result"] == "y" * 100
+    assert compact["truncated"] is True
+    assert row.size == 5000
+
+
+async def test_raw_output_is_loaded_for_a_single_task(session, monkeypatch):
+    monkeypatch.setenv("AUTOMAGIK_SPARK_TASK_OUTPUT_INLINE_LIMIT", "1024")
+    workflow = Workflow(id=uuid4(), name="wf", source="langflow", remote_flow_id=str(uuid4()))
+    task = Task(id=uuid4(), workflow_id=workflow.id, input_data="hi", status="completed")
+    session.add_all([workflow, task])
+    response = langflow_response("hello", padding=5000)
+
+    await store_task_output_async(session, task, json.dumps(response))
+    await session.commit()
+
+    # Lists only see the compact extract
+    listed = TaskResponse.model_validate(task)
+    assert listed.output_data["result"] == "hello"
+    assert "outputs" not in listed.output_data
+
+    manager = WorkflowManager(session)
+    assert json.loads(await manager.get_task_output(task)) == response
+
+    # A retried run replaces the stored output
+    await store_task_output_async(session, task, json.dumps(langflow_response("again", padding=5000)))
+    await session.commit()
+    rows = (await session.execute(select(TaskOutput))).scalars().all()
+    assert len(rows) == 1
+    raw = json.loads(await manager.get_task_output(task))
+    assert extract_result(raw)["result"] == "again"
+
+    await manager.task.delete_task(task.id)
+    assert (await session.execute(select(TaskOutput))).scalars().all() == []
@@ -0,0 +1,91 @@
+"""Tests for keyset pagination and list totals."""
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from automagik_spark.core.database import pagination
+from automagik_spark.core.database.models import Task, Workflow
+from automagik_spark.core.database.pagination import (
+    count_total,
+    decode_cursor,
+    encode_cursor,
+    next_cursor,
+    page_items,
+)
+from automagik_spark.core.workflows.manager import WorkflowManager
+
+
+@pytest.fixture(autouse=True)
+def clear_counts():
+    pagination.clear_count_cache()
+    yield
+    pagination.clear_count_cache()
+
+
+async def add_tasks(session, count, same_time=False):
+    workflow = Workflow(id=uuid4(), name="wf", source="langflow", remote_flow_id=str(uuid4()))
+    session.add(workflow)
+    now = datetime.now(timezone.utc)
+    for i in range(count):
+        created_at = now if same_time else now - timedelta(minutes=i)
+        session.add(
+            Task(id=uuid4(), workflow_id=workflow.id, input_data=str(i), status="completed", created_at=created_at)
+        )
+    await session.commit()
+    return workflow
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    row_id = uuid4()
+    assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+
+
+def test_invalid_cursor_raises():
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.parametrize("same_time", [False, True])
+async def test_cursor_pages_cover_every_task_once(session, same_time):
+    """Following next_cursor visits each task exactly once, even with equal timestamps."""
+    await add_tasks(session, 7, same_time=same_time)
+    manager = WorkflowManager(session)
+
+    seen = []
+    cursor = None
+    while True:
+        rows = await manager.list_tasks(limit=3 + 1, cursor=cursor)
+        rows, has_more = page_items(rows, 3)
+        seen.extend(row["id"] for row in rows)
+        cursor = next_cursor(rows, has_more)
+        if cursor is None:
+            break
+
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+
+    expected = [row["id"] for row in await manager.list_tasks(limit=10)]
+    assert seen == expected
+
+
+async def test_count_modes(session, monkeypatch):
+    """Cached totals are reused and count=none skips counting."""
+    await add_tasks(session, 2)
+    query = select(func.count(Task.id))
+
+    assert await count_total(session, query, "none") is None
+    assert await count_total(session, query, "cached", cache_key=("tasks",)) == 2
+
+    await add_tasks(session, 3)
+    assert await count_total(session, query, "cached", cache_key=("tasks",)) == 2
+    assert await count_total(session, query, "exact") == 5
+
+    # sqlite has no planner estimate, so the estimate falls back to the cached count
+    assert await count_total(session, query, "estimate", cache_key=("tasks",), table="tasks") == 2
+
+    monkeypatch.setenv("AUTOMAGIK_SPARK_COUNT_CACHE_TTL", "0")
+    assert await count_total(session, query, "cached", cache_key=("tasks",)) == 5
@@ -0,0 +1,62 @@
+"""Test cases for the compiled schedule cache."""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from automagik_spark.core.scheduler.compiled import compile_schedule
+
+
+def test_compiled_schedules_are_cached():
+    """The same expression compiles once per timezone."""
+    assert compile_schedule("cron", "*/5 * * * *", "UTC") is compile_schedule("cron", "*/5 * * * *", "UTC")
+    assert compile_schedule("cron", "*/5 * * * *", "UTC") is not compile_schedule(
+        "cron", "*/5 * * * *", "America/Sao_Paulo"
+    )
+
+
+def test_interval_next_run():
+    """Intervals add their timedelta to the reference time."""
+    compiled = compile_schedule("interval", "30m")
+    after = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    assert compiled.interval == timedelta(minutes=30)
+    assert compiled.next_run(after) == after + timedelta(minutes=30)
+
+
+def test_cron_next_runs_respect_timezone():
+    """Cron expressions are evaluated in the schedule timezone and returned in UTC."""
+    after = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+    utc_runs = compile_schedule("cron", "0 8 * * *", "UTC").iter_runs(after)
+    assert next(utc_runs) == datetime(2025, 1, 2, 8, 0, tzinfo=timezone.utc)
+    assert next(utc_runs) == datetime(2025, 1, 3, 8, 0, tzinfo=timezone.utc)
+
+    sao_paulo = compile_schedule("cron", "0 8 * * *", "America/Sao_Paulo")
+    assert sao_paulo.next_run(after) == datetime(2025, 1, 2, 11, 0, tzinfo=timezone.utc)
+
+
+def test_one_time_schedules():
+    """One-time schedules run once and not at all when in the past."""
+    now = datetime.now(timezone.utc)
+    future = compile_schedule("one-time", (now + timedelta(hours=1)).isoformat())
+
+    assert list(future.iter_runs(now)) == [future.run_at]
+    assert compile_schedule("one-time", "2000-01-01T00:00:00").next_run(now) is None
+    assert compile_schedule("one-time", "now").beat_schedule(now) is not None
+
+
+@pytest.mark.parametrize(
+    "schedule_type,schedule_expr",
+    [
+        ("interval", "0m"),
+        ("interval", "5x"),
+        ("cron", "invalid"),
+        ("cron", "0 0 * * * *"),
+        ("one-time", "not a date"),
+        ("weekly", "1"),
+    ],
+)
+def test_invalid_expressions_raise(schedule_type, schedule_expr):
+    """Invalid expressions raise ValueError."""
+    with pytest.raises(ValueError):
+        compile_schedule(schedule_type, schedule_expr)
@@ -0,0 +1,51 @@
+"""Test cases for the due-time priority queue."""
+
+from automagik_spark.core.scheduler.due_queue import DueQueue
+
+
+def test_pop_due_returns_only_due_keys_in_order():
+    """Keys come out earliest first and only once they are due."""
+    queue = DueQueue()
+    queue.push("b", 20)
+    queue.push("a", 10)
+    queue.push("c", 30)
+
+    assert queue.pop_due(5) == []
+    assert queue.pop_due(20) == ["a", "b"]
+    assert queue.peek() == 30
+    assert len(queue) == 1
+
+
+def test_push_replaces_deadline():
+    """Re-pushing a key moves it instead of duplicating it."""
+    queue = DueQueue()
+    queue.push("a", 10)
+    queue.push("a", 50)
+
+    assert queue.pop_due(20) == []
+    assert queue.deadline("a") == 50
+    assert queue.pop_due(50) == ["a"]
+    assert queue.pop_due(100) == []
+
+
+def test_discard_and_limit():
+    """Discarded keys are skipped and limit caps a single pop."""
+    queue = DueQueue()
+    for i in range(5):
+        queue.push(i, i)
+    queue.discard(0)
+
+    assert 0 not in queue
+    assert queue.pop_due(10, limit=2) == [1, 2]
+    assert queue.pop_due(10) == [3, 4]
+    assert queue.peek() is None
+
+
+def test_stale_items_are_compacted():
+    """Repeated reschedules do not grow the heap without bound."""
+    queue = DueQueue()
+    for deadline in range(1000):
+        queue.push("a", deadline)
+
+    assert len(queue) == 1
+    assert len(queue._heap) < 100
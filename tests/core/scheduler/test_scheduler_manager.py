@@ -280,3 +280,85 @@ async def test_delete_nonexistent_schedule(scheduler_manager):
     """Test deleting a schedule that doesn't exist."""
     result = await scheduler_manager.delete_schedule(uuid4())
     assert result is False
+
+
+@pytest.mark.asyncio
+async def test_schedule_changes_are_published(scheduler_manager, sample_workflow, monkeypatch):
+    """Creating, pausing and deleting a schedule notifies the beat with its ID."""
+    from automagik_spark.core.celery import scheduler as beat_scheduler
+
+    notified = []
+    monkeypatch.setattr(beat_scheduler, "notify_scheduler_change", lambda *ids: notified.append(ids))
+
+    schedule = await scheduler_manager.create_schedule(
+        workflow_id=sample_workflow.id,
+        schedule_type="interval",
+        schedule_expr="30m",
+    )
+    await scheduler_manager.update_schedule_status(str(schedule.id), "pause")
+    await scheduler_manager.delete_schedule(schedule.id)
+
+    assert [str(ids[0]) for ids in notified] == [str(schedule.id)] * 3
+
+
+@pytest.mark.asyncio
+async def test_process_schedules_runs_only_due(scheduler_manager, sample_workflow, session):
+    """Only schedules whose next_run_at has passed are run, then moved forward."""
+    from datetime import timedelta
+    from unittest.mock import AsyncMock
+    from automagik_spark.core.database.models import Schedule
+
+    now = datetime.now(timezone.utc)
+    due = Schedule(
+        workflow_id=sample_workflow.id,
+        schedule_type="interval",
+        schedule_expr="30m",
+        status="active",
+        next_run_at=now - timedelta(minutes=1),
+    )
+    later = Schedule(
+        workflow_id=sample_workflow.id,
+        schedule_type="interval",
+        schedule_expr="30m",
+        status="active",
+        next_run_at=now + timedelta(hours=1),
+    )
+    session.add_all([due, later])
+    await session.commit()
+
+    scheduler = scheduler_manager.scheduler
+    scheduler.workflow_manager.run_workflow = AsyncMock()
+
+    assert await scheduler.process_schedules() == 1
+    scheduler.workflow_manager.run_workflow.assert_awaited_once()
+    assert due.next_run_at > now
+    assert await scheduler.get_next_deadline() is not None
+
+
+@pytest.mark.asyncio
+async def test_scheduler_loop_never_spins(scheduler_manager, sample_workflow, session):
+    """A schedule left due or a failing pass still makes the loop sleep, backing off on failures."""
+    from datetime import timedelta
+    from unittest.mock import patch
+
+    from automagik_spark.core.database.models import Schedule
+    from automagik_spark.core.scheduler.scheduler import MIN_SLEEP
+
+    session.add(
+        Schedule(
+            workflow_id=sample_workflow.id,
+            schedule_type="interval",
+            schedule_expr="30m",
+            status="active",
+            next_run_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+        )
+    )
+    await session.commit()
+
+    scheduler = scheduler_manager.scheduler
+    assert await scheduler._sleep_time(60) == MIN_SLEEP
+
+    with patch.object(scheduler.session, "execute", side_effect=RuntimeError("database down")):
+        assert await scheduler.process_schedules() == 0
+        assert await scheduler.process_schedules() == 0
+    assert await scheduler._sleep_time(60) == MIN_SLEEP * 2
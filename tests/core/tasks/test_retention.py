@@ -0,0 +1,108 @@
+"""Tests for the task retention purge."""
+
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from automagik_spark.core.database.models import Task, TaskLog, Worker, Workflow
+from automagik_spark.core.tasks.retention import RetentionPolicy, purge_task_history
+
+NOW = datetime.now(timezone.utc)
+
+
+async def add_workflow(session, retention_days=None):
+    workflow = Workflow(
+        id=uuid4(), name="wf", source="langflow", remote_flow_id=str(uuid4()), retention_days=retention_days
+    )
+    session.add(workflow)
+    await session.commit()
+    return workflow
+
+
+async def add_task(session, workflow, status, age_days):
+    task = Task(
+        id=uuid4(),
+        workflow_id=workflow.id,
+        input_data="hi",
+        status=status,
+        created_at=NOW - timedelta(days=age_days),
+    )
+    session.add(task)
+    session.add(TaskLog(id=uuid4(), task_id=task.id, level="info", message=f"{status} log"))
+    await session.commit()
+    return task
+
+
+async def remaining_ids(session):
+    session.expire_all()
+    return set((await session.execute(select(Task.id))).scalars().all())
+
+
+async def test_purge_applies_status_and_workflow_retention(session):
+    default = await add_workflow(session)
+    keep_long = await add_workflow(session, retention_days=90)
+
+    old_completed = await add_task(session, default, "completed", 10)
+    old_failed = await add_task(session, default, "failed", 10)
+    recent_completed = await add_task(session, default, "completed", 1)
+    old_running = await add_task(session, default, "running", 100)
+    overridden = await add_task(session, keep_long, "completed", 10)
+    await add_task(session, keep_long, "failed", 100)
+    session.add(Worker(id=uuid4(), hostname="h", pid=1, status="idle", current_task_id=old_completed.id))
+    await session.commit()
+
+    policy = RetentionPolicy(default_days=30, status_days={"completed": 7}, batch_size=1)
+    assert purge_task_history(policy, dry_run=True, now=NOW).deleted == 2
+
+    result = purge_task_history(policy, now=NOW)
+
+    assert result.deleted == 2
+    assert result.logs_deleted == 2
+    # The expired tasks are gone; running tasks are never purged
+    kept = {old_failed.id, recent_completed.id, old_running.id, overridden.id}
+    assert await remaining_ids(session) == kept
+    worker = (await session.execute(select(Worker))).scalar_one()
+    assert worker.current_task_id is None
+
+
+async def test_purge_without_retention_keeps_everything(session):
+    workflow = await add_workflow(session)
+    await add_task(session, workflow, "completed", 1000)
+
+    assert purge_task_history(RetentionPolicy(), now=NOW).deleted == 0
+    assert len(await remaining_ids(session)) == 1
+
+
+async def test_purge_archives_before_deleting(session, tmp_path):
+    workflow = await add_workflow(session, retention_days=90)
+    task = await add_task(session, workflow, "failed", 10)
+
+    # Explicit purges ignore per-workflow retention
+    policy = RetentionPolicy(default_days=5, archive_dir=str(tmp_path), workflow_overrides=False)
+    result = purge_task_history(policy, now=NOW)
+
+    assert result.deleted == 1
+    with gzip.open(result.archive_path, "rt") as archive:
+        records = [json.loads(line) for line in archive]
+    assert [record["id"] for record in records] == [str(task.id)]
+    assert records[0]["logs"][0]["message"] == "failed log"
+    assert await remaining_ids(session) == set()
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("completed=7, failed=30", {"completed": 7, "failed": 30}), ("", {})],
+)
+def test_policy_from_env(monkeypatch, value, expected):
+    monkeypatch.setenv("AUTOMAGIK_SPARK_TASK_RETENTION_BY_STATUS", value)
+    monkeypatch.setenv("AUTOMAGIK_SPARK_TASK_RETENTION_DAYS", "14")
+
+    policy = RetentionPolicy.from_env()
+
+    assert policy.status_days == expected
+    assert policy.default_days == 14
+    assert policy.days_for_status("cancelled") == 14
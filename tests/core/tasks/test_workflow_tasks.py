@@ -0,0 +1,145 @@
+"""Test cases for workflow execution tasks."""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from uuid import uuid4
+from sqlalchemy import select
+
+from automagik_spark.core.database.models import Schedule, Task, Workflow
+from automagik_spark.core.tasks.workflow_tasks import (
+    _claim_schedules_sync,
+    _execute_task_sync,
+    execute_task,
+    process_pending_tasks,
+)
+
+
+@pytest.fixture
+async def sample_workflow(session):
+    """Create a sample workflow for testing."""
+    workflow = Workflow(
+        id=uuid4(),
+        name="Test Workflow",
+        source="test",
+        remote_flow_id="test-workflow",
+        data={"test": "data"},
+    )
+    session.add(workflow)
+    await session.commit()
+    return workflow
+
+
+async def _add_schedule(session, workflow, schedule_type, schedule_expr, status="active"):
+    schedule = Schedule(
+        id=uuid4(),
+        workflow_id=workflow.id,
+        schedule_type=schedule_type,
+        schedule_expr=schedule_expr,
+        params={"value": f"input for {schedule_expr}"},
+        status=status,
+        next_run_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+    )
+    session.add(schedule)
+    await session.commit()
+    return schedule
+
+
+@pytest.mark.asyncio
+async def test_claim_schedules_creates_tasks_in_one_batch(session, sample_workflow):
+    """Active schedules get a pending task each; one-time schedules complete."""
+    interval = await _add_schedule(session, sample_workflow, "interval", "30m")
+    one_time = await _add_schedule(session, sample_workflow, "one-time", "now")
+    paused = await _add_schedule(session, sample_workflow, "interval", "1h", status="paused")
+
+    task_ids = _claim_schedules_sync([str(interval.id), str(one_time.id), str(paused.id), "not-a-uuid"])
+
+    assert len(task_ids) == 2
+    tasks = (await session.execute(select(Task))).scalars().all()
+    assert {task.schedule_id for task in tasks} == {interval.id, one_time.id}
+    assert all(task.status == "pending" for task in tasks)
+    assert {task.input_data for task in tasks} == {"input for 30m", "input for now"}
+
+    await session.refresh(interval)
+    await session.refresh(one_time)
+    await session.refresh(paused)
+    assert one_time.status == "completed"
+    assert interval.next_run_at.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc)
+    assert paused.status == "paused"
+
+
+@pytest.mark.asyncio
+async def test_execute_task_runs_pending_task_once(session, sample_workflow):
+    """A claimed task runs once and records the workflow output."""
+    schedule = await _add_schedule(session, sample_workflow, "interval", "30m")
+    (task_id,) = _claim_schedules_sync([str(schedule.id)])
+
+    with patch("automagik_spark.core.tasks.workflow_tasks.WorkflowSyncSync") as sync_class:
+        sync_class.return_value.__enter__.return_value.execute_workflow.return_value = {"result": "ok"}
+        task = _execute_task_sync(task_id)
+        assert task.status == "completed"
+        assert _execute_task_sync(task_id) is None
+
+    sync_class.return_value.__enter__.return_value.execute_workflow.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_execute_task_posts_callback(session, sample_workflow):
+    """Tasks enqueued with a callback URL POST the finished task to it."""
+    task = Task(id=uuid4(), workflow_id=sample_workflow.id, input_data="hello", status="pending")
+    session.add(task)
+    await session.commit()
+
+    with (
+        patch("automagik_spark.core.tasks.workflow_tasks.WorkflowSyncSync") as sync_class,
+        patch("automagik_spark.core.tasks.workflow_tasks.sync_client") as client_factory,
+    ):
+        sync_class.return_value.__enter__.return_value.execute_workflow.return_value = {"result": "ok"}
+        result = execute_task.apply(args=(str(task.id),), kwargs={"callback_url": "http://hooks/done"}).get()
+
+    assert result["status"] == "completed"
+    client = client_factory.return_value.__enter__.return_value
+    url, payload = client.post.call_args.args[0], client.post.call_args.kwargs["json"]
+    assert url == "http://hooks/done"
+    assert payload["id"] == str(task.id)
+    assert payload["status"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_busy_source_requeues_task(session, sample_workflow):
+    """A task whose source is at its run limits goes back to pending and is requeued."""
+    from automagik_spark.core.workflows.limiter import SourceBusyError
+
+    task = Task(id=uuid4(), workflow_id=sample_workflow.id, input_data="hello", status="pending")
+    session.add(task)
+    await session.commit()
+
+    with (
+        patch("automagik_spark.core.tasks.workflow_tasks.WorkflowSyncSync") as sync_class,
+        patch.object(execute_task, "apply_async") as requeue,
+    ):
+        sync_class.return_value.__enter__.return_value.execute_workflow.side_effect = SourceBusyError("src", 3.0)
+        assert execute_task.apply(args=(str(task.id),)).get() is None
+
+    requeue.assert_called_once_with(
+        (str(task.id),), {"callback_url": None, "stream": False}, countdown=3.0, queue=None, priority=None
+    )
+    await session.refresh(task)
+    assert (task.status, task.started_at, task.tries) == ("pending", None, 0)
+
+
+@pytest.mark.asyncio
+async def test_pending_sweep_leaves_busy_tasks_pending(session, sample_workflow):
+    """The pending task sweep keeps a task whose source is busy for its next pass."""
+    from automagik_spark.core.workflows.limiter import SourceBusyError
+
+    task = Task(id=uuid4(), workflow_id=sample_workflow.id, input_data="hello", status="pending")
+    session.add(task)
+    await session.commit()
+
+    with patch("automagik_spark.core.tasks.workflow_tasks.WorkflowSyncSync") as sync_class:
+        sync_class.return_value.__enter__.return_value.execute_workflow.side_effect = SourceBusyError("src", 3.0)
+        process_pending_tasks()
+
+    await session.refresh(task)
+    assert (task.status, task.started_at, task.error) == ("pending", None, None)
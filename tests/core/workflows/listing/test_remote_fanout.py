@@ -0,0 +1,107 @@
+"""Tests for concurrent remote flow listing across sources."""
+
+import time
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from automagik_spark.core.database.models import WorkflowSource
+from automagik_spark.core.workflows.manager import WorkflowManager
+
+
+@pytest.fixture
+def flow_manager(session):
+    return WorkflowManager(session)
+
+
+async def add_source(session, name, status="active"):
+    source = WorkflowSource(
+        name=name,
+        source_type="langflow",
+        url=f"http://{name}-{uuid4().hex[:8]}:7860",
+        encrypted_api_key=WorkflowSource.encrypt_api_key("secret"),
+        status=status,
+    )
+    session.add(source)
+    await session.commit()
+    return source
+
+
+def source_manager(list_flows):
+    manager = MagicMock()
+    manager.list_flows_sync.side_effect = list_flows
+    return manager
+
+
+async def test_sources_are_listed_concurrently(session, flow_manager):
+    """Slow sources overlap instead of adding up."""
+    sources = [await add_source(session, f"slow{i}") for i in range(3)]
+
+    def slow_list():
+        time.sleep(0.3)
+        return [{"id": str(uuid4())}]
+
+    managers = {source.id: source_manager(slow_list) for source in sources}
+
+    async def get_manager(source=None, source_url=None):
+        return managers[source.id]
+
+    started = time.monotonic()
+    with patch.object(flow_manager, "_get_source_manager", side_effect=get_manager):
+        flows, statuses = await flow_manager.list_remote_flows_with_status()
+
+    assert time.monotonic() - started < 0.8
+    assert len(flows) == 3
+    assert [status["status"] for status in statuses] == ["ok", "ok", "ok"]
+
+
+async def test_failed_and_slow_sources_are_reported(session, flow_manager):
+    """Partial results come back with per-source errors and timeouts."""
+    ok = await add_source(session, "ok")
+    broken = await add_source(session, "broken")
+    slow = await add_source(session, "slow")
+    await add_source(session, "inactive", status="inactive")
+
+    def fail():
+        raise ConnectionError("connection refused")
+
+    def hang():
+        time.sleep(1)
+        return []
+
+    managers = {
+        ok.id: source_manager(lambda: [{"id": "flow-1"}]),
+        broken.id: source_manager(fail),
+        slow.id: source_manager(hang),
+    }
+
+    async def get_manager(source=None, source_url=None):
+        return managers[source.id]
+
+    with patch.object(flow_manager, "_get_source_manager", side_effect=get_manager):
+        flows, statuses = await flow_manager.list_remote_flows_with_status(timeout=0.2)
+
+    assert [flow["id"] for flow in flows] == ["flow-1"]
+    assert flows[0]["source_url"] == ok.url
+
+    by_url = {status["source_url"]: status for status in statuses}
+    assert len(by_url) == 3
+    assert by_url[ok.url]["status"] == "ok"
+    assert by_url[ok.url]["flow_count"] == 1
+    assert by_url[broken.url]["status"] == "error"
+    assert "connection refused" in by_url[broken.url]["error"]
+    assert by_url[slow.url]["status"] == "timeout"
+
+
+async def test_list_remote_flows_returns_flows_only(session, flow_manager):
+    """The plain listing keeps returning a list of flows."""
+    source = await add_source(session, "plain")
+
+    async def get_manager(source=None, source_url=None):
+        return source_manager(lambda: [{"id": "flow-1"}])
+
+    with patch.object(flow_manager, "_get_source_manager", side_effect=get_manager):
+        flows = await flow_manager.list_remote_flows()
+
+    assert flows == [{"id": "flow-1", "source_url": source.url, "instance": flows[0]["instance"]}]
@@ -0,0 +1,92 @@
+"""Tests for the aggregated local workflow listing."""
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+
+from automagik_spark.core.database.models import Schedule, Task, Workflow
+from automagik_spark.core.workflows.manager import WorkflowManager
+
+
+@pytest.fixture
+def flow_manager(session):
+    return WorkflowManager(session)
+
+
+async def add_workflow(session, name, statuses=()):
+    workflow = Workflow(
+        id=uuid4(),
+        name=name,
+        source="langflow",
+        remote_flow_id=str(uuid4()),
+        data={"nodes": ["big"]},
+        flow_raw_data={"raw": "x" * 1000},
+        created_at=datetime.now(timezone.utc),
+    )
+    session.add(workflow)
+    started = datetime.now(timezone.utc) - timedelta(hours=1)
+    for i, status in enumerate(statuses):
+        session.add(
+            Task(
+                id=uuid4(),
+                workflow_id=workflow.id,
+                input_data="",
+                status=status,
+                created_at=started + timedelta(minutes=i),
+            )
+        )
+    await session.commit()
+    return workflow
+
+
+async def test_listing_aggregates_task_history(session, flow_manager):
+    """Counts and latest status come from the database, not loaded tasks."""
+    busy = await add_workflow(session, "busy", ["completed", "failed", "failed", "running"])
+    idle = await add_workflow(session, "idle")
+    session.add(Schedule(workflow_id=busy.id, schedule_type="interval", schedule_expr="5m", status="active"))
+    await session.commit()
+    session.expunge_all()
+
+    workflows = {w["name"]: w for w in await flow_manager.list_workflows()}
+
+    assert workflows["busy"]["task_count"] == 4
+    assert workflows["busy"]["failed_task_count"] == 2
+    assert workflows["busy"]["latest_run"] == "RUNNING"
+    assert len(workflows["busy"]["schedules"]) == 1
+    assert workflows["idle"]["task_count"] == 0
+    assert workflows["idle"]["latest_run"] == "NEW"
+    assert str(idle.id) == workflows["idle"]["id"]
+
+
+async def test_listing_skips_large_columns(session, flow_manager):
+    """The list projection leaves out data and flow_raw_data."""
+    await add_workflow(session, "flow", ["completed"])
+    session.expunge_all()
+
+    statements = []
+    engine = session.bind.sync_engine
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        workflows = await flow_manager.list_workflows(limit=10)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert "data" not in workflows[0] and "flow_raw_data" not in workflows[0]
+    assert not any("flow_raw_data" in statement for statement in statements)
+    # One query for the page and one for its schedules, whatever the task history
+    assert len(statements) == 2
+
+
+def test_to_dict_does_not_require_loaded_tasks():
+    """A workflow without loaded tasks reports empty statistics."""
+    workflow = Workflow(id=uuid4(), name="new", source="langflow", remote_flow_id="r1", data={"a": 1})
+    result = workflow.to_dict(include_data=False)
+    assert result["latest_run"] == "NEW"
+    assert "data" not in result
+    assert workflow.to_dict()["data"] == {"a": 1}
@@ -0,0 +1,121 @@
+"""Tests for syncing a whole source in one pass."""
+
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from automagik_spark.core.database.models import Workflow, WorkflowComponent, WorkflowSource
+from automagik_spark.core.workflows.adapters.langflow_adapter import LangFlowAdapter
+from automagik_spark.core.workflows.manager import WorkflowManager
+
+
+def langflow_flow(flow_id, name, with_data=True):
+    flow = {"id": flow_id, "name": name, "description": f"{name} flow", "folder_id": "folder-1"}
+    if with_data:
+        flow["data"] = {
+            "nodes": [
+                {"id": f"{flow_id}-in", "data": {"type": "ChatInput"}},
+                {"id": f"{flow_id}-out", "data": {"type": "ChatOutput"}},
+            ]
+        }
+    return flow
+
+
+@pytest.fixture
+async def source(session):
+    source = WorkflowSource(
+        name="langflow",
+        source_type="langflow",
+        url=f"http://langflow-{uuid4().hex[:8]}:7860",
+        encrypted_api_key=WorkflowSource.encrypt_api_key("secret"),
+        status="active",
+    )
+    session.add(source)
+    await session.commit()
+    return source
+
+
+def fake_adapter(source, flows, full_flows=None):
+    adapter = LangFlowAdapter(source.url, "secret", source_id=source.id)
+    adapter.list_flows = AsyncMock(return_value=flows)
+    adapter.get_flow = AsyncMock(side_effect=lambda flow_id: (full_flows or {}).get(flow_id))
+    return adapter
+
+
+async def count(session, model):
+    return (await session.execute(select(func.count()).select_from(model))).scalar()
+
+
+async def test_sync_source_lists_once_and_upserts(session, source):
+    manager = WorkflowManager(session)
+    adapter = fake_adapter(
+        source,
+        [langflow_flow("a", "Alpha"), langflow_flow("b", "Beta", with_data=False)],
+        full_flows={"b": langflow_flow("b", "Beta")},
+    )
+
+    with patch("automagik_spark.core.workflows.manager.AdapterRegistry.get_adapter", return_value=adapter):
+        result = await manager.sync_source(str(source.id))
+
+    assert (result["created"], result["updated"]) == (2, 0)
+    adapter.list_flows.assert_awaited_once()
+    # Only the flow the listing did not fully describe is fetched
+    adapter.get_flow.assert_awaited_once_with("b")
+    assert await count(session, Workflow) == 2
+    assert await count(session, WorkflowComponent) == 4
+
+    workflow = (await session.execute(select(Workflow).where(Workflow.remote_flow_id == "a"))).scalar_one()
+    assert workflow.input_component == "a-in"
+    assert workflow.workflow_source_id == source.id
+
+    # Re-sync by URL: existing rows are updated, components replaced, chosen components kept
+    workflow.input_component = "custom-in"
+    await session.commit()
+    adapter = fake_adapter(source, [langflow_flow("a", "Alpha v2"), langflow_flow("b", "Beta")])
+    with patch("automagik_spark.core.workflows.manager.AdapterRegistry.get_adapter", return_value=adapter):
+        result = await manager.sync_source(source.url, flow_ids=["a", "zzz"])
+
+    assert (result["created"], result["updated"]) == (0, 1)
+    assert result["missing"] == ["zzz"]
+    assert await count(session, Workflow) == 2
+    assert await count(session, WorkflowComponent) == 4
+    workflow = (await session.execute(select(Workflow).where(Workflow.remote_flow_id == "a"))).scalar_one()
+    assert workflow.name == "Alpha v2"
+    assert workflow.input_component == "custom-in"
+
+
+async def test_sync_source_unknown_source(session):
+    with pytest.raises(ValueError, match="not found"):
+        await WorkflowManager(session).sync_source(str(uuid4()))
+
+
+async def test_resync_skips_unchanged_flows(session, source):
+    manager = WorkflowManager(session)
+
+    async def sync(flows):
+        adapter = fake_adapter(source, flows)
+        with patch("automagik_spark.core.workflows.manager.AdapterRegistry.get_adapter", return_value=adapter):
+            return await manager.sync_source(str(source.id))
+
+    await sync([langflow_flow("a", "Alpha")])
+    workflow = (await session.execute(select(Workflow))).scalar_one()
+    first_hash, first_updated_at = workflow.flow_hash, workflow.updated_at
+    assert workflow.flow_version == 1
+
+    # Only upstream bookkeeping changed
+    flow = langflow_flow("a", "Alpha")
+    flow["updated_at"] = "2030-01-01T00:00:00"
+    result = await sync([flow])
+    assert (result["updated"], result["unchanged"]) == (0, 1)
+    await session.refresh(workflow)
+    assert (workflow.flow_hash, workflow.updated_at, workflow.flow_version) == (first_hash, first_updated_at, 1)
+
+    flow["data"]["nodes"].append({"id": "a-extra", "data": {"type": "Prompt"}})
+    result = await sync([flow])
+    assert (result["updated"], result["unchanged"]) == (1, 0)
+    await session.refresh(workflow)
+    assert workflow.flow_hash != first_hash
+    assert workflow.flow_version == 2
+    assert await count(session, WorkflowComponent) == 3
@@ -0,0 +1,109 @@
+"""Tests for the async workflow adapter interface."""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from unittest.mock import AsyncMock, patch
+
+from automagik_spark.core.workflows.adapters import (
+    BaseWorkflowAdapter,
+    HiveAdapter,
+    LangFlowAdapter,
+    WorkflowExecutionResult,
+)
+
+
+class BlockingAdapter(BaseWorkflowAdapter):
+    """Adapter that only implements the sync interface."""
+
+    def __init__(self):
+        super().__init__("http://blocking", "key")
+        self.threads = set()
+
+    @property
+    def source_type(self) -> str:
+        return "blocking"
+
+    def list_flows_sync(self) -> List[Dict[str, Any]]:
+        self.threads.add(threading.current_thread().name)
+        return [{"id": "flow-1"}]
+
+    def get_flow_sync(self, flow_id: str) -> Optional[Dict[str, Any]]:
+        return {"id": flow_id}
+
+    def run_flow_sync(self, flow_id: str, input_data: Any, session_id: Optional[str] = None) -> WorkflowExecutionResult:
+        self.threads.add(threading.current_thread().name)
+        time.sleep(0.2)
+        return WorkflowExecutionResult(success=True, result=input_data, session_id=session_id)
+
+    async def validate(self) -> Dict[str, Any]:
+        return {"status": "success"}
+
+
+async def test_sync_adapter_falls_back_to_thread_pool():
+    """Adapters without native coroutines run in the adapter thread pool."""
+    adapter = BlockingAdapter()
+
+    assert await adapter.list_flows() == [{"id": "flow-1"}]
+    assert await adapter.get_flow("flow-2") == {"id": "flow-2"}
+    result = await adapter.run_flow("flow-1", "hello", "session")
+
+    assert result.success and result.result == "hello" and result.session_id == "session"
+    assert all(name.startswith("adapter") for name in adapter.threads)
+
+
+async def test_blocking_runs_do_not_block_event_loop():
+    """Concurrent runs overlap, and the loop keeps serving other coroutines."""
+    adapter = BlockingAdapter()
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    tick_task = asyncio.create_task(ticker())
+    started = time.monotonic()
+    await asyncio.gather(*(adapter.run_flow("flow-1", str(i)) for i in range(4)))
+    elapsed = time.monotonic() - started
+    tick_task.cancel()
+
+    assert elapsed < 0.6
+    assert ticks > 5
+
+
+async def test_langflow_adapter_runs_natively():
+    """LangFlow runs use the manager's coroutine instead of a thread."""
+    adapter = LangFlowAdapter("http://langflow", "key")
+    with patch.object(adapter.manager, "run_workflow", AsyncMock(return_value={"outputs": []})) as run:
+        result = await adapter.run_flow("flow-1", "hello", "session")
+
+    run.assert_awaited_once_with("flow-1", "hello")
+    assert result.success and result.result == {"outputs": []}
+
+
+async def test_langflow_adapter_reports_run_errors():
+    adapter = LangFlowAdapter("http://langflow", "key")
+    with patch.object(adapter.manager, "run_workflow", AsyncMock(side_effect=RuntimeError("boom"))):
+        result = await adapter.run_flow("flow-1", "hello")
+
+    assert not result.success
+    assert result.error == "boom"
+
+
+async def test_hive_adapter_runs_natively():
+    """Hive runs are normalized the same way as the sync path."""
+    adapter = HiveAdapter("http://hive", "key")
+    response = {"result": "done", "session_id": "s1", "run_id": "r1", "agent_id": "agent", "status": "completed"}
+    with patch.object(adapter.manager, "run_flow", AsyncMock(return_value=response)) as run:
+        async with adapter:
+            result = await adapter.run_flow("agent", "hello", "s0")
+
+    run.assert_awaited_once_with("agent", "hello", "s0", flow_type=None)
+    assert result.success
+    assert result.result == "done"
+    assert result.run_id == "r1"
+    assert result.metadata["agent_id"] == "agent"
+    assert adapter.manager._client is None
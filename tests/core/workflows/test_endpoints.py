@@ -0,0 +1,105 @@
+"""Tests for running flows without looking them up first."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from automagik_spark.core.workflows.adapters import HiveAdapter
+from automagik_spark.core.workflows.endpoints import get_resolved
+from automagik_spark.core.workflows.remote import APIClientError, LangFlowManager
+
+LANGFLOW_FLOW = {
+    "id": "flow-1",
+    "data": {
+        "nodes": [
+            {"id": "ChatInput-1", "data": {"type": "ChatInput"}},
+            {"id": "ChatOutput-1", "data": {"type": "ChatOutput"}},
+        ]
+    },
+}
+
+
+@pytest.fixture
+def hive_client():
+    with patch("httpx.Client") as client_class:
+        client = MagicMock()
+        client_class.return_value.__enter__.return_value = client
+        response = MagicMock()
+        response.json.return_value = {"content": "hi", "status": "completed"}
+        client.post.return_value = response
+        yield client
+
+
+def test_synced_hive_workflow_skips_lookup(hive_client):
+    adapter = HiveAdapter("http://hive", "key")
+    workflow = SimpleNamespace(remote_flow_id="helper", data={"type": "hive_team"})
+
+    with patch.object(adapter.manager, "get_flow_sync") as get_flow:
+        result = adapter.run_workflow_sync(workflow, "hello", "s1")
+
+    assert result.success
+    get_flow.assert_not_called()
+    assert hive_client.post.call_args.args[0] == "/teams/helper/runs"
+
+
+def test_unsynced_hive_flow_is_looked_up_once(hive_client):
+    adapter = HiveAdapter("http://hive", "key")
+    workflow = SimpleNamespace(remote_flow_id="helper", data=None)
+
+    with patch.object(adapter.manager, "get_flow_sync", return_value={"data": {"type": "hive_agent"}}) as get_flow:
+        adapter.run_workflow_sync(workflow, "hello")
+        adapter.run_workflow_sync(workflow, "again")
+
+    get_flow.assert_called_once_with("helper")
+    assert get_resolved("http://hive", "helper") == "hive_agent"
+
+
+def test_missing_hive_flow_is_not_cached(hive_client):
+    adapter = HiveAdapter("http://hive", "key")
+
+    with patch.object(adapter.manager, "get_flow_sync", return_value=None) as get_flow:
+        assert not adapter.run_flow_sync("gone", "hello").success
+        assert not adapter.run_flow_sync("gone", "hello").success
+
+    assert get_flow.call_count == 2
+
+
+def test_langflow_components_are_resolved_once():
+    manager = LangFlowManager(api_url="http://langflow", api_key="key")
+    responses = {"GET": LANGFLOW_FLOW, "POST": {"outputs": []}}
+
+    with patch.object(manager, "_make_request_sync", side_effect=lambda method, *a, **kw: responses[method]) as request:
+        manager.run_flow_sync("flow-1", "hello")
+        manager.run_flow_sync("flow-1", "again")
+        manager.run_flow_sync("flow-2", "hi", input_component="in", output_component="out")
+
+    methods = [call.args[0] for call in request.call_args_list]
+    assert methods == ["GET", "POST", "POST", "POST"]
+    assert request.call_args.kwargs["json"]["tweaks"] == {"in": {}, "out": {}}
+
+
+def test_langflow_client_error_forgets_components():
+    manager = LangFlowManager(api_url="http://langflow", api_key="key")
+
+    def request(method, *args, **kwargs):
+        if method == "GET":
+            return LANGFLOW_FLOW
+        raise APIClientError("Client error: 404 - Flow not found")
+
+    with patch.object(manager, "_make_request_sync", side_effect=request):
+        with pytest.raises(APIClientError):
+            manager.run_flow_sync("flow-1", "hello")
+
+    assert get_resolved("http://langflow", "flow-1") is None
+
+
+def test_zero_ttl_disables_cache(hive_client, monkeypatch):
+    monkeypatch.setenv("AUTOMAGIK_SPARK_RESOLVED_FLOW_TTL", "0")
+    adapter = HiveAdapter("http://hive", "key")
+
+    with patch.object(adapter.manager, "get_flow_sync", return_value={"data": {"type": "hive_agent"}}) as get_flow:
+        adapter.run_flow_sync("helper", "hello")
+        adapter.run_flow_sync("helper", "again")
+
+    assert get_flow.call_count == 2
@@ -0,0 +1,120 @@
+"""Tests for queueing workflow runs instead of running them in the request."""
+
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+from automagik_spark.core.celery.routing import DEFAULT_PRIORITY, message_priority
+from automagik_spark.core.database.models import Task, Workflow, WorkflowSource
+from automagik_spark.core.workflows.limiter import SourceLimiter
+from automagik_spark.core.workflows.manager import WorkflowManager
+from automagik_spark.core.workflows.remote import LangFlowManager
+
+
+@pytest.fixture
+async def workflow(session):
+    workflow = Workflow(
+        id=uuid4(),
+        name="Queued Workflow",
+        source="test",
+        remote_flow_id="queued-flow",
+        data={},
+    )
+    session.add(workflow)
+    await session.commit()
+    return workflow
+
+
+async def test_enqueue_creates_pending_task_on_direct_queue(session, workflow):
+    """The task row is created and sent to the direct queue without running the flow."""
+    manager = WorkflowManager(session)
+    with patch("automagik_spark.core.tasks.workflow_tasks.execute_task.apply_async") as apply_async:
+        task = await manager.enqueue_workflow(workflow.remote_flow_id, "hello", callback_url="http://hooks/done")
+
+    assert task.status == "pending"
+    apply_async.assert_called_once_with(
+        args=(str(task.id),),
+        kwargs={"callback_url": "http://hooks/done"},
+        queue="direct",
+        priority=message_priority(DEFAULT_PRIORITY),
+    )
+    stored = (await session.execute(select(Task).where(Task.id == task.id))).scalar_one()
+    assert stored.input_data == "hello"
+
+
+async def test_enqueue_unknown_workflow_returns_none(session):
+    manager = WorkflowManager(session)
+    with patch("automagik_spark.core.tasks.workflow_tasks.execute_task.apply_async") as apply_async:
+        assert await manager.enqueue_workflow(str(uuid4()), "hello") is None
+    apply_async.assert_not_called()
+
+
+async def test_enqueue_marks_task_failed_when_broker_is_down(session, workflow):
+    manager = WorkflowManager(session)
+    with patch(
+        "automagik_spark.core.tasks.workflow_tasks.execute_task.apply_async",
+        side_effect=ConnectionError("broker unreachable"),
+    ):
+        with pytest.raises(RuntimeError):
+            await manager.enqueue_workflow(workflow.remote_flow_id, "hello")
+
+    task = (await session.execute(select(Task).where(Task.workflow_id == workflow.id))).scalar_one()
+    assert task.status == "failed"
+    assert "broker unreachable" in task.error
+
+
+async def _add_limited_source(session, workflow, max_concurrency):
+    source = WorkflowSource(
+        id=uuid4(),
+        source_type="langflow",
+        url="http://langflow",
+        encrypted_api_key=WorkflowSource.encrypt_api_key("key"),
+        status="active",
+        max_concurrency=max_concurrency,
+    )
+    workflow.workflow_source_id = source.id
+    session.add(source)
+    await session.commit()
+    return source
+
+
+async def test_inline_run_on_a_busy_source_is_requeued(session, workflow):
+    """An inline run with no room under the source's limits goes to a worker instead of failing."""
+    source = await _add_limited_source(session, workflow, max_concurrency=1)
+
+    limiter = SourceLimiter(wait=0)
+    limiter.acquire(source)
+    manager = WorkflowManager(session)
+    with (
+        patch("automagik_spark.core.workflows.manager.get_source_limiter", return_value=limiter),
+        patch("automagik_spark.core.tasks.workflow_tasks.execute_task.apply_async") as apply_async,
+    ):
+        task = await manager.run_workflow(workflow.id, "hello")
+
+    assert (task.status, task.started_at, task.error) == ("pending", None, None)
+    assert apply_async.call_args.kwargs["args"] == (str(task.id),)
+    assert apply_async.call_args.kwargs["countdown"] >= 1
+
+
+async def test_inline_run_rate_limited_shrinks_the_source_window(session, workflow):
+    """A 429 from the source fails the inline run and halves the source's concurrency window."""
+    source = await _add_limited_source(session, workflow, max_concurrency=4)
+    rate_limited = httpx.HTTPStatusError(
+        "Too Many Requests",
+        request=httpx.Request("POST", "http://langflow/api/v1/run/queued-flow"),
+        response=httpx.Response(429),
+    )
+
+    limiter = SourceLimiter(wait=0)
+    manager = WorkflowManager(session)
+    with (
+        patch("automagik_spark.core.workflows.manager.get_source_limiter", return_value=limiter),
+        patch.object(LangFlowManager, "run_workflow", AsyncMock(side_effect=rate_limited)),
+    ):
+        task = await manager.run_workflow(workflow.id, "hello")
+
+    assert task.status == "failed"
+    assert limiter._local.window(str(source.id), 4) == 2
@@ -0,0 +1,185 @@
+"""Tests for the remote flow catalog cache and conditional requests."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from automagik_spark.core.workflows import catalog
+from automagik_spark.core.workflows.catalog import RemoteFlowCatalog, catalog_key, conditional_get
+
+
+def make_source(url="http://langflow:7860", api_key="encrypted"):
+    return SimpleNamespace(id=uuid4(), url=url, source_type="langflow", encrypted_api_key=api_key)
+
+
+class CountingFetch:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        result = self.results[min(self.calls, len(self.results)) - 1]
+        if isinstance(result, Exception):
+            raise result
+        return [dict(flow) for flow in result]
+
+
+async def test_fresh_catalog_is_served_from_cache():
+    """Within the TTL the source is only queried once."""
+    cache = RemoteFlowCatalog(ttl=60, stale_ttl=60)
+    source = make_source()
+    fetch = CountingFetch([{"id": "flow-1"}])
+
+    first = await cache.get_flows(source, fetch)
+    first[0]["mutated"] = True
+    second = await cache.get_flows(source, fetch)
+
+    assert fetch.calls == 1
+    assert second == [{"id": "flow-1"}]
+
+
+async def test_stale_catalog_is_served_while_refreshing():
+    """Past the TTL the stale flows are returned and refreshed in the background."""
+    cache = RemoteFlowCatalog(ttl=60, stale_ttl=600)
+    source = make_source()
+    fetch = CountingFetch([{"id": "old"}], [{"id": "new"}])
+
+    await cache.get_flows(source, fetch)
+    cache._entries[catalog_key(source)].fetched_at -= 120
+
+    assert await cache.get_flows(source, fetch) == [{"id": "old"}]
+    await asyncio.gather(*cache._refreshing.values())
+    assert fetch.calls == 2
+    assert await cache.get_flows(source, fetch) == [{"id": "new"}]
+
+
+async def test_expired_catalog_is_fetched_again():
+    """Past the stale window the caller waits for fresh flows."""
+    cache = RemoteFlowCatalog(ttl=60, stale_ttl=60)
+    source = make_source()
+    fetch = CountingFetch([{"id": "old"}], [{"id": "new"}])
+
+    await cache.get_flows(source, fetch)
+    cache._entries[catalog_key(source)].fetched_at -= 600
+
+    assert await cache.get_flows(source, fetch) == [{"id": "new"}]
+
+
+async def test_failed_fetch_is_not_cached():
+    """Errors propagate and the next call queries the source again."""
+    cache = RemoteFlowCatalog(ttl=60, stale_ttl=60)
+    source = make_source()
+    fetch = CountingFetch(RuntimeError("down"), [{"id": "flow-1"}])
+
+    with pytest.raises(RuntimeError):
+        await cache.get_flows(source, fetch)
+    assert await cache.get_flows(source, fetch) == [{"id": "flow-1"}]
+
+
+async def test_force_refresh_and_invalidate():
+    """Forced refreshes and invalidation bypass the cached flows."""
+    cache = RemoteFlowCatalog(ttl=60, stale_ttl=60)
+    source = make_source()
+    fetch = CountingFetch([{"id": "flow-1"}])
+
+    await cache.get_flows(source, fetch)
+    await cache.get_flows(source, fetch, force_refresh=True)
+    assert fetch.calls == 2
+
+    cache.invalidate(source)
+    assert len(cache) == 0
+    await cache.get_flows(source, fetch)
+    assert fetch.calls == 3
+
+
+async def test_edited_source_misses_catalog():
+    """Changing a source's URL or key changes its catalog key."""
+    source = make_source()
+    key = catalog_key(source)
+    source.encrypted_api_key = "rotated"
+    assert catalog_key(source) != key
+
+
+async def test_disabled_catalog_always_fetches():
+    """A TTL of zero turns the cache off."""
+    cache = RemoteFlowCatalog(ttl=0, stale_ttl=0)
+    source = make_source()
+    fetch = CountingFetch([{"id": "flow-1"}])
+
+    await cache.get_flows(source, fetch)
+    await cache.get_flows(source, fetch)
+    assert fetch.calls == 2
+    assert len(cache) == 0
+
+
+def test_conditional_get_revalidates_with_etag():
+    """A 304 answer reuses the previously downloaded body."""
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(dict(request.headers))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=[{"id": "flow-1"}], headers={"ETag": '"v1"'})
+
+    with httpx.Client(base_url="http://langflow", transport=httpx.MockTransport(handler)) as client:
+        assert conditional_get(client, "/flows/") == [{"id": "flow-1"}]
+        assert conditional_get(client, "/flows/") == [{"id": "flow-1"}]
+
+    assert "if-none-match" not in seen_headers[0]
+    assert seen_headers[1]["if-none-match"] == '"v1"'
+
+
+def test_conditional_get_without_validators_is_plain_get():
+    """Responses without ETag/Last-Modified are not kept."""
+
+    def handler(request):
+        assert "if-none-match" not in request.headers
+        return httpx.Response(200, json={"ok": True})
+
+    with httpx.Client(base_url="http://hive", transport=httpx.MockTransport(handler)) as client:
+        assert conditional_get(client, "/agents") == {"ok": True}
+        assert conditional_get(client, "/agents") == {"ok": True}
+    assert not catalog._validated
+
+
+def test_conditional_get_uses_error_handler():
+    """Non-304 responses go through the given error handler."""
+    check = MagicMock(side_effect=ValueError("bad"))
+
+    with httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(500))) as client:
+        with pytest.raises(ValueError):
+            conditional_get(client, "http://langflow/api/v1/flows/", check=check)
+
+
+async def test_list_remote_flows_uses_catalog():
+    """Listing the same source twice only queries it once."""
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from automagik_spark.core.workflows.manager import WorkflowManager
+
+    source = make_source()
+    source.status = "active"
+    workflow_manager = WorkflowManager(MagicMock(spec=AsyncSession))
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = [source]
+
+    async def execute(*args, **kwargs):
+        return result
+
+    workflow_manager.session.execute = execute
+
+    manager = MagicMock()
+    manager.list_flows_sync.return_value = [{"id": "flow-1"}]
+    with patch.object(workflow_manager, "_get_source_manager", return_value=manager):
+        first = await workflow_manager.list_remote_flows(source_url=source.url)
+        second = await workflow_manager.list_remote_flows(source_url=source.url)
+
+    assert manager.list_flows_sync.call_count == 1
+    assert first == second
+    assert first[0]["source_url"] == source.url
@@ -2,7 +2,7 @@
 
 import pytest
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 import httpx
 import json
@@ -10,6 +10,7 @@ import json
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from automagik_spark.core.workflows.remote import LangFlowManager
 from automagik_spark.core.workflows.sync import WorkflowSync
 from automagik_spark.core.database.models import Task, Workflow, TaskLog
 
@@ -384,3 +385,26 @@ async def test_manager_not_initialized_error(
     # Don't use context manager, should raise error
     with pytest.raises(RuntimeError, match="Manager not initialized"):
         await workflow_sync.execute_workflow(workflow=test_flow, task=test_task, input_data="test input")
+
+
+@pytest.mark.asyncio
+async def test_langflow_run_uses_synced_components(
+    session: AsyncSession,
+    workflow_sync: WorkflowSync,
+    test_flow: Workflow,
+    test_task: Task,
+):
+    """Synced chat components are sent with the run, so the flow graph is never downloaded."""
+    manager = LangFlowManager(api_url="http://langflow", api_key="key")
+
+    with (
+        patch.object(manager, "get_flow", AsyncMock()) as get_flow,
+        patch.object(manager, "_make_request_async", AsyncMock(return_value={"outputs": []})) as request,
+    ):
+        async with workflow_sync as sync:
+            sync._manager = manager
+            await sync.execute_workflow(workflow=test_flow, task=test_task, input_data="test input")
+
+    get_flow.assert_not_called()
+    assert request.call_args.kwargs["json"]["tweaks"] == {"input_node": {}, "output_node": {}}
+    assert test_task.status == "completed"
@@ -0,0 +1,49 @@
+"""Test cases for the per-process HTTP client pool."""
+
+import pytest
+
+from automagik_spark.core.workflows import http_pool
+
+
+@pytest.fixture
+def pool():
+    """Initialize a client pool for the test and close it afterwards."""
+    pool = http_pool.init_client_pool()
+    yield pool
+    http_pool.close_client_pool()
+
+
+def test_clients_are_reused_per_source(pool):
+    """The same source and credentials share one client."""
+    first = pool.get_client("http://source-a", headers={"x-api-key": "a"}, timeout=30, verify=False)
+    again = pool.get_client("http://source-a", headers={"x-api-key": "a"}, timeout=30, verify=False)
+    other_key = pool.get_client("http://source-a", headers={"x-api-key": "b"}, timeout=30, verify=False)
+    other_source = pool.get_client("http://source-b", headers={"x-api-key": "a"}, timeout=30, verify=False)
+
+    assert first is again
+    assert first is not other_key
+    assert first is not other_source
+    assert len(pool) == 3
+
+
+def test_sync_client_borrows_from_pool(pool):
+    """Pooled clients stay open after the context exits."""
+    with http_pool.sync_client(base_url="http://source-a", timeout=30) as client:
+        pass
+
+    assert not client.is_closed
+    with http_pool.sync_client(base_url="http://source-a", timeout=30) as again:
+        assert again is client
+
+    http_pool.close_client_pool()
+    assert client.is_closed
+    assert http_pool.get_client_pool() is None
+
+
+def test_sync_client_without_pool_is_short_lived():
+    """Without a pool every call gets its own client that is closed on exit."""
+    assert http_pool.get_client_pool() is None
+    with http_pool.sync_client(base_url="http://source-a", timeout=30) as client:
+        assert not client.is_closed
+
+    assert client.is_closed
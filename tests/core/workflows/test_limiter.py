@@ -0,0 +1,193 @@
+"""Tests for per-source run limits."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from automagik_spark.core.workflows.limiter import (
+    RunLimitError,
+    SourceBusyError,
+    SourceLimiter,
+    WorkflowBusyError,
+    is_overload_error,
+    workflow_slots,
+)
+from automagik_spark.core.workflows.remote import APIClientError, LangFlowManager, RateLimitError
+
+
+def make_source(max_concurrency=None, max_runs_per_minute=None):
+    return SimpleNamespace(id=uuid4(), max_concurrency=max_concurrency, max_runs_per_minute=max_runs_per_minute)
+
+
+def http_error(status_code):
+    return httpx.HTTPStatusError("error", request=MagicMock(), response=MagicMock(status_code=status_code))
+
+
+def test_unlimited_sources_are_not_tracked():
+    limiter = SourceLimiter(wait=0)
+    source = make_source()
+
+    assert limiter.acquire(source) is None
+    with limiter.slot(source):
+        pass
+
+
+def test_concurrency_slots():
+    limiter = SourceLimiter(wait=0)
+    source = make_source(max_concurrency=2)
+
+    first = limiter.acquire(source)
+    limiter.acquire(source)
+    with pytest.raises(SourceBusyError):
+        limiter.acquire(source)
+
+    limiter.release(source, first)
+    assert limiter.acquire(source)
+    # Other sources have their own slots
+    assert limiter.acquire(make_source(max_concurrency=1))
+
+
+def test_runs_per_minute():
+    limiter = SourceLimiter(wait=0)
+    source = make_source(max_runs_per_minute=60)
+
+    limiter.acquire(source)
+    with pytest.raises(SourceBusyError) as busy:
+        limiter.acquire(source)
+    assert 0 < busy.value.retry_after <= 1.0
+
+
+def test_window_backs_off_and_recovers(monkeypatch):
+    monkeypatch.setenv("AUTOMAGIK_SPARK_LIMITER_LATENCY_TARGET", "30")
+    limiter = SourceLimiter(wait=0)
+    source = make_source(max_concurrency=8)
+    window = lambda: limiter._local.window(str(source.id), 8)  # noqa: E731
+
+    with pytest.raises(httpx.HTTPStatusError):
+        with limiter.slot(source):
+            raise http_error(503)
+    assert window() == 4
+
+    # Failures of runs already in flight do not halve the window again
+    limiter.record(source, latency=1.0, error=RateLimitError("Rate limit exceeded"))
+    assert window() == 4
+
+    # Client errors are the caller's fault, not congestion
+    limiter.record(source, latency=1.0, error=APIClientError("Client error: 400"))
+    assert window() > 4
+
+    for _ in range(40):
+        limiter.record(source, latency=1.0)
+    assert window() == 8
+
+    # Only four runs fit while the window is halved
+    limiter._local._windows[str(source.id)] = (4.0, 0.0)
+    limiter.record(source, latency=60.0)
+    assert window() == 2
+    limiter.acquire(source)
+    limiter.acquire(source)
+    with pytest.raises(SourceBusyError):
+        limiter.acquire(source)
+
+
+def test_unreachable_redis_falls_back_to_process_limits():
+    limiter = SourceLimiter(redis_url="redis://127.0.0.1:1/0", wait=0)
+    source = make_source(max_concurrency=1)
+
+    assert limiter.acquire(source)
+    with pytest.raises(SourceBusyError):
+        limiter.acquire(source)
+
+
+def test_overload_errors():
+    assert is_overload_error(http_error(429))
+    assert is_overload_error(http_error(502))
+    assert is_overload_error(httpx.ReadTimeout("timed out"))
+    assert not is_overload_error(http_error(404))
+    assert not is_overload_error(ValueError("bad input"))
+
+
+def test_langflow_429_raises_rate_limit_error():
+    response = httpx.Response(429, text="slow down", request=httpx.Request("POST", "http://langflow/api/v1/run/x"))
+    with pytest.raises(RateLimitError):
+        LangFlowManager._handle_error_response(response)
+
+
+def test_workflow_share_weighted_by_priority(monkeypatch):
+    monkeypatch.setenv("AUTOMAGIK_SPARK_WORKFLOW_MAX_SLOTS", "6")
+    assert workflow_slots() == 6
+    assert workflow_slots(9) == 10
+    assert workflow_slots(0) == 1
+
+    monkeypatch.setenv("AUTOMAGIK_SPARK_WORKFLOW_MAX_SLOTS", "0")
+    assert workflow_slots(9) is None
+
+
+def test_over_share_runs_back_off_with_load(monkeypatch):
+    """Runs turned away from a share wait longer the more runs already wait, and shorter with a bigger share."""
+    monkeypatch.setenv("AUTOMAGIK_SPARK_WORKFLOW_MAX_SLOTS", "1")
+    limiter = SourceLimiter(wait=0)
+    workflow = SimpleNamespace(id=uuid4(), priority=None)
+    limiter._local.observe(f"workflow:{workflow.id}", 4.0)
+
+    def turned_away():
+        with pytest.raises(WorkflowBusyError) as error:
+            with limiter.workflow_share(workflow):
+                pass
+        return error.value.retry_after
+
+    with limiter.workflow_share(workflow):
+        assert [turned_away() for _ in range(3)] == [4.0, 8.0, 12.0]
+
+    roomy = SimpleNamespace(id=uuid4(), priority=9)
+    monkeypatch.setenv("AUTOMAGIK_SPARK_WORKFLOW_MAX_SLOTS", "2")
+    limiter._local.observe(f"workflow:{roomy.id}", 4.0)
+    with limiter.workflow_share(roomy), limiter.workflow_share(roomy), limiter.workflow_share(roomy):
+        with pytest.raises(WorkflowBusyError) as error:
+            with limiter.workflow_share(roomy):
+                pass
+    assert error.value.retry_after == pytest.approx(4.0 / 3)
+
+
+def test_workflow_over_its_share_is_turned_away(monkeypatch):
+    """A workflow holding its share of slots is requeued at once while others still run."""
+    monkeypatch.setenv("AUTOMAGIK_SPARK_WORKFLOW_MAX_SLOTS", "1")
+    limiter = SourceLimiter(wait=30)
+    busy = SimpleNamespace(id=uuid4(), priority=None)
+    other = SimpleNamespace(id=uuid4(), priority=None)
+
+    with limiter.workflow_share(busy):
+        with pytest.raises(WorkflowBusyError) as error:
+            with limiter.workflow_share(busy):
+                pass
+        with limiter.workflow_share(other):
+            pass
+
+    assert isinstance(error.value, RunLimitError)
+    assert not isinstance(error.value, SourceBusyError)
+    with limiter.workflow_share(busy):
+        pass
+
+
+async def test_run_async_holds_both_limits(monkeypatch):
+    """Async runs take the workflow's share and a source slot and give both back."""
+    monkeypatch.setenv("AUTOMAGIK_SPARK_WORKFLOW_MAX_SLOTS", "1")
+    limiter = SourceLimiter(wait=0)
+    workflow = SimpleNamespace(id=uuid4(), priority=None)
+    source = make_source(max_concurrency=1)
+
+    async with limiter.run_async(workflow, source):
+        with pytest.raises(SourceBusyError):
+            limiter.acquire(source)
+        with pytest.raises(WorkflowBusyError):
+            with limiter.workflow_share(workflow):
+                pass
+
+    with pytest.raises(RuntimeError):
+        async with limiter.run_async(workflow, source):
+            raise RuntimeError("boom")
+    with limiter.run(workflow, source):
+        pass
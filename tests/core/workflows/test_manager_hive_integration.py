@@ -144,8 +144,8 @@ class TestWorkflowManagerHiveIntegration:
 
         # Mock adapter instance with required methods
         mock_adapter = MagicMock()
-        mock_adapter.list_flows_sync.return_value = mock_hive_flows
-        mock_adapter.get_flow_sync.return_value = mock_hive_flows[0]
+        mock_adapter.list_flows = AsyncMock(return_value=mock_hive_flows)
+        mock_adapter.get_flow = AsyncMock(return_value=mock_hive_flows[0])
         mock_adapter.get_default_sync_params.return_value = {
             "input_component": "message",
             "output_component": "result",
@@ -0,0 +1,110 @@
+"""Tests for streaming runs against LangFlow and AutoMagik Hive."""
+
+import json
+
+import httpx
+import pytest
+
+from automagik_spark.core.workflows.automagik_hive import AutomagikHiveManager
+from automagik_spark.core.workflows.remote import LangFlowManager
+from automagik_spark.core.workflows.streaming import iter_stream_events
+
+
+def test_parses_server_sent_events():
+    lines = [
+        ": comment",
+        "event: RunContent",
+        'data: {"content": "Hel"}',
+        "",
+        "data: plain text",
+        "data: on two lines",
+        "",
+    ]
+    assert list(iter_stream_events(lines)) == [
+        ("RunContent", {"content": "Hel"}),
+        ("message", "plain text\non two lines"),
+    ]
+
+
+def test_parses_json_lines_and_concatenated_objects():
+    lines = [
+        '{"event": "token", "data": {"chunk": "a"}}',
+        "",
+        '{"event": "RunContent", "content": "b"}{"event": "RunCompleted", "content": "b"}',
+        "not json",
+    ]
+    assert list(iter_stream_events(lines)) == [
+        ("token", {"chunk": "a"}),
+        ("RunContent", {"event": "RunContent", "content": "b"}),
+        ("RunCompleted", {"event": "RunCompleted", "content": "b"}),
+    ]
+
+
+def test_langflow_stream_relays_tokens_and_returns_result():
+    events = [
+        {"event": "add_message", "data": {"text": ""}},
+        {"event": "token", "data": {"chunk": "Hello", "id": "1"}},
+        {"event": "token", "data": {"chunk": " world", "id": "1"}},
+        {"event": "end", "data": {"result": {"session_id": "s1", "outputs": [{"text": "Hello world"}]}}},
+    ]
+
+    def handler(request):
+        assert request.url.params["stream"] == "true"
+        return httpx.Response(200, text="\n\n".join(json.dumps(event) for event in events))
+
+    relayed = []
+    with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+        result = LangFlowManager._stream_workflow_sync(
+            client, "http://langflow/api/v1/run/flow", {}, lambda event, data: relayed.append((event, data))
+        )
+
+    assert result == {"session_id": "s1", "outputs": [{"text": "Hello world"}]}
+    assert [data["chunk"] for event, data in relayed if event == "token"] == ["Hello", " world"]
+    assert relayed[0] == ("event", {"type": "add_message", "data": {"text": ""}})
+
+
+def test_langflow_stream_error_raises():
+    body = json.dumps({"event": "error", "data": {"error": "component failed"}})
+    with httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, text=body))) as client:
+        with pytest.raises(ValueError, match="component failed"):
+            LangFlowManager._stream_workflow_sync(client, "http://langflow/run", {}, lambda *args: None)
+
+
+def test_hive_agent_stream_accumulates_content():
+    body = "".join(
+        f"event: {name}\ndata: {json.dumps(data)}\n\n"
+        for name, data in [
+            ("RunStarted", {"run_id": "r1", "session_id": "s1", "agent_id": "agent"}),
+            ("RunContent", {"content": "Hi"}),
+            ("ToolCallStarted", {"tool": {"name": "search"}}),
+            ("RunContent", {"content": " there"}),
+            ("RunCompleted", {"content": "Hi there", "metrics": {"tokens": 3}}),
+        ]
+    )
+
+    def handler(request):
+        assert request.url.path == "/agents/agent/runs"
+        assert b"stream=true" in request.content
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    relayed = []
+    manager = AutomagikHiveManager("http://hive", "key")
+    with httpx.Client(base_url="http://hive", transport=httpx.MockTransport(handler)) as client:
+        result = manager._stream_run_sync(
+            client, "hive_agent", "agent", "hello", None, lambda event, data: relayed.append((event, data))
+        )
+
+    assert result["result"] == "Hi there"
+    assert result["run_id"] == "r1" and result["session_id"] == "s1" and result["agent_id"] == "agent"
+    assert result["metadata"] == {"tokens": 3}
+    assert [data["chunk"] for event, data in relayed if event == "token"] == ["Hi", " there"]
+    assert ("event", {"type": "ToolCallStarted"}) in relayed
+
+
+def test_hive_stream_error_raises():
+    body = 'event: RunError\ndata: {"content": "model overloaded"}\n\n'
+    manager = AutomagikHiveManager("http://hive", "key")
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text=body))
+    with httpx.Client(base_url="http://hive", transport=transport) as client:
+        with pytest.raises(ValueError, match="model overloaded"):
+            manager._stream_run_sync(client, "hive_team", "team", "hello", None, lambda *args: None)